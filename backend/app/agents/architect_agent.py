@@ -3,19 +3,193 @@ Architect Agent for generating system design proposals based on PRDs.
 Enhanced with PRD analysis and structured component recommendations.
 """
 
-from typing import Dict, Any, List, Optional
-import vertexai
-from vertexai.generative_models import GenerativeModel, Part, FinishReason
-import vertexai.preview.generative_models as generative_models
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict
 from ..core.config import settings
+from ..core.llm_registry import LLMRegistry
+from ..core.metrics import instrument_agent_method
+from ..core.structured_output import StructuredOutput, extract_json_object
+import copy
+import hashlib
 import logging
-import re
-import json
 from datetime import datetime
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+ANALYSIS_CACHE_SIZE = 128  # PRD analyses memoized per agent instance
+
+# Separates the analysis JSON from the design markdown in combined mode
+COMBINED_DESIGN_MARKER = "=== SYSTEM DESIGN ==="
+
+PRD_ANALYSIS_SCHEMA = """{
+  "key_features": ["list of main features/capabilities"],
+  "user_roles": ["list of user types/roles"],
+  "data_entities": ["list of main data objects/entities"],
+  "external_integrations": ["list of external systems mentioned"],
+  "functional_requirements": ["key functional requirements"],
+  "non_functional_requirements": ["performance, security, compliance requirements"],
+  "complexity_indicators": {
+    "user_roles_count": number,
+    "features_count": number,
+    "integrations_count": number,
+    "estimated_complexity": "low|medium|high"
+  },
+  "api_needs": ["suggested API endpoints based on user journeys"],
+  "data_storage_needs": ["database/storage requirements identified"]
+}"""
+
+DESIGN_SECTIONS_PROMPT = """## 1. **Architecture Overview**
+   - High-level architecture pattern recommendation with rationale
+   - Key architectural principles and design philosophy
+   - Overall system topology and communication patterns
+
+## 2. **Component Architecture**
+   ### Core Services/Components
+   - **List each major component with specific responsibilities**
+   - **Data flow between components**
+   - **Inter-service communication patterns**
+
+   ### Suggested Microservices (if applicable)
+   - Service breakdown based on identified features
+   - Service boundaries and responsibilities
+   - Dependencies and communication protocols
+
+## 3. **API Design Recommendations**
+   ### RESTful API Endpoints
+   - Specific endpoint suggestions based on user journeys
+   - Request/response data models
+   - Authentication and authorization strategy
+
+   ### Example API Structure:
+   ```
+   GET /api/v1/resource
+   POST /api/v1/resource
+   PUT /api/v1/resource/{id}
+   DELETE /api/v1/resource/{id}
+   ```
+
+## 4. **Data Architecture**
+   ### Database Design
+   - Recommended database type (SQL/NoSQL) with rationale
+   - Core entity relationships and schema suggestions
+   - Data access patterns and query optimization
+
+   ### Data Storage Strategy
+   - Primary data storage solutions
+   - Caching strategies
+   - Data backup and recovery approaches
+
+## 5. **Technology Stack Recommendations**
+   ### Frontend Stack
+   - Framework recommendations with rationale
+   - State management approach
+   - UI component strategy
+
+   ### Backend Stack
+   - Runtime and framework recommendations
+   - Dependency management
+   - Development and testing tools
+
+   ### Infrastructure & Cloud Services
+   - Google Cloud Platform service recommendations
+   - Containerization strategy (Docker/Kubernetes)
+   - CI/CD pipeline architecture
+
+## 6. **Security & Compliance**
+   ### Authentication & Authorization
+   - Identity provider integration (Google Identity Platform)
+   - Role-based access control (RBAC) design
+   - API security (OAuth 2.0, JWT tokens)
+
+   ### Healthcare Compliance
+   - HIPAA compliance considerations
+   - Data encryption (at rest and in transit)
+   - Audit logging requirements
+
+## 7. **Scalability & Performance**
+   ### Scalability Strategy
+   - Horizontal vs vertical scaling approach
+   - Auto-scaling configuration
+   - Load balancing strategy
+
+   ### Performance Optimization
+   - Caching strategies (Redis, CDN)
+   - Database optimization
+   - Monitoring and alerting
+
+## 8. **Implementation Roadmap**
+   ### Phase 1: Foundation (Weeks 1-4)
+   - Core infrastructure setup
+   - Basic authentication
+   - Primary data models
+
+   ### Phase 2: Core Features (Weeks 5-8)
+   - Main business logic
+   - API implementation
+   - Basic UI development
+
+   ### Phase 3: Integration & Enhancement (Weeks 9-12)
+   - External integrations
+   - Advanced features
+   - Performance optimization
+
+## 9. **Risk Assessment & Mitigation**
+   - Technical risks identified
+   - Mitigation strategies
+   - Fallback plans
+
+## 10. **Development & Deployment**
+   ### Development Environment
+   - Local development setup
+   - Testing strategy (unit, integration, e2e)
+   - Code quality and review processes
+
+   ### Deployment Strategy
+   - Environment promotion (dev → staging → prod)
+   - Blue-green or canary deployment
+   - Rollback procedures
+
+Provide specific, actionable recommendations that would be suitable for a healthcare technology company like DrFirst. Focus on proven technologies and patterns that support enterprise-grade applications with emphasis on security, compliance, and scalability.
+
+Format your response in clear markdown with headers and bullet points for easy reading. Include code examples and specific configuration recommendations where appropriate."""
+
+
+class ComplexityIndicators(BaseModel):
+    """Complexity section of the PRD analysis."""
+
+    model_config = ConfigDict(extra="allow")
+
+    user_roles_count: Optional[Union[int, float]] = None
+    features_count: Optional[Union[int, float]] = None
+    integrations_count: Optional[Union[int, float]] = None
+    estimated_complexity: Optional[str] = None
+
+
+class PrdAnalysisOutput(BaseModel):
+    """Expected JSON output of the PRD analysis prompt."""
+
+    model_config = ConfigDict(extra="allow")
+
+    key_features: Optional[List[str]] = None
+    user_roles: Optional[List[str]] = None
+    data_entities: Optional[List[str]] = None
+    external_integrations: Optional[List[str]] = None
+    functional_requirements: Optional[List[str]] = None
+    non_functional_requirements: Optional[List[str]] = None
+    complexity_indicators: Optional[ComplexityIndicators] = None
+    api_needs: Optional[List[str]] = None
+    data_storage_needs: Optional[List[str]] = None
+
+
+PRD_ANALYSIS_OUTPUT = StructuredOutput(PrdAnalysisOutput)
+
+
+def prd_content_hash(prd_content: str) -> str:
+    """Hash PRD content for memoizing its analysis."""
+    return hashlib.sha256((prd_content or "").encode("utf-8")).hexdigest()
+
 
 class ArchitectAgent:
     """
@@ -26,7 +200,11 @@ class ArchitectAgent:
     specific architectural recommendations based on actual PRD content.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        llm_registry: Optional[LLMRegistry] = None,
+        combined_design: Optional[bool] = None,
+    ):
         self.name = "Architect Agent"
         self.description = (
             "Generates system design proposals based on PRDs with enhanced analysis."
@@ -38,16 +216,26 @@ class ArchitectAgent:
         self.location = settings.vertex_ai_location
         self.model_name = settings.vertex_ai_model_name or "gemini-2.0-flash-lite"
 
-        try:
-            vertexai.init(project=self.project_id, location=self.location)
-            self.model = GenerativeModel(self.model_name)
+        # Combined mode returns the PRD analysis and the design from one call
+        self.combined_design = (
+            settings.architect_combined_design if combined_design is None else combined_design
+        )
+        self._analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        # Shared model handles from the process-wide LLM registry
+        if llm_registry is None:
+            from ..core.dependencies import get_llm_registry
+            llm_registry = get_llm_registry()
+        self.llm_registry = llm_registry
+        self.model = llm_registry.get_model(self.model_name, "system_design")
+        self.analysis_model = llm_registry.get_model(self.model_name, "prd_analysis")
+        if self.model:
             logger.info(
-                f"ArchitectAgent: Vertex AI initialized successfully with model {self.model_name}."
+                f"ArchitectAgent: Using shared Vertex AI model handle {self.model_name}."
             )
             self.status = "available"
-        except Exception as e:
-            logger.info(f"ArchitectAgent: Failed to initialize Vertex AI: {e}")
-            self.model = None
+        else:
+            logger.info("ArchitectAgent: Vertex AI model not available")
             self.status = "error"
 
     async def analyze_prd_content(self, prd_content: str) -> Dict[str, Any]:
@@ -60,11 +248,17 @@ class ArchitectAgent:
         Returns:
             Dict[str, Any]: Analysis results including features, entities, complexity, etc.
         """
-        if not self.model:
+        if not self.analysis_model:
             return {"error": "Model not available"}
 
+        prd_hash = prd_content_hash(prd_content)
+        cached_analysis = self._get_cached_analysis(prd_hash)
+        if cached_analysis is not None:
+            logger.info("[ArchitectAgent] Reusing PRD analysis for unchanged PRD content")
+            return cached_analysis
+
         try:
-            analysis_prompt = """Analyze the following PRD content and extract key architectural information:
+            analysis_prompt = f"""Analyze the following PRD content and extract key architectural information:
 
 --- PRD Content ---
 {prd_content}
@@ -72,56 +266,30 @@ class ArchitectAgent:
 
 Please provide a structured analysis in JSON format with the following sections:
 
-{{
-  "key_features": ["list of main features/capabilities"],
-  "user_roles": ["list of user types/roles"],
-  "data_entities": ["list of main data objects/entities"],
-  "external_integrations": ["list of external systems mentioned"],
-  "functional_requirements": ["key functional requirements"],
-  "non_functional_requirements": ["performance, security, compliance requirements"],
-  "complexity_indicators": {{
-    "user_roles_count": number,
-    "features_count": number,
-    "integrations_count": number,
-    "estimated_complexity": "low|medium|high"
-  }},
-  "api_needs": ["suggested API endpoints based on user journeys"],
-  "data_storage_needs": ["database/storage requirements identified"]
-}}
+{PRD_ANALYSIS_SCHEMA}
 
 Focus on extracting concrete, actionable architectural information that will guide system design decisions."""
 
-            response = await self.model.generate_content_async(
+            result = await self.analysis_model.generate(
                 [analysis_prompt],
-                generation_config={
-                    "max_output_tokens": 2048,
-                    "temperature": 0.2,
-                    "top_p": 0.8,
-                },
-                stream=False,
+                generation_config=PRD_ANALYSIS_OUTPUT.generation_config(
+                    self.analysis_model.generation_config
+                ),
             )
 
-            if response.candidates and response.candidates[0].content.parts:
-                analysis_text = response.candidates[0].content.parts[0].text.strip()
-
-                # Try to extract JSON from the response
-                try:
-                    # Find JSON block in the response
-                    json_match = re.search(r"\{.*\}", analysis_text, re.DOTALL)
-                    if json_match:
-                        analysis_data = json.loads(json_match.group())
-                        logger.info(
-                            "[ArchitectAgent] PRD analysis completed successfully"
-                        )
-                        return analysis_data
-                    else:
-                        # Fallback to basic analysis
-                        return self._fallback_prd_analysis(prd_content)
-                except json.JSONDecodeError:
-                    logger.warning(
-                        "[ArchitectAgent] Could not parse PRD analysis JSON, using fallback"
+            if result.text:
+                # Extract the JSON object and validate it against the output schema
+                analysis_data = PRD_ANALYSIS_OUTPUT.parse(result.text)
+                if analysis_data is not None:
+                    logger.info(
+                        "[ArchitectAgent] PRD analysis completed successfully"
                     )
-                    return self._fallback_prd_analysis(prd_content)
+                    self._store_analysis(prd_hash, analysis_data)
+                    return analysis_data
+                logger.warning(
+                    "[ArchitectAgent] Could not parse PRD analysis JSON, using fallback"
+                )
+                return self._fallback_prd_analysis(prd_content)
             else:
                 return self._fallback_prd_analysis(prd_content)
 
@@ -129,6 +297,20 @@ Focus on extracting concrete, actionable architectural information that will gui
             logger.error(f"[ArchitectAgent] Error in PRD analysis: {str(e)}")
             return self._fallback_prd_analysis(prd_content)
 
+    def _get_cached_analysis(self, prd_hash: str) -> Optional[Dict[str, Any]]:
+        analysis = self._analysis_cache.get(prd_hash)
+        if analysis is None:
+            return None
+        self._analysis_cache.move_to_end(prd_hash)
+        return copy.deepcopy(analysis)
+
+    def _store_analysis(self, prd_hash: str, analysis: Dict[str, Any]) -> None:
+        """Memoize a model-produced analysis (fallback analyses are not kept)."""
+        self._analysis_cache[prd_hash] = copy.deepcopy(analysis)
+        self._analysis_cache.move_to_end(prd_hash)
+        while len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
     def _fallback_prd_analysis(self, prd_content: str) -> Dict[str, Any]:
         """
         Fallback PRD analysis using simple text parsing.
@@ -163,6 +345,7 @@ Focus on extracting concrete, actionable architectural information that will gui
             "data_storage_needs": ["Database storage required"],
         }
 
+    @instrument_agent_method("ArchitectAgent")
     async def generate_system_design(
         self, prd_content: str, case_title: str
     ) -> Dict[str, Any]:
@@ -188,43 +371,34 @@ Focus on extracting concrete, actionable architectural information that will gui
             }
 
         try:
-            # First, analyze the PRD content
-            prd_analysis = await self.analyze_prd_content(prd_content)
-
-            # Generate enhanced system design prompt based on analysis
-            system_design_prompt = self._create_enhanced_design_prompt(
-                prd_content, case_title, prd_analysis
-            )
-
-            # Use generation settings optimized for technical content
-            generation_config = {
-                "max_output_tokens": 8192,  # Allow for comprehensive design
-                "temperature": 0.3,  # Lower temperature for more structured output
-                "top_p": 0.8,
-                "top_k": 40,
-            }
+            prd_analysis = self._get_cached_analysis(prd_content_hash(prd_content))
 
-            safety_settings = {
-                generative_models.HarmCategory.HARM_CATEGORY_HATE_SPEECH: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_HARASSMENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            }
+            if prd_analysis is None and self.combined_design:
+                # One call returns both the PRD analysis and the design
+                logger.info(
+                    f"[ArchitectAgent] Generating PRD analysis and system design in one call for case: {case_title}"
+                )
+                system_design_content, prd_analysis = await self._generate_combined_design(
+                    prd_content, case_title
+                )
+            else:
+                # First, analyze the PRD content (memoized per PRD hash)
+                if prd_analysis is None:
+                    prd_analysis = await self.analyze_prd_content(prd_content)
 
-            logger.info(
-                f"[ArchitectAgent] Generating enhanced system design for case: {case_title}"
-            )
-            response = await self.model.generate_content_async(
-                [system_design_prompt],
-                generation_config=generation_config,
-                safety_settings=safety_settings,
-                stream=False,
-            )
+                # Generate enhanced system design prompt based on analysis
+                system_design_prompt = self._create_enhanced_design_prompt(
+                    prd_content, case_title, prd_analysis
+                )
 
-            if response.candidates and response.candidates[0].content.parts:
-                system_design_content = (
-                    response.candidates[0].content.parts[0].text.strip()
+                # The system_design profile is optimized for technical content
+                logger.info(
+                    f"[ArchitectAgent] Generating enhanced system design for case: {case_title}"
                 )
+                result = await self.model.generate([system_design_prompt])
+                system_design_content = result.text.strip() if result.text else None
+
+            if system_design_content:
 
                 system_design_draft = {
                     "content_markdown": system_design_content,
@@ -266,6 +440,67 @@ Focus on extracting concrete, actionable architectural information that will gui
                 "system_design_draft": None,
             }
 
+    async def _generate_combined_design(
+        self, prd_content: str, case_title: str
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Generate the PRD analysis and the system design with a single call.
+
+        Returns:
+            Tuple of the design markdown (None if nothing was generated) and
+            the PRD analysis (the fallback analysis if none could be parsed)
+        """
+        result = await self.model.generate(
+            [self._create_combined_design_prompt(prd_content, case_title)]
+        )
+        if not result.text:
+            return None, self._fallback_prd_analysis(prd_content)
+
+        prd_analysis, system_design_content = self._split_combined_response(result.text)
+        if prd_analysis is None:
+            logger.warning(
+                "[ArchitectAgent] Could not parse PRD analysis from combined response, using fallback"
+            )
+            prd_analysis = self._fallback_prd_analysis(prd_content)
+        else:
+            self._store_analysis(prd_content_hash(prd_content), prd_analysis)
+        return system_design_content or None, prd_analysis
+
+    @staticmethod
+    def _split_combined_response(
+        response_text: str,
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Split a combined response into the analysis JSON and the design markdown."""
+        head, marker, tail = response_text.partition(COMBINED_DESIGN_MARKER)
+        if not marker:
+            return None, response_text.strip()
+
+        analysis = extract_json_object(head)
+        if analysis is not None:
+            analysis = PRD_ANALYSIS_OUTPUT.validate(analysis)
+        return analysis, tail.strip()
+
+    def _create_combined_design_prompt(self, prd_content: str, case_title: str) -> str:
+        """
+        Create a prompt that asks for the PRD analysis and the system design
+        in one response, separated by COMBINED_DESIGN_MARKER.
+        """
+        return f"""You are a Senior Software Architect with expertise in healthcare technology and cloud-based systems. Analyze the following approved PRD for the project titled '{case_title}' and then generate a comprehensive, actionable system design.
+
+--- PRD Content ---
+{prd_content}
+--- End PRD Content ---
+
+Respond in two parts.
+
+Part 1: A structured analysis of the PRD as a single JSON object with the following sections:
+
+{PRD_ANALYSIS_SCHEMA}
+
+Part 2: On its own line write exactly {COMBINED_DESIGN_MARKER} and then the system design in markdown, informed by your analysis. The system design must include:
+
+{DESIGN_SECTIONS_PROMPT}"""
+
     def _create_enhanced_design_prompt(
         self, prd_content: str, case_title: str, analysis: Dict[str, Any]
     ) -> str:
@@ -279,7 +514,7 @@ Focus on extracting concrete, actionable architectural information that will gui
         integrations = analysis.get("external_integrations", [])
         api_needs = analysis.get("api_needs", [])
 
-        return """You are a Senior Software Architect with expertise in healthcare technology and cloud-based systems. Based on the following approved PRD and its analysis for the project titled '{case_title}', generate a comprehensive, actionable system design.
+        return f"""You are a Senior Software Architect with expertise in healthcare technology and cloud-based systems. Based on the following approved PRD and its analysis for the project titled '{case_title}', generate a comprehensive, actionable system design.
 
 --- PRD Content ---
 {prd_content}
@@ -294,120 +529,7 @@ Estimated API Endpoints Needed: {len(api_needs) if api_needs else 'TBD'}
 
 Please provide a structured system design that includes:
 
-## 1. **Architecture Overview**
-   - High-level architecture pattern recommendation with rationale
-   - Key architectural principles and design philosophy
-   - Overall system topology and communication patterns
-
-## 2. **Component Architecture**
-   ### Core Services/Components
-   - **List each major component with specific responsibilities**
-   - **Data flow between components**
-   - **Inter-service communication patterns**
-
-   ### Suggested Microservices (if applicable)
-   - Service breakdown based on identified features
-   - Service boundaries and responsibilities
-   - Dependencies and communication protocols
-
-## 3. **API Design Recommendations**
-   ### RESTful API Endpoints
-   - Specific endpoint suggestions based on user journeys
-   - Request/response data models
-   - Authentication and authorization strategy
-
-   ### Example API Structure:
-   ```
-   GET /api/v1/resource
-   POST /api/v1/resource
-   PUT /api/v1/resource/{{id}}
-   DELETE /api/v1/resource/{{id}}
-   ```
-
-## 4. **Data Architecture**
-   ### Database Design
-   - Recommended database type (SQL/NoSQL) with rationale
-   - Core entity relationships and schema suggestions
-   - Data access patterns and query optimization
-
-   ### Data Storage Strategy
-   - Primary data storage solutions
-   - Caching strategies
-   - Data backup and recovery approaches
-
-## 5. **Technology Stack Recommendations**
-   ### Frontend Stack
-   - Framework recommendations with rationale
-   - State management approach
-   - UI component strategy
-
-   ### Backend Stack
-   - Runtime and framework recommendations
-   - Dependency management
-   - Development and testing tools
-
-   ### Infrastructure & Cloud Services
-   - Google Cloud Platform service recommendations
-   - Containerization strategy (Docker/Kubernetes)
-   - CI/CD pipeline architecture
-
-## 6. **Security & Compliance**
-   ### Authentication & Authorization
-   - Identity provider integration (Google Identity Platform)
-   - Role-based access control (RBAC) design
-   - API security (OAuth 2.0, JWT tokens)
-
-   ### Healthcare Compliance
-   - HIPAA compliance considerations
-   - Data encryption (at rest and in transit)
-   - Audit logging requirements
-
-## 7. **Scalability & Performance**
-   ### Scalability Strategy
-   - Horizontal vs vertical scaling approach
-   - Auto-scaling configuration
-   - Load balancing strategy
-
-   ### Performance Optimization
-   - Caching strategies (Redis, CDN)
-   - Database optimization
-   - Monitoring and alerting
-
-## 8. **Implementation Roadmap**
-   ### Phase 1: Foundation (Weeks 1-4)
-   - Core infrastructure setup
-   - Basic authentication
-   - Primary data models
-
-   ### Phase 2: Core Features (Weeks 5-8)
-   - Main business logic
-   - API implementation
-   - Basic UI development
-
-   ### Phase 3: Integration & Enhancement (Weeks 9-12)
-   - External integrations
-   - Advanced features
-   - Performance optimization
-
-## 9. **Risk Assessment & Mitigation**
-   - Technical risks identified
-   - Mitigation strategies
-   - Fallback plans
-
-## 10. **Development & Deployment**
-   ### Development Environment
-   - Local development setup
-   - Testing strategy (unit, integration, e2e)
-   - Code quality and review processes
-
-   ### Deployment Strategy
-   - Environment promotion (dev → staging → prod)
-   - Blue-green or canary deployment
-   - Rollback procedures
-
-Provide specific, actionable recommendations that would be suitable for a healthcare technology company like DrFirst. Focus on proven technologies and patterns that support enterprise-grade applications with emphasis on security, compliance, and scalability.
-
-Format your response in clear markdown with headers and bullet points for easy reading. Include code examples and specific configuration recommendations where appropriate."""
+{DESIGN_SECTIONS_PROMPT}"""
 
     async def design_architecture(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -10,6 +10,7 @@ from app.core.dependencies import get_db
 from app.core.database import DatabaseClient
 from app.core.constants import BusinessRules, Collections
 from app.core.logging_config import log_agent_operation, log_error_with_context, log_performance_metric
+from app.core.metrics import instrument_agent_method
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -32,6 +33,7 @@ class CostAnalystAgent:
         logger.info("CostAnalystAgent: Initialized successfully.")
         self.status = "available"
 
+    @instrument_agent_method("CostAnalystAgent")
     async def calculate_cost(
         self, effort_breakdown: Dict[str, Any], case_title: str
     ) -> Dict[str, Any]:
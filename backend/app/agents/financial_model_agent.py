@@ -4,6 +4,7 @@ Financial Model Agent for consolidating cost estimates and value projections.
 
 from typing import Dict, Any
 import logging
+from app.core.metrics import instrument_agent_method
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -25,6 +26,7 @@ class FinancialModelAgent:
         logger.info("FinancialModelAgent: Initialized successfully.")
         self.status = "available"
 
+    @instrument_agent_method("FinancialModelAgent")
     async def generate_financial_summary(
         self,
         cost_estimate: Dict[str, Any],
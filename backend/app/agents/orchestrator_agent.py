@@ -3,16 +3,30 @@ Orchestrator Agent for coordinating business case generation
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 import asyncio
 from enum import Enum
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from pydantic import BaseModel, Field
 from app.core.config import settings
-from app.core.dependencies import get_db, get_array_union
+from app.core.checkpoints import (
+    CHECKPOINTS_FIELD,
+    PIPELINE_RUN_FIELD,
+    completed_stage_output,
+    stage_input_hash,
+    with_checkpoint,
+)
+from app.core.dag import DagNode, DagScheduler
+from app.core.dependencies import get_db, get_array_union, get_llm_registry
 from app.core.database import DatabaseClient
+from app.core.job_queue import ClaimedJob, JobHandler, JobQueue, ProgressCallback
+from app.core.single_flight import SingleFlight, payload_hash
+from app.core.llm_registry import LLMRegistry
+from app.core.llm_cache import bypass_llm_cache
+from app.core.llm_limiter import AdaptiveConcurrencyLimiter
+from app.services.prompt_service import PromptService
 from app.core.logging_config import (
     log_agent_operation, 
     log_business_case_operation,
@@ -38,13 +52,26 @@ from .sales_value_analyst_agent import SalesValueAnalystAgent
 # Import FinancialModelAgent
 from .financial_model_agent import FinancialModelAgent
 
-# Import Firestore models for job tracking
-from app.models.firestore_models import Job, JobStatus
+# Speculative system design generation on PRD submission
+from .speculative_design import (
+    SPECULATIVE_DESIGN_FIELD,
+    SpeculativeDesignRunner,
+    stored_speculative_design,
+)
 
 # Import constants
 from app.core.constants import MessageTypes, MessageSources, Collections
 
 
+BUSINESS_CASE_JOB_TYPE = "business_case_generation"
+RESUME_PIPELINE_JOB_TYPE = "case_pipeline_resume"
+
+# Requests that start work; identical concurrent ones are coalesced
+SINGLE_FLIGHT_REQUEST_TYPES = frozenset(
+    {"initiate_case", "generate_business_case", "resume_case"}
+)
+
+
 class BusinessCaseStatus(Enum):
     """Represents the various states of a business case lifecycle."""
 
@@ -82,6 +109,36 @@ class BusinessCaseStatus(Enum):
     REJECTED = "REJECTED"
 
 
+# Statuses the design/planning pipeline can be resumed from
+DESIGN_PLANNING_RESUMABLE_STATUSES = frozenset(
+    {
+        BusinessCaseStatus.PRD_APPROVED.value,
+        BusinessCaseStatus.SYSTEM_DESIGN_DRAFTING.value,
+        BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
+        BusinessCaseStatus.PLANNING_IN_PROGRESS.value,
+    }
+)
+
+# Transient statuses; a case left in one of them has lost its worker
+IN_PROGRESS_STATUSES = [
+    BusinessCaseStatus.SYSTEM_DESIGN_DRAFTING.value,
+    BusinessCaseStatus.PLANNING_IN_PROGRESS.value,
+    BusinessCaseStatus.FINANCIAL_MODEL_IN_PROGRESS.value,
+]
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    """Timestamps are stored as datetimes, but older documents may hold ISO strings."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
 # Pydantic model for Firestore data
 class BusinessCaseData(BaseModel):
     case_id: str = Field(..., description="Unique ID for the business case")
@@ -151,22 +208,51 @@ class OrchestratorAgent:
     by managing other specialized agents.
     """
 
-    def __init__(self, db: Optional[DatabaseClient] = None):
+    def __init__(
+        self,
+        db: Optional[DatabaseClient] = None,
+        llm_registry: Optional[LLMRegistry] = None,
+        job_queue: Optional[JobQueue] = None,
+    ):
         self.name = "Orchestrator Agent"
         self.description = "Coordinates the business case generation process"
         self.status = "initialized"
         self.echo_tool = EchoTool()
-        self.product_manager_agent = ProductManagerAgent()
-        self.architect_agent = ArchitectAgent()
-        self.planner_agent = PlannerAgent()
-        self.cost_analyst_agent = CostAnalystAgent()
-        self.sales_value_analyst_agent = SalesValueAnalystAgent()
-        self.financial_model_agent = FinancialModelAgent()
         self.logger = logging.getLogger(__name__)
 
-        # Use dependency injection for database client
+        # Use dependency injection for database client and LLM registry
         self.db = db if db is not None else get_db()
         self.logger.info("OrchestratorAgent: Database client initialized successfully.")
+        self.llm_registry = llm_registry if llm_registry is not None else get_llm_registry()
+        self.job_queue = job_queue if job_queue is not None else JobQueue(self.db)
+
+        self.product_manager_agent = ProductManagerAgent(
+            prompt_service=PromptService(self.db), llm_registry=self.llm_registry
+        )
+        self.architect_agent = ArchitectAgent(llm_registry=self.llm_registry)
+        self.planner_agent = PlannerAgent(llm_registry=self.llm_registry)
+        self.cost_analyst_agent = CostAnalystAgent(db=self.db)
+        self.sales_value_analyst_agent = SalesValueAnalystAgent(
+            llm_registry=self.llm_registry, db=self.db
+        )
+        self.financial_model_agent = FinancialModelAgent()
+        self.business_case_dag = self._build_business_case_dag()
+        self.single_flight: Optional[SingleFlight] = None
+        if settings.single_flight_enabled:
+            self.single_flight = SingleFlight(
+                "orchestrator", window_seconds=settings.single_flight_window_seconds
+            )
+
+        self.speculative_design: Optional[SpeculativeDesignRunner] = None
+        if settings.speculative_design_enabled:
+            limiter = getattr(self.llm_registry, "limiter", None)
+            self.speculative_design = SpeculativeDesignRunner(
+                self.architect_agent,
+                max_concurrency=settings.speculative_design_concurrency,
+                ttl_seconds=settings.speculative_design_ttl_seconds,
+                limiter=limiter if isinstance(limiter, AdaptiveConcurrencyLimiter) else None,
+                store=self._store_speculative_design,
+            )
 
     async def handle_request(
         self, request_type: str, payload: Dict[str, Any], user_id: str
@@ -174,7 +260,37 @@ class OrchestratorAgent:
         """
         Main entry point for handling various requests to the Orchestrator Agent.
         Routes requests to the appropriate tool or method based on request_type.
+
+        A truthy ``bypassCache`` in the payload skips LLM response cache
+        lookups for every agent call made while handling the request.
+
+        Identical concurrent initiate_case/generate_business_case/resume_case
+        requests (same user, request type and normalized payload) share one run and
+        its result; a successful result is also returned to duplicates that
+        arrive within single_flight_window_seconds of completion.
         """
+        if self.single_flight is not None and request_type in SINGLE_FLIGHT_REQUEST_TYPES:
+            key = f"{user_id}:{request_type}:{payload_hash(payload)}"
+            return await self.single_flight.do(
+                key,
+                lambda: self._handle_request(request_type, payload, user_id),
+                cacheable=lambda response: response.get("status") == "success",
+            )
+        return await self._handle_request(request_type, payload, user_id)
+
+    async def _handle_request(
+        self, request_type: str, payload: Dict[str, Any], user_id: str
+    ) -> Dict[str, Any]:
+        """Apply request-scoped options, then dispatch."""
+        if payload.get("bypassCache"):
+            with bypass_llm_cache():
+                return await self._dispatch_request(request_type, payload, user_id)
+        return await self._dispatch_request(request_type, payload, user_id)
+
+    async def _dispatch_request(
+        self, request_type: str, payload: Dict[str, Any], user_id: str
+    ) -> Dict[str, Any]:
+        """Route a request to the handler for its request_type."""
         if not self.db:
             return {
                 "status": "error",
@@ -272,6 +388,16 @@ class OrchestratorAgent:
                     "result": None,
                 }
 
+            if payload.get("streamPrd"):
+                # The client drafts the PRD through the SSE stream endpoint
+                initial_user_message = f"Business case '{case_data.title}' initiated (ID: {case_id}). Problem: '{case_data.problem_statement}'. PRD drafting will be streamed."
+                return {
+                    "status": "success",
+                    "message": initial_user_message,
+                    "caseId": case_id,
+                    "initialMessage": initial_user_message,
+                }
+
             # Now, invoke ProductManagerAgent to draft PRD
             case_logger = log_business_case_operation(
                 self.logger, case_id, user_id, "prd_generation"
@@ -380,81 +506,81 @@ class OrchestratorAgent:
                 "initialMessage": initial_user_message,
             }
         elif request_type == "generate_business_case":
-            # Handle business case generation with job tracking
+            # Queue business case generation; a job worker runs it
             requirements = payload.get("requirements", {})
             title = payload.get("title", "Business Case Generation")
-            
-            # Create a job for tracking
-            job_id = str(uuid.uuid4())
-            current_time = datetime.now(timezone.utc)
-            
-            job = Job(
-                id=job_id,
-                job_type="business_case_generation",
-                status=JobStatus.PENDING,
-                user_uid=user_id,
-                progress=0,
-                created_at=current_time,
-                updated_at=current_time,
-                metadata={
-                    "title": title,
-                    "requirements": requirements,
-                    "request_type": "generate_business_case"
-                }
-            )
-            
-            # Store job in Firestore
+
             try:
-                job_ref = self.db.collection(Collections.JOBS).document(job_id)
-                await asyncio.to_thread(job_ref.set, job.model_dump(exclude_none=True, exclude={"id"}))
-                
-                # Update job to IN_PROGRESS and start generation
-                await asyncio.to_thread(job_ref.update, {
-                    "status": JobStatus.IN_PROGRESS.value,
-                    "started_at": current_time,
-                    "progress": 10
-                })
-                
-                # Trigger the business case generation workflow
-                generation_result = await self.generate_business_case(requirements)
-                
-                # Update job with result
-                if generation_result.get("status") == "success":
-                    await asyncio.to_thread(job_ref.update, {
-                        "status": JobStatus.COMPLETED.value,
-                        "completed_at": datetime.now(timezone.utc),
-                        "progress": 100,
-                        "business_case_id": generation_result.get("case_id")
-                    })
-                else:
-                    await asyncio.to_thread(job_ref.update, {
-                        "status": JobStatus.FAILED.value,
-                        "completed_at": datetime.now(timezone.utc),
-                        "error_message": generation_result.get("message", "Unknown error")
-                    })
-                
+                job_id = await self.job_queue.enqueue(
+                    BUSINESS_CASE_JOB_TYPE,
+                    user_id,
+                    payload={"requirements": requirements, "title": title},
+                    metadata={
+                        "title": title,
+                        "request_type": "generate_business_case"
+                    },
+                )
                 return {
                     "status": "success",
-                    "message": "Business case generation started",
+                    "message": "Business case generation queued",
                     "job_id": job_id,
-                    "result": generation_result
+                    "result": {"status": "pending"}
                 }
-                
+
             except Exception as e:
                 job_logger = log_agent_operation(
-                    self.logger, "OrchestratorAgent", job_id, "create_job"
+                    self.logger, "OrchestratorAgent", "unknown", "create_job"
                 )
                 log_error_with_context(
                     job_logger, 
                     "Failed to create business case generation job", 
                     e,
-                    {'job_id': job_id, 'user_id': user_id}
+                    {'user_id': user_id}
                 )
                 return {
                     "status": "error",
                     "message": f"Failed to create generation job: {str(e)}",
                     "result": None,
                 }
+        elif request_type == "resume_case":
+            # Queue a resume of an interrupted case pipeline
+            case_id = payload.get("case_id")
+            if not case_id:
+                return {
+                    "status": "error",
+                    "message": "Missing 'case_id' in payload for resume_case request.",
+                    "result": None,
+                }
+
+            try:
+                case_ref = self.db.collection(Collections.BUSINESS_CASES).document(case_id)
+                doc = await asyncio.to_thread(case_ref.get)
+                if not doc.exists or (doc.to_dict() or {}).get("user_id") != user_id:
+                    return {
+                        "status": "error",
+                        "message": f"Business case {case_id} not found",
+                        "result": None,
+                    }
+
+                job_id = await self.job_queue.enqueue(
+                    RESUME_PIPELINE_JOB_TYPE,
+                    user_id,
+                    payload={"case_id": case_id},
+                    metadata={"request_type": "resume_case"},
+                )
+                return {
+                    "status": "success",
+                    "message": "Case pipeline resume queued",
+                    "job_id": job_id,
+                    "result": {"status": "pending"}
+                }
+
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "message": f"Failed to queue case resume: {str(e)}",
+                    "result": None,
+                }
         elif request_type == "get_case_status":
             # Get status of a business case
             case_id = payload.get("case_id")
@@ -506,7 +632,7 @@ class OrchestratorAgent:
                 }
             
             try:
-                job_ref = self.db.collection("jobs").document(job_id)
+                job_ref = self.db.collection(Collections.JOBS).document(job_id)
                 doc = await asyncio.to_thread(job_ref.get)
                 
                 if not doc.exists:
@@ -524,6 +650,7 @@ class OrchestratorAgent:
                         "job_id": job_id,
                         "status": job_data.get("status"),
                         "progress": job_data.get("progress", 0),
+                        "progress_message": job_data.get("progress_message"),
                         "business_case_id": job_data.get("business_case_id"),
                         "error_message": job_data.get("error_message"),
                         "created_at": job_data.get("created_at"),
@@ -602,155 +729,126 @@ class OrchestratorAgent:
                 "message": f"Business case generation failed: {str(e)}",
             }
 
+    def job_handlers(self) -> Dict[str, JobHandler]:
+        """Handlers a JobWorker runs for jobs queued by this orchestrator."""
+        return {
+            BUSINESS_CASE_JOB_TYPE: self._run_business_case_job,
+            RESUME_PIPELINE_JOB_TYPE: self._run_resume_job,
+        }
+
+    async def _run_business_case_job(
+        self, job: ClaimedJob, progress: ProgressCallback
+    ) -> Dict[str, Any]:
+        """Job handler for queued generate_business_case requests."""
+        requirements = dict(job.payload.get("requirements") or {})
+        # The case belongs to the user who queued the job
+        requirements.setdefault("user_id", job.user_uid)
+        await progress(10, "Generating business case")
+        return await self.generate_business_case(requirements)
+
+    async def _run_resume_job(
+        self, job: ClaimedJob, progress: ProgressCallback
+    ) -> Dict[str, Any]:
+        """Job handler resuming an interrupted case pipeline."""
+        await progress(10, "Resuming case pipeline")
+        return await self.resume_case_pipeline(job.payload.get("case_id", ""))
+
     async def run_echo_tool(self, input_text: str) -> str:
         """Runs the EchoTool with the provided input text."""
         return await self.echo_tool.run(input_text)
 
-    async def coordinate_agents(
-        self, task_data: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
+    def _build_business_case_dag(self) -> DagScheduler:
+        """
+        Agent workflow graph: PRD -> design -> effort -> {cost, value} -> financial.
+
+        Node outputs are the agents' own response dicts. Value analysis only
+        reads the PRD but, like cost, is gated on the effort estimate to
+        match the approval workflow; cost and value then run concurrently.
+        """
+
+        def prd_content(results: Dict[str, Any]) -> str:
+            return (results["prd"].get("prd_draft") or {}).get("content_markdown", "")
+
+        async def prd(context, results):
+            return await self.product_manager_agent.draft_prd(
+                problem_statement=context.get("problem_statement", ""),
+                case_title=context.get("case_title", ""),
+                relevant_links=context.get("relevant_links", []),
+            )
+
+        async def design(context, results):
+            return await self.architect_agent.generate_system_design(
+                prd_content=prd_content(results),
+                case_title=context.get("case_title", ""),
+            )
+
+        async def effort(context, results):
+            system_design = results["design"].get("system_design_draft") or {}
+            return await self.planner_agent.estimate_effort(
+                prd_content=prd_content(results),
+                system_design_content=system_design.get("content_markdown", ""),
+                case_title=context.get("case_title", ""),
+            )
+
+        async def cost(context, results):
+            return await self.cost_analyst_agent.calculate_cost(
+                effort_breakdown=results["effort"].get("effort_breakdown") or {},
+                case_title=context.get("case_title", ""),
+            )
+
+        async def value(context, results):
+            return await self.sales_value_analyst_agent.project_value(
+                prd_content=prd_content(results),
+                case_title=context.get("case_title", ""),
+            )
+
+        async def financial(context, results):
+            return await self.financial_model_agent.generate_financial_summary(
+                cost_estimate=results["cost"].get("cost_estimate") or {},
+                value_projection=results["value"].get("value_projection") or {},
+                case_title=context.get("case_title", ""),
+            )
+
+        return DagScheduler(
+            "business_case",
+            [
+                DagNode("prd", prd),
+                DagNode("design", design, inputs=("prd",)),
+                DagNode("effort", effort, inputs=("prd", "design")),
+                DagNode("cost", cost, inputs=("effort",)),
+                DagNode("value", value, inputs=("prd", "effort")),
+                DagNode("financial", financial, inputs=("cost", "value")),
+            ],
+            concurrency_limits=settings.dag_stage_concurrency,
+        )
+
+    async def coordinate_agents(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Coordinate multiple agents to work on different aspects of the business case.
-        This method can run agents in parallel or sequence based on the task requirements.
+        Run the agent workflow DAG for a business case.
+
+        Each stage starts as soon as the stages it depends on have finished,
+        so independent stages (cost and value) run concurrently.
+
+        Args:
+            task_data: {
+                "case_data": shared inputs (problem_statement, case_title,
+                    relevant_links),
+                "provided": outputs of already completed stages, keyed by
+                    node name (prd, design, effort, cost, value, financial),
+                "targets": stages to produce; defaults to the whole workflow
+            }
+
+        Returns:
+            Dict[str, Any]: Overall status, per-node status and timing, and
+            each stage's agent response under "results"
         """
         try:
-            task_type = task_data.get("task_type", "sequential")
-            agents_to_run = task_data.get("agents", [])
-            case_data = task_data.get("case_data", {})
-            
-            results = []
-            
-            if task_type == "parallel":
-                # Run multiple agents in parallel for independent tasks
-                tasks = []
-                
-                for agent_config in agents_to_run:
-                    agent_name = agent_config.get("agent")
-                    agent_task = agent_config.get("task")
-                    agent_payload = agent_config.get("payload", {})
-                    
-                    if agent_name == "product_manager" and agent_task == "draft_prd":
-                        task = self.product_manager_agent.draft_prd(
-                            problem_statement=agent_payload.get("problem_statement", ""),
-                            case_title=agent_payload.get("case_title", ""),
-                            relevant_links=agent_payload.get("relevant_links", [])
-                        )
-                        tasks.append(task)
-                    elif agent_name == "architect" and agent_task == "generate_system_design":
-                        task = self.architect_agent.generate_system_design(
-                            prd_content=agent_payload.get("prd_content", ""),
-                            case_title=agent_payload.get("case_title", "")
-                        )
-                        tasks.append(task)
-                    elif agent_name == "planner" and agent_task == "estimate_effort":
-                        task = self.planner_agent.estimate_effort(
-                            prd_content=agent_payload.get("prd_content", ""),
-                            system_design_content=agent_payload.get("system_design_content", ""),
-                            case_title=agent_payload.get("case_title", "")
-                        )
-                        tasks.append(task)
-                    elif agent_name == "cost_analyst" and agent_task == "estimate_costs":
-                        task = self.cost_analyst_agent.estimate_costs(
-                            effort_breakdown=agent_payload.get("effort_breakdown", {}),
-                            case_title=agent_payload.get("case_title", "")
-                        )
-                        tasks.append(task)
-                    elif agent_name == "sales_value_analyst" and agent_task == "analyze_value":
-                        task = self.sales_value_analyst_agent.analyze_value(
-                            prd_content=agent_payload.get("prd_content", ""),
-                            case_title=agent_payload.get("case_title", "")
-                        )
-                        tasks.append(task)
-                    elif agent_name == "financial_model" and agent_task == "generate_model":
-                        task = self.financial_model_agent.generate_financial_model(
-                            cost_estimate=agent_payload.get("cost_estimate", {}),
-                            value_projection=agent_payload.get("value_projection", {}),
-                            case_title=agent_payload.get("case_title", "")
-                        )
-                        tasks.append(task)
-                
-                # Run all tasks in parallel
-                if tasks:
-                    parallel_results = await asyncio.gather(*tasks, return_exceptions=True)
-                    
-                    for i, result in enumerate(parallel_results):
-                        if isinstance(result, Exception):
-                            results.append({
-                                "agent": agents_to_run[i].get("agent"),
-                                "status": "error",
-                                "message": str(result)
-                            })
-                        else:
-                            results.append({
-                                "agent": agents_to_run[i].get("agent"),
-                                "status": "success",
-                                "result": result
-                            })
-            
-            elif task_type == "sequential":
-                # Run agents in sequence (default behavior)
-                for agent_config in agents_to_run:
-                    agent_name = agent_config.get("agent")
-                    agent_task = agent_config.get("task")
-                    agent_payload = agent_config.get("payload", {})
-                    
-                    try:
-                        if agent_name == "product_manager" and agent_task == "draft_prd":
-                            result = await self.product_manager_agent.draft_prd(
-                                problem_statement=agent_payload.get("problem_statement", ""),
-                                case_title=agent_payload.get("case_title", ""),
-                                relevant_links=agent_payload.get("relevant_links", [])
-                            )
-                        elif agent_name == "architect" and agent_task == "generate_system_design":
-                            result = await self.architect_agent.generate_system_design(
-                                prd_content=agent_payload.get("prd_content", ""),
-                                case_title=agent_payload.get("case_title", "")
-                            )
-                        elif agent_name == "planner" and agent_task == "estimate_effort":
-                            result = await self.planner_agent.estimate_effort(
-                                prd_content=agent_payload.get("prd_content", ""),
-                                system_design_content=agent_payload.get("system_design_content", ""),
-                                case_title=agent_payload.get("case_title", "")
-                            )
-                        elif agent_name == "cost_analyst" and agent_task == "estimate_costs":
-                            result = await self.cost_analyst_agent.estimate_costs(
-                                effort_breakdown=agent_payload.get("effort_breakdown", {}),
-                                case_title=agent_payload.get("case_title", "")
-                            )
-                        elif agent_name == "sales_value_analyst" and agent_task == "analyze_value":
-                            result = await self.sales_value_analyst_agent.analyze_value(
-                                prd_content=agent_payload.get("prd_content", ""),
-                                case_title=agent_payload.get("case_title", "")
-                            )
-                        elif agent_name == "financial_model" and agent_task == "generate_model":
-                            result = await self.financial_model_agent.generate_financial_model(
-                                cost_estimate=agent_payload.get("cost_estimate", {}),
-                                value_projection=agent_payload.get("value_projection", {}),
-                                case_title=agent_payload.get("case_title", "")
-                            )
-                        else:
-                            result = {
-                                "status": "error",
-                                "message": f"Unknown agent/task combination: {agent_name}/{agent_task}"
-                            }
-                        
-                        results.append({
-                            "agent": agent_name,
-                            "task": agent_task,
-                            "status": "success" if result.get("status") == "success" else "error",
-                            "result": result
-                        })
-                        
-                    except Exception as e:
-                        results.append({
-                            "agent": agent_name,
-                            "task": agent_task,
-                            "status": "error",
-                            "message": str(e)
-                        })
-            
-            return results
-            
+            run = await self.business_case_dag.run(
+                task_data.get("case_data", {}),
+                provided=task_data.get("provided"),
+                targets=task_data.get("targets"),
+            )
+            return run.to_dict()
         except Exception as e:
             orchestrator_logger = log_agent_operation(
                 self.logger, "OrchestratorAgent", "unknown", "coordinate_agents"
@@ -761,10 +859,10 @@ class OrchestratorAgent:
                 e,
                 {'task_data': str(task_data)}
             )
-            return [{
+            return {
                 "status": "error",
-                "message": f"Agent coordination failed: {str(e)}"
-            }]
+                "message": f"Agent coordination failed: {str(e)}",
+            }
 
     def get_status(self) -> Dict[str, str]:
         """Get the current status of the orchestrator agent"""
@@ -774,6 +872,138 @@ class OrchestratorAgent:
             "description": self.description,
         }
 
+    async def stream_prd_draft(self, case_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream PRD drafting for an existing case and persist the final draft.
+
+        Relays the ProductManagerAgent stream events ("status" and "chunk",
+        then "complete" or "error"). Once the stream completes, the draft is
+        stored on the case with status PRD_DRAFTING before the "complete"
+        event is yielded.
+
+        Args:
+            case_id (str): The business case ID
+
+        Yields:
+            Dict[str, Any]: Stream events with a "type" key
+        """
+        case_logger = log_agent_operation(
+            self.logger, "OrchestratorAgent", case_id, "stream_prd_draft"
+        )
+        case_doc_ref = self.db.collection(Collections.BUSINESS_CASES).document(case_id)
+        doc_snapshot = await asyncio.to_thread(case_doc_ref.get)
+        if not doc_snapshot.exists:
+            yield {"type": "error", "message": f"Business case {case_id} not found"}
+            return
+
+        case_data = doc_snapshot.to_dict()
+        case_logger.info("Streaming PRD draft from ProductManagerAgent")
+
+        async for event in self.product_manager_agent.stream_prd(
+            problem_statement=case_data.get("problem_statement", ""),
+            case_title=case_data.get("title", "Untitled Business Case"),
+            relevant_links=case_data.get("relevant_links", []),
+        ):
+            if event["type"] == "error":
+                case_logger.error(f"PRD streaming failed: {event.get('message')}")
+                updated_at_time = datetime.now(timezone.utc)
+                try:
+                    await asyncio.to_thread(
+                        case_doc_ref.update,
+                        {
+                            "history": get_array_union([
+                                {
+                                    "timestamp": updated_at_time.isoformat(),
+                                    "source": MessageSources.ORCHESTRATOR_AGENT,
+                                    "type": MessageTypes.AGENT_ERROR,
+                                    "content": f"Failed to generate PRD draft: {event.get('message')}",
+                                }
+                            ]),
+                            "updated_at": updated_at_time,
+                        },
+                    )
+                except Exception as e:
+                    log_error_with_context(
+                        case_logger, "Failed to update case history with PRD error", e
+                    )
+                yield event
+                return
+
+            if event["type"] == "complete":
+                prd_draft = event["prd_draft"]
+                updated_at_time = datetime.now(timezone.utc)
+                try:
+                    await asyncio.to_thread(
+                        case_doc_ref.update,
+                        {
+                            "prd_draft": prd_draft,
+                            "status": BusinessCaseStatus.PRD_DRAFTING.value,
+                            "history": get_array_union([
+                                {
+                                    "timestamp": updated_at_time.isoformat(),
+                                    "source": MessageSources.ORCHESTRATOR_AGENT,
+                                    "type": MessageTypes.STATUS_UPDATE,
+                                    "content": f"Status updated to {BusinessCaseStatus.PRD_DRAFTING.value}. Initial PRD draft generated by Product Manager Agent.",
+                                },
+                                {
+                                    "timestamp": updated_at_time.isoformat(),
+                                    "source": MessageSources.PRD_AGENT,
+                                    "type": MessageTypes.PRD_SUBMISSION,
+                                    "content": prd_draft["content_markdown"],
+                                },
+                            ]),
+                            "updated_at": updated_at_time,
+                        },
+                    )
+                    case_logger.info(
+                        "Case updated with streamed PRD draft and status",
+                        extra={'new_status': BusinessCaseStatus.PRD_DRAFTING.value}
+                    )
+                except Exception as e:
+                    log_error_with_context(
+                        case_logger, "Failed to update case with streamed PRD draft", e
+                    )
+                    yield {
+                        "type": "error",
+                        "message": f"Failed to store PRD draft: {str(e)}",
+                    }
+                    return
+
+            yield event
+
+    def start_speculative_system_design(
+        self, case_id: str, prd_content: str, case_title: str
+    ) -> bool:
+        """
+        Start generating the system design for a PRD submitted for review,
+        ahead of approval. No-op unless speculative design is enabled.
+
+        Returns:
+            bool: Whether a speculative run was started
+        """
+        if self.speculative_design is None or not prd_content:
+            return False
+        started = self.speculative_design.start(case_id, prd_content, case_title)
+        if started:
+            self.logger.info(f"Started speculative system design for case {case_id}")
+        return started
+
+    async def _store_speculative_design(
+        self, case_id: str, input_hash: str, response: Dict[str, Any]
+    ) -> None:
+        """Save a speculative design on its case so any process can adopt it."""
+        case_doc_ref = self.db.collection(Collections.BUSINESS_CASES).document(case_id)
+        await asyncio.to_thread(
+            case_doc_ref.update,
+            {
+                SPECULATIVE_DESIGN_FIELD: {
+                    "input_hash": input_hash,
+                    "system_design_draft": response["system_design_draft"],
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                }
+            },
+        )
+
     async def handle_prd_approval(self, case_id: str) -> Dict[str, Any]:
         """
         Handle PRD approval by triggering System Design generation.
@@ -791,7 +1021,7 @@ class OrchestratorAgent:
             orchestrator_logger.info(f"Handling PRD approval for case {case_id}")
             
             # Get the business case
-            case_doc_ref = self.db.collection("businessCases").document(case_id)
+            case_doc_ref = self.db.collection(Collections.BUSINESS_CASES).document(case_id)
             doc_snapshot = await asyncio.to_thread(case_doc_ref.get)
             
             if not doc_snapshot.exists:
@@ -817,13 +1047,117 @@ class OrchestratorAgent:
                     "message": "PRD draft content not found",
                 }
             
+            return await self._run_design_and_planning(
+                case_id, case_doc_ref, case_data, orchestrator_logger
+            )
+
+        except Exception as e:
+            orchestrator_logger = log_agent_operation(
+                self.logger, "OrchestratorAgent", case_id, "handle_prd_approval"
+            )
+            log_error_with_context(
+                orchestrator_logger, 
+                f"Error handling PRD approval for case {case_id}", 
+                e,
+                {'case_id': case_id}
+            )
+            return {
+                "status": "error",
+                "message": f"Error handling PRD approval: {str(e)}",
+            }
+
+    async def _commit_case_updates(
+        self,
+        case_doc_ref,
+        updates: List[Dict[str, Any]],
+        expect: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Apply consecutive updates to a case in one atomic commit.
+
+        Args:
+            case_doc_ref: Document reference of the case
+            updates: Updates applied in order
+            expect: Field values the case must still have for the commit to
+                apply, checked in the same transaction
+
+        Returns:
+            bool: False if the case no longer matched expect
+        """
+        if expect is None:
+            batch = self.db.batch()
+            for update in updates:
+                batch.update(case_doc_ref, update)
+            await asyncio.to_thread(batch.commit)
+            return True
+
+        def apply(transaction) -> bool:
+            current = transaction.get(case_doc_ref).to_dict() or {}
+            if any(current.get(field) != value for field, value in expect.items()):
+                return False
+            for update in updates:
+                transaction.update(case_doc_ref, update)
+            return True
+
+        return await asyncio.to_thread(self.db.transaction().run, apply)
+
+    def _case_changed_error(self, case_id: str) -> Dict[str, Any]:
+        return {
+            "status": "error",
+            "message": f"Business case {case_id} was changed by another run; another run may be in progress",
+            "case_id": case_id,
+        }
+
+    async def _run_design_and_planning(
+        self,
+        case_id: str,
+        case_doc_ref,
+        case_data: Dict[str, Any],
+        orchestrator_logger,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Generate the system design and then the effort estimate for an
+        approved PRD.
+
+        Each stage records a checkpoint in the same update that stores its
+        output. With resume=True, a stage whose checkpoint matches its
+        current inputs is skipped and its stored output reused.
+
+        The run's first write only applies if the case is unchanged since
+        case_data was read, so concurrent approvals or resumes of one case
+        cannot both run the stages. That write stamps the case with this
+        run's pipeline_run_id, and every later write only applies while the
+        id is unchanged, so a run superseded by a resume stops writing. The
+        stored design and the start of planning are committed together.
+        """
+        prd_content = case_data["prd_draft"]["content_markdown"]
+        case_title = case_data.get("title", "Unknown")
+        run_id = uuid.uuid4().hex
+        run_fence = {PIPELINE_RUN_FIELD: run_id}
+        # Replaced by run_fence once this run has made its first write
+        expect: Dict[str, Any] = {
+            "status": case_data.get("status"),
+            "updated_at": case_data.get("updated_at"),
+        }
+        # Committed with the next status change
+        pending_updates: List[Dict[str, Any]] = []
+
+        design_hash = stage_input_hash(case_title, prd_content)
+        system_design = (
+            completed_stage_output(case_data, "design", design_hash) if resume else None
+        )
+        if system_design is not None:
+            orchestrator_logger.info(f"Reusing checkpointed system design for case {case_id}")
+        else:
             # Trigger System Design generation
             orchestrator_logger.info(f"Triggering system design generation for case {case_id}")
-            
+
             # Update status to SYSTEM_DESIGN_DRAFTING
             current_time = datetime.now(timezone.utc)
             update_data = {
                 "status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTING.value,
+                PIPELINE_RUN_FIELD: run_id,
                 "updated_at": current_time,
                 "history": get_array_union([
                     {
@@ -834,201 +1168,385 @@ class OrchestratorAgent:
                     }
                 ]),
             }
-            await asyncio.to_thread(case_doc_ref.update, update_data)
-            
+            if not await self._commit_case_updates(case_doc_ref, [update_data], expect=expect):
+                return self._case_changed_error(case_id)
+            expect = run_fence
+
+            # Adopt a speculative design generated for this exact PRD, if any,
+            # whether it is running here or was stored on the case elsewhere
+            system_design_response = None
+            if self.speculative_design is not None:
+                system_design_response = await self.speculative_design.adopt(
+                    case_id, prd_content, case_title
+                )
+            if system_design_response is None:
+                system_design_response = stored_speculative_design(
+                    case_data, prd_content, case_title
+                )
+                if system_design_response is not None:
+                    orchestrator_logger.info(f"Adopting stored speculative design for case {case_id}")
+
             # Generate system design using ArchitectAgent
-            system_design_response = await self.architect_agent.generate_system_design(
-                prd_content=prd_draft.get("content_markdown"),
-                case_title=case_data.get("title", "Unknown"),
-                problem_statement=case_data.get("problem_statement", ""),
-            )
-            
+            if system_design_response is None:
+                system_design_response = await self.architect_agent.generate_system_design(
+                    prd_content=prd_content,
+                    case_title=case_title,
+                )
+
             updated_at_time = datetime.now(timezone.utc)
-            
-            if system_design_response.get("status") == "success" and system_design_response.get("system_design"):
-                # System design generation successful
-                system_design = system_design_response["system_design"]
-                
-                # Add metadata to system design
-                system_design["generated_by"] = "ArchitectAgent"
-                system_design["version"] = "v1"
-                system_design["generated_timestamp"] = updated_at_time.isoformat()
-                
-                # Update case with system design and change status to SYSTEM_DESIGN_DRAFTED
+
+            if not (
+                system_design_response.get("status") == "success"
+                and system_design_response.get("system_design_draft")
+            ):
+                # System design generation failed
+                error_message = system_design_response.get("message", "Failed to generate system design")
+                log_error_with_context(
+                    orchestrator_logger, 
+                    f"ArchitectAgent failed for case {case_id}", 
+                    Exception(error_message),
+                    {'case_id': case_id, 'error_message': error_message}
+                )
+
+                # Update with error information - revert to PRD_APPROVED state
                 update_data = {
-                    "system_design_v1_draft": system_design,
-                    "status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
+                    "status": BusinessCaseStatus.PRD_APPROVED.value,
                     "updated_at": updated_at_time,
                     "history": get_array_union([
-                        {
-                            "timestamp": updated_at_time.isoformat(),
-                            "source": "ARCHITECT_AGENT",
-                            "type": "SYSTEM_DESIGN",
-                            "content": f"System design generated for {case_data.get('title', 'Unknown')}",
-                        },
                         {
                             "timestamp": updated_at_time.isoformat(),
                             "source": "ORCHESTRATOR_AGENT",
-                            "type": "STATUS_UPDATE", 
-                            "content": f"Status updated to {BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value}. System design generation completed.",
+                            "type": "ERROR",
+                            "content": f"System design generation failed: {error_message}",
                         }
                     ]),
                 }
-                
-                await asyncio.to_thread(case_doc_ref.update, update_data)
-                
-                orchestrator_logger.info(f"System design generation completed successfully for case {case_id}")
-                
-                # Now trigger planning (effort estimation) after system design is complete
-                try:
-                    orchestrator_logger.info(f"Triggering planning/effort estimation for case {case_id}")
-                    
-                    # Update status to PLANNING_IN_PROGRESS
-                    planning_time = datetime.now(timezone.utc)
-                    planning_update_data = {
-                        "status": BusinessCaseStatus.PLANNING_IN_PROGRESS.value,
-                        "updated_at": planning_time,
+
+                if not await self._commit_case_updates(case_doc_ref, [update_data], expect=expect):
+                    return self._case_changed_error(case_id)
+
+                return {
+                    "status": "error",
+                    "message": f"System design generation failed: {error_message}",
+                    "case_id": case_id,
+                }
+
+            # System design generation successful
+            system_design = system_design_response["system_design_draft"]
+
+            # Add metadata to system design
+            system_design["generated_by"] = "ArchitectAgent"
+            system_design["version"] = "v1"
+            system_design["generated_timestamp"] = updated_at_time.isoformat()
+
+            # Store the system design with status SYSTEM_DESIGN_DRAFTED; committed
+            # together with the start of planning below
+            pending_updates.append({
+                "system_design_v1_draft": system_design,
+                CHECKPOINTS_FIELD: with_checkpoint(
+                    case_data, "design", design_hash, "system_design_v1_draft"
+                ),
+                "status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
+                "updated_at": updated_at_time,
+                "history": get_array_union([
+                    {
+                        "timestamp": updated_at_time.isoformat(),
+                        "source": "ARCHITECT_AGENT",
+                        "type": "SYSTEM_DESIGN",
+                        "content": f"System design generated for {case_data.get('title', 'Unknown')}",
+                    },
+                    {
+                        "timestamp": updated_at_time.isoformat(),
+                        "source": "ORCHESTRATOR_AGENT",
+                        "type": "STATUS_UPDATE", 
+                        "content": f"Status updated to {BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value}. System design generation completed.",
+                    }
+                ]),
+            })
+
+            orchestrator_logger.info(f"System design generation completed successfully for case {case_id}")
+
+        # Now trigger planning (effort estimation) after system design is complete
+        try:
+            effort_hash = stage_input_hash(
+                case_title, prd_content, system_design.get("content_markdown", "")
+            )
+            if resume and completed_stage_output(case_data, "effort", effort_hash) is not None:
+                orchestrator_logger.info(f"Reusing checkpointed effort estimate for case {case_id}")
+                if case_data.get("status") != BusinessCaseStatus.PLANNING_COMPLETE.value:
+                    resumed_time = datetime.now(timezone.utc)
+                    pending_updates.append({
+                        "status": BusinessCaseStatus.PLANNING_COMPLETE.value,
+                        PIPELINE_RUN_FIELD: run_id,
+                        "updated_at": resumed_time,
                         "history": get_array_union([
                             {
-                                "timestamp": planning_time.isoformat(),
+                                "timestamp": resumed_time.isoformat(),
                                 "source": "ORCHESTRATOR_AGENT",
                                 "type": "STATUS_UPDATE",
-                                "content": f"Status updated to {BusinessCaseStatus.PLANNING_IN_PROGRESS.value}. PlannerAgent initiated for effort estimation.",
+                                "content": f"Status updated to {BusinessCaseStatus.PLANNING_COMPLETE.value}. Resumed from checkpointed effort estimate.",
                             }
                         ]),
-                    }
-                    await asyncio.to_thread(case_doc_ref.update, planning_update_data)
-                    
-                    # Trigger effort estimation using PlannerAgent
-                    effort_response = await self.planner_agent.generate_effort_estimate(
-                        system_design_content=system_design,
-                        case_title=case_data.get("title", "Unknown"),
-                        problem_statement=case_data.get("problem_statement", ""),
+                    })
+                if pending_updates:
+                    committed = await self._commit_case_updates(
+                        case_doc_ref, pending_updates, expect=expect
                     )
-                    
-                    effort_time = datetime.now(timezone.utc)
-                    
-                    if effort_response.get("status") == "success" and effort_response.get("effort_estimate"):
-                        # Effort estimation successful
-                        effort_estimate = effort_response["effort_estimate"]
-                        effort_estimate["generated_by"] = "PlannerAgent"
-                        effort_estimate["version"] = "v1"
-                        effort_estimate["generated_timestamp"] = effort_time.isoformat()
-                        
-                        # Update case with effort estimate and change status to PLANNING_COMPLETE
-                        effort_update_data = {
-                            "effort_estimate_v1": effort_estimate,
-                            "status": BusinessCaseStatus.PLANNING_COMPLETE.value,
-                            "updated_at": effort_time,
-                            "history": get_array_union([
-                                {
-                                    "timestamp": effort_time.isoformat(),
-                                    "source": "PLANNER_AGENT",
-                                    "type": "EFFORT_ESTIMATE",
-                                    "content": f"Effort estimate generated for {case_data.get('title', 'Unknown')}",
-                                },
-                                {
-                                    "timestamp": effort_time.isoformat(),
-                                    "source": "ORCHESTRATOR_AGENT",
-                                    "type": "STATUS_UPDATE",
-                                    "content": f"Status updated to {BusinessCaseStatus.PLANNING_COMPLETE.value}. Effort estimation completed.",
-                                }
-                            ]),
-                        }
-                        
-                        await asyncio.to_thread(case_doc_ref.update, effort_update_data)
-                        orchestrator_logger.info(f"Effort estimation completed successfully for case {case_id}")
-                        
-                        return {
-                            "status": "success",
-                            "message": "System design and effort estimation generated successfully",
-                            "case_id": case_id,
-                            "new_status": BusinessCaseStatus.PLANNING_COMPLETE.value,
-                        }
-                    else:
-                        # Effort estimation failed - revert to SYSTEM_DESIGN_DRAFTED
-                        error_message = effort_response.get("message", "Failed to generate effort estimate")
-                        orchestrator_logger.warning(f"Effort estimation failed for case {case_id}: {error_message}")
-                        
-                        revert_update_data = {
-                            "status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
-                            "updated_at": effort_time,
-                            "history": get_array_union([
-                                {
-                                    "timestamp": effort_time.isoformat(),
-                                    "source": "ORCHESTRATOR_AGENT",
-                                    "type": "WARNING",
-                                    "content": f"Effort estimation failed: {error_message}. Status reverted to SYSTEM_DESIGN_DRAFTED.",
-                                }
-                            ]),
-                        }
-                        
-                        await asyncio.to_thread(case_doc_ref.update, revert_update_data)
-                        
-                        return {
-                            "status": "success",
-                            "message": "System design generated successfully, but effort estimation failed",
-                            "case_id": case_id,
-                            "new_status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
-                            "effort_estimation_error": error_message,
-                        }
-                        
-                except Exception as planning_error:
-                    orchestrator_logger.warning(f"Error in effort estimation for case {case_id}: {str(planning_error)}")
-                    return {
-                        "status": "success",
-                        "message": "System design generated successfully, but effort estimation could not be initiated",
-                        "case_id": case_id,
-                        "new_status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
-                        "effort_estimation_error": str(planning_error),
+                    pending_updates = []
+                    if not committed:
+                        return self._case_changed_error(case_id)
+                return {
+                    "status": "success",
+                    "message": "System design and effort estimation generated successfully",
+                    "case_id": case_id,
+                    "new_status": BusinessCaseStatus.PLANNING_COMPLETE.value,
+                }
+
+            orchestrator_logger.info(f"Triggering planning/effort estimation for case {case_id}")
+
+            # Update status to PLANNING_IN_PROGRESS
+            planning_time = datetime.now(timezone.utc)
+            planning_update_data = {
+                "status": BusinessCaseStatus.PLANNING_IN_PROGRESS.value,
+                PIPELINE_RUN_FIELD: run_id,
+                "updated_at": planning_time,
+                "history": get_array_union([
+                    {
+                        "timestamp": planning_time.isoformat(),
+                        "source": "ORCHESTRATOR_AGENT",
+                        "type": "STATUS_UPDATE",
+                        "content": f"Status updated to {BusinessCaseStatus.PLANNING_IN_PROGRESS.value}. PlannerAgent initiated for effort estimation.",
                     }
+                ]),
+            }
+            committed = await self._commit_case_updates(
+                case_doc_ref, pending_updates + [planning_update_data], expect=expect
+            )
+            pending_updates = []
+            if not committed:
+                return self._case_changed_error(case_id)
+            expect = run_fence
+
+            # Trigger effort estimation using PlannerAgent
+            effort_response = await self.planner_agent.estimate_effort(
+                prd_content=prd_content,
+                system_design_content=system_design.get("content_markdown", ""),
+                case_title=case_title,
+            )
+
+            effort_time = datetime.now(timezone.utc)
+
+            if effort_response.get("status") == "success" and effort_response.get("effort_breakdown"):
+                # Effort estimation successful
+                effort_estimate = effort_response["effort_breakdown"]
+                effort_estimate["generated_by"] = "PlannerAgent"
+                effort_estimate["version"] = "v1"
+                effort_estimate["generated_timestamp"] = effort_time.isoformat()
+
+                # Update case with effort estimate and change status to PLANNING_COMPLETE
+                effort_update_data = {
+                    "effort_estimate_v1": effort_estimate,
+                    CHECKPOINTS_FIELD: with_checkpoint(
+                        case_data, "effort", effort_hash, "effort_estimate_v1"
+                    ),
+                    "status": BusinessCaseStatus.PLANNING_COMPLETE.value,
+                    "updated_at": effort_time,
+                    "history": get_array_union([
+                        {
+                            "timestamp": effort_time.isoformat(),
+                            "source": "PLANNER_AGENT",
+                            "type": "EFFORT_ESTIMATE",
+                            "content": f"Effort estimate generated for {case_data.get('title', 'Unknown')}",
+                        },
+                        {
+                            "timestamp": effort_time.isoformat(),
+                            "source": "ORCHESTRATOR_AGENT",
+                            "type": "STATUS_UPDATE",
+                            "content": f"Status updated to {BusinessCaseStatus.PLANNING_COMPLETE.value}. Effort estimation completed.",
+                        }
+                    ]),
+                }
+
+                if not await self._commit_case_updates(
+                    case_doc_ref, [effort_update_data], expect=expect
+                ):
+                    return self._case_changed_error(case_id)
+                orchestrator_logger.info(f"Effort estimation completed successfully for case {case_id}")
+
+                return {
+                    "status": "success",
+                    "message": "System design and effort estimation generated successfully",
+                    "case_id": case_id,
+                    "new_status": BusinessCaseStatus.PLANNING_COMPLETE.value,
+                }
             else:
-                # System design generation failed
-                error_message = system_design_response.get("message", "Failed to generate system design")
-                log_error_with_context(
-                    orchestrator_logger, 
-                    f"ArchitectAgent failed for case {case_id}", 
-                    Exception(error_message),
-                    {'case_id': case_id, 'error_message': error_message}
-                )
-                
-                # Update with error information - revert to PRD_APPROVED state
-                update_data = {
-                    "status": BusinessCaseStatus.PRD_APPROVED.value,
-                    "updated_at": updated_at_time,
+                # Effort estimation failed - revert to SYSTEM_DESIGN_DRAFTED
+                error_message = effort_response.get("message", "Failed to generate effort estimate")
+                orchestrator_logger.warning(f"Effort estimation failed for case {case_id}: {error_message}")
+
+                revert_update_data = {
+                    "status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
+                    "updated_at": effort_time,
                     "history": get_array_union([
                         {
-                            "timestamp": updated_at_time.isoformat(),
+                            "timestamp": effort_time.isoformat(),
                             "source": "ORCHESTRATOR_AGENT",
-                            "type": "ERROR",
-                            "content": f"System design generation failed: {error_message}",
+                            "type": "WARNING",
+                            "content": f"Effort estimation failed: {error_message}. Status reverted to SYSTEM_DESIGN_DRAFTED.",
                         }
                     ]),
                 }
-                
-                await asyncio.to_thread(case_doc_ref.update, update_data)
-                
+
+                if not await self._commit_case_updates(
+                    case_doc_ref, [revert_update_data], expect=expect
+                ):
+                    return self._case_changed_error(case_id)
+
                 return {
-                    "status": "error",
-                    "message": f"System design generation failed: {error_message}",
+                    "status": "success",
+                    "message": "System design generated successfully, but effort estimation failed",
                     "case_id": case_id,
+                    "new_status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
+                    "effort_estimation_error": error_message,
                 }
-                
-        except Exception as e:
-            orchestrator_logger = log_agent_operation(
-                self.logger, "OrchestratorAgent", case_id, "handle_prd_approval"
+
+        except Exception as planning_error:
+            orchestrator_logger.warning(f"Error in effort estimation for case {case_id}: {str(planning_error)}")
+            if pending_updates and expect is run_fence:
+                # Keep the generated design even though planning never started
+                await self._commit_case_updates(case_doc_ref, pending_updates, expect=expect)
+            return {
+                "status": "success",
+                "message": "System design generated successfully, but effort estimation could not be initiated",
+                "case_id": case_id,
+                "new_status": BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value,
+                "effort_estimation_error": str(planning_error),
+            }
+
+    async def resume_case_pipeline(self, case_id: str) -> Dict[str, Any]:
+        """
+        Resume an interrupted pipeline from its last completed stage.
+
+        Design and planning resume from their checkpoints, so a stage whose
+        inputs are unchanged is not rerun. A stalled financial model is
+        regenerated from the case's cost estimate and value projection.
+
+        Args:
+            case_id (str): The business case ID
+
+        Returns:
+            Dict[str, Any]: Result of the resumed stages
+        """
+        orchestrator_logger = log_agent_operation(
+            self.logger, "OrchestratorAgent", case_id, "resume_case_pipeline"
+        )
+        try:
+            case_doc_ref = self.db.collection(Collections.BUSINESS_CASES).document(case_id)
+            doc_snapshot = await asyncio.to_thread(case_doc_ref.get)
+
+            if not doc_snapshot.exists:
+                return {
+                    "status": "error",
+                    "message": f"Business case {case_id} not found",
+                }
+
+            case_data = doc_snapshot.to_dict() or {}
+            current_status = case_data.get("status")
+            orchestrator_logger.info(f"Resuming pipeline for case {case_id} from {current_status}")
+
+            if current_status == BusinessCaseStatus.FINANCIAL_MODEL_IN_PROGRESS.value:
+                cost_estimate = case_data.get("cost_estimate_v1")
+                value_projection = case_data.get("value_projection_v1")
+                if not cost_estimate or not value_projection:
+                    return {
+                        "status": "error",
+                        "message": "Cost estimate or value projection missing; cannot resume financial model",
+                    }
+                return await self._generate_financial_model(
+                    case_id,
+                    case_doc_ref,
+                    cost_estimate,
+                    value_projection,
+                    case_data.get("title", "Unknown"),
+                    expect={
+                        "status": current_status,
+                        "updated_at": case_data.get("updated_at"),
+                    },
+                )
+
+            if current_status not in DESIGN_PLANNING_RESUMABLE_STATUSES:
+                return {
+                    "status": "error",
+                    "message": f"Case status is {current_status}; nothing to resume",
+                }
+
+            prd_draft = case_data.get("prd_draft")
+            if not prd_draft or not prd_draft.get("content_markdown"):
+                return {
+                    "status": "error",
+                    "message": "PRD draft content not found",
+                }
+
+            return await self._run_design_and_planning(
+                case_id, case_doc_ref, case_data, orchestrator_logger, resume=True
             )
+
+        except Exception as e:
             log_error_with_context(
-                orchestrator_logger, 
-                f"Error handling PRD approval for case {case_id}", 
+                orchestrator_logger,
+                f"Error resuming pipeline for case {case_id}",
                 e,
                 {'case_id': case_id}
             )
             return {
                 "status": "error",
-                "message": f"Error handling PRD approval: {str(e)}",
+                "message": f"Error resuming case pipeline: {str(e)}",
             }
 
+    async def sweep_stalled_cases(
+        self, stalled_after_seconds: Optional[float] = None
+    ) -> List[str]:
+        """
+        Queue a resume job for every case stuck in an in-progress status.
+
+        A case is stalled when its status is in-progress and it has not been
+        updated for stalled_after_seconds (default: pipeline_stall_seconds).
+        Job ids derive from the case id and its last update, so concurrent
+        sweepers queue each stall once.
+
+        Returns:
+            List[str]: IDs of the resume jobs for stalled cases
+        """
+        if stalled_after_seconds is None:
+            stalled_after_seconds = settings.pipeline_stall_seconds
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=stalled_after_seconds)
+
+        query = self.db.collection(Collections.BUSINESS_CASES).where(
+            "status", "in", IN_PROGRESS_STATUSES
+        )
+        docs = await asyncio.to_thread(query.stream)
+
+        job_ids = []
+        for doc in docs:
+            case_data = doc.to_dict() or {}
+            updated_at = _as_utc(case_data.get("updated_at"))
+            if updated_at is None or updated_at > cutoff:
+                continue
+            job_id = f"resume-{doc.id}-{int(updated_at.timestamp())}"
+            await self.job_queue.enqueue(
+                RESUME_PIPELINE_JOB_TYPE,
+                case_data.get("user_id") or "system",
+                payload={"case_id": doc.id},
+                metadata={"stalled_status": case_data.get("status")},
+                job_id=job_id,
+                unique=True,
+            )
+            self.logger.warning(
+                f"OrchestratorAgent: Case {doc.id} stalled in {case_data.get('status')}; queued {job_id}"
+            )
+            job_ids.append(job_id)
+        return job_ids
+
     async def check_and_trigger_financial_model(self, case_id: str) -> Dict[str, Any]:
         """
         Check if both cost estimate and value projection are approved, and if so,
@@ -1045,7 +1563,7 @@ class OrchestratorAgent:
 
         try:
             # Get the latest case data
-            case_doc_ref = self.db.collection("businessCases").document(case_id)
+            case_doc_ref = self.db.collection(Collections.BUSINESS_CASES).document(case_id)
             doc_snapshot = await asyncio.to_thread(case_doc_ref.get)
 
             if not doc_snapshot.exists:
@@ -1079,7 +1597,7 @@ class OrchestratorAgent:
             # Check if both are approved
             if current_status == BusinessCaseStatus.COSTING_APPROVED.value:
                 # Cost was just approved, check if value is also approved
-                case_doc_ref_refresh = self.db.collection("businessCases").document(
+                case_doc_ref_refresh = self.db.collection(Collections.BUSINESS_CASES).document(
                     case_id
                 )
                 doc_snapshot_refresh = await asyncio.to_thread(case_doc_ref_refresh.get)
@@ -1102,6 +1620,10 @@ class OrchestratorAgent:
                         cost_estimate,
                         value_projection,
                         case_data.get("title", "Unknown"),
+                        expect={
+                            "status": current_status,
+                            "updated_at": case_data.get("updated_at"),
+                        },
                     )
                 else:
                     print(
@@ -1114,7 +1636,7 @@ class OrchestratorAgent:
 
             elif current_status == BusinessCaseStatus.VALUE_APPROVED.value:
                 # Value was just approved, check if cost is also approved
-                case_doc_ref_refresh = self.db.collection("businessCases").document(
+                case_doc_ref_refresh = self.db.collection(Collections.BUSINESS_CASES).document(
                     case_id
                 )
                 doc_snapshot_refresh = await asyncio.to_thread(case_doc_ref_refresh.get)
@@ -1137,6 +1659,10 @@ class OrchestratorAgent:
                         cost_estimate,
                         value_projection,
                         case_data.get("title", "Unknown"),
+                        expect={
+                            "status": current_status,
+                            "updated_at": case_data.get("updated_at"),
+                        },
                     )
                 else:
                     print(
@@ -1169,6 +1695,7 @@ class OrchestratorAgent:
         cost_estimate: Dict[str, Any],
         value_projection: Dict[str, Any],
         case_title: str,
+        expect: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Generate financial model using the FinancialModelAgent.
@@ -1179,6 +1706,10 @@ class OrchestratorAgent:
             cost_estimate (Dict[str, Any]): Approved cost estimate data
             value_projection (Dict[str, Any]): Approved value projection data
             case_title (str): Case title
+            expect (Optional[Dict[str, Any]]): Field values the case must still
+                have for generation to start, so concurrent triggers run it once.
+                Later writes only apply while the case keeps this run's
+                pipeline_run_id.
 
         Returns:
             Dict[str, Any]: Result of financial model generation
@@ -1190,8 +1721,10 @@ class OrchestratorAgent:
         try:
             # Update status to FINANCIAL_MODEL_IN_PROGRESS
             current_time = datetime.now(timezone.utc)
+            run_id = uuid.uuid4().hex
             update_data = {
                 "status": BusinessCaseStatus.FINANCIAL_MODEL_IN_PROGRESS.value,
+                PIPELINE_RUN_FIELD: run_id,
                 "updated_at": current_time,
                 "history": get_array_union(
                     [
@@ -1204,7 +1737,9 @@ class OrchestratorAgent:
                     ]
                 ),
             }
-            await asyncio.to_thread(case_doc_ref.update, update_data)
+            if not await self._commit_case_updates(case_doc_ref, [update_data], expect=expect):
+                return self._case_changed_error(case_id)
+            run_fence = {PIPELINE_RUN_FIELD: run_id}
 
             # Invoke FinancialModelAgent
             financial_response = (
@@ -1258,7 +1793,10 @@ class OrchestratorAgent:
                     ),
                 }
 
-                await asyncio.to_thread(case_doc_ref.update, update_data)
+                if not await self._commit_case_updates(
+                    case_doc_ref, [update_data], expect=run_fence
+                ):
+                    return self._case_changed_error(case_id)
 
                 print(
                     f"[OrchestratorAgent] Financial model generation completed successfully for case {case_id}"
@@ -1296,7 +1834,10 @@ class OrchestratorAgent:
                     ),
                 }
 
-                await asyncio.to_thread(case_doc_ref.update, update_data)
+                if not await self._commit_case_updates(
+                    case_doc_ref, [update_data], expect=run_fence
+                ):
+                    return self._case_changed_error(case_id)
 
                 return {
                     "status": "error",
@@ -2,18 +2,43 @@
 Planner Agent for estimating development effort based on PRDs and system designs.
 """
 
-from typing import Dict, Any
-import json
-import re
-import vertexai
-from vertexai.generative_models import GenerativeModel
-import vertexai.preview.generative_models as generative_models
+from typing import Dict, Any, List, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeFloat, NonNegativeInt
 from ..core.config import settings
+from ..core.llm_registry import LLMRegistry
+from ..core.metrics import instrument_agent_method
+from ..core.structured_output import StructuredOutput
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+Hours = Union[NonNegativeInt, NonNegativeFloat]
+
+
+class RoleEffort(BaseModel):
+    """Estimated hours for a single role."""
+
+    model_config = ConfigDict(extra="allow")
+
+    role: str
+    hours: Hours
+
+
+class EffortEstimateOutput(BaseModel):
+    """Expected JSON output of the effort estimation prompt."""
+
+    model_config = ConfigDict(extra="allow")
+
+    roles: List[RoleEffort] = Field(min_length=1)
+    total_hours: Hours
+    estimated_duration_weeks: Hours
+    complexity_assessment: Literal["Low", "Medium", "High", "Very High"]
+    notes: str
+
+
+EFFORT_ESTIMATE_OUTPUT = StructuredOutput(EffortEstimateOutput)
+
 
 class PlannerAgent:
     """
@@ -21,7 +46,7 @@ class PlannerAgent:
     based on approved PRDs and system design documents using AI-powered analysis.
     """
 
-    def __init__(self):
+    def __init__(self, llm_registry: Optional[LLMRegistry] = None):
         self.name = "Planner Agent"
         self.description = "Estimates development effort by role using AI analysis of PRD and System Design content."
         self.status = "initialized"
@@ -31,19 +56,23 @@ class PlannerAgent:
         self.location = settings.vertex_ai_location
         self.model_name = settings.vertex_ai_model_name or "gemini-2.0-flash-lite"
 
-        try:
-            vertexai.init(project=self.project_id, location=self.location)
-            self.model = GenerativeModel(self.model_name)
+        # Shared model handle from the process-wide LLM registry
+        if llm_registry is None:
+            from ..core.dependencies import get_llm_registry
+            llm_registry = get_llm_registry()
+        self.llm_registry = llm_registry
+        self.model = llm_registry.get_model(self.model_name, "effort_estimation")
+        if self.model:
             logger.info(
-                f"PlannerAgent: Vertex AI initialized successfully with model {self.model_name}."
+                f"PlannerAgent: Using shared Vertex AI model handle {self.model_name}."
             )
-        except Exception as e:
-            logger.info(f"PlannerAgent: Failed to initialize Vertex AI: {e}")
-            self.model = None
+        else:
+            logger.info("PlannerAgent: Vertex AI model not available")
 
         logger.info("PlannerAgent: Initialized successfully.")
         self.status = "available"
 
+    @instrument_agent_method("PlannerAgent")
     async def estimate_effort(
         self, prd_content: str, system_design_content: str, case_title: str
     ) -> Dict[str, Any]:
@@ -130,7 +159,7 @@ class PlannerAgent:
                 else "No System Design content provided"
             )
 
-            prompt = """You are a Senior Project Planner with expertise in healthcare technology projects. Based on the following PRD and System Design for a project titled '{case_title}', estimate the development effort in hours for each role.
+            prompt = f"""You are a Senior Project Planner with expertise in healthcare technology projects. Based on the following PRD and System Design for a project titled '{case_title}', estimate the development effort in hours for each role.
 
 --- PRD Content ---
 {truncated_prd}
@@ -165,57 +194,28 @@ Respond ONLY with a valid JSON object in this exact format:
 
 Make sure your response is valid JSON without any additional text or markdown formatting."""
 
-            # Configure generation settings for structured output
-            generation_config = {
-                "max_output_tokens": 1024,
-                "temperature": 0.2,  # Low temperature for consistent, structured output
-                "top_p": 0.8,
-                "top_k": 20,
-            }
-
-            safety_settings = {
-                generative_models.HarmCategory.HARM_CATEGORY_HATE_SPEECH: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_HARASSMENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            }
-
+            # The effort_estimation profile is tuned for structured output
             logger.info("[PlannerAgent] Calling AI model for effort estimation...")
-            response = await self.model.generate_content_async(
+            result = await self.model.generate(
                 [prompt],
-                generation_config=generation_config,
-                safety_settings=safety_settings,
-                stream=False,
+                generation_config=EFFORT_ESTIMATE_OUTPUT.generation_config(
+                    self.model.generation_config
+                ),
             )
 
-            if response.candidates and response.candidates[0].content.parts:
-                response_text = response.candidates[0].content.parts[0].text.strip()
+            if result.text:
+                response_text = result.text.strip()
                 logger.info(f"[PlannerAgent] AI response received: {response_text[:200]}...")
 
-                # Parse JSON response
-                try:
-                    # Clean the response to extract just the JSON
-                    json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                    if json_match:
-                        json_str = json_match.group(0)
-                        effort_data = json.loads(json_str)
-
-                        # Validate the structure
-                        if self._validate_effort_data(effort_data):
-                            logger.info(
-                                "[PlannerAgent] Successfully parsed AI effort estimation"
-                            )
-                            return effort_data
-                        else:
-                            logger.info("[PlannerAgent] AI response validation failed")
-                            return None
-                    else:
-                        logger.info("[PlannerAgent] No valid JSON found in AI response")
-                        return None
-
-                except json.JSONDecodeError as e:
-                    logger.info(f"[PlannerAgent] Failed to parse AI response as JSON: {e}")
-                    return None
+                # Extract and validate the JSON object against the output schema
+                effort_data = EFFORT_ESTIMATE_OUTPUT.parse(response_text)
+                if effort_data is not None:
+                    logger.info(
+                        "[PlannerAgent] Successfully parsed AI effort estimation"
+                    )
+                    return effort_data
+                logger.info("[PlannerAgent] AI response validation failed")
+                return None
             else:
                 logger.info("[PlannerAgent] No valid response from AI model")
                 return None
@@ -344,69 +344,6 @@ Make sure your response is valid JSON without any additional text or markdown fo
             "notes": notes,
         }
 
-    def _validate_effort_data(self, data: Dict[str, Any]) -> bool:
-        """
-        Validate the structure of effort estimation data.
-
-        Args:
-            data: The effort data to validate
-
-        Returns:
-            bool: True if valid, False otherwise
-        """
-        required_fields = [
-            "roles",
-            "total_hours",
-            "estimated_duration_weeks",
-            "complexity_assessment",
-            "notes",
-        ]
-
-        # Check required fields exist
-        for field in required_fields:
-            if field not in data:
-                logger.info(f"[PlannerAgent] Missing required field: {field}")
-                return False
-
-        # Check roles structure
-        if not isinstance(data["roles"], list) or len(data["roles"]) == 0:
-            logger.info("[PlannerAgent] Invalid roles structure")
-            return False
-
-        for role_data in data["roles"]:
-            if (
-                not isinstance(role_data, dict)
-                or "role" not in role_data
-                or "hours" not in role_data
-            ):
-                logger.info("[PlannerAgent] Invalid role data structure")
-                return False
-            if (
-                not isinstance(role_data["hours"], (int, float))
-                or role_data["hours"] < 0
-            ):
-                logger.info("[PlannerAgent] Invalid hours value")
-                return False
-
-        # Check other fields
-        if not isinstance(data["total_hours"], (int, float)) or data["total_hours"] < 0:
-            logger.info("[PlannerAgent] Invalid total_hours")
-            return False
-
-        if (
-            not isinstance(data["estimated_duration_weeks"], (int, float))
-            or data["estimated_duration_weeks"] < 0
-        ):
-            logger.info("[PlannerAgent] Invalid estimated_duration_weeks")
-            return False
-
-        valid_complexity = ["Low", "Medium", "High", "Very High"]
-        if data["complexity_assessment"] not in valid_complexity:
-            logger.info("[PlannerAgent] Invalid complexity_assessment")
-            return False
-
-        return True
-
     def get_status(self) -> Dict[str, str]:
         """Get the current status of the planner agent"""
         return {
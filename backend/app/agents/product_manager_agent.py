@@ -2,12 +2,16 @@
 Product Manager Agent for handling PRD generation and related tasks.
 """
 
-from typing import Dict, Any, List
-import vertexai
-from vertexai.generative_models import GenerativeModel, Part, FinishReason
-import vertexai.preview.generative_models as generative_models
+import asyncio
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from pydantic import BaseModel
 from ..core.config import settings
+from ..core.llm_registry import LLMRegistry
+from ..core.metrics import instrument_agent_method
+from ..core.structured_output import StructuredOutput, extract_json_object
 from ..services.prompt_service import PromptService
+from ..utils.text_compaction import build_relevance_query, compact_text
+from ..utils.url_cache import URLContentCache, summary_query_key
 from ..utils.web_utils import fetch_web_content
 from google.cloud import firestore
 import logging
@@ -16,13 +20,34 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class LinkSummary(BaseModel):
+    id: int
+    summary: str
+
+
+class LinkSummariesOutput(BaseModel):
+    """Expected JSON output of the batched link summarization prompt."""
+
+    summaries: List[LinkSummary]
+
+
+# Used for the response schema only; entries are validated individually so
+# one malformed summary does not discard the rest of the batch
+LINK_SUMMARIES_OUTPUT = StructuredOutput(LinkSummariesOutput)
+
+
 class ProductManagerAgent:
     """
     The Product Manager Agent is responsible for generating and managing
     Product Requirements Documents (PRDs) and related product artifacts.
     """
 
-    def __init__(self, prompt_service: PromptService = None):
+    def __init__(
+        self,
+        prompt_service: PromptService = None,
+        llm_registry: Optional[LLMRegistry] = None,
+        url_cache: Optional[URLContentCache] = None,
+    ):
         self.name = "ProductManagerAgent"
         self.description = (
             "Generates and manages Product Requirements Documents (PRDs)."
@@ -45,33 +70,45 @@ class ProductManagerAgent:
             db = firestore.Client()
             self.prompt_service = PromptService(db)
 
-        try:
-            logger.info(f"ProductManagerAgent: Attempting to initialize VertexAI with project={self.project_id}, location={self.location}")
-            vertexai.init(project=self.project_id, location=self.location)
-            logger.info(f"ProductManagerAgent: VertexAI init successful, creating model {self.model_name}")
-            self.model = GenerativeModel(self.model_name)
+        # Shared cache of relevant-link content and summaries
+        if url_cache is None:
+            from ..core.dependencies import get_url_cache
+            url_cache = get_url_cache()
+        self.url_cache = url_cache
+
+        # Shared model handles from the process-wide LLM registry
+        if llm_registry is None:
+            from ..core.dependencies import get_llm_registry
+            llm_registry = get_llm_registry()
+        self.llm_registry = llm_registry
+        self.model = llm_registry.get_model(self.model_name)
+        self.summary_model = llm_registry.get_model(self.model_name, "summarization")
+        if self.model:
             logger.info(
-                f"ProductManagerAgent: Vertex AI initialized successfully with model {self.model_name}."
+                f"ProductManagerAgent: Using shared Vertex AI model handle {self.model_name}."
             )
-        except Exception as e:
-            logger.error(f"ProductManagerAgent: Failed to initialize Vertex AI: {e}")
+        else:
+            logger.error("ProductManagerAgent: Vertex AI model not available")
             logger.error(f"ProductManagerAgent: Project ID: {self.project_id}, Location: {self.location}, Model: {self.model_name}")
-            self.model = None
 
     async def summarize_content(
-        self, text_content: str, link_name: str = "content"
+        self, text_content: str, link_name: str = "content", query: str = ""
     ) -> str:
         """
         Generate a concise summary of text content using Vertex AI.
 
+        The content is first compacted locally to the passages most relevant
+        to query, within settings.link_content_token_budget.
+
         Args:
             text_content (str): The text content to summarize
             link_name (str): Name of the source for context
+            query (str): Case title and problem statement used to rank passages
 
         Returns:
             str: Concise summary of the content, or empty string if summarization fails
         """
-        if not self.model:
+        if not self.summary_model:
             logger.warning("Vertex AI model not available for content summarization")
             return ""
 
@@ -79,12 +116,24 @@ class ProductManagerAgent:
             logger.info(f"Content from {link_name} too short for summarization")
             return ""
 
+        compaction = compact_text(
+            text_content, query, settings.link_content_token_budget
+        )
+        compacted_content = compaction["text"]
+        logger.info(
+            f"[ProductManagerAgent] Compacted {link_name} from ~{compaction['original_tokens']} "
+            f"to ~{compaction['compacted_tokens']} tokens ({compaction['passages_kept']} passages kept)"
+        )
+        if not compacted_content:
+            logger.info(f"No relevant passages found in content from {link_name}")
+            return ""
+
         try:
             # Create a focused prompt for summarization
-            summarization_prompt = """Please analyze the following text content and provide a concise summary focusing on information relevant to a software/technology project or business case:
+            summarization_prompt = f"""Please analyze the following text content and provide a concise summary focusing on information relevant to a software/technology project or business case:
 
 Text Content:
-{text_content[:8000]}  # Limit content to avoid overly long prompts
+{compacted_content}
 
 Instructions:
 - Extract key points relevant to technology projects, product development, or business requirements
@@ -96,33 +145,14 @@ Instructions:
 
 Summary:"""
 
-            # Use conservative generation settings for summarization
-            generation_config = {
-                "max_output_tokens": 512,  # Shorter for summaries
-                "temperature": 0.3,  # More focused and consistent
-                "top_p": 0.8,
-                "top_k": 20,
-            }
-
-            safety_settings = {
-                generative_models.HarmCategory.HARM_CATEGORY_HATE_SPEECH: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_HARASSMENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            }
-
+            # The summarization profile uses conservative generation settings
             logger.info(
                 f"[ProductManagerAgent] Generating summary for content from: {link_name}"
             )
-            response = await self.model.generate_content_async(
-                [summarization_prompt],
-                generation_config=generation_config,
-                safety_settings=safety_settings,
-                stream=False,
-            )
+            result = await self.summary_model.generate([summarization_prompt])
 
-            if response.candidates and response.candidates[0].content.parts:
-                summary = response.candidates[0].content.parts[0].text.strip()
+            if result.text:
+                summary = result.text.strip()
                 logger.info(
                     f"[ProductManagerAgent] Successfully generated summary for {link_name}"
                 )
@@ -139,6 +169,91 @@ Summary:"""
             )
             return ""
 
+    async def summarize_contents_batch(
+        self, items: List[Tuple[str, str]], query: str = ""
+    ) -> Dict[int, str]:
+        """
+        Summarize several link contents with a single Vertex AI call.
+
+        Args:
+            items (List[Tuple[str, str]]): (link_name, text_content) pairs
+            query (str): Case title and problem statement used to rank passages
+
+        Returns:
+            Dict[int, str]: Summaries keyed by position in items. Positions
+            missing from the model response are left out.
+        """
+        if not self.summary_model or not items:
+            return {}
+
+        documents = []
+        for index, (link_name, text_content) in enumerate(items):
+            compacted = compact_text(
+                text_content, query, settings.link_content_token_budget
+            )["text"]
+            documents.append(
+                f"Document {index + 1} ({link_name}):\n<<<\n{compacted}\n>>>"
+            )
+        documents_text = "\n\n".join(documents)
+
+        batch_prompt = f"""Please analyze each of the following {len(items)} documents and provide a concise summary of each, focusing on information relevant to a software/technology project or business case.
+
+{documents_text}
+
+Instructions:
+- Summarize each document independently
+- Extract key points relevant to technology projects, product development, or business requirements
+- Focus on problems, solutions, requirements, goals, or technical details
+- Provide 2-3 bullet points maximum per document, each under 100 words
+- If a document is not relevant to software/technology projects, its summary should be "No relevant business/technical information found"
+
+Respond with only a JSON object in this exact format:
+{{"summaries": [{{"id": <document number>, "summary": "<bullet points>"}}]}}"""
+
+        generation_config = LINK_SUMMARIES_OUTPUT.generation_config(
+            self.summary_model.generation_config
+        )
+        generation_config["max_output_tokens"] = min(
+            generation_config.get("max_output_tokens", 512) * len(items), 8192
+        )
+
+        logger.info(
+            f"[ProductManagerAgent] Generating batched summary for {len(items)} links"
+        )
+        result = await self.summary_model.generate(
+            [batch_prompt], generation_config=generation_config
+        )
+        summaries = self._parse_batch_summaries(result.text or "", len(items))
+        logger.info(
+            f"[ProductManagerAgent] Parsed {len(summaries)} of {len(items)} batched summaries"
+        )
+        return summaries
+
+    @staticmethod
+    def _parse_batch_summaries(response_text: str, count: int) -> Dict[int, str]:
+        """Parse per-document summaries out of a batched summarization response."""
+        data = extract_json_object(response_text)
+        if data is None:
+            return {}
+
+        summaries: Dict[int, str] = {}
+        entries = data.get("summaries")
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            document_id, summary = entry.get("id"), entry.get("summary")
+            if isinstance(document_id, str) and document_id.strip().isdigit():
+                document_id = int(document_id)
+            if (
+                isinstance(document_id, int)
+                and 1 <= document_id <= count
+                and isinstance(summary, str)
+                and summary.strip()
+            ):
+                summaries[document_id - 1] = summary.strip()
+        return summaries
+
+    @instrument_agent_method("ProductManagerAgent")
     async def draft_prd(
         self,
         problem_statement: str,
@@ -159,60 +274,380 @@ Summary:"""
                 "prd_draft": None,
             }
 
-        # Process relevant links: fetch content and generate summaries
-        links_context = ""
+        prompt = await self._build_prd_prompt(
+            problem_statement, case_title, relevant_links
+        )
+
+        try:
+            logger.info(
+                f"[ProductManagerAgent] Sending enhanced prompt to Vertex AI model: {self.model_name}"
+            )
+            result = await self.model.generate([prompt], policy="prd_draft")
+
+            if result.text:
+                prd_draft_content = result.text
+                logger.info(
+                    "[ProductManagerAgent] Successfully received structured PRD draft from Vertex AI."
+                )
+                logger.info(
+                    f"[ProductManagerAgent] PRD draft length: {len(prd_draft_content)} characters"
+                )
+
+                return {
+                    "status": "success",
+                    "message": "Structured PRD draft generated successfully by Vertex AI.",
+                    "prd_draft": self._build_prd_draft(case_title, prd_draft_content),
+                }
+            else:
+                message = result.describe_empty()
+                logger.info(f"[ProductManagerAgent] Error: {message}")
+                return {"status": "error", "message": message, "prd_draft": None}
+
+        except Exception as e:
+            logger.info(f"[ProductManagerAgent] Error generating PRD with Vertex AI: {e}")
+            return {
+                "status": "error",
+                "message": f"An error occurred while generating the PRD with Vertex AI: {str(e)}",
+                "prd_draft": None,
+            }
+
+    async def stream_prd(
+        self,
+        problem_statement: str,
+        case_title: str,
+        relevant_links: List[Dict[str, str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams PRD generation, yielding events as the draft is produced.
+
+        Yields dicts with a "type" of "status" (carrying "message") before
+        relevant links are gathered and before generation starts, "chunk"
+        (carrying "text") for each piece of the Markdown as it arrives, and
+        finally a single "complete" event (carrying "prd_draft") or "error"
+        event (carrying "message").
+        """
+        logger.info(f"[ProductManagerAgent] Received request to stream PRD for: {case_title}")
+
+        if not self.model:
+            yield {
+                "type": "error",
+                "message": "ProductManagerAgent not properly initialized with Vertex AI model.",
+            }
+            return
+
         if relevant_links:
+            yield {
+                "type": "status",
+                "message": f"Gathering context from {len(relevant_links)} relevant links",
+            }
+        prompt = await self._build_prd_prompt(
+            problem_statement, case_title, relevant_links
+        )
+        yield {"type": "status", "message": "Generating PRD draft"}
+
+        parts: List[str] = []
+        last_chunk = None
+        try:
             logger.info(
-                f"[ProductManagerAgent] Processing {len(relevant_links)} relevant links for context..."
+                f"[ProductManagerAgent] Streaming enhanced prompt to Vertex AI model: {self.model_name}"
             )
-            links_context += "\n\nAdditional Context from Relevant Links:\n"
+            async for chunk in self.model.stream([prompt], policy="prd_draft"):
+                last_chunk = chunk
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield {"type": "chunk", "text": chunk.text}
+        except Exception as e:
+            logger.info(f"[ProductManagerAgent] Error streaming PRD with Vertex AI: {e}")
+            yield {
+                "type": "error",
+                "message": f"An error occurred while generating the PRD with Vertex AI: {str(e)}",
+            }
+            return
 
-            for link_item in relevant_links:
-                link_name = link_item.get("name", "Unnamed Link")
-                link_url = link_item.get("url", "No URL provided")
+        if not parts:
+            message = (
+                last_chunk.describe_empty()
+                if last_chunk is not None
+                else "Vertex AI returned no content."
+            )
+            logger.info(f"[ProductManagerAgent] Error: {message}")
+            yield {"type": "error", "message": message}
+            return
 
-                if not link_url or link_url == "No URL provided":
-                    links_context += f"- **{link_name}**: No URL provided\n"
-                    continue
+        prd_draft_content = "".join(parts)
+        logger.info(
+            f"[ProductManagerAgent] Streamed PRD draft length: {len(prd_draft_content)} characters"
+        )
+        yield {
+            "type": "complete",
+            "prd_draft": self._build_prd_draft(case_title, prd_draft_content),
+        }
 
-                logger.info(
-                    f"[ProductManagerAgent] Fetching content from: {link_name} ({link_url})"
-                )
+    def _build_prd_draft(self, case_title: str, content_markdown: str) -> Dict[str, Any]:
+        """Wrap generated PRD Markdown in the prd_draft structure stored on the case."""
+        return {
+            "title": case_title,
+            "content_markdown": content_markdown,
+            "version": "1.0.0_structured",
+            "generated_with": f"Vertex AI {self.model_name}",
+            "sections": [
+                "Introduction / Problem Statement",
+                "Goals / Objectives",
+                "Target Audience / Users",
+                "Proposed Solution / Scope",
+                "Key Features / User Stories",
+                "Success Metrics / KPIs",
+                "Technical Considerations / Dependencies",
+                "Open Questions / Risks",
+            ],
+        }
+
+    async def _process_relevant_links(
+        self, relevant_links: List[Dict[str, str]], query: str = ""
+    ) -> List[str]:
+        """
+        Fetch and summarize relevant links.
+
+        Every link is fetched first, at most settings.prd_link_concurrency at
+        once. The fetched links are then summarized in chunks of
+        settings.link_summary_batch_size, one summarize_contents_batch call
+        per chunk; a link whose summary cannot be parsed from the batch
+        response falls back to an individual summarize_content call.
 
-                # Attempt to fetch and summarize content from the URL
+        Each fetch is bounded by settings.prd_link_timeout_seconds and the
+        whole operation, summarization included, by
+        settings.prd_links_total_timeout_seconds; links that miss a deadline
+        get a note saying whether fetching or summarizing timed out.
+
+        Returns:
+            List[str]: One links_context entry per link, in the original order
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.prd_link_concurrency))
+        link_timeout = settings.prd_link_timeout_seconds
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.prd_links_total_timeout_seconds
+        entries: List[Optional[str]] = [None] * len(relevant_links)
+
+        def timeout_note(link_item: Dict[str, str]) -> str:
+            link_name = link_item.get("name", "Unnamed Link")
+            link_url = link_item.get("url", "No URL provided")
+            logger.info(
+                f"[ProductManagerAgent] Timed out processing {link_name} after {link_timeout}s"
+            )
+            return f"- **{link_name}** ({link_url}): Unable to fetch content - timed out after {link_timeout:g} seconds\n\n"
+
+        async def fetch(link_item: Dict[str, str]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+            async with semaphore:
                 try:
-                    web_result = await fetch_web_content(link_url)
+                    return await asyncio.wait_for(
+                        self._fetch_relevant_link(link_item, query), timeout=link_timeout
+                    )
+                except asyncio.TimeoutError:
+                    return timeout_note(link_item), None
 
-                    if web_result["success"] and web_result["content"]:
-                        # Generate summary of the fetched content
-                        summary = await self.summarize_content(
-                            web_result["content"], link_name
-                        )
+        async def summarize(chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+            async with semaphore:
+                chunk_entries = await self._summarize_fetched_links(
+                    [fetched for _, fetched in chunk], query
+                )
+            for (index, _), entry in zip(chunk, chunk_entries):
+                entries[index] = entry
+
+        fetch_tasks = [asyncio.create_task(fetch(link_item)) for link_item in relevant_links]
+        done, pending = await asyncio.wait(
+            fetch_tasks, timeout=settings.prd_links_total_timeout_seconds
+        )
+        for task in pending:
+            task.cancel()
+
+        to_summarize: List[Tuple[int, Dict[str, Any]]] = []
+        for index, task in enumerate(fetch_tasks):
+            if task in done and not task.cancelled() and task.exception() is None:
+                entry, fetched = task.result()
+                if fetched is None:
+                    entries[index] = entry
+                else:
+                    to_summarize.append((index, fetched))
+
+        batch_size = max(1, settings.link_summary_batch_size)
+        summarize_tasks = [
+            asyncio.create_task(summarize(to_summarize[start:start + batch_size]))
+            for start in range(0, len(to_summarize), batch_size)
+        ]
+        if summarize_tasks:
+            _, pending_summaries = await asyncio.wait(
+                summarize_tasks, timeout=max(0.0, deadline - loop.time())
+            )
+            for task in pending_summaries:
+                task.cancel()
+            for index, fetched in to_summarize:
+                if entries[index] is None:
+                    logger.info(
+                        f"[ProductManagerAgent] Summarizing {fetched['name']} did not finish by the overall deadline"
+                    )
+                    entries[index] = (
+                        f"- **{fetched['name']}** ({fetched['url']}): "
+                        "Content retrieved but summarization timed out\n\n"
+                    )
+
+        missing = sum(1 for entry in entries if entry is None)
+        if missing:
+            logger.info(
+                f"[ProductManagerAgent] {missing} of {len(relevant_links)} links still pending at the overall deadline"
+            )
+        return [
+            entry
+            if entry is not None
+            else (
+                f"- **{link_item.get('name', 'Unnamed Link')}** ({link_item.get('url', 'No URL provided')}): "
+                "Unable to fetch content - link processing deadline exceeded\n\n"
+            )
+            for link_item, entry in zip(relevant_links, entries)
+        ]
+
+    async def _summarize_fetched_links(
+        self, fetched_links: List[Dict[str, Any]], query: str = ""
+    ) -> List[str]:
+        """
+        Summarize fetched links with one batched call, falling back to an
+        individual call for each link the batch response did not cover.
+        """
+        summaries: Dict[int, str] = {}
+        if len(fetched_links) > 1:
+            try:
+                summaries = await self.summarize_contents_batch(
+                    [(fetched["name"], fetched["content"]) for fetched in fetched_links],
+                    query=query,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"[ProductManagerAgent] Batched summarization failed, falling back to per-link calls: {e}"
+                )
+
+        async def resolve(index: int) -> str:
+            fetched = fetched_links[index]
+            summary = summaries.get(index)
+            if summary is None:
+                summary = await self.summarize_content(
+                    fetched["content"], fetched["name"], query=query
+                )
+            return await self._summarized_link_entry(fetched, summary, query)
 
-                        if summary and summary.strip():
-                            links_context += f"- **{link_name}** ({link_url}):\n"
-                            links_context += f"  Content Summary: {summary}\n\n"
-                            logger.info(
-                                f"[ProductManagerAgent] Successfully processed content from {link_name}"
-                            )
-                        else:
-                            links_context += f"- **{link_name}** ({link_url}): Content retrieved but no relevant summary generated\n\n"
-                            logger.info(
-                                f"[ProductManagerAgent] Content retrieved from {link_name} but summarization failed or not relevant"
-                            )
-                    else:
-                        error_msg = web_result.get("error", "Unknown error")
-                        links_context += f"- **{link_name}** ({link_url}): Unable to fetch content - {error_msg}\n\n"
+        return await asyncio.gather(*(resolve(index) for index in range(len(fetched_links))))
+
+    async def _fetch_relevant_link(
+        self, link_item: Dict[str, str], query: str = ""
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Fetch a relevant link's content.
+
+        Returns:
+            (entry, None) when the link's links_context entry is already known
+            (fetch failure or cached summary), otherwise (None, fetched) with
+            the name, url, content and content hash to summarize
+        """
+        link_name = link_item.get("name", "Unnamed Link")
+        link_url = link_item.get("url", "No URL provided")
+
+        if not link_url or link_url == "No URL provided":
+            return f"- **{link_name}**: No URL provided\n", None
+
+        logger.info(
+            f"[ProductManagerAgent] Fetching content from: {link_name} ({link_url})"
+        )
+
+        # Attempt to fetch content from the URL
+        try:
+            web_result = await fetch_web_content(link_url, cache=self.url_cache)
+
+            if web_result["success"] and web_result["content"]:
+                # Reuse the summary when the page content and relevance query are unchanged
+                text_hash = web_result.get("metadata", {}).get("content_hash")
+                if self.url_cache is not None and text_hash:
+                    summary = await self.url_cache.get_summary(
+                        link_url,
+                        text_hash,
+                        summary_query_key(query, settings.link_content_token_budget),
+                    )
+                    if summary:
                         logger.info(
-                            f"[ProductManagerAgent] Failed to fetch content from {link_name}: {error_msg}"
+                            f"[ProductManagerAgent] Content of {link_name} unchanged, reusing cached summary"
                         )
+                        return self._link_summary_entry(link_name, link_url, summary), None
+                return None, {
+                    "name": link_name,
+                    "url": link_url,
+                    "content": web_result["content"],
+                    "content_hash": text_hash,
+                }
+
+            error_msg = web_result.get("error", "Unknown error")
+            logger.info(
+                f"[ProductManagerAgent] Failed to fetch content from {link_name}: {error_msg}"
+            )
+            return f"- **{link_name}** ({link_url}): Unable to fetch content - {error_msg}\n\n", None
 
+        except Exception as e:
+            logger.info(
+                f"[ProductManagerAgent] Unexpected error processing {link_name}: {str(e)}"
+            )
+            return f"- **{link_name}** ({link_url}): Unexpected error: {str(e)}\n\n", None
+
+    async def _summarized_link_entry(
+        self, fetched: Dict[str, Any], summary: str, query: str = ""
+    ) -> str:
+        """Cache a fetched link's new summary and render its links_context entry."""
+        link_name, link_url = fetched["name"], fetched["url"]
+        if summary and summary.strip():
+            if self.url_cache is not None and fetched["content_hash"]:
+                try:
+                    await self.url_cache.store_summary(
+                        link_url,
+                        fetched["content_hash"],
+                        summary,
+                        summary_query_key(query, settings.link_content_token_budget),
+                    )
                 except Exception as e:
-                    error_msg = f"Unexpected error: {str(e)}"
-                    links_context += f"- **{link_name}** ({link_url}): {error_msg}\n\n"
-                    logger.info(
-                        f"[ProductManagerAgent] Unexpected error processing {link_name}: {str(e)}"
+                    logger.warning(
+                        f"[ProductManagerAgent] Could not cache summary for {link_name}: {e}"
                     )
+            return self._link_summary_entry(link_name, link_url, summary)
+        logger.info(
+            f"[ProductManagerAgent] Content retrieved from {link_name} but summarization failed or not relevant"
+        )
+        return f"- **{link_name}** ({link_url}): Content retrieved but no relevant summary generated\n\n"
+
+    @staticmethod
+    def _link_summary_entry(link_name: str, link_url: str, summary: str) -> str:
+        logger.info(
+            f"[ProductManagerAgent] Successfully processed content from {link_name}"
+        )
+        return (
+            f"- **{link_name}** ({link_url}):\n"
+            f"  Content Summary: {summary}\n\n"
+        )
+
+    async def _build_prd_prompt(
+        self,
+        problem_statement: str,
+        case_title: str,
+        relevant_links: Optional[List[Dict[str, str]]] = None,
+    ) -> str:
+        """
+        Render the PRD generation prompt, including summaries of relevant links.
+        """
+        # Process relevant links: fetch content and generate summaries
+        links_context = ""
+        if relevant_links:
+            logger.info(
+                f"[ProductManagerAgent] Processing {len(relevant_links)} relevant links for context..."
+            )
+            links_context += "\n\nAdditional Context from Relevant Links:\n"
+
+            query = build_relevance_query(case_title, problem_statement)
+            links_context += "".join(
+                await self._process_relevant_links(relevant_links, query)
+            )
 
             if links_context.strip() == "Additional Context from Relevant Links:":
                 # No successful content was retrieved
@@ -296,88 +731,7 @@ Generate the PRD now:"""
             )
             logger.info(f"[ProductManagerAgent] Formatted prompt with case_title='{case_title}', problem_statement length={len(problem_statement)}")
 
-        generation_config = {
-            "max_output_tokens": settings.vertex_ai_max_tokens,
-            "temperature": settings.vertex_ai_temperature,
-            "top_p": settings.vertex_ai_top_p,
-            "top_k": settings.vertex_ai_top_k,
-        }
-
-        safety_settings = {
-            generative_models.HarmCategory.HARM_CATEGORY_HATE_SPEECH: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            generative_models.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            generative_models.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            generative_models.HarmCategory.HARM_CATEGORY_HARASSMENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-        }
-
-        try:
-            logger.info(
-                f"[ProductManagerAgent] Sending enhanced prompt to Vertex AI model: {self.model_name}"
-            )
-            response = await self.model.generate_content_async(
-                [prompt],
-                generation_config=generation_config,
-                safety_settings=safety_settings,
-                stream=False,
-            )
-
-            if response.candidates and response.candidates[0].content.parts:
-                prd_draft_content = response.candidates[0].content.parts[0].text
-                logger.info(
-                    "[ProductManagerAgent] Successfully received structured PRD draft from Vertex AI."
-                )
-                logger.info(
-                    f"[ProductManagerAgent] PRD draft length: {len(prd_draft_content)} characters"
-                )
-
-                return {
-                    "status": "success",
-                    "message": "Structured PRD draft generated successfully by Vertex AI.",
-                    "prd_draft": {
-                        "title": case_title,
-                        "content_markdown": prd_draft_content,
-                        "version": "1.0.0_structured",
-                        "generated_with": f"Vertex AI {self.model_name}",
-                        "sections": [
-                            "Introduction / Problem Statement",
-                            "Goals / Objectives",
-                            "Target Audience / Users",
-                            "Proposed Solution / Scope",
-                            "Key Features / User Stories",
-                            "Success Metrics / KPIs",
-                            "Technical Considerations / Dependencies",
-                            "Open Questions / Risks",
-                        ],
-                    },
-                }
-            else:
-                finish_reason = (
-                    response.candidates[0].finish_reason
-                    if response.candidates
-                    else "Unknown"
-                )
-                safety_ratings = (
-                    response.candidates[0].safety_ratings
-                    if response.candidates
-                    else "N/A"
-                )
-                message = f"Vertex AI returned no content. Finish Reason: {finish_reason}. Safety Ratings: {safety_ratings}"
-                if response.prompt_feedback:
-                    message += (
-                        f" Prompt Feedback: {response.prompt_feedback.block_reason}"
-                    )
-                    if response.prompt_feedback.block_reason_message:
-                        message += f" ({response.prompt_feedback.block_reason_message})"
-                logger.info(f"[ProductManagerAgent] Error: {message}")
-                return {"status": "error", "message": message, "prd_draft": None}
-
-        except Exception as e:
-            logger.info(f"[ProductManagerAgent] Error generating PRD with Vertex AI: {e}")
-            return {
-                "status": "error",
-                "message": f"An error occurred while generating the PRD with Vertex AI: {str(e)}",
-                "prd_draft": None,
-            }
+        return prompt
 
     def get_status(self) -> Dict[str, str]:
         """Get the current status of the Product Manager agent."""
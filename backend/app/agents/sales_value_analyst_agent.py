@@ -3,21 +3,47 @@ Sales/Value Analyst Agent for generating potential revenue or value scenarios.
 Enhanced with Vertex AI integration and detailed pricing template usage.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 import asyncio
 import logging
-import json
 import re
-import vertexai
-from vertexai.generative_models import GenerativeModel
-import vertexai.preview.generative_models as generative_models
-from google.cloud import firestore
+from pydantic import BaseModel, ConfigDict, Field
 from app.core.config import settings
+from app.core.database import DatabaseClient
+from app.core.dependencies import get_db
+from app.core.llm_registry import LLMRegistry
+from app.core.metrics import instrument_agent_method
+from app.core.structured_output import StructuredOutput
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+class ValueScenario(BaseModel):
+    """A single Low/Base/High value scenario."""
+
+    model_config = ConfigDict(extra="allow")
+
+    case: str
+    value: Union[int, float]
+    description: Optional[str] = None
+
+
+class ValueProjectionOutput(BaseModel):
+    """Expected JSON output of the value projection prompt."""
+
+    model_config = ConfigDict(extra="allow")
+
+    scenarios: List[ValueScenario] = Field(min_length=1)
+    methodology: Optional[str] = None
+    assumptions: Optional[List[str]] = None
+    market_factors: Optional[List[str]] = None
+    notes: Optional[str] = None
+
+
+VALUE_PROJECTION_OUTPUT = StructuredOutput(ValueProjectionOutput)
+
+
 class SalesValueAnalystAgent:
     """
     The Sales/Value Analyst Agent is responsible for generating potential revenue
@@ -25,7 +51,11 @@ class SalesValueAnalystAgent:
     Enhanced with Vertex AI integration for intelligent value projection generation.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        llm_registry: Optional[LLMRegistry] = None,
+        db: Optional[DatabaseClient] = None,
+    ):
         self.name = "Sales/Value Analyst Agent"
         self.description = "Calculates potential revenue or value scenarios using AI and pricing templates."
         self.status = "initialized"
@@ -37,30 +67,28 @@ class SalesValueAnalystAgent:
         self.location = settings.vertex_ai_location
         self.model_name = settings.vertex_ai_model_name or "gemini-2.0-flash-lite"
 
-        # Initialize Vertex AI for intelligent value projection
-        try:
-            vertexai.init(project=self.project_id, location=self.location)
-            self.model = GenerativeModel(self.model_name)
+        # Shared model handle from the process-wide LLM registry
+        if llm_registry is None:
+            from app.core.dependencies import get_llm_registry
+            llm_registry = get_llm_registry()
+        self.llm_registry = llm_registry
+        self.model = llm_registry.get_model(self.model_name, "value_projection")
+        self.vertex_ai_available = self.model is not None
+        if self.vertex_ai_available:
             logger.info(
-                f"SalesValueAnalystAgent: Vertex AI initialized successfully with model {self.model_name}."
+                f"SalesValueAnalystAgent: Using shared Vertex AI model handle {self.model_name}."
             )
-            self.vertex_ai_available = True
-        except Exception as e:
-            logger.info(f"SalesValueAnalystAgent: Failed to initialize Vertex AI: {e}")
-            self.model = None
-            self.vertex_ai_available = False
+        else:
+            logger.info("SalesValueAnalystAgent: Vertex AI model not available")
 
-        # Initialize Firestore client for pricing template access
-        try:
-            self.db = firestore.Client(project=settings.firebase_project_id)
-            logger.info("SalesValueAnalystAgent: Firestore client initialized successfully.")
-        except Exception as e:
-            logger.info(f"SalesValueAnalystAgent: Failed to initialize Firestore client: {e}")
-            self.db = None
+        # Use dependency injection for the pricing template database client
+        self.db = db if db is not None else get_db()
+        logger.info("SalesValueAnalystAgent: Database client initialized successfully.")
 
         logger.info("SalesValueAnalystAgent: Initialized successfully.")
         self.status = "available"
 
+    @instrument_agent_method("SalesValueAnalystAgent")
     async def project_value(self, prd_content: str, case_title: str) -> Dict[str, Any]:
         """
         Projects value/revenue scenarios based on PRD content and case details.
@@ -252,7 +280,7 @@ class SalesValueAnalystAgent:
             template_metadata = template.get("metadata", {})
 
             # Construct AI prompt for value projection
-            prompt = """You are an experienced Sales/Value Analyst at DrFirst, a healthcare technology company. You are tasked with projecting realistic business value and revenue scenarios for a technology business case.
+            prompt = f"""You are an experienced Sales/Value Analyst at DrFirst, a healthcare technology company. You are tasked with projecting realistic business value and revenue scenarios for a technology business case.
 
 **Business Case Information:**
 - **Title**: {case_title}
@@ -299,31 +327,17 @@ Provide your response as a valid JSON object with this exact structure:
 
 Generate the value projection now:"""
 
-            # Generate AI response
-            generation_config = {
-                "max_output_tokens": settings.vertex_ai_max_tokens,
-                "temperature": 0.4,  # More conservative for financial projections
-                "top_p": 0.8,
-                "top_k": 20,
-            }
-
-            safety_settings = {
-                generative_models.HarmCategory.HARM_CATEGORY_HATE_SPEECH: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                generative_models.HarmCategory.HARM_CATEGORY_HARASSMENT: generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            }
-
+            # Generate AI response (value_projection profile is conservative)
             logger.info("[SalesValueAnalystAgent] Sending prompt to Vertex AI")
-            response = await self.model.generate_content_async(
+            result = await self.model.generate(
                 [prompt],
-                generation_config=generation_config,
-                safety_settings=safety_settings,
-                stream=False,
+                generation_config=VALUE_PROJECTION_OUTPUT.generation_config(
+                    self.model.generation_config
+                ),
             )
 
-            if response.candidates and response.candidates[0].content.parts:
-                ai_response_text = response.candidates[0].content.parts[0].text.strip()
+            if result.text:
+                ai_response_text = result.text.strip()
                 logger.info(
                     f"[SalesValueAnalystAgent] Received AI response ({len(ai_response_text)} characters)"
                 )
@@ -445,36 +459,29 @@ Generate the value projection now:"""
             Dict[str, Any]: Structured value projection data or None if parsing fails
         """
         try:
-            # Try to extract JSON from the response
-            json_match = re.search(r"\{.*\}", ai_text, re.DOTALL)
-            if json_match:
-                json_text = json_match.group()
-                parsed_data = json.loads(json_text)
-
-                # Validate required structure
-                if "scenarios" in parsed_data and isinstance(
-                    parsed_data["scenarios"], list
-                ):
-                    # Enhance with template information
-                    parsed_data["template_used"] = template.get(
-                        "name", "AI-Enhanced Template"
-                    )
-                    parsed_data["currency"] = "USD"
-
-                    # Ensure required fields exist
-                    if "methodology" not in parsed_data:
-                        parsed_data["methodology"] = (
-                            "AI-powered value projection with template guidance"
-                        )
-                    if "assumptions" not in parsed_data:
-                        parsed_data["assumptions"] = [
-                            "AI-generated assumptions based on PRD analysis"
-                        ]
+            # Extract the JSON object and validate it against the output schema
+            parsed_data = VALUE_PROJECTION_OUTPUT.parse(ai_text)
+            if parsed_data is not None:
+                # Enhance with template information
+                parsed_data["template_used"] = template.get(
+                    "name", "AI-Enhanced Template"
+                )
+                parsed_data["currency"] = "USD"
 
-                    logger.info(
-                        f"[SalesValueAnalystAgent] Successfully parsed JSON with {len(parsed_data['scenarios'])} scenarios"
+                # Ensure required fields exist
+                if "methodology" not in parsed_data:
+                    parsed_data["methodology"] = (
+                        "AI-powered value projection with template guidance"
                     )
-                    return parsed_data
+                if "assumptions" not in parsed_data:
+                    parsed_data["assumptions"] = [
+                        "AI-generated assumptions based on PRD analysis"
+                    ]
+
+                logger.info(
+                    f"[SalesValueAnalystAgent] Successfully parsed JSON with {len(parsed_data['scenarios'])} scenarios"
+                )
+                return parsed_data
 
             # Fallback: manual extraction
             logger.info(
@@ -482,11 +489,6 @@ Generate the value projection now:"""
             )
             return self._manual_extract_scenarios(ai_text, template)
 
-        except json.JSONDecodeError as e:
-            logger.warning(
-                f"[SalesValueAnalystAgent] JSON parsing error: {e}, attempting manual extraction"
-            )
-            return self._manual_extract_scenarios(ai_text, template)
         except Exception as e:
             logger.error(f"[SalesValueAnalystAgent] Error parsing AI response: {e}")
             return None
@@ -0,0 +1,233 @@
+"""
+Speculative system design generation.
+
+When a PRD is submitted for review, the system design can be generated in
+the background so it is ready the moment the PRD is approved. Results are
+keyed by a hash of the design inputs; approval adopts a result only if the
+approved PRD still hashes the same, otherwise it is discarded.
+
+Runs live in the process that started them. A finished result is also
+handed to the runner's store callback, which the orchestrator uses to save
+it on the case under speculative_system_design, so an approval handled by
+another replica or by a job worker can adopt it with
+stored_speculative_design.
+
+Speculative runs have their own concurrency budget and wait while the
+shared LLM limiter has interactive callers queued, so they never compete
+with user-facing work for model capacity. Approval only waits for a run
+that has begun generating; one still queued is cancelled so the approval
+does not wait at speculative priority.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.llm_limiter import AdaptiveConcurrencyLimiter
+
+logger = logging.getLogger(__name__)
+
+IDLE_POLL_SECONDS = 0.5
+SPECULATIVE_DESIGN_FIELD = "speculative_system_design"
+
+# store(case_id, input_hash, response) persists a successful result
+ResultStore = Callable[[str, str, Dict[str, Any]], Awaitable[None]]
+
+
+def design_input_hash(prd_content: str, case_title: str) -> str:
+    """Hash the inputs a system design is generated from."""
+    digest = hashlib.sha256()
+    for part in (case_title or "", prd_content or ""):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def stored_speculative_design(
+    case_data: Dict[str, Any], prd_content: str, case_title: str
+) -> Optional[Dict[str, Any]]:
+    """
+    The generate_system_design response saved on a case for these exact
+    inputs, or None.
+    """
+    stored = case_data.get(SPECULATIVE_DESIGN_FIELD) or {}
+    if not stored.get("system_design_draft"):
+        return None
+    if stored.get("input_hash") != design_input_hash(prd_content, case_title):
+        return None
+    return {"status": "success", "system_design_draft": dict(stored["system_design_draft"])}
+
+
+class _Speculation:
+    def __init__(self, input_hash: str):
+        self.input_hash = input_hash
+        self.task: Optional["asyncio.Task[Dict[str, Any]]"] = None
+        self.started_at = time.time()
+        # Set by _run once budget and idle capacity allow generation
+        self.generating_since: Optional[float] = None
+
+
+class SpeculativeDesignRunner:
+    """
+    Runs at most one speculative system design per case.
+
+    Args:
+        architect_agent: Agent providing generate_system_design
+        max_concurrency: Speculative runs allowed at once
+        ttl_seconds: Age after which an unadopted result is dropped
+        limiter: Shared LLM limiter; runs wait while it has a queue
+        store: Persists each successful result for other processes
+    """
+
+    def __init__(
+        self,
+        architect_agent: Any,
+        max_concurrency: int = 2,
+        ttl_seconds: float = 3600,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        store: Optional[ResultStore] = None,
+    ):
+        self.architect_agent = architect_agent
+        self.max_concurrency = max(1, max_concurrency)
+        self.ttl_seconds = ttl_seconds
+        self.limiter = limiter
+        self.store = store
+
+        self._speculations: Dict[str, _Speculation] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"started": 0, "adopted": 0, "discarded": 0, "failed": 0}
+
+    def _budget(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        for case_id, speculation in list(self._speculations.items()):
+            if speculation.started_at < cutoff:
+                self.discard(case_id)
+
+    async def _wait_for_idle_capacity(self) -> None:
+        while self.limiter is not None and self.limiter.queue_depth:
+            await asyncio.sleep(IDLE_POLL_SECONDS)
+
+    async def _run(
+        self, speculation: _Speculation, case_id: str, prd_content: str, case_title: str
+    ) -> Dict[str, Any]:
+        async with self._budget():
+            await self._wait_for_idle_capacity()
+            speculation.generating_since = time.time()
+            logger.info(f"SpeculativeDesignRunner: Generating system design for case {case_id}")
+            try:
+                response = await self.architect_agent.generate_system_design(
+                    prd_content=prd_content, case_title=case_title
+                )
+            except Exception as e:
+                response = {"status": "error", "message": str(e)}
+            if response.get("status") != "success":
+                self.stats["failed"] += 1
+                logger.info(
+                    f"SpeculativeDesignRunner: Speculative design failed for case {case_id}: {response.get('message')}"
+                )
+            elif self.store is not None:
+                try:
+                    await self.store(case_id, speculation.input_hash, response)
+                except Exception as e:
+                    logger.warning(
+                        f"SpeculativeDesignRunner: Could not store speculative design for case {case_id}: {e}"
+                    )
+            return response
+
+    def start(self, case_id: str, prd_content: str, case_title: str) -> bool:
+        """
+        Start speculative generation for a submitted PRD.
+
+        A run already in progress for the same inputs is kept; a run for
+        older inputs is cancelled and replaced.
+
+        Returns:
+            bool: Whether a new run was started
+        """
+        self._expire()
+        input_hash = design_input_hash(prd_content, case_title)
+        existing = self._speculations.get(case_id)
+        if existing is not None:
+            if existing.input_hash == input_hash and not (
+                existing.task.done() and self._failed(existing.task)
+            ):
+                return False
+            self.discard(case_id)
+
+        speculation = _Speculation(input_hash)
+        speculation.task = asyncio.create_task(
+            self._run(speculation, case_id, prd_content, case_title)
+        )
+        self._speculations[case_id] = speculation
+        self.stats["started"] += 1
+        return True
+
+    @staticmethod
+    def _failed(task: "asyncio.Task[Dict[str, Any]]") -> bool:
+        if task.cancelled() or task.exception() is not None:
+            return True
+        return task.result().get("status") != "success"
+
+    async def adopt(
+        self, case_id: str, prd_content: str, case_title: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Take the speculative result for an approved PRD.
+
+        Waits for a run that is already generating for the same inputs. A
+        run still waiting for the speculative budget or for idle capacity is
+        cancelled instead.
+
+        Returns:
+            The generate_system_design response, or None when there is no
+            usable speculative result (the caller generates normally)
+        """
+        speculation = self._speculations.pop(case_id, None)
+        if speculation is None:
+            return None
+        if speculation.input_hash != design_input_hash(prd_content, case_title):
+            speculation.task.cancel()
+            self.stats["discarded"] += 1
+            logger.info(f"SpeculativeDesignRunner: PRD changed since submission, discarding design for case {case_id}")
+            return None
+        if speculation.generating_since is None and not speculation.task.done():
+            speculation.task.cancel()
+            self.stats["discarded"] += 1
+            logger.info(f"SpeculativeDesignRunner: Design for case {case_id} not started yet, generating interactively")
+            return None
+        try:
+            response = await asyncio.shield(speculation.task)
+        except asyncio.CancelledError:
+            if speculation.task.cancelled():
+                return None
+            raise
+        if response.get("status") != "success":
+            return None
+        self.stats["adopted"] += 1
+        logger.info(f"SpeculativeDesignRunner: Adopted speculative design for case {case_id}")
+        return response
+
+    def discard(self, case_id: str) -> None:
+        """Cancel and forget any speculative run for a case."""
+        speculation = self._speculations.pop(case_id, None)
+        if speculation is not None:
+            speculation.task.cancel()
+            self.stats["discarded"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending": sum(1 for s in self._speculations.values() if not s.task.done()),
+            "ready": sum(1 for s in self._speculations.values() if s.task.done()),
+            "max_concurrency": self.max_concurrency,
+        }
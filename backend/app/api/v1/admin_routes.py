@@ -12,6 +12,7 @@ from datetime import datetime, timezone
 from google.cloud import firestore
 from app.auth.firebase_auth import require_admin_role
 from app.core.config import settings
+from app.core.dependencies import get_llm_registry
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
@@ -639,6 +640,12 @@ async def get_analytics(current_user: dict = Depends(require_admin_role)):
     return {"message": "Admin analytics endpoint - implementation pending"}
 
 
+@router.get("/llm/status", summary="Get LLM registry, cache and limiter status")
+async def get_llm_status(current_user: dict = Depends(require_admin_role)):
+    """Get LLM response cache stats and adaptive concurrency limiter metrics (admin only)"""
+    return get_llm_registry().get_status()
+
+
 @router.post("/agent/deploy", summary="Deploy agent updates")
 async def deploy_agent_updates(current_user: dict = Depends(require_admin_role)):
     """Deploy updates to the agent system (admin only)"""
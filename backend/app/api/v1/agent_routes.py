@@ -11,16 +11,16 @@ from app.middleware.rate_limiter import limiter
 
 logger = logging.getLogger(__name__)
 
-# Import the OrchestratorAgent
-from app.agents.orchestrator_agent import OrchestratorAgent
+# Import the shared OrchestratorAgent provider
+from app.core.dependencies import get_orchestrator_agent
 
 # Import the authentication dependency
 from app.auth.firebase_auth import get_current_active_user
 
 router = APIRouter()
 
-# Initialize the OrchestratorAgent instance (can be improved with dependency injection later)
-orchestrator = OrchestratorAgent()
+# Shared OrchestratorAgent instance (also used by the PRD approval routes)
+orchestrator = get_orchestrator_agent()
 
 
 # Pydantic models for request validation
@@ -2,12 +2,17 @@
 API routes for PRD (Product Requirements Document) management.
 """
 
+import asyncio
+import json
 import logging
 from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict
 from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi.responses import StreamingResponse
 
 from app.auth.firebase_auth import get_current_active_user
-from app.core.dependencies import get_firestore_service
+from app.core.config import settings
+from app.core.dependencies import get_firestore_service, get_orchestrator_agent
 from app.services.firestore_service import FirestoreService
 from .models import PrdUpdateRequest, PrdRejectRequest
 
@@ -104,6 +109,122 @@ async def update_prd_draft(
         )
 
 
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format a stream event as a Server-Sent Events message."""
+    data = {key: value for key, value in event.items() if key != "type"}
+    return f"event: {event['type']}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _with_keepalive(messages: AsyncIterator[str], interval: float) -> AsyncIterator[str]:
+    """
+    Relay SSE messages, sending a comment whenever none arrives for interval
+    seconds so clients and proxies do not drop an idle connection.
+    """
+    iterator = messages.__aiter__()
+    next_message = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_message}, timeout=interval)
+            if not done:
+                yield ": keepalive\n\n"
+                continue
+            try:
+                message = next_message.result()
+            except StopAsyncIteration:
+                return
+            yield message
+            next_message = asyncio.ensure_future(iterator.__anext__())
+    finally:
+        next_message.cancel()
+
+
+@router.get(
+    "/cases/{case_id}/prd/stream",
+    summary="Stream PRD generation for a specific business case",
+    response_class=StreamingResponse,
+)
+async def stream_prd_draft(
+    case_id: str = Path(
+        ...,
+        min_length=1,
+        max_length=128,
+        description="Business case ID"
+    ),
+    current_user: dict = Depends(get_current_active_user),
+    firestore_service: FirestoreService = Depends(get_firestore_service),
+):
+    """
+    Generates the PRD draft for a case and streams it as Server-Sent Events.
+
+    Emits "status" events ({"message": ...}) while relevant links are
+    gathered and generation starts, "chunk" events ({"text": ...}) as
+    Markdown arrives, then a single "complete" event ({"prd_draft": ...,
+    "case_id": ...}) once the draft has been stored on the case, or an
+    "error" event ({"message": ...}). A ": keepalive" comment is sent while
+    the stream is otherwise idle.
+    """
+    user_id = current_user.get("uid")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="User ID not found in token.")
+
+    try:
+        from app.agents.orchestrator_agent import BusinessCaseStatus
+
+        business_case = await firestore_service.get_business_case(case_id)
+
+        if not business_case:
+            raise HTTPException(
+                status_code=404, detail=f"Business case {case_id} not found."
+            )
+
+        if business_case.user_id != user_id:
+            raise HTTPException(
+                status_code=403,
+                detail="You do not have permission to generate a PRD for this business case.",
+            )
+
+        current_status_str = str(business_case.status)
+        if hasattr(business_case.status, "value"):
+            current_status_str = business_case.status.value
+
+        valid_stream_statuses = [
+            BusinessCaseStatus.INTAKE.value,
+            BusinessCaseStatus.PRD_DRAFTING.value,
+            BusinessCaseStatus.PRD_REJECTED.value,
+        ]
+        if current_status_str not in valid_stream_statuses:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot generate PRD from current status: {current_status_str}. Must be in INTAKE, PRD_DRAFTING, or PRD_REJECTED state.",
+            )
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"Error preparing PRD stream for case {case_id}, user {user_id}: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to start PRD stream: {str(e)}"
+        )
+
+    orchestrator = get_orchestrator_agent()
+
+    async def event_stream():
+        try:
+            async for event in orchestrator.stream_prd_draft(case_id):
+                if event["type"] == "complete":
+                    event = {**event, "case_id": case_id}
+                yield _format_sse(event)
+        except Exception as e:
+            logger.error(f"Error streaming PRD for case {case_id}: {e}")
+            yield _format_sse({"type": "error", "message": f"PRD stream failed: {str(e)}"})
+
+    return StreamingResponse(
+        _with_keepalive(event_stream(), settings.prd_stream_keepalive_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post(
     "/cases/{case_id}/submit-prd", status_code=200, summary="Submit PRD for review"
 )
@@ -198,6 +319,14 @@ async def submit_prd_for_review(
                 status_code=500, detail="Failed to submit PRD for review"
             )
 
+        # Optionally start generating the system design ahead of approval
+        try:
+            get_orchestrator_agent().start_speculative_system_design(
+                case_id, prd_draft.get("content_markdown"), business_case.title
+            )
+        except Exception as spec_error:
+            logger.warning(f"Could not start speculative system design for case {case_id}: {spec_error}")
+
         return {
             "message": "PRD submitted for review successfully",
             "new_status": BusinessCaseStatus.PRD_REVIEW.value,
@@ -291,9 +420,7 @@ async def approve_prd(
 
         # After successful PRD approval, initiate system design generation
         try:
-            from app.agents.orchestrator_agent import OrchestratorAgent
-
-            orchestrator = OrchestratorAgent()
+            orchestrator = get_orchestrator_agent()
 
             logger.info(f"Triggering system design generation for approved PRD in case {case_id}")
             design_result = await orchestrator.handle_prd_approval(case_id)
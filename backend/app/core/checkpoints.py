@@ -0,0 +1,56 @@
+"""
+Per-stage pipeline checkpoints stored on business case documents.
+
+When a pipeline stage finishes, the update that stores its output also
+records a checkpoint under pipeline_checkpoints.<stage>: the hash of the
+stage's inputs and the case field holding its output. Resuming a pipeline
+skips a stage whose checkpoint matches its current inputs and whose output
+is still on the case.
+
+Each run also stamps the case with its own pipeline_run_id when it first
+writes; its later writes only apply while that id is unchanged, so a run
+superseded by a resume cannot overwrite the resumed run's results.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+CHECKPOINTS_FIELD = "pipeline_checkpoints"
+PIPELINE_RUN_FIELD = "pipeline_run_id"
+
+
+def stage_input_hash(*inputs: Any) -> str:
+    """Hash of a stage's inputs."""
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def stage_checkpoint(stage: str, input_hash: str, output_field: str) -> Dict[str, Any]:
+    return {
+        "stage": stage,
+        "input_hash": input_hash,
+        "output_field": output_field,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def with_checkpoint(
+    case_data: Dict[str, Any], stage: str, input_hash: str, output_field: str
+) -> Dict[str, Any]:
+    """The case's checkpoint map with stage recorded, for the stage's output update."""
+    checkpoints = dict(case_data.get(CHECKPOINTS_FIELD) or {})
+    checkpoints[stage] = stage_checkpoint(stage, input_hash, output_field)
+    case_data[CHECKPOINTS_FIELD] = checkpoints
+    return checkpoints
+
+
+def completed_stage_output(
+    case_data: Dict[str, Any], stage: str, input_hash: str
+) -> Optional[Any]:
+    """A stage's stored output if its checkpoint matches input_hash, else None."""
+    checkpoint = (case_data.get(CHECKPOINTS_FIELD) or {}).get(stage)
+    if not checkpoint or checkpoint.get("input_hash") != input_hash:
+        return None
+    return case_data.get(checkpoint.get("output_field"))
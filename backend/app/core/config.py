@@ -3,7 +3,7 @@ Configuration management for the DrFirst Business Case Generator Backend
 """
 
 import os
-from typing import Optional, List
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -56,6 +56,95 @@ class Settings(BaseSettings):
     vertex_ai_top_p: float = 0.9
     vertex_ai_top_k: int = 40
 
+    # LLM response cache settings
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 512
+    llm_cache_ttl_seconds: int = 86400  # 24 hours
+    llm_cache_sqlite_path: Optional[str] = None  # Set to enable the on-disk tier
+
+    # LLM adaptive concurrency limiter settings (shared by all agents)
+    llm_limiter_enabled: bool = True
+    llm_initial_concurrency: int = 8
+    llm_min_concurrency: int = 1
+    llm_max_concurrency: int = 32
+    llm_limiter_latency_threshold_seconds: Optional[float] = 30.0  # Slower calls do not grow the limit
+
+    # LLM request policy settings (deadlines include retries and hedges)
+    llm_request_timeout_seconds: float = 120.0
+    llm_prd_draft_timeout_seconds: float = 180.0
+    llm_prd_analysis_timeout_seconds: float = 60.0
+    llm_system_design_timeout_seconds: float = 300.0
+    llm_summarization_timeout_seconds: float = 30.0
+    llm_max_retries: int = 2  # Retries of transient errors (429, 503, ...)
+    llm_retry_backoff_seconds: float = 1.0  # Base of the jittered exponential backoff
+    llm_hedging_enabled: bool = True  # Hedge PRD analysis and link summaries
+    llm_hedge_quantile: float = 0.95  # Observed latency quantile that triggers a hedge
+    llm_json_mode_enabled: bool = True  # Request JSON output with a response schema
+
+    # LLM backend: "vertex" (live), "record" (live + write cassettes) or "replay" (offline)
+    llm_backend: str = "vertex"
+    llm_cassette_dir: str = "cassettes/llm"
+    llm_replay_latency_mode: str = "recorded"  # recorded, lognormal, fixed or none
+    llm_replay_latency_median_seconds: float = 2.0  # Used by lognormal and fixed modes
+    llm_replay_latency_sigma: float = 0.5  # Lognormal tail width
+    llm_replay_latency_scale: float = 1.0  # Multiplier for every replayed latency
+    llm_replay_seed: Optional[int] = None  # Makes sampled latencies reproducible
+
+    # Speculative system design (generated when a PRD is submitted for review)
+    speculative_design_enabled: bool = False
+    speculative_design_concurrency: int = 2  # Separate from interactive LLM capacity
+    speculative_design_ttl_seconds: int = 3600  # Unadopted designs are dropped after this
+    architect_combined_design: bool = False  # One call returns PRD analysis and design
+
+    # Agent workflow DAG: per-stage concurrency limits shared by all cases,
+    # keyed by node (prd, design, effort, cost, value, financial)
+    dag_stage_concurrency: Dict[str, int] = {}
+
+    # Single-flight deduplication of identical orchestrator requests
+    single_flight_enabled: bool = True
+    single_flight_window_seconds: float = 10.0  # Late duplicates reuse a success this long
+
+    # Metrics (Prometheus text format at /metrics)
+    metrics_enabled: bool = True
+
+    # Background jobs (business case generation runs on job workers)
+    job_lease_seconds: int = 120  # A claimed job is re-queued if not heartbeated within this
+    job_heartbeat_seconds: float = 30.0  # How often workers extend their leases
+    job_max_attempts: int = 3  # Claims allowed before a job is marked failed
+    job_poll_interval_seconds: float = 2.0  # Idle workers poll for new jobs this often
+    job_worker_concurrency: int = 4  # Jobs run at once per worker process
+    job_worker_embedded: bool = False  # Also run a worker inside each API process
+    pipeline_stall_seconds: int = 900  # In-progress cases untouched this long are resumed
+    pipeline_sweep_interval_seconds: float = 300.0  # Workers look for stalled cases this often; 0 disables
+
+    # CPU-bound work (PDF rendering, HTML parsing) runs in a process pool
+    process_pool_enabled: bool = True  # False runs tasks in the default thread pool
+    process_pool_workers: int = 2  # Worker processes kept warm per API/worker process
+    process_pool_max_queue: int = 32  # Tasks waiting for a worker before new ones are rejected
+    process_pool_task_timeout_seconds: float = 120.0  # Stuck workers are killed and replaced
+    process_pool_start_method: str = "spawn"  # multiprocessing start method
+    process_pool_preload: List[str] = ["weasyprint", "markdown", "bs4"]  # Imported at worker start
+
+    # PRD relevant-link processing settings
+    prd_link_concurrency: int = 4  # Link fetches / summary batches in flight at once
+    prd_link_timeout_seconds: float = 30.0  # Per-link fetch deadline
+    prd_links_total_timeout_seconds: float = 60.0  # Deadline for fetching and summarizing all links
+    link_content_token_budget: int = 1500  # Compacted page text sent for summarization
+    link_summary_batch_size: int = 6  # Links summarized per LLM call; 1 disables batching
+    prd_stream_keepalive_seconds: float = 15.0  # Idle PRD stream sends an SSE comment this often
+
+    # Relevant-link URL cache settings
+    url_cache_enabled: bool = True
+    url_cache_max_entries: int = 256
+    url_cache_ttl_seconds: int = 604800  # 7 days; entries are revalidated on reuse
+    url_cache_sqlite_path: Optional[str] = None  # Set to persist across restarts
+
+    # Outbound HTTP client settings (relevant-link fetching)
+    http_client_max_connections: int = 100
+    http_client_max_keepalive_connections: int = 20
+    http_client_max_connections_per_host: int = 6
+    http_client_keepalive_expiry_seconds: float = 30.0
+
     # CORS settings - comma-separated string that gets parsed into a list
     backend_cors_origins: str = "http://localhost:4000,http://127.0.0.1:4000,https://drfirst-business-case-gen.web.app,https://drfirst-business-case-gen.firebaseapp.com"
 
@@ -154,6 +154,7 @@ class Collections:
     USERS = "users"
     BUSINESS_CASES = "business_cases"
     JOBS = "jobs"
+    JOB_LEASES = "job_leases"
     RATE_CARDS = "rateCards"  # Note: camelCase to match existing Firestore collection
     GLOBAL_CONFIG = "global_config"
     AUDIT_LOGS = "audit_logs"
@@ -0,0 +1,317 @@
+"""
+Declarative DAG execution for multi-agent workflows.
+
+Each DagNode names the nodes whose outputs it needs. DagScheduler starts a
+node as soon as all of its inputs have completed, so independent branches
+(e.g. cost and value analysis once effort is known) run concurrently.
+Nodes may share a concurrency limit across every run of the scheduler, and
+each run records per-node queueing and execution time.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from app.core.metrics import REGISTRY, observe_duration
+
+logger = logging.getLogger(__name__)
+
+DAG_NODE_DURATION = REGISTRY.histogram(
+    "dag_node_duration_seconds",
+    "Execution time of workflow DAG nodes (excluding queueing)",
+    ("dag", "node", "outcome"),
+)
+
+NodeFunc = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+
+# Node states
+PENDING = "pending"
+SUCCESS = "success"
+ERROR = "error"
+SKIPPED = "skipped"
+PROVIDED = "provided"
+
+
+class DagNode:
+    """
+    One stage of a workflow.
+
+    Args:
+        name: Unique node name; downstream nodes refer to it in inputs
+        func: async func(context, results) -> output. results holds the
+            outputs of every completed node, keyed by node name
+        inputs: Names of the nodes that must succeed first
+        concurrency: Maximum concurrent executions of this node across all
+            runs of the scheduler (None for unlimited)
+        timeout_seconds: Per-execution deadline
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: NodeFunc,
+        inputs: Sequence[str] = (),
+        concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.concurrency = concurrency
+        self.timeout_seconds = timeout_seconds
+
+
+class NodeRun:
+    """Outcome and timing of one node within a DAG run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = PENDING
+        self.error: Optional[str] = None
+        self.queued_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def wait_seconds(self) -> Optional[float]:
+        if self.queued_at is None or self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        def offset(value: Optional[float]) -> Optional[float]:
+            return round(value - origin, 4) if value is not None else None
+
+        return {
+            "status": self.status,
+            "error": self.error,
+            "start_offset_seconds": offset(self.started_at),
+            "end_offset_seconds": offset(self.finished_at),
+            "wait_seconds": round(self.wait_seconds, 4) if self.wait_seconds is not None else None,
+            "duration_seconds": (
+                round(self.duration_seconds, 4) if self.duration_seconds is not None else None
+            ),
+        }
+
+
+class DagRun:
+    """Results of executing a DAG once."""
+
+    def __init__(self, dag_name: str, node_names: Iterable[str]):
+        self.dag_name = dag_name
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.results: Dict[str, Any] = {}
+        self.nodes: Dict[str, NodeRun] = {name: NodeRun(name) for name in node_names}
+
+    @property
+    def succeeded(self) -> bool:
+        return all(node.status in (SUCCESS, PROVIDED) for node in self.nodes.values())
+
+    @property
+    def failed_nodes(self) -> List[str]:
+        return [name for name, node in self.nodes.items() if node.status == ERROR]
+
+    def timings(self) -> Dict[str, Dict[str, Any]]:
+        return {name: node.to_dict(self.started_at) for name, node in self.nodes.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": "success" if self.succeeded else "error",
+            "dag": self.dag_name,
+            "duration_seconds": (
+                round(self.finished_at - self.started_at, 4) if self.finished_at else None
+            ),
+            "failed_nodes": self.failed_nodes,
+            "nodes": self.timings(),
+            "results": self.results,
+        }
+
+
+def _is_error_response(output: Any) -> bool:
+    return isinstance(output, dict) and output.get("status") == "error"
+
+
+class DagScheduler:
+    """
+    Executes a set of DagNodes respecting their dependencies.
+
+    A node whose func raises, times out or returns {"status": "error"} is
+    marked failed and every node depending on it is skipped; unrelated
+    branches keep running.
+
+    Args:
+        name: Name used in logs and metrics
+        nodes: Workflow nodes; the graph must be acyclic
+        concurrency_limits: Per-node limits overriding DagNode.concurrency
+    """
+
+    def __init__(
+        self,
+        name: str,
+        nodes: Sequence[DagNode],
+        concurrency_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.name = name
+        self.nodes: Dict[str, DagNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate DAG node: {node.name}")
+            self.nodes[node.name] = node
+        for node in nodes:
+            for dependency in node.inputs:
+                if dependency not in self.nodes:
+                    raise ValueError(f"Node {node.name} depends on unknown node {dependency}")
+        self.order = self._topological_order()
+
+        limits = {n.name: n.concurrency for n in nodes if n.concurrency}
+        for node_name, limit in (concurrency_limits or {}).items():
+            if node_name not in self.nodes:
+                raise ValueError(f"Concurrency limit for unknown node {node_name}")
+            limits[node_name] = limit
+        self.concurrency_limits = {name: max(1, int(limit)) for name, limit in limits.items()}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"DAG cycle: {' -> '.join(path + [name])}")
+            state[name] = 1
+            for dependency in self.nodes[name].inputs:
+                visit(dependency, path + [name])
+            state[name] = 2
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return order
+
+    def _required(self, targets: Optional[Iterable[str]]) -> Set[str]:
+        """Targets plus everything they transitively depend on."""
+        if targets is None:
+            return set(self.nodes)
+        required: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.nodes:
+                raise ValueError(f"Unknown DAG node: {name}")
+            if name not in required:
+                required.add(name)
+                stack.extend(self.nodes[name].inputs)
+        return required
+
+    def _semaphore(self, name: str) -> Optional[asyncio.Semaphore]:
+        limit = self.concurrency_limits.get(name)
+        if limit is None:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphores = {}
+            self._loop = loop
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = self._semaphores[name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def _execute(self, node: DagNode, run: DagRun, context: Dict[str, Any]) -> None:
+        node_run = run.nodes[node.name]
+        node_run.queued_at = time.perf_counter()
+        semaphore = self._semaphore(node.name)
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            node_run.started_at = time.perf_counter()
+            with observe_duration(DAG_NODE_DURATION, dag=self.name, node=node.name) as labels:
+                try:
+                    call = node.func(context, dict(run.results))
+                    if node.timeout_seconds is not None:
+                        output = await asyncio.wait_for(call, node.timeout_seconds)
+                    else:
+                        output = await call
+                except asyncio.TimeoutError:
+                    output = {
+                        "status": "error",
+                        "message": f"{node.name} exceeded {node.timeout_seconds}s",
+                    }
+                except Exception as e:
+                    output = {"status": "error", "message": str(e)}
+                if _is_error_response(output):
+                    labels["outcome"] = "error"
+            node_run.finished_at = time.perf_counter()
+            if _is_error_response(output):
+                node_run.status = ERROR
+                node_run.error = output.get("message")
+                logger.warning(f"DagScheduler[{self.name}]: Node {node.name} failed: {node_run.error}")
+            else:
+                node_run.status = SUCCESS
+            run.results[node.name] = output
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    async def run(
+        self,
+        context: Dict[str, Any],
+        provided: Optional[Dict[str, Any]] = None,
+        targets: Optional[Iterable[str]] = None,
+    ) -> DagRun:
+        """
+        Execute the DAG.
+
+        Args:
+            context: Shared inputs passed to every node (e.g. case title)
+            provided: Outputs already available for some nodes; those nodes
+                are not executed
+            targets: Nodes to produce; only they and their dependencies run
+                (default: every node)
+
+        Returns:
+            DagRun: Per-node outputs, statuses and timings
+        """
+        required = self._required(targets)
+        names = [name for name in self.order if name in required]
+        run = DagRun(self.name, names)
+        for name, output in (provided or {}).items():
+            if name in run.nodes:
+                run.results[name] = output
+                run.nodes[name].status = PROVIDED
+
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while True:
+                for name in names:
+                    node_run = run.nodes[name]
+                    if node_run.status != PENDING or name in running.values():
+                        continue
+                    statuses = [run.nodes[d].status for d in self.nodes[name].inputs]
+                    if any(s in (ERROR, SKIPPED) for s in statuses):
+                        node_run.status = SKIPPED
+                        node_run.error = "upstream failure"
+                    elif all(s in (SUCCESS, PROVIDED) for s in statuses):
+                        task = asyncio.create_task(self._execute(self.nodes[name], run, context))
+                        running[task] = name
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    running.pop(task)
+                    task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            run.finished_at = time.perf_counter()
+        return run
@@ -4,7 +4,13 @@ Provides interfaces and implementations for data access.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class DocumentAlreadyExistsError(Exception):
+    """Raised by DocumentReference.create when the document already exists."""
 
 
 class DatabaseClient(ABC):
@@ -15,6 +21,16 @@ class DatabaseClient(ABC):
         """Get a collection reference."""
         pass
 
+    @abstractmethod
+    def batch(self) -> "WriteBatch":
+        """Start a batch of writes committed atomically."""
+        pass
+
+    @abstractmethod
+    def transaction(self, max_attempts: int = 5) -> "Transaction":
+        """Start a read-write transaction."""
+        pass
+
 
 class CollectionReference(ABC):
     """Abstract interface for collection operations."""
@@ -58,6 +74,16 @@ class DocumentReference(ABC):
         """Set document data."""
         pass
 
+    @abstractmethod
+    def create(self, data: Dict[str, Any]) -> None:
+        """
+        Create the document, failing atomically if it already exists.
+
+        Raises:
+            DocumentAlreadyExistsError: If the document exists
+        """
+        pass
+
     @abstractmethod
     def update(self, data: Dict[str, Any]) -> None:
         """Update document data."""
@@ -114,6 +140,195 @@ class Query(ABC):
         pass
 
 
+class WriteBatch(ABC):
+    """
+    Abstract interface for writes committed together.
+
+    Writes are buffered in order and applied atomically by commit(): either
+    all of them land or none do, in a single round-trip.
+    """
+
+    @abstractmethod
+    def set(self, doc_ref: DocumentReference, data: Dict[str, Any], merge: bool = False) -> "WriteBatch":
+        """Buffer a set."""
+        pass
+
+    @abstractmethod
+    def create(self, doc_ref: DocumentReference, data: Dict[str, Any]) -> "WriteBatch":
+        """Buffer a create; the commit fails if the document exists."""
+        pass
+
+    @abstractmethod
+    def update(self, doc_ref: DocumentReference, data: Dict[str, Any]) -> "WriteBatch":
+        """Buffer an update; the commit fails if the document is missing."""
+        pass
+
+    @abstractmethod
+    def delete(self, doc_ref: DocumentReference) -> "WriteBatch":
+        """Buffer a delete."""
+        pass
+
+    @abstractmethod
+    def commit(self) -> None:
+        """
+        Apply the buffered writes atomically.
+
+        Raises:
+            DocumentAlreadyExistsError: If a created document exists
+        """
+        pass
+
+
+class Transaction(ABC):
+    """
+    Abstract interface for read-write transactions.
+
+    run(func) calls func(transaction); reads go through transaction.get and
+    must precede its writes, which are buffered and committed atomically
+    when func returns. If a document read by func changes before the commit,
+    func is run again, up to max_attempts times.
+    """
+
+    @abstractmethod
+    def get(self, doc_ref: DocumentReference) -> DocumentSnapshot:
+        """Read a document within the transaction."""
+        pass
+
+    @abstractmethod
+    def set(self, doc_ref: DocumentReference, data: Dict[str, Any], merge: bool = False) -> None:
+        """Buffer a set."""
+        pass
+
+    @abstractmethod
+    def create(self, doc_ref: DocumentReference, data: Dict[str, Any]) -> None:
+        """Buffer a create; the commit fails if the document exists."""
+        pass
+
+    @abstractmethod
+    def update(self, doc_ref: DocumentReference, data: Dict[str, Any]) -> None:
+        """Buffer an update; the commit fails if the document is missing."""
+        pass
+
+    @abstractmethod
+    def delete(self, doc_ref: DocumentReference) -> None:
+        """Buffer a delete."""
+        pass
+
+    @abstractmethod
+    def run(self, func: Callable[["Transaction"], T]) -> T:
+        """
+        Run func in the transaction and commit its writes.
+
+        Returns:
+            T: func's return value from the attempt that committed
+
+        Raises:
+            DocumentAlreadyExistsError: If a created document exists
+        """
+        pass
+
+
+class AsyncDatabaseClient(ABC):
+    """
+    Abstract asyncio interface for database operations.
+
+    Mirrors DatabaseClient, but every call that reaches the database is a
+    coroutine so callers await it directly instead of hopping to a thread.
+    """
+
+    @abstractmethod
+    def collection(self, name: str) -> "AsyncCollectionReference":
+        """Get a collection reference."""
+        pass
+
+
+class AsyncCollectionReference(ABC):
+    """Abstract asyncio interface for collection operations."""
+
+    @abstractmethod
+    def document(self, doc_id: str) -> "AsyncDocumentReference":
+        """Get a document reference."""
+        pass
+
+    @abstractmethod
+    async def add(self, data: Dict[str, Any]) -> "AsyncDocumentReference":
+        """Add a new document."""
+        pass
+
+    @abstractmethod
+    async def stream(self) -> List[DocumentSnapshot]:
+        """Stream all documents in the collection."""
+        pass
+
+    @abstractmethod
+    def where(self, field: str, op: str, value: Any) -> "AsyncQuery":
+        """Create a query with a where clause."""
+        pass
+
+    @abstractmethod
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "AsyncQuery":
+        """Create a query with ordering."""
+        pass
+
+
+class AsyncDocumentReference(ABC):
+    """Abstract asyncio interface for document operations."""
+
+    @abstractmethod
+    async def get(self) -> DocumentSnapshot:
+        """Get the document."""
+        pass
+
+    @abstractmethod
+    async def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        """Set document data."""
+        pass
+
+    @abstractmethod
+    async def create(self, data: Dict[str, Any]) -> None:
+        """
+        Create the document, failing atomically if it already exists.
+
+        Raises:
+            DocumentAlreadyExistsError: If the document exists
+        """
+        pass
+
+    @abstractmethod
+    async def update(self, data: Dict[str, Any]) -> None:
+        """Update document data."""
+        pass
+
+    @abstractmethod
+    async def delete(self) -> None:
+        """Delete the document."""
+        pass
+
+
+class AsyncQuery(ABC):
+    """Abstract asyncio interface for queries."""
+
+    @abstractmethod
+    def where(self, field: str, op: str, value: Any) -> "AsyncQuery":
+        """Add a where clause."""
+        pass
+
+    @abstractmethod
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "AsyncQuery":
+        """Add ordering."""
+        pass
+
+    @abstractmethod
+    def limit(self, count: int) -> "AsyncQuery":
+        """Limit results."""
+        pass
+
+    @abstractmethod
+    async def stream(self) -> List[DocumentSnapshot]:
+        """Execute query and return results."""
+        pass
+
+
 class ArrayUnion:
     """Abstract array union operation."""
 
@@ -5,8 +5,9 @@ Dependency injection container for managing database implementations.
 import os
 from typing import Optional
 
-from app.core.database import DatabaseClient, ArrayUnion, Increment
+from app.core.database import AsyncDatabaseClient, DatabaseClient, ArrayUnion, Increment
 from app.core.config import settings
+from app.core.llm_registry import LLMRegistry
 
 
 def get_database_client() -> DatabaseClient:
@@ -26,6 +27,28 @@ def get_database_client() -> DatabaseClient:
         return FirestoreClient(project_id=settings.firebase_project_id)
 
 
+def get_async_database_client() -> AsyncDatabaseClient:
+    """
+    Factory function to get the asyncio database client for the environment.
+
+    Returns:
+        AsyncDatabaseClient: Either AsyncFirestoreClient for production or an
+        AsyncMockClient sharing the mock data of get_db() for testing
+    """
+    environment = os.getenv('ENVIRONMENT', getattr(settings, 'environment', 'development'))
+
+    if environment == 'test':
+        from app.core.mock_impl import AsyncMockClient, MockClient
+        sync_client = get_db()
+        return AsyncMockClient(
+            project_id=settings.firebase_project_id,
+            sync_client=sync_client if isinstance(sync_client, MockClient) else None,
+        )
+    else:
+        from app.core.firestore_impl import AsyncFirestoreClient
+        return AsyncFirestoreClient(project_id=settings.firebase_project_id)
+
+
 def get_array_union(values: list) -> ArrayUnion:
     """
     Factory function to create ArrayUnion operations.
@@ -77,6 +100,30 @@ def reset_db():
     _db_client = None
 
 
+_async_db_client: Optional[AsyncDatabaseClient] = None
+
+
+def get_async_db() -> AsyncDatabaseClient:
+    """
+    Get singleton asyncio database client instance.
+
+    Returns:
+        AsyncDatabaseClient: The asyncio database client instance
+    """
+    global _async_db_client
+    if _async_db_client is None:
+        _async_db_client = get_async_database_client()
+    return _async_db_client
+
+
+def reset_async_db():
+    """
+    Reset the asyncio database client singleton. Useful for testing.
+    """
+    global _async_db_client
+    _async_db_client = None
+
+
 # FirestoreService dependency injection
 def get_firestore_service():
     """
@@ -86,4 +133,147 @@ def get_firestore_service():
         FirestoreService: Service instance with injected database client
     """
     from app.services.firestore_service import FirestoreService
-    return FirestoreService(db=get_db()) 
+    return FirestoreService(db=get_async_db())
+
+
+# LLM registry dependency injection
+_llm_registry: Optional[LLMRegistry] = None
+
+
+def get_llm_registry() -> LLMRegistry:
+    """
+    Get singleton LLM registry instance.
+
+    Returns:
+        LLMRegistry: Process-wide registry of shared Vertex AI model handles
+    """
+    global _llm_registry
+    if _llm_registry is None:
+        _llm_registry = LLMRegistry()
+    return _llm_registry
+
+
+def reset_llm_registry():
+    """
+    Reset the LLM registry singleton. Useful for testing.
+    """
+    global _llm_registry
+    _llm_registry = None
+
+
+# URL content cache dependency injection
+_url_cache = None
+
+
+def get_url_cache():
+    """
+    Get singleton URL content cache instance.
+
+    Returns:
+        Optional[URLContentCache]: Shared relevant-link cache, or None when
+        url_cache_enabled is off
+    """
+    global _url_cache
+    if _url_cache is None and settings.url_cache_enabled:
+        from app.utils.url_cache import URLContentCache
+        _url_cache = URLContentCache(
+            max_entries=settings.url_cache_max_entries,
+            ttl_seconds=settings.url_cache_ttl_seconds,
+            sqlite_path=settings.url_cache_sqlite_path,
+        )
+    return _url_cache
+
+
+def reset_url_cache():
+    """
+    Reset the URL content cache singleton. Useful for testing.
+    """
+    global _url_cache
+    _url_cache = None
+
+
+# Shared HTTP client dependency injection
+_http_client = None
+
+
+def get_http_client():
+    """
+    Get singleton pooled HTTP client instance.
+
+    Returns:
+        SharedHTTPClient: Process-wide client used for outbound web requests
+    """
+    global _http_client
+    if _http_client is None:
+        from app.core.http_client import build_shared_http_client
+        _http_client = build_shared_http_client()
+    return _http_client
+
+
+async def close_http_client():
+    """
+    Close and reset the pooled HTTP client. Called on application shutdown.
+    """
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+
+
+# OrchestratorAgent dependency injection
+_orchestrator_agent = None
+
+
+def get_orchestrator_agent():
+    """
+    Get singleton OrchestratorAgent instance.
+
+    The orchestrator and its agents are built once per process with the shared
+    database client and LLM registry instead of once per request.
+
+    Returns:
+        OrchestratorAgent: Shared orchestrator instance
+    """
+    global _orchestrator_agent
+    if _orchestrator_agent is None:
+        from app.agents.orchestrator_agent import OrchestratorAgent
+        _orchestrator_agent = OrchestratorAgent(
+            db=get_db(), llm_registry=get_llm_registry()
+        )
+    return _orchestrator_agent
+
+
+def reset_orchestrator_agent():
+    """
+    Reset the OrchestratorAgent singleton. Useful for testing.
+    """
+    global _orchestrator_agent
+    _orchestrator_agent = None
+
+
+# CPU-bound task process pool dependency injection
+_process_pool = None
+
+
+def get_process_pool():
+    """
+    Get singleton process pool service instance.
+
+    Returns:
+        ProcessPoolService: Process-wide pool for PDF rendering and HTML parsing
+    """
+    global _process_pool
+    if _process_pool is None:
+        from app.core.process_pool import ProcessPoolService
+        _process_pool = ProcessPoolService()
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """
+    Shut down and reset the process pool. Called on application shutdown.
+    """
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown()
+    _process_pool = None
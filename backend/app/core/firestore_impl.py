@@ -1,13 +1,41 @@
 """
-Firestore implementation of the database interface.
+Firestore implementations of the database interfaces.
+
+FirestoreClient wraps the synchronous SDK; AsyncFirestoreClient wraps the
+SDK's AsyncClient so asyncio callers await Firestore directly. Every call
+that reaches Firestore is timed into the firestore_operation_duration_seconds
+metric, labelled by collection.
 """
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar, Union
 
 from app.core.database import (
     DatabaseClient, CollectionReference, DocumentReference, 
-    DocumentSnapshot, Query, ArrayUnion, Increment
+    DocumentSnapshot, Query, ArrayUnion, Increment, DocumentAlreadyExistsError,
+    WriteBatch, Transaction,
+    AsyncDatabaseClient, AsyncCollectionReference, AsyncDocumentReference, AsyncQuery
 )
+from app.core.metrics import time_firestore_operation
+
+T = TypeVar("T")
+
+
+def _convert_operations(firestore_module, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert abstract operations to Firestore operations."""
+    converted = {}
+    for key, value in data.items():
+        if isinstance(value, ArrayUnion):
+            converted[key] = firestore_module.ArrayUnion(value.values)
+        elif isinstance(value, Increment):
+            converted[key] = firestore_module.Increment(value.value)
+        else:
+            converted[key] = value
+    return converted
+
+
+def _collections_label(names: Iterable[str]) -> str:
+    """Metric label for a multi-document operation: its collections, sorted."""
+    return ",".join(sorted(set(names))) or "unknown"
 
 
 class FirestoreClient(DatabaseClient):
@@ -24,85 +52,108 @@ class FirestoreClient(DatabaseClient):
         """Get a collection reference."""
         return FirestoreCollectionReference(
             self._client.collection(name), 
-            self._firestore
+            self._firestore,
+            name,
         )
 
+    def batch(self) -> "FirestoreWriteBatch":
+        """Start a batch of writes committed atomically."""
+        return FirestoreWriteBatch(self._client.batch(), self._firestore)
+
+    def transaction(self, max_attempts: int = 5) -> "FirestoreTransaction":
+        """Start a read-write transaction."""
+        return FirestoreTransaction(self._client, self._firestore, max_attempts)
+
 
 class FirestoreCollectionReference(CollectionReference):
     """Firestore implementation of CollectionReference."""
 
-    def __init__(self, collection_ref, firestore_module):
+    def __init__(self, collection_ref, firestore_module, name: Optional[str] = None):
         self._collection_ref = collection_ref
         self._firestore = firestore_module
+        self.name = name or collection_ref.id
 
     def document(self, doc_id: str) -> "FirestoreDocumentReference":
         """Get a document reference."""
         return FirestoreDocumentReference(
             self._collection_ref.document(doc_id),
-            self._firestore
+            self._firestore,
+            self.name,
         )
 
     def add(self, data: Dict[str, Any]) -> "FirestoreDocumentReference":
         """Add a new document."""
-        doc_ref = self._collection_ref.add(data)[1]
-        return FirestoreDocumentReference(doc_ref, self._firestore)
+        with time_firestore_operation(self.name, "add"):
+            doc_ref = self._collection_ref.add(data)[1]
+        return FirestoreDocumentReference(doc_ref, self._firestore, self.name)
 
     def stream(self) -> List["FirestoreDocumentSnapshot"]:
         """Stream all documents in the collection."""
-        docs = self._collection_ref.stream()
+        with time_firestore_operation(self.name, "stream"):
+            docs = list(self._collection_ref.stream())
         return [FirestoreDocumentSnapshot(doc) for doc in docs]
 
     def where(self, field: str, op: str, value: Any) -> "FirestoreQuery":
         """Create a query with a where clause."""
         query = self._collection_ref.where(field, op, value)
-        return FirestoreQuery(query)
+        return FirestoreQuery(query, self.name)
 
     def order_by(self, field: str, direction: str = "ASCENDING") -> "FirestoreQuery":
         """Create a query with ordering."""
         direction_enum = getattr(self._firestore.Query, direction)
         query = self._collection_ref.order_by(field, direction=direction_enum)
-        return FirestoreQuery(query)
+        return FirestoreQuery(query, self.name)
 
 
 class FirestoreDocumentReference(DocumentReference):
     """Firestore implementation of DocumentReference."""
 
-    def __init__(self, doc_ref, firestore_module):
+    def __init__(self, doc_ref, firestore_module, collection_name: Optional[str] = None):
         self._doc_ref = doc_ref
         self._firestore = firestore_module
+        self._collection_name = collection_name or doc_ref.parent.id
 
     def get(self) -> "FirestoreDocumentSnapshot":
         """Get the document."""
-        doc = self._doc_ref.get()
+        with time_firestore_operation(self._collection_name, "get"):
+            doc = self._doc_ref.get()
         return FirestoreDocumentSnapshot(doc)
 
     def set(self, data: Dict[str, Any], merge: bool = False) -> None:
         """Set document data."""
         # Convert our abstract operations to Firestore operations
         converted_data = self._convert_operations(data)
-        self._doc_ref.set(converted_data, merge=merge)
+        with time_firestore_operation(self._collection_name, "set"):
+            self._doc_ref.set(converted_data, merge=merge)
+
+    def create(self, data: Dict[str, Any]) -> None:
+        """Create the document; raises DocumentAlreadyExistsError if it exists."""
+        from google.api_core.exceptions import Conflict
+
+        converted_data = self._convert_operations(data)
+        with time_firestore_operation(self._collection_name, "create"):
+            try:
+                self._doc_ref.create(converted_data)
+            except Conflict as e:
+                raise DocumentAlreadyExistsError(
+                    f"Document {self._doc_ref.id} already exists in {self._collection_name}"
+                ) from e
 
     def update(self, data: Dict[str, Any]) -> None:
         """Update document data."""
         # Convert our abstract operations to Firestore operations
         converted_data = self._convert_operations(data)
-        self._doc_ref.update(converted_data)
+        with time_firestore_operation(self._collection_name, "update"):
+            self._doc_ref.update(converted_data)
 
     def delete(self) -> None:
         """Delete the document."""
-        self._doc_ref.delete()
+        with time_firestore_operation(self._collection_name, "delete"):
+            self._doc_ref.delete()
 
     def _convert_operations(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert abstract operations to Firestore operations."""
-        converted = {}
-        for key, value in data.items():
-            if isinstance(value, ArrayUnion):
-                converted[key] = self._firestore.ArrayUnion(value.values)
-            elif isinstance(value, Increment):
-                converted[key] = self._firestore.Increment(value.value)
-            else:
-                converted[key] = value
-        return converted
+        return _convert_operations(self._firestore, data)
 
 
 class FirestoreDocumentSnapshot(DocumentSnapshot):
@@ -129,27 +180,268 @@ class FirestoreDocumentSnapshot(DocumentSnapshot):
 class FirestoreQuery(Query):
     """Firestore implementation of Query."""
 
-    def __init__(self, query):
+    def __init__(self, query, collection_name: str = "unknown"):
         self._query = query
+        self._collection_name = collection_name
 
     def where(self, field: str, op: str, value: Any) -> "FirestoreQuery":
         """Add a where clause."""
         new_query = self._query.where(field, op, value)
-        return FirestoreQuery(new_query)
+        return FirestoreQuery(new_query, self._collection_name)
 
     def order_by(self, field: str, direction: str = "ASCENDING") -> "FirestoreQuery":
         """Add ordering."""
         from google.cloud import firestore
         direction_enum = getattr(firestore.Query, direction)
         new_query = self._query.order_by(field, direction=direction_enum)
-        return FirestoreQuery(new_query)
+        return FirestoreQuery(new_query, self._collection_name)
 
     def limit(self, count: int) -> "FirestoreQuery":
         """Limit results."""
         new_query = self._query.limit(count)
-        return FirestoreQuery(new_query)
+        return FirestoreQuery(new_query, self._collection_name)
 
     def stream(self) -> List[FirestoreDocumentSnapshot]:
         """Execute query and return results."""
-        docs = self._query.stream()
-        return [FirestoreDocumentSnapshot(doc) for doc in docs] 
+        with time_firestore_operation(self._collection_name, "query"):
+            docs = list(self._query.stream())
+        return [FirestoreDocumentSnapshot(doc) for doc in docs]
+
+
+class FirestoreWriteBatch(WriteBatch):
+    """Firestore implementation of WriteBatch."""
+
+    def __init__(self, batch, firestore_module):
+        self._batch = batch
+        self._firestore = firestore_module
+        self._collections: List[str] = []
+
+    def set(
+        self, doc_ref: FirestoreDocumentReference, data: Dict[str, Any], merge: bool = False
+    ) -> "FirestoreWriteBatch":
+        """Buffer a set."""
+        self._batch.set(doc_ref._doc_ref, _convert_operations(self._firestore, data), merge=merge)
+        self._collections.append(doc_ref._collection_name)
+        return self
+
+    def create(self, doc_ref: FirestoreDocumentReference, data: Dict[str, Any]) -> "FirestoreWriteBatch":
+        """Buffer a create; the commit fails if the document exists."""
+        self._batch.create(doc_ref._doc_ref, _convert_operations(self._firestore, data))
+        self._collections.append(doc_ref._collection_name)
+        return self
+
+    def update(self, doc_ref: FirestoreDocumentReference, data: Dict[str, Any]) -> "FirestoreWriteBatch":
+        """Buffer an update; the commit fails if the document is missing."""
+        self._batch.update(doc_ref._doc_ref, _convert_operations(self._firestore, data))
+        self._collections.append(doc_ref._collection_name)
+        return self
+
+    def delete(self, doc_ref: FirestoreDocumentReference) -> "FirestoreWriteBatch":
+        """Buffer a delete."""
+        self._batch.delete(doc_ref._doc_ref)
+        self._collections.append(doc_ref._collection_name)
+        return self
+
+    def commit(self) -> None:
+        """Apply the buffered writes atomically."""
+        from google.api_core.exceptions import Conflict
+
+        with time_firestore_operation(_collections_label(self._collections), "batch_commit"):
+            try:
+                self._batch.commit()
+            except Conflict as e:
+                raise DocumentAlreadyExistsError(str(e)) from e
+
+
+class FirestoreTransaction(Transaction):
+    """Firestore implementation of Transaction, retried by firestore.transactional."""
+
+    def __init__(self, client, firestore_module, max_attempts: int = 5):
+        self._client = client
+        self._firestore = firestore_module
+        self._max_attempts = max_attempts
+        self._transaction = None
+        self._collections: List[str] = []
+
+    def get(self, doc_ref: FirestoreDocumentReference) -> FirestoreDocumentSnapshot:
+        """Read a document within the transaction."""
+        self._collections.append(doc_ref._collection_name)
+        return FirestoreDocumentSnapshot(doc_ref._doc_ref.get(transaction=self._transaction))
+
+    def set(self, doc_ref: FirestoreDocumentReference, data: Dict[str, Any], merge: bool = False) -> None:
+        """Buffer a set."""
+        self._collections.append(doc_ref._collection_name)
+        self._transaction.set(doc_ref._doc_ref, _convert_operations(self._firestore, data), merge=merge)
+
+    def create(self, doc_ref: FirestoreDocumentReference, data: Dict[str, Any]) -> None:
+        """Buffer a create; the commit fails if the document exists."""
+        self._collections.append(doc_ref._collection_name)
+        self._transaction.create(doc_ref._doc_ref, _convert_operations(self._firestore, data))
+
+    def update(self, doc_ref: FirestoreDocumentReference, data: Dict[str, Any]) -> None:
+        """Buffer an update; the commit fails if the document is missing."""
+        self._collections.append(doc_ref._collection_name)
+        self._transaction.update(doc_ref._doc_ref, _convert_operations(self._firestore, data))
+
+    def delete(self, doc_ref: FirestoreDocumentReference) -> None:
+        """Buffer a delete."""
+        self._collections.append(doc_ref._collection_name)
+        self._transaction.delete(doc_ref._doc_ref)
+
+    def run(self, func: Callable[[Transaction], T]) -> T:
+        """Run func in the transaction and commit its writes."""
+        from google.api_core.exceptions import Conflict
+
+        @self._firestore.transactional
+        def attempt(transaction):
+            self._transaction = transaction
+            self._collections = []
+            return func(self)
+
+        with time_firestore_operation("unknown", "transaction") as observed:
+            try:
+                return attempt(self._client.transaction(max_attempts=self._max_attempts))
+            except Conflict as e:
+                raise DocumentAlreadyExistsError(str(e)) from e
+            finally:
+                observed["collection"] = _collections_label(self._collections)
+
+
+class AsyncFirestoreClient(AsyncDatabaseClient):
+    """Firestore AsyncClient implementation of AsyncDatabaseClient."""
+
+    def __init__(self, project_id: Optional[str] = None):
+        # Only import when actually needed (lazy loading)
+        from google.cloud import firestore
+
+        self._client = firestore.AsyncClient(project=project_id)
+        self._firestore = firestore  # Keep reference for operations
+
+    def collection(self, name: str) -> "AsyncFirestoreCollectionReference":
+        """Get a collection reference."""
+        return AsyncFirestoreCollectionReference(
+            self._client.collection(name),
+            self._firestore,
+            name,
+        )
+
+
+class AsyncFirestoreCollectionReference(AsyncCollectionReference):
+    """Firestore AsyncClient implementation of AsyncCollectionReference."""
+
+    def __init__(self, collection_ref, firestore_module, name: Optional[str] = None):
+        self._collection_ref = collection_ref
+        self._firestore = firestore_module
+        self.name = name or collection_ref.id
+
+    def document(self, doc_id: str) -> "AsyncFirestoreDocumentReference":
+        """Get a document reference."""
+        return AsyncFirestoreDocumentReference(
+            self._collection_ref.document(doc_id),
+            self._firestore,
+            self.name,
+        )
+
+    async def add(self, data: Dict[str, Any]) -> "AsyncFirestoreDocumentReference":
+        """Add a new document."""
+        with time_firestore_operation(self.name, "add"):
+            _, doc_ref = await self._collection_ref.add(_convert_operations(self._firestore, data))
+        return AsyncFirestoreDocumentReference(doc_ref, self._firestore, self.name)
+
+    async def stream(self) -> List[FirestoreDocumentSnapshot]:
+        """Stream all documents in the collection."""
+        with time_firestore_operation(self.name, "stream"):
+            docs = [doc async for doc in self._collection_ref.stream()]
+        return [FirestoreDocumentSnapshot(doc) for doc in docs]
+
+    def where(self, field: str, op: str, value: Any) -> "AsyncFirestoreQuery":
+        """Create a query with a where clause."""
+        query = self._collection_ref.where(field, op, value)
+        return AsyncFirestoreQuery(query, self._firestore, self.name)
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "AsyncFirestoreQuery":
+        """Create a query with ordering."""
+        direction_enum = getattr(self._firestore.Query, direction)
+        query = self._collection_ref.order_by(field, direction=direction_enum)
+        return AsyncFirestoreQuery(query, self._firestore, self.name)
+
+
+class AsyncFirestoreDocumentReference(AsyncDocumentReference):
+    """Firestore AsyncClient implementation of AsyncDocumentReference."""
+
+    def __init__(self, doc_ref, firestore_module, collection_name: Optional[str] = None):
+        self._doc_ref = doc_ref
+        self._firestore = firestore_module
+        self._collection_name = collection_name or doc_ref.parent.id
+
+    @property
+    def id(self) -> str:
+        """Get document ID."""
+        return self._doc_ref.id
+
+    async def get(self) -> FirestoreDocumentSnapshot:
+        """Get the document."""
+        with time_firestore_operation(self._collection_name, "get"):
+            doc = await self._doc_ref.get()
+        return FirestoreDocumentSnapshot(doc)
+
+    async def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        """Set document data."""
+        converted_data = _convert_operations(self._firestore, data)
+        with time_firestore_operation(self._collection_name, "set"):
+            await self._doc_ref.set(converted_data, merge=merge)
+
+    async def create(self, data: Dict[str, Any]) -> None:
+        """Create the document; raises DocumentAlreadyExistsError if it exists."""
+        from google.api_core.exceptions import Conflict
+
+        converted_data = _convert_operations(self._firestore, data)
+        with time_firestore_operation(self._collection_name, "create"):
+            try:
+                await self._doc_ref.create(converted_data)
+            except Conflict as e:
+                raise DocumentAlreadyExistsError(
+                    f"Document {self._doc_ref.id} already exists in {self._collection_name}"
+                ) from e
+
+    async def update(self, data: Dict[str, Any]) -> None:
+        """Update document data."""
+        converted_data = _convert_operations(self._firestore, data)
+        with time_firestore_operation(self._collection_name, "update"):
+            await self._doc_ref.update(converted_data)
+
+    async def delete(self) -> None:
+        """Delete the document."""
+        with time_firestore_operation(self._collection_name, "delete"):
+            await self._doc_ref.delete()
+
+
+class AsyncFirestoreQuery(AsyncQuery):
+    """Firestore AsyncClient implementation of AsyncQuery."""
+
+    def __init__(self, query, firestore_module, collection_name: str = "unknown"):
+        self._query = query
+        self._firestore = firestore_module
+        self._collection_name = collection_name
+
+    def where(self, field: str, op: str, value: Any) -> "AsyncFirestoreQuery":
+        """Add a where clause."""
+        new_query = self._query.where(field, op, value)
+        return AsyncFirestoreQuery(new_query, self._firestore, self._collection_name)
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "AsyncFirestoreQuery":
+        """Add ordering."""
+        direction_enum = getattr(self._firestore.Query, direction)
+        new_query = self._query.order_by(field, direction=direction_enum)
+        return AsyncFirestoreQuery(new_query, self._firestore, self._collection_name)
+
+    def limit(self, count: int) -> "AsyncFirestoreQuery":
+        """Limit results."""
+        new_query = self._query.limit(count)
+        return AsyncFirestoreQuery(new_query, self._firestore, self._collection_name)
+
+    async def stream(self) -> List[FirestoreDocumentSnapshot]:
+        """Execute query and return results."""
+        with time_firestore_operation(self._collection_name, "query"):
+            docs = [doc async for doc in self._query.stream()]
+        return [FirestoreDocumentSnapshot(doc) for doc in docs]
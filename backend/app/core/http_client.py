@@ -0,0 +1,149 @@
+"""
+Shared async HTTP client for outbound web requests.
+
+Wraps a single pooled httpx.AsyncClient (keep-alive, optional HTTP/2) with
+per-host concurrency limits. The client is created lazily on first use and
+closed from the application lifespan.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class SharedHTTPClient:
+    """
+    Lifecycle-managed pooled HTTP client.
+
+    httpx pools connections globally, so per-host limits are enforced with a
+    semaphore per host on top of the pool limits.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_connections_per_host: int = 6,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.http2 = _http2_available()
+        self.transport = transport
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.timeout),
+            headers=self.headers,
+            follow_redirects=True,
+            http2=self.http2,
+            transport=self.transport,
+        )
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Return the pooled client, creating it on first use.
+
+        The pool belongs to the event loop it was created on; a new loop
+        (e.g. a fresh test loop) gets a new client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = self._build_client()
+            self._loop = loop
+            self._host_limits = {}
+            logger.info(
+                f"SharedHTTPClient: Created pooled client (http2={self.http2}, "
+                f"max_connections={self.max_connections}, per_host={self.max_connections_per_host})"
+            )
+        return self._client
+
+    @contextlib.asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the per-host connection slots for the URL's host."""
+        host = urlparse(url).netloc.lower()
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, self.max_connections_per_host))
+            self._host_limits[host] = semaphore
+        async with semaphore:
+            yield
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """Open a streaming request within the URL's per-host limit."""
+        client = self.get_client()
+        request_timeout = (
+            httpx.Timeout(timeout) if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        )
+        async with self.host_slot(url):
+            async with client.stream(
+                method, url, headers=headers, timeout=request_timeout
+            ) as response:
+                yield response
+
+    async def aclose(self) -> None:
+        """Close the pooled client and its connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("SharedHTTPClient: Closed pooled client")
+        self._client = None
+        self._loop = None
+        self._host_limits = {}
+
+    def get_status(self) -> Dict[str, object]:
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_connections_per_host": self.max_connections_per_host,
+            "hosts": len(self._host_limits),
+        }
+
+
+def build_shared_http_client() -> SharedHTTPClient:
+    """Build the shared client from application settings."""
+    return SharedHTTPClient(
+        max_connections=settings.http_client_max_connections,
+        max_keepalive_connections=settings.http_client_max_keepalive_connections,
+        max_connections_per_host=settings.http_client_max_connections_per_host,
+        keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+    )
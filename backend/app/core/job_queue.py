@@ -0,0 +1,472 @@
+"""
+Lease-based background job queue stored in the jobs collection.
+
+API processes enqueue jobs and return the job id immediately; JobWorker
+processes (``python -m app.worker``) claim them and run the registered
+handler. A claim is a transaction that re-reads the job, creates a lease
+document named after the job and attempt number in the job_leases
+collection and records the worker on the job, so exactly one worker wins
+each attempt on Firestore and on the in-process MockClient alike and a
+failed claim leaves nothing behind. The winner must heartbeat before the
+lease lapses; a job whose lease lapses (crashed or stuck worker) is claimed
+again as the next attempt until max_attempts is reached. Heartbeats,
+completion and failure check the lease and write in one transaction, so a
+worker whose lease lapsed cannot overwrite the attempt that replaced it.
+
+Delivery is at-least-once: handlers should tolerate a job being re-run
+after a lease expiry.
+"""
+
+import asyncio
+import contextlib
+import logging
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.constants import Collections
+from app.core.database import DatabaseClient, DocumentAlreadyExistsError, Transaction
+from app.models.firestore_models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, Optional[str]], Awaitable[None]]
+
+
+class LeaseLostError(Exception):
+    """Raised when a worker no longer holds the lease on a job it is running."""
+
+
+class ClaimedJob:
+    """A job leased to one worker for one attempt."""
+
+    def __init__(self, job_id: str, data: Dict[str, Any], worker_id: str, attempt: int):
+        self.id = job_id
+        self.data = data
+        self.worker_id = worker_id
+        self.attempt = attempt
+
+    @property
+    def job_type(self) -> str:
+        return self.data.get("job_type", "")
+
+    @property
+    def user_uid(self) -> str:
+        return self.data.get("user_uid", "")
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        return self.data.get("payload") or {}
+
+
+JobHandler = Callable[[ClaimedJob, ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+
+class JobQueue:
+    """
+    Job queue over a DatabaseClient.
+
+    Args:
+        db: Database client holding the jobs and job_leases collections
+        lease_seconds: Lease granted on claim and on every heartbeat
+        max_attempts: Claims allowed per job before it is marked failed
+    """
+
+    def __init__(
+        self,
+        db: DatabaseClient,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.db = db
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.max_attempts = max_attempts or settings.job_max_attempts
+
+    def _job_ref(self, job_id: str):
+        return self.db.collection(Collections.JOBS).document(job_id)
+
+    async def enqueue(
+        self,
+        job_type: str,
+        user_uid: str,
+        payload: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+        unique: bool = False,
+    ) -> str:
+        """
+        Store a pending job and return its id.
+
+        With unique=True and an explicit job_id, an existing job with that
+        id is left untouched, so repeated enqueues of the same work are
+        idempotent.
+        """
+        job_id = job_id or str(uuid.uuid4())
+        now = _now()
+        job = Job(
+            id=job_id,
+            job_type=job_type,
+            status=JobStatus.PENDING,
+            user_uid=user_uid,
+            created_at=now,
+            updated_at=now,
+            metadata=metadata or {},
+            payload=payload,
+            max_attempts=self.max_attempts,
+        )
+        data = job.model_dump(exclude_none=True, exclude={"id"})
+        data["status"] = JobStatus.PENDING.value
+        if unique:
+            try:
+                await asyncio.to_thread(self._job_ref(job_id).create, data)
+            except DocumentAlreadyExistsError:
+                pass
+        else:
+            await asyncio.to_thread(self._job_ref(job_id).set, data)
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        doc = await asyncio.to_thread(self._job_ref(job_id).get)
+        return doc.to_dict() if doc.exists else None
+
+    def _candidates(self, limit: int) -> List[Any]:
+        jobs = self.db.collection(Collections.JOBS)
+        pending = (
+            jobs.where("status", "==", JobStatus.PENDING.value)
+            .order_by("created_at")
+            .limit(limit)
+            .stream()
+        )
+        expired = (
+            jobs.where("status", "==", JobStatus.IN_PROGRESS.value)
+            .where("lease_expires_at", "<", _now())
+            .limit(limit)
+            .stream()
+        )
+        return list(pending) + list(expired)
+
+    async def claim(
+        self, worker_id: str, job_types: Optional[Iterable[str]] = None, scan: int = 10
+    ) -> Optional[ClaimedJob]:
+        """
+        Lease the oldest claimable job: pending, or in progress with a
+        lapsed lease.
+
+        Args:
+            worker_id: Identity recorded on the job while the lease is held
+            job_types: Only claim these job types (default: any)
+            scan: Candidates examined per call
+
+        Returns:
+            Optional[ClaimedJob]: The claimed job, or None if none is available
+        """
+        allowed = set(job_types) if job_types is not None else None
+        for doc in await asyncio.to_thread(self._candidates, scan):
+            data = doc.to_dict() or {}
+            if allowed is not None and data.get("job_type") not in allowed:
+                continue
+            attempt = int(data.get("attempts") or 0) + 1
+            max_attempts = int(data.get("max_attempts") or self.max_attempts)
+            if attempt > max_attempts:
+                await self._expire(doc.id, data)
+                continue
+
+            try:
+                claimed = await asyncio.to_thread(
+                    self.db.transaction().run,
+                    lambda transaction: self._claim_attempt(transaction, doc.id, attempt, worker_id),
+                )
+            except DocumentAlreadyExistsError:
+                continue  # Another worker won this attempt
+            if claimed is None:
+                continue  # Claimed or finished since it was listed
+
+            data = claimed
+            if attempt > 1:
+                logger.warning(f"JobQueue: Re-claimed job {doc.id} (attempt {attempt}) for {worker_id}")
+            return ClaimedJob(doc.id, data, worker_id, attempt)
+        return None
+
+    def _claim_attempt(
+        self, transaction: Transaction, job_id: str, attempt: int, worker_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Lease attempt `attempt` of a job if it is still claimable; runs in a transaction."""
+        job_ref = self._job_ref(job_id)
+        data = transaction.get(job_ref).to_dict() or {}
+        status = data.get("status")
+        now = _now()
+        lease_expires_at = data.get("lease_expires_at")
+        claimable = status == JobStatus.PENDING.value or (
+            status == JobStatus.IN_PROGRESS.value
+            and lease_expires_at is not None
+            and lease_expires_at < now
+        )
+        if not claimable or int(data.get("attempts") or 0) + 1 != attempt:
+            return None
+
+        update = {
+            "status": JobStatus.IN_PROGRESS.value,
+            "attempts": attempt,
+            "worker_id": worker_id,
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+            "heartbeat_at": now,
+            "updated_at": now,
+        }
+        if not data.get("started_at"):
+            update["started_at"] = now
+        transaction.create(
+            self.db.collection(Collections.JOB_LEASES).document(f"{job_id}-{attempt}"),
+            {"job_id": job_id, "attempt": attempt, "worker_id": worker_id, "claimed_at": now},
+        )
+        transaction.update(job_ref, update)
+        data.update(update)
+        return data
+
+    async def _expire(self, job_id: str, data: Dict[str, Any]) -> None:
+        now = _now()
+        await asyncio.to_thread(
+            self._job_ref(job_id).update,
+            {
+                "status": JobStatus.FAILED.value,
+                "error_message": data.get("error_message")
+                or f"Job lease expired after {data.get('attempts')} attempts",
+                "lease_expires_at": None,
+                "completed_at": now,
+                "updated_at": now,
+            },
+        )
+        logger.error(f"JobQueue: Job {job_id} failed after exhausting its attempts")
+
+    def _update_leased(
+        self, transaction: Transaction, job: ClaimedJob, update: Dict[str, Any]
+    ) -> None:
+        """Apply update to a job only while job's lease is held; runs in a transaction."""
+        job_ref = self._job_ref(job.id)
+        snapshot = transaction.get(job_ref)
+        data = snapshot.to_dict() if snapshot.exists else None
+        if (
+            data is None
+            or data.get("status") != JobStatus.IN_PROGRESS.value
+            or data.get("worker_id") != job.worker_id
+            or data.get("attempts") != job.attempt
+        ):
+            raise LeaseLostError(f"Worker {job.worker_id} no longer holds job {job.id}")
+        transaction.update(job_ref, update)
+
+    async def _write_leased(self, job: ClaimedJob, update: Dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            self.db.transaction().run,
+            lambda transaction: self._update_leased(transaction, job, update),
+        )
+
+    async def heartbeat(
+        self, job: ClaimedJob, progress: Optional[int] = None, message: Optional[str] = None
+    ) -> None:
+        """
+        Extend the lease and optionally record progress.
+
+        Raises:
+            LeaseLostError: If the job was re-claimed, cancelled or finished
+        """
+        now = _now()
+        update: Dict[str, Any] = {
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+            "heartbeat_at": now,
+            "updated_at": now,
+        }
+        if progress is not None:
+            update["progress"] = max(0, min(100, int(progress)))
+        if message is not None:
+            update["progress_message"] = message[:500]
+        await self._write_leased(job, update)
+
+    async def complete(
+        self,
+        job: ClaimedJob,
+        result: Optional[Dict[str, Any]] = None,
+        business_case_id: Optional[str] = None,
+    ) -> None:
+        """
+        Mark a leased job completed.
+
+        Raises:
+            LeaseLostError: If the job was re-claimed, cancelled or finished
+        """
+        now = _now()
+        update: Dict[str, Any] = {
+            "status": JobStatus.COMPLETED.value,
+            "progress": 100,
+            "result": result,
+            "lease_expires_at": None,
+            "completed_at": now,
+            "updated_at": now,
+        }
+        if business_case_id:
+            update["business_case_id"] = business_case_id
+        await self._write_leased(job, update)
+
+    async def fail(self, job: ClaimedJob, error: str, retry: bool = True) -> JobStatus:
+        """
+        Release a leased job after a failure.
+
+        Args:
+            job: The failed job
+            error: Error message recorded on the job
+            retry: Re-queue the job if it has attempts left
+
+        Returns:
+            JobStatus: PENDING if re-queued, otherwise FAILED
+
+        Raises:
+            LeaseLostError: If the job was re-claimed, cancelled or finished
+        """
+        now = _now()
+        max_attempts = int(job.data.get("max_attempts") or self.max_attempts)
+        status = JobStatus.PENDING if retry and job.attempt < max_attempts else JobStatus.FAILED
+        update: Dict[str, Any] = {
+            "status": status.value,
+            "error_message": error[:1000],
+            "worker_id": None,
+            "lease_expires_at": None,
+            "updated_at": now,
+        }
+        if status == JobStatus.FAILED:
+            update["completed_at"] = now
+        await self._write_leased(job, update)
+        return status
+
+
+class JobWorker:
+    """
+    Claims jobs from a JobQueue and runs their handlers.
+
+    Handlers are called as ``await handler(job, progress)`` where
+    ``await progress(percent, message)`` records progress and extends the
+    lease. A handler returning {"status": "error"} fails the job without
+    retry; an exception is retried while attempts remain. The lease is also
+    extended in the background every heartbeat_seconds, and the handler is
+    cancelled if the lease is lost.
+
+    Args:
+        queue: Job queue to claim from
+        handlers: Handler per job type; only these types are claimed
+        worker_id: Identity recorded on claimed jobs
+        concurrency: Jobs run at once
+        poll_interval: Idle wait between claim attempts
+        heartbeat_seconds: Background lease renewal interval
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        heartbeat_seconds: Optional[float] = None,
+    ):
+        self.queue = queue
+        self.handlers = dict(handlers)
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = max(1, concurrency or settings.job_worker_concurrency)
+        self.poll_interval = (
+            poll_interval if poll_interval is not None else settings.job_poll_interval_seconds
+        )
+        self.heartbeat_seconds = heartbeat_seconds or settings.job_heartbeat_seconds
+
+    async def run_once(self) -> bool:
+        """Claim and run one job to completion. Returns False if none was available."""
+        job = await self.queue.claim(self.worker_id, self.handlers)
+        if job is None:
+            return False
+        await self._process(job)
+        return True
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Claim and run jobs until stop is set, then wait for in-flight jobs."""
+        stop = stop or asyncio.Event()
+        tasks: set = set()
+        logger.info(f"JobWorker {self.worker_id}: Started (concurrency {self.concurrency})")
+        try:
+            while not stop.is_set():
+                job = None
+                if len(tasks) < self.concurrency:
+                    try:
+                        job = await self.queue.claim(self.worker_id, self.handlers)
+                    except Exception as e:
+                        logger.error(f"JobWorker {self.worker_id}: Claim failed: {e}")
+                if job is not None:
+                    task = asyncio.create_task(self._process(job))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    continue
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for task in tasks:
+                task.cancel()
+            logger.info(f"JobWorker {self.worker_id}: Stopped")
+
+    async def _heartbeat(self, job: ClaimedJob, handler_task: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.queue.heartbeat(job)
+            except LeaseLostError:
+                logger.warning(f"JobWorker {self.worker_id}: Lost lease on job {job.id}")
+                handler_task.cancel()
+                return
+            except Exception as e:
+                logger.warning(f"JobWorker {self.worker_id}: Heartbeat for job {job.id} failed: {e}")
+
+    async def _process(self, job: ClaimedJob) -> None:
+        handler = self.handlers[job.job_type]
+
+        async def progress(percent: int, message: Optional[str] = None) -> None:
+            await self.queue.heartbeat(job, progress=percent, message=message)
+
+        handler_task = asyncio.create_task(handler(job, progress))
+        heartbeat_task = asyncio.create_task(self._heartbeat(job, handler_task))
+        try:
+            result = await handler_task
+        except asyncio.CancelledError:
+            if heartbeat_task.done() and not heartbeat_task.cancelled():
+                return  # Lease lost: the job belongs to another attempt now
+            raise
+        except Exception as e:
+            logger.error(f"JobWorker {self.worker_id}: Job {job.id} raised: {e}")
+            try:
+                await self.queue.fail(job, str(e), retry=True)
+            except LeaseLostError:
+                pass
+            except Exception as release_error:
+                logger.error(
+                    f"JobWorker {self.worker_id}: Could not release job {job.id}: {release_error}"
+                )
+            return
+        finally:
+            heartbeat_task.cancel()
+
+        try:
+            if isinstance(result, dict) and result.get("status") == "error":
+                await self.queue.fail(job, result.get("message") or "Job failed", retry=False)
+            else:
+                result = result if isinstance(result, dict) else {"result": result}
+                await self.queue.complete(job, result=result, business_case_id=result.get("case_id"))
+        except LeaseLostError:
+            logger.warning(f"JobWorker {self.worker_id}: Finished job {job.id} after losing its lease")
+        except Exception as e:
+            # The job is re-claimed once its lease lapses
+            logger.error(f"JobWorker {self.worker_id}: Could not record the outcome of job {job.id}: {e}")
@@ -0,0 +1,285 @@
+"""
+Pluggable backends for the models behind LLMRegistry handles.
+
+- vertex: live Vertex AI GenerativeModel (default)
+- record: live Vertex AI, with every prompt and response written to a
+  cassette directory; the response cache is disabled so every request
+  reaches the model and is recorded
+- replay: responses served from the cassette directory with a configurable
+  latency distribution, so the full agent pipeline runs without network
+  access or Google Cloud credentials
+
+Cassettes are JSON files named after the same content-addressed key the
+response cache uses (model, rendered prompt, generation config, safety
+settings), so a recorded run replays deterministically as long as the
+prompts are unchanged.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.llm_cache import GenerationResult, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("vertex", "record", "replay")
+LATENCY_MODES = ("recorded", "lognormal", "fixed", "none")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when no cassette matches a request."""
+
+
+def _config_dict(generation_config: Any) -> Any:
+    """Plain-dict view of an SDK GenerationConfig so cassette keys are stable."""
+    to_dict = getattr(generation_config, "to_dict", None)
+    return to_dict() if callable(to_dict) else generation_config
+
+
+def cassette_key(
+    model_name: str,
+    contents: List[Any],
+    generation_config: Any,
+    safety_settings: Optional[Dict[Any, Any]],
+) -> str:
+    """Key identifying a generation request across record and replay runs."""
+    return make_cache_key(
+        model_name, contents, _config_dict(generation_config), safety_settings
+    )
+
+
+class CassetteStore:
+    """Directory of recorded generations, one JSON file per request key."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self._path(key)}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, indent=2, default=str)
+            os.replace(tmp_path, self._path(key))
+
+    def __len__(self) -> int:
+        if not os.path.isdir(self.directory):
+            return 0
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+
+
+class LatencyModel:
+    """
+    Latency applied to replayed generations.
+
+    Args:
+        mode: "recorded" (recorded latency x scale), "lognormal" (sampled
+            around median_seconds with sigma, x scale), "fixed"
+            (median_seconds x scale) or "none"
+        median_seconds: Median latency for lognormal and fixed modes
+        sigma: Lognormal shape; larger values give a longer tail
+        scale: Multiplier applied to every latency
+        seed: Seed for reproducible lognormal samples
+    """
+
+    def __init__(
+        self,
+        mode: str = "recorded",
+        median_seconds: float = 2.0,
+        sigma: float = 0.5,
+        scale: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        if mode not in LATENCY_MODES:
+            raise ValueError(f"Unknown replay latency mode: {mode}")
+        self.mode = mode
+        self.median_seconds = median_seconds
+        self.sigma = sigma
+        self.scale = scale
+        self._random = random.Random(seed)
+
+    def sample(self, recorded_seconds: Optional[float] = None) -> float:
+        if self.mode == "none":
+            return 0.0
+        if self.mode == "recorded":
+            base = recorded_seconds if recorded_seconds is not None else self.median_seconds
+        elif self.mode == "fixed":
+            base = self.median_seconds
+        else:
+            base = self._random.lognormvariate(0.0, self.sigma) * self.median_seconds
+        return max(0.0, base * self.scale)
+
+
+def build_vertex_response(chunk: Dict[str, Any]) -> Any:
+    """Vertex-shaped response object readable by GenerationResult.from_vertex_response."""
+    text = chunk.get("text")
+    usage = chunk.get("usage") or {}
+    candidate = SimpleNamespace(
+        content=SimpleNamespace(parts=[SimpleNamespace(text=text)] if text is not None else []),
+        finish_reason=chunk.get("finish_reason"),
+        safety_ratings=[],
+    )
+    return SimpleNamespace(
+        text=text,
+        candidates=[candidate],
+        prompt_feedback=None,
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=usage.get("prompt_tokens", 0),
+            candidates_token_count=usage.get("output_tokens", 0),
+        ),
+    )
+
+
+class RecordingModel:
+    """Wraps a live GenerativeModel and writes each generation to a cassette."""
+
+    def __init__(self, model: Any, model_name: str, store: CassetteStore):
+        self._model = model
+        self.model_name = model_name
+        self.store = store
+
+    def _entry(self, contents, generation_config, latency, chunks) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "contents": contents,
+            "generation_config": _config_dict(generation_config),
+            "latency_seconds": round(latency, 4),
+            "chunks": chunks,
+            "recorded_at": time.time(),
+        }
+
+    async def generate_content_async(
+        self, contents, generation_config=None, safety_settings=None, stream=False
+    ):
+        key = cassette_key(self.model_name, contents, generation_config, safety_settings)
+        started = time.perf_counter()
+        response = await self._model.generate_content_async(
+            contents,
+            generation_config=generation_config,
+            safety_settings=safety_settings,
+            stream=stream,
+        )
+        if not stream:
+            result = GenerationResult.from_vertex_response(response, self.model_name)
+            self.store.save(
+                key,
+                self._entry(
+                    contents,
+                    generation_config,
+                    time.perf_counter() - started,
+                    [dict(result.to_dict(), offset_seconds=0.0)],
+                ),
+            )
+            return response
+        return self._record_stream(key, contents, generation_config, started, response)
+
+    async def _record_stream(self, key, contents, generation_config, started, responses):
+        chunks = []
+        async for response in responses:
+            result = GenerationResult.from_vertex_response(response, self.model_name)
+            chunks.append(
+                dict(result.to_dict(), offset_seconds=round(time.perf_counter() - started, 4))
+            )
+            yield response
+        self.store.save(
+            key,
+            self._entry(contents, generation_config, time.perf_counter() - started, chunks),
+        )
+
+
+class ReplayModel:
+    """Serves recorded generations from a cassette store with simulated latency."""
+
+    def __init__(self, model_name: str, store: CassetteStore, latency: LatencyModel):
+        self.model_name = model_name
+        self.store = store
+        self.latency = latency
+
+    async def generate_content_async(
+        self, contents, generation_config=None, safety_settings=None, stream=False
+    ):
+        key = cassette_key(self.model_name, contents, generation_config, safety_settings)
+        entry = await asyncio.to_thread(self.store.load, key)
+        if entry is None:
+            logger.warning(f"ReplayModel: No cassette {key}.json for {self.model_name}")
+            raise CassetteMissError(
+                f"No recorded response for this {self.model_name} prompt in {self.store.directory}"
+            )
+        chunks = entry.get("chunks") or [{"text": None}]
+        latency = self.latency.sample(entry.get("latency_seconds"))
+
+        if not stream:
+            await asyncio.sleep(latency)
+            merged = dict(chunks[-1])
+            merged["text"] = "".join(c.get("text") or "" for c in chunks) or None
+            return build_vertex_response(merged)
+        return self._replay_stream(chunks, latency, entry.get("latency_seconds"))
+
+    async def _replay_stream(
+        self, chunks: List[Dict[str, Any]], latency: float, recorded: Optional[float]
+    ) -> AsyncIterator[Any]:
+        # Keep the recorded chunk timing shape, stretched to the sampled latency
+        elapsed = 0.0
+        for index, chunk in enumerate(chunks):
+            offset = chunk.get("offset_seconds")
+            if recorded and offset is not None:
+                target = latency * min(1.0, offset / recorded)
+            else:
+                target = latency * (index + 1) / len(chunks)
+            await asyncio.sleep(max(0.0, target - elapsed))
+            elapsed = max(elapsed, target)
+            yield build_vertex_response(chunk)
+
+
+def get_backend_name() -> str:
+    backend = (settings.llm_backend or "vertex").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {settings.llm_backend}")
+    return backend
+
+
+def build_latency_model() -> LatencyModel:
+    return LatencyModel(
+        mode=settings.llm_replay_latency_mode,
+        median_seconds=settings.llm_replay_latency_median_seconds,
+        sigma=settings.llm_replay_latency_sigma,
+        scale=settings.llm_replay_latency_scale,
+        seed=settings.llm_replay_seed,
+    )
+
+
+def create_model(
+    model_name: str,
+    backend: str,
+    store: Optional[CassetteStore] = None,
+    latency: Optional[LatencyModel] = None,
+) -> Any:
+    """Build the model object a ModelHandle calls for the given backend."""
+    if backend == "replay":
+        return ReplayModel(model_name, store, latency or build_latency_model())
+
+    from vertexai.generative_models import GenerativeModel
+
+    model = GenerativeModel(model_name)
+    if backend == "record":
+        return RecordingModel(model, model_name, store)
+    return model
@@ -0,0 +1,329 @@
+"""
+Content-addressed cache for LLM generation results.
+
+Entries are keyed on a SHA-256 hash of (model, rendered prompt, generation
+config, safety settings). Lookups go through a bounded in-memory LRU tier
+with TTL first and an optional SQLite tier that survives restarts.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Per-request bypass flag; set with bypass_llm_cache()
+_bypass_cache: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "llm_cache_bypass", default=False
+)
+
+
+@contextlib.contextmanager
+def bypass_llm_cache(enabled: bool = True):
+    """
+    Bypass the LLM response cache for every generation in this context.
+
+    Example:
+        with bypass_llm_cache():
+            await agent.draft_prd(...)  # always calls Vertex AI
+    """
+    token = _bypass_cache.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass_cache.reset(token)
+
+
+def is_cache_bypassed() -> bool:
+    """Whether the current context asked to bypass the cache."""
+    return _bypass_cache.get()
+
+
+def _normalize(value: Any) -> Any:
+    """Convert SDK enums and nested containers into JSON-stable values."""
+    if isinstance(value, dict):
+        return sorted(
+            ([str(_normalize(k)), _normalize(v)] for k, v in value.items()),
+            key=lambda item: item[0],
+        )
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    name = getattr(value, "name", None)
+    return name if isinstance(name, str) else str(value)
+
+
+def make_cache_key(
+    model_name: str,
+    contents: List[Any],
+    generation_config: Optional[Dict[str, Any]],
+    safety_settings: Optional[Dict[Any, Any]],
+) -> str:
+    """Build the content-addressed cache key for a generation request."""
+    payload = json.dumps(
+        {
+            "model": model_name,
+            "contents": _normalize(contents),
+            "generation_config": _normalize(generation_config or {}),
+            "safety_settings": _normalize(safety_settings or {}),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationResult:
+    """Model-agnostic result of a single generation call."""
+
+    def __init__(
+        self,
+        text: Optional[str],
+        model_name: str,
+        finish_reason: Optional[str] = None,
+        safety_ratings: Optional[str] = None,
+        block_reason: Optional[str] = None,
+        block_reason_message: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+        cached: bool = False,
+    ):
+        self.text = text
+        self.model_name = model_name
+        self.finish_reason = finish_reason
+        self.safety_ratings = safety_ratings
+        self.block_reason = block_reason
+        self.block_reason_message = block_reason_message
+        self.usage = usage or {}
+        self.cached = cached
+
+    @classmethod
+    def from_vertex_response(cls, response: Any, model_name: str) -> "GenerationResult":
+        """Extract text and diagnostics from a Vertex AI response."""
+        text = None
+        finish_reason = None
+        safety_ratings = None
+        candidates = getattr(response, "candidates", None)
+        if candidates:
+            candidate = candidates[0]
+            finish_reason = str(getattr(candidate, "finish_reason", None))
+            safety_ratings = str(getattr(candidate, "safety_ratings", None))
+            content = getattr(candidate, "content", None)
+            parts = getattr(content, "parts", None) if content is not None else None
+            if parts:
+                text = parts[0].text
+
+        block_reason = None
+        block_reason_message = None
+        prompt_feedback = getattr(response, "prompt_feedback", None)
+        if prompt_feedback:
+            block_reason = str(getattr(prompt_feedback, "block_reason", "")) or None
+            block_reason_message = getattr(prompt_feedback, "block_reason_message", None)
+
+        usage = {}
+        usage_metadata = getattr(response, "usage_metadata", None)
+        if usage_metadata is not None:
+            usage = {
+                "prompt_tokens": getattr(usage_metadata, "prompt_token_count", 0) or 0,
+                "output_tokens": getattr(usage_metadata, "candidates_token_count", 0) or 0,
+            }
+
+        return cls(
+            text=text,
+            model_name=model_name,
+            finish_reason=finish_reason,
+            safety_ratings=safety_ratings,
+            block_reason=block_reason,
+            block_reason_message=block_reason_message,
+            usage=usage,
+        )
+
+    def describe_empty(self) -> str:
+        """Human-readable explanation for a result without content."""
+        message = (
+            f"Vertex AI returned no content. Finish Reason: {self.finish_reason or 'Unknown'}. "
+            f"Safety Ratings: {self.safety_ratings or 'N/A'}"
+        )
+        if self.block_reason:
+            message += f" Prompt Feedback: {self.block_reason}"
+            if self.block_reason_message:
+                message += f" ({self.block_reason_message})"
+        return message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "model_name": self.model_name,
+            "finish_reason": self.finish_reason,
+            "usage": self.usage,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], cached: bool = True) -> "GenerationResult":
+        return cls(
+            text=data.get("text"),
+            model_name=data.get("model_name", ""),
+            finish_reason=data.get("finish_reason"),
+            usage=data.get("usage"),
+            cached=cached,
+        )
+
+
+class SQLiteCacheStore:
+    """On-disk cache tier backed by a single SQLite table."""
+
+    def __init__(self, path: str, table: str = "llm_cache"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """The stored value and its expires_at, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache of generation results.
+
+    Only results that produced text are stored; errors and blocked
+    responses always go back to the model.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 86400,
+        sqlite_path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._disk = SQLiteCacheStore(sqlite_path) if sqlite_path else None
+        self.stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _set_memory(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[GenerationResult]:
+        """Look up a cached result, promoting disk hits into memory."""
+        value = self._get_memory(key)
+        if value is not None:
+            self.stats["hits"] += 1
+            self.stats["memory_hits"] += 1
+            return GenerationResult.from_dict(value)
+
+        if self._disk is not None:
+            try:
+                stored = await asyncio.to_thread(self._disk.get, key)
+            except Exception as e:
+                logger.warning(f"LLMResponseCache: Disk tier read failed: {e}")
+                stored = None
+            if stored is not None:
+                # Keep the row's own expiry so promotion does not extend its TTL
+                value, expires_at = stored
+                self._set_memory(key, value, expires_at)
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                return GenerationResult.from_dict(value)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, result: GenerationResult) -> None:
+        """Store a successful result in every tier."""
+        if not result.text:
+            return
+        value = result.to_dict()
+        expires_at = time.time() + self.ttl_seconds
+        self._set_memory(key, value, expires_at)
+        self.stats["stores"] += 1
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set, key, value, expires_at)
+            except Exception as e:
+                logger.warning(f"LLMResponseCache: Disk tier write failed: {e}")
+
+    def record_bypass(self) -> None:
+        self.stats["bypassed"] += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries from both tiers."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._memory),
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self._disk is not None,
+        }
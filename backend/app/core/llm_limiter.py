@@ -0,0 +1,176 @@
+"""
+Adaptive (AIMD) concurrency limiter for LLM calls.
+
+A single limiter sits in front of every model call made through the LLM
+registry. The concurrency limit grows additively while calls succeed within
+the latency threshold and is cut multiplicatively when Vertex AI reports
+quota exhaustion (HTTP 429 / RESOURCE_EXHAUSTED). Waiting callers are served
+in FIFO order.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_OVERLOAD_MARKERS = ("429", "resource_exhausted", "resource exhausted", "quota exceeded", "too many requests")
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an exception signals that the model backend is throttling us."""
+    try:
+        from google.api_core import exceptions as api_exceptions
+
+        if isinstance(
+            error, (api_exceptions.ResourceExhausted, api_exceptions.TooManyRequests)
+        ):
+            return True
+    except ImportError:
+        pass
+    message = f"{type(error).__name__} {error}".lower()
+    return any(marker in message for marker in _OVERLOAD_MARKERS)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter with a fair (FIFO) wait queue.
+
+    - Each successful call within latency_threshold_seconds raises the limit
+      by increase_step / limit (about +increase_step per full window).
+    - An overload error multiplies the limit by decrease_factor, at most
+      once per window: calls that started before the last decrease do not
+      decrease it again.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_threshold_seconds: Optional[float] = None,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_threshold_seconds = latency_threshold_seconds
+
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+        self._requests = 0
+        self._throttled = 0
+        self._errors = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Current effective concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> float:
+        """
+        Wait for a slot.
+
+        Returns:
+            float: Seconds spent waiting in the queue
+        """
+        started = time.monotonic()
+        if self._in_flight < self.limit and not self.queue_depth:
+            self._in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # A slot was handed to us just before cancellation
+                    self._in_flight -= 1
+                    self._wake_waiters()
+                raise
+        waited = time.monotonic() - started
+        self._requests += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        return waited
+
+    def release(
+        self,
+        started_at: float,
+        latency: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Return a slot and adapt the limit from the call outcome."""
+        self._in_flight -= 1
+        if error is None:
+            if self.latency_threshold_seconds is None or latency <= self.latency_threshold_seconds:
+                self._limit = min(
+                    float(self.max_limit), self._limit + self.increase_step / self._limit
+                )
+        elif is_overload_error(error):
+            self._throttled += 1
+            if started_at >= self._last_decrease:
+                previous = self.limit
+                self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                self._last_decrease = time.monotonic()
+                logger.warning(
+                    f"AdaptiveConcurrencyLimiter: Backend throttling, limit {previous} -> {self.limit}"
+                )
+        else:
+            self._errors += 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of one model call."""
+        await self.acquire()
+        started_at = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            error = None if isinstance(e, (asyncio.CancelledError, GeneratorExit)) else e
+            self.release(started_at, time.monotonic() - started_at, error)
+            raise
+        else:
+            self.release(started_at, time.monotonic() - started_at)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "requests": self._requests,
+            "throttled": self._throttled,
+            "errors": self._errors,
+            "total_wait_seconds": round(self._total_wait, 4),
+            "avg_wait_seconds": round(self._total_wait / self._requests, 4) if self._requests else 0.0,
+            "max_wait_seconds": round(self._max_wait, 4),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+        }
@@ -0,0 +1,338 @@
+"""
+Request policies for LLM calls: deadlines, hedging and retries.
+
+A policy is chosen per agent function (PRD drafting, PRD analysis, system
+design, ...) and bounds every model call made for that function:
+
+- timeout_seconds: overall deadline, including retries and hedges
+- max_retries: retries of transient errors with full-jitter backoff
+- hedge: once a call has run longer than the observed p95 latency for the
+  same model and policy, a duplicate request is sent and whichever finishes
+  first wins (the other is cancelled)
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.llm_limiter import AdaptiveConcurrencyLimiter, is_overload_error
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_TRANSIENT_MARKERS = (
+    "503",
+    "unavailable",
+    "deadline exceeded",
+    "deadline_exceeded",
+    "internal error",
+    "connection reset",
+    "connection aborted",
+)
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """Raised when an LLM call does not finish within its policy deadline."""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether an LLM call failure is worth retrying."""
+    if isinstance(error, LLMDeadlineExceeded):
+        return False
+    if is_overload_error(error):
+        return True
+    try:
+        from google.api_core import exceptions as api_exceptions
+
+        if isinstance(
+            error,
+            (
+                api_exceptions.ServiceUnavailable,
+                api_exceptions.InternalServerError,
+                api_exceptions.DeadlineExceeded,
+                api_exceptions.Aborted,
+            ),
+        ):
+            return True
+    except ImportError:
+        pass
+    if isinstance(error, (ConnectionError, asyncio.TimeoutError)):
+        return True
+    message = f"{type(error).__name__} {error}".lower()
+    return any(marker in message for marker in _TRANSIENT_MARKERS)
+
+
+class RequestPolicy:
+    """Deadline, retry and hedging settings for one agent function."""
+
+    def __init__(
+        self,
+        name: str,
+        timeout_seconds: Optional[float] = None,
+        max_retries: int = 0,
+        retry_backoff_seconds: float = 1.0,
+        retry_backoff_max_seconds: float = 10.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay_seconds: float = 1.0,
+    ):
+        self.name = name
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.retry_backoff_max_seconds = retry_backoff_max_seconds
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number attempt + 1."""
+        ceiling = min(
+            self.retry_backoff_max_seconds, self.retry_backoff_seconds * (2**attempt)
+        )
+        return random.uniform(0, ceiling)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency at quantile q, or None until min_samples are recorded."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+def build_default_policies() -> Dict[str, RequestPolicy]:
+    """Build the request policies used by the agents from settings."""
+    retries = settings.llm_max_retries
+    backoff = settings.llm_retry_backoff_seconds
+    hedging = settings.llm_hedging_enabled
+    quantile = settings.llm_hedge_quantile
+    return {
+        "default": RequestPolicy(
+            "default",
+            timeout_seconds=settings.llm_request_timeout_seconds,
+            max_retries=retries,
+            retry_backoff_seconds=backoff,
+        ),
+        "prd_draft": RequestPolicy(
+            "prd_draft",
+            timeout_seconds=settings.llm_prd_draft_timeout_seconds,
+            max_retries=retries,
+            retry_backoff_seconds=backoff,
+        ),
+        "prd_analysis": RequestPolicy(
+            "prd_analysis",
+            timeout_seconds=settings.llm_prd_analysis_timeout_seconds,
+            max_retries=retries,
+            retry_backoff_seconds=backoff,
+            hedge=hedging,
+            hedge_quantile=quantile,
+        ),
+        "system_design": RequestPolicy(
+            "system_design",
+            timeout_seconds=settings.llm_system_design_timeout_seconds,
+            max_retries=retries,
+            retry_backoff_seconds=backoff,
+        ),
+        "summarization": RequestPolicy(
+            "summarization",
+            timeout_seconds=settings.llm_summarization_timeout_seconds,
+            max_retries=retries,
+            retry_backoff_seconds=backoff,
+            hedge=hedging,
+            hedge_quantile=quantile,
+        ),
+    }
+
+
+class RequestPolicyRunner:
+    """
+    Executes model calls under their request policy.
+
+    Latencies are tracked per (model name, policy name) so hedge delays
+    follow the behaviour of that specific kind of call. Hedges are skipped
+    while the concurrency limiter has callers queued, so hedging never adds
+    load when the backend is already saturated.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, RequestPolicy]] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    ):
+        self.policies = policies if policies is not None else build_default_policies()
+        self.limiter = limiter
+        self._trackers: Dict[Tuple[str, str], LatencyTracker] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def get_policy(self, name: Optional[str]) -> RequestPolicy:
+        """Policy by name, falling back to the 'default' policy."""
+        policy = self.policies.get(name or "default") or self.policies.get("default")
+        return policy or RequestPolicy("default")
+
+    def deadline(self, policy: RequestPolicy) -> Optional[float]:
+        """Event loop time by which a call under policy must finish."""
+        if not policy.timeout_seconds:
+            return None
+        return asyncio.get_running_loop().time() + policy.timeout_seconds
+
+    def tracker(self, model_name: str, policy_name: str) -> LatencyTracker:
+        key = (model_name, policy_name)
+        tracker = self._trackers.get(key)
+        if tracker is None:
+            tracker = self._trackers[key] = LatencyTracker()
+        return tracker
+
+    def _count(self, policy: RequestPolicy, event: str) -> None:
+        counters = self.stats.setdefault(
+            policy.name,
+            {"calls": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "deadline_exceeded": 0},
+        )
+        counters[event] += 1
+
+    def hedge_delay(self, model_name: str, policy: RequestPolicy) -> Optional[float]:
+        """Delay before hedging, or None when the call should not be hedged."""
+        if not policy.hedge:
+            return None
+        observed = self.tracker(model_name, policy.name).quantile(policy.hedge_quantile)
+        if observed is None:
+            return None
+        return max(policy.hedge_min_delay_seconds, observed)
+
+    async def run(
+        self,
+        model_name: str,
+        policy_name: Optional[str],
+        call: Callable[[], Awaitable[T]],
+        allow_hedge: bool = True,
+        deadline: Optional[float] = None,
+    ) -> T:
+        """
+        Run call() under the named policy.
+
+        Args:
+            model_name: Model the call goes to (latency tracking key)
+            policy_name: Request policy to apply
+            call: Factory issuing one model request per invocation
+            allow_hedge: Whether duplicate requests may be sent
+            deadline: Event loop time overriding the policy deadline
+
+        Raises:
+            LLMDeadlineExceeded: If the policy deadline passes first
+        """
+        policy = self.get_policy(policy_name)
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = self.deadline(policy)
+        self._count(policy, "calls")
+
+        attempt = 0
+        while True:
+            try:
+                attempt_call = self._attempt(model_name, policy, call, allow_hedge)
+                if deadline is None:
+                    return await attempt_call
+                return await asyncio.wait_for(attempt_call, max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError as e:
+                if deadline is not None and loop.time() >= deadline:
+                    self._count(policy, "deadline_exceeded")
+                    raise LLMDeadlineExceeded(
+                        f"LLM call '{policy.name}' exceeded its {policy.timeout_seconds}s deadline"
+                    ) from e
+                error = e
+            except Exception as e:
+                error = e
+
+            if attempt >= policy.max_retries or not is_transient_error(error):
+                raise error
+            delay = policy.backoff(attempt)
+            if deadline is not None and loop.time() + delay >= deadline:
+                raise error
+            attempt += 1
+            self._count(policy, "retries")
+            logger.warning(
+                f"RequestPolicyRunner: Retrying '{policy.name}' call to {model_name} "
+                f"in {delay:.2f}s (attempt {attempt + 1}) after: {error}"
+            )
+            await asyncio.sleep(delay)
+
+    async def _attempt(
+        self,
+        model_name: str,
+        policy: RequestPolicy,
+        call: Callable[[], Awaitable[T]],
+        allow_hedge: bool,
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        tracker = self.tracker(model_name, policy.name)
+        delay = self.hedge_delay(model_name, policy) if allow_hedge else None
+
+        started = loop.time()
+        if delay is None:
+            result = await call()
+            tracker.record(loop.time() - started)
+            return result
+
+        primary = asyncio.ensure_future(call())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and not (self.limiter is not None and self.limiter.queue_depth):
+                hedge_started = loop.time()
+                hedge = asyncio.ensure_future(call())
+                tasks.add(hedge)
+                self._count(policy, "hedges")
+                logger.info(
+                    f"RequestPolicyRunner: Hedging '{policy.name}' call to {model_name} after {delay:.2f}s"
+                )
+            else:
+                hedge, hedge_started = None, started
+
+            pending = set(tasks)
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge:
+                            self._count(policy, "hedge_wins")
+                            tracker.record(loop.time() - hedge_started)
+                        else:
+                            tracker.record(loop.time() - started)
+                        return task.result()
+                    first_error = first_error or error
+            raise first_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-policy counters and observed hedge quantiles."""
+        latencies = {
+            f"{model}:{policy}": {
+                "samples": len(tracker),
+                "p95_seconds": tracker.quantile(0.95),
+            }
+            for (model, policy), tracker in self._trackers.items()
+        }
+        return {"policies": dict(self.stats), "latency": latencies}
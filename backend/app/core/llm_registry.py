@@ -0,0 +1,517 @@
+"""
+Process-wide registry for Vertex AI generative model handles.
+
+Initializes the Vertex AI SDK once per process and hands out shared model
+handles keyed by (model_name, generation profile), so agents no longer call
+vertexai.init or build their own GenerativeModel instances. The model behind
+each handle comes from the configured backend (see app.core.llm_backends):
+live Vertex AI, recording to cassettes, or replaying them offline.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.llm_backends import CassetteStore, create_model, get_backend_name
+from app.core.llm_cache import (
+    GenerationResult,
+    LLMResponseCache,
+    is_cache_bypassed,
+    make_cache_key,
+)
+from app.core.llm_limiter import AdaptiveConcurrencyLimiter
+from app.core.llm_policy import LLMDeadlineExceeded, RequestPolicyRunner
+from app.core.metrics import LLM_REQUEST_DURATION, observe_duration, record_llm_usage
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationProfile:
+    """Named generation configuration shared by model handles."""
+
+    def __init__(
+        self,
+        name: str,
+        generation_config: Dict[str, Any],
+        use_safety_settings: bool = True,
+    ):
+        self.name = name
+        self.generation_config = generation_config
+        self.use_safety_settings = use_safety_settings
+
+
+def _build_default_profiles() -> Dict[str, GenerationProfile]:
+    """Build the generation profiles used by the agents."""
+    return {
+        "default": GenerationProfile(
+            "default",
+            {
+                "max_output_tokens": settings.vertex_ai_max_tokens,
+                "temperature": settings.vertex_ai_temperature,
+                "top_p": settings.vertex_ai_top_p,
+                "top_k": settings.vertex_ai_top_k,
+            },
+        ),
+        "summarization": GenerationProfile(
+            "summarization",
+            {
+                "max_output_tokens": 512,  # Shorter for summaries
+                "temperature": 0.3,  # More focused and consistent
+                "top_p": 0.8,
+                "top_k": 20,
+            },
+        ),
+        "prd_analysis": GenerationProfile(
+            "prd_analysis",
+            {
+                "max_output_tokens": 2048,
+                "temperature": 0.2,
+                "top_p": 0.8,
+            },
+            use_safety_settings=False,
+        ),
+        "system_design": GenerationProfile(
+            "system_design",
+            {
+                "max_output_tokens": 8192,  # Allow for comprehensive design
+                "temperature": 0.3,  # Lower temperature for more structured output
+                "top_p": 0.8,
+                "top_k": 40,
+            },
+        ),
+        "effort_estimation": GenerationProfile(
+            "effort_estimation",
+            {
+                "max_output_tokens": 1024,
+                "temperature": 0.2,  # Low temperature for consistent, structured output
+                "top_p": 0.8,
+                "top_k": 20,
+            },
+        ),
+        "value_projection": GenerationProfile(
+            "value_projection",
+            {
+                "max_output_tokens": settings.vertex_ai_max_tokens,
+                "temperature": 0.4,  # More conservative for financial projections
+                "top_p": 0.8,
+                "top_k": 20,
+            },
+        ),
+    }
+
+
+def build_safety_settings() -> Dict[Any, Any]:
+    """Default safety settings applied to every agent call."""
+    import vertexai.preview.generative_models as generative_models
+
+    threshold = generative_models.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
+    return {
+        generative_models.HarmCategory.HARM_CATEGORY_HATE_SPEECH: threshold,
+        generative_models.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: threshold,
+        generative_models.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: threshold,
+        generative_models.HarmCategory.HARM_CATEGORY_HARASSMENT: threshold,
+    }
+
+
+def _sdk_generation_config(generation_config: Dict[str, Any]) -> Any:
+    """
+    Pass plain dict configs through, but build an SDK GenerationConfig for
+    JSON mode so the response schema is converted to the Schema proto.
+    """
+    if "response_schema" not in generation_config:
+        return generation_config
+    from vertexai.generative_models import GenerationConfig
+
+    return GenerationConfig(**generation_config)
+
+
+async def _bounded(responses: AsyncIterator[Any], deadline: Optional[float]):
+    """Iterate a response stream, failing once the deadline has passed."""
+    if deadline is None:
+        async for response in responses:
+            yield response
+        return
+    loop = asyncio.get_running_loop()
+    iterator = responses.__aiter__()
+    while True:
+        try:
+            response = await asyncio.wait_for(
+                iterator.__anext__(), max(0.0, deadline - loop.time())
+            )
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError as e:
+            raise LLMDeadlineExceeded("LLM stream exceeded its deadline") from e
+        yield response
+
+
+class ModelHandle:
+    """
+    Shared handle around a single GenerativeModel instance.
+
+    Calls default to the handle's generation profile; callers may still
+    override generation_config or safety_settings per call. Model calls (but
+    not cache hits) hold a slot of the registry's concurrency limiter and
+    run under a request policy, by default the one named after the profile.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        profile: GenerationProfile,
+        model: Any,
+        safety_settings: Optional[Dict[Any, Any]] = None,
+        cache: Optional[LLMResponseCache] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        policy_runner: Optional[RequestPolicyRunner] = None,
+    ):
+        self.model_name = model_name
+        self.profile = profile
+        self._model = model
+        self._safety_settings = safety_settings
+        self._cache = cache
+        self._limiter = limiter
+        self._policy_runner = policy_runner
+
+    @property
+    def generation_config(self) -> Dict[str, Any]:
+        return dict(self.profile.generation_config)
+
+    @property
+    def safety_settings(self) -> Optional[Dict[Any, Any]]:
+        return self._safety_settings if self.profile.use_safety_settings else None
+
+    def _slot(self):
+        if self._limiter is None:
+            return contextlib.nullcontext()
+        return self._limiter.slot()
+
+    async def _call_model(
+        self,
+        contents: List[Any],
+        generation_config: Dict[str, Any],
+        safety_settings: Optional[Dict[Any, Any]],
+        stream: bool,
+        policy: Optional[str],
+        deadline: Optional[float] = None,
+        hold_slot: bool = True,
+    ):
+        async def call():
+            async with self._slot() if hold_slot else contextlib.nullcontext():
+                return await self._model.generate_content_async(
+                    contents,
+                    generation_config=_sdk_generation_config(generation_config),
+                    safety_settings=safety_settings,
+                    stream=stream,
+                )
+
+        with observe_duration(
+            LLM_REQUEST_DURATION, model=self.model_name, profile=self.profile.name
+        ):
+            if self._policy_runner is None:
+                return await call()
+            return await self._policy_runner.run(
+                self.model_name,
+                policy or self.profile.name,
+                call,
+                allow_hedge=not stream,
+                deadline=deadline,
+            )
+
+    async def generate_content_async(
+        self,
+        contents: List[Any],
+        generation_config: Optional[Dict[str, Any]] = None,
+        safety_settings: Optional[Dict[Any, Any]] = None,
+        stream: bool = False,
+        policy: Optional[str] = None,
+    ):
+        """Generate content using the shared model and the profile defaults."""
+        return await self._call_model(
+            contents,
+            generation_config or self.generation_config,
+            safety_settings or self.safety_settings,
+            stream,
+            policy,
+        )
+
+    async def generate(
+        self,
+        contents: List[Any],
+        generation_config: Optional[Dict[str, Any]] = None,
+        safety_settings: Optional[Dict[Any, Any]] = None,
+        bypass_cache: bool = False,
+        policy: Optional[str] = None,
+    ) -> GenerationResult:
+        """
+        Generate a single (non-streaming) response through the response cache.
+
+        Args:
+            contents: Rendered prompt parts
+            generation_config: Overrides the profile generation config
+            safety_settings: Overrides the profile safety settings
+            bypass_cache: Skip the cache lookup for this call (the fresh
+                result is still stored)
+            policy: Request policy name; defaults to the profile name
+
+        Returns:
+            GenerationResult: Extracted text and diagnostics
+        """
+        generation_config = generation_config or self.generation_config
+        safety_settings = safety_settings or self.safety_settings
+
+        cache_key = None
+        if self._cache is not None:
+            cache_key = make_cache_key(
+                self.model_name, contents, generation_config, safety_settings
+            )
+            if bypass_cache or is_cache_bypassed():
+                self._cache.record_bypass()
+            else:
+                cached = await self._cache.get(cache_key)
+                if cached is not None:
+                    logger.debug(
+                        f"LLMRegistry: Cache hit for {self.model_name} ({self.profile.name})"
+                    )
+                    return cached
+
+        response = await self._call_model(
+            contents, generation_config, safety_settings, False, policy
+        )
+        result = GenerationResult.from_vertex_response(response, self.model_name)
+        record_llm_usage(self.model_name, self.profile.name, result.usage)
+
+        if cache_key is not None:
+            await self._cache.set(cache_key, result)
+        return result
+
+    async def stream(
+        self,
+        contents: List[Any],
+        generation_config: Optional[Dict[str, Any]] = None,
+        safety_settings: Optional[Dict[Any, Any]] = None,
+        bypass_cache: bool = False,
+        policy: Optional[str] = None,
+    ) -> AsyncIterator[GenerationResult]:
+        """
+        Stream a response as a sequence of partial results.
+
+        Each yielded GenerationResult carries the text delta of one chunk.
+        A cache hit is replayed as a single chunk, and the assembled text of
+        a completed stream is stored so later calls with the same prompt
+        (streaming or not) are served from the cache.
+
+        The policy deadline covers the whole stream. Opening the stream is
+        retried on transient errors; failures mid-stream are not.
+        """
+        generation_config = generation_config or self.generation_config
+        safety_settings = safety_settings or self.safety_settings
+
+        cache_key = None
+        if self._cache is not None:
+            cache_key = make_cache_key(
+                self.model_name, contents, generation_config, safety_settings
+            )
+            if bypass_cache or is_cache_bypassed():
+                self._cache.record_bypass()
+            else:
+                cached = await self._cache.get(cache_key)
+                if cached is not None:
+                    yield cached
+                    return
+
+        deadline = None
+        if self._policy_runner is not None:
+            deadline = self._policy_runner.deadline(
+                self._policy_runner.get_policy(policy or self.profile.name)
+            )
+
+        parts: List[str] = []
+        last_chunk: Optional[GenerationResult] = None
+        # The limiter slot is held until the stream is exhausted
+        async with self._slot():
+            responses = await self._call_model(
+                contents,
+                generation_config,
+                safety_settings,
+                True,
+                policy,
+                deadline=deadline,
+                hold_slot=False,
+            )
+            async for response in _bounded(responses, deadline):
+                last_chunk = GenerationResult.from_vertex_response(response, self.model_name)
+                if last_chunk.text:
+                    parts.append(last_chunk.text)
+                yield last_chunk
+
+        if last_chunk is not None:
+            record_llm_usage(self.model_name, self.profile.name, last_chunk.usage)
+        if cache_key is not None and parts and last_chunk is not None:
+            await self._cache.set(
+                cache_key,
+                GenerationResult(
+                    "".join(parts),
+                    self.model_name,
+                    finish_reason=last_chunk.finish_reason,
+                    usage=last_chunk.usage,
+                ),
+            )
+
+
+class LLMRegistry:
+    """
+    Registry that owns Vertex AI initialization and shared model handles.
+
+    vertexai.init runs at most once per registry. Handles are created lazily
+    and cached by (model_name, profile) so every agent asking for the same
+    pair receives the same underlying GenerativeModel (and gRPC channel).
+    """
+
+    def __init__(
+        self,
+        project_id: Optional[str] = None,
+        location: Optional[str] = None,
+        profiles: Optional[Dict[str, GenerationProfile]] = None,
+        cache: Optional[LLMResponseCache] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        policy_runner: Optional[RequestPolicyRunner] = None,
+        backend: Optional[str] = None,
+        cassette_store: Optional[CassetteStore] = None,
+    ):
+        self.project_id = project_id or settings.google_cloud_project_id or "drfirst-genai-01"
+        self.location = location or settings.vertex_ai_location
+        self.default_model_name = settings.vertex_ai_model_name or "gemini-2.0-flash-lite"
+        self.profiles = profiles or _build_default_profiles()
+        self.backend = backend or get_backend_name()
+
+        if self.backend == "record":
+            # A cache hit would never reach the model, so no cassette is written
+            cache = None
+        elif cache is None and settings.llm_cache_enabled:
+            cache = LLMResponseCache(
+                max_entries=settings.llm_cache_max_entries,
+                ttl_seconds=settings.llm_cache_ttl_seconds,
+                sqlite_path=settings.llm_cache_sqlite_path,
+            )
+        self.cache = cache
+
+        if limiter is None and settings.llm_limiter_enabled:
+            limiter = AdaptiveConcurrencyLimiter(
+                initial_limit=settings.llm_initial_concurrency,
+                min_limit=settings.llm_min_concurrency,
+                max_limit=settings.llm_max_concurrency,
+                latency_threshold_seconds=settings.llm_limiter_latency_threshold_seconds,
+            )
+        self.limiter = limiter
+        self.policy_runner = policy_runner or RequestPolicyRunner(limiter=limiter)
+
+        if cassette_store is None and self.backend != "vertex":
+            cassette_store = CassetteStore(settings.llm_cassette_dir)
+        self.cassette_store = cassette_store
+
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._init_error: Optional[Exception] = None
+        self._safety_settings: Optional[Dict[Any, Any]] = None
+        self._handles: Dict[Tuple[str, str], ModelHandle] = {}
+
+    @property
+    def available(self) -> bool:
+        """Whether Vertex AI initialized successfully."""
+        self._ensure_initialized()
+        return self._init_error is None
+
+    def _ensure_initialized(self) -> None:
+        if self._initialized:
+            return
+        with self._lock:
+            if self._initialized:
+                return
+            if self.backend == "replay":
+                # Replayed cassettes need no project, credentials or network
+                try:
+                    self._safety_settings = build_safety_settings()
+                except Exception as e:
+                    logger.warning(f"LLMRegistry: Safety settings unavailable in replay mode: {e}")
+                logger.info(f"LLMRegistry: Replaying LLM responses from {self.cassette_store.directory}")
+                self._initialized = True
+                return
+            try:
+                import vertexai
+
+                logger.info(
+                    f"LLMRegistry: Initializing VertexAI with project={self.project_id}, location={self.location}"
+                )
+                vertexai.init(project=self.project_id, location=self.location)
+                self._safety_settings = build_safety_settings()
+                logger.info("LLMRegistry: VertexAI initialized successfully")
+            except Exception as e:
+                logger.error(f"LLMRegistry: Failed to initialize Vertex AI: {e}")
+                self._init_error = e
+            self._initialized = True
+
+    def _create_model(self, model_name: str) -> Any:
+        """Build the underlying model object for a new handle."""
+        return create_model(model_name, self.backend, self.cassette_store)
+
+    def get_model(
+        self, model_name: Optional[str] = None, profile: str = "default"
+    ) -> Optional[ModelHandle]:
+        """
+        Get the shared model handle for a model name and generation profile.
+
+        Returns:
+            ModelHandle, or None if Vertex AI is unavailable
+        """
+        self._ensure_initialized()
+        if self._init_error is not None:
+            return None
+
+        model_name = model_name or self.default_model_name
+        if profile not in self.profiles:
+            raise ValueError(f"Unknown generation profile: {profile}")
+
+        key = (model_name, profile)
+        handle = self._handles.get(key)
+        if handle is not None:
+            return handle
+
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                try:
+                    handle = ModelHandle(
+                        model_name,
+                        self.profiles[profile],
+                        self._create_model(model_name),
+                        self._safety_settings,
+                        self.cache,
+                        self.limiter,
+                        self.policy_runner,
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"LLMRegistry: Failed to create model {model_name} ({profile}): {e}"
+                    )
+                    return None
+                self._handles[key] = handle
+                logger.info(f"LLMRegistry: Created model handle {model_name} ({profile})")
+        return handle
+
+    def get_status(self) -> Dict[str, Any]:
+        """Summarize registry state for diagnostics."""
+        return {
+            "backend": self.backend,
+            "project": self.project_id,
+            "location": self.location,
+            "initialized": self._initialized,
+            "available": self._initialized and self._init_error is None,
+            "handles": [f"{name}:{profile}" for name, profile in self._handles],
+            "cache": self.cache.get_stats() if self.cache is not None else None,
+            "limiter": self.limiter.get_metrics() if self.limiter is not None else None,
+            "request_policies": self.policy_runner.get_stats(),
+        }
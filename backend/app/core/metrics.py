@@ -0,0 +1,348 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Counters and histograms are kept in a process-wide MetricsRegistry and
+rendered in the Prometheus text format at /metrics. Instrumented today:
+
+- agent_method_duration_seconds: every agent entry point (draft_prd,
+  generate_system_design, estimate_effort, calculate_cost, project_value,
+  generate_financial_summary), labelled by outcome
+- llm_request_duration_seconds / llm_tokens_total: Vertex AI calls made
+  through ModelHandle, with token counts from the response usage metadata
+- firestore_operation_duration_seconds: Firestore reads and writes per
+  collection and operation
+"""
+
+import contextlib
+import functools
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import log_performance_metric
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Exposition lines for every labelled series."""
+        pass
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        pass
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class _HistogramState:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed distribution per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._states: Dict[LabelValues, _HistogramState] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _HistogramState(len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state.buckets[index] += 1
+                    break
+            state.count += 1
+            state.sum += value
+
+    @contextlib.contextmanager
+    def time(self, **labels: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Observe the duration of a block. An "outcome" label, if the metric
+        has one, is set to "error" when the block raises and may be
+        overridden through the yielded dict.
+        """
+        labels = dict(labels)
+        if "outcome" in self.labelnames:
+            labels.setdefault("outcome", "success")
+        started = time.perf_counter()
+        try:
+            yield labels
+        except BaseException:
+            if "outcome" in self.labelnames:
+                labels["outcome"] = "error"
+            raise
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        state = self._states.get(self._key(labels))
+        return state.count if state is not None else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(state.buckets), state.count, state.sum)
+                for key, state in self._states.items()
+            )
+        lines = []
+        for key, buckets, count, total in items:
+            cumulative = 0
+            for bound, observed in zip(self.buckets, buckets):
+                cumulative += observed
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, description, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, description, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear recorded values (metric definitions are kept)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+AGENT_METHOD_DURATION = REGISTRY.histogram(
+    "agent_method_duration_seconds",
+    "Duration of agent entry-point calls",
+    ("agent", "method", "outcome"),
+)
+LLM_REQUEST_DURATION = REGISTRY.histogram(
+    "llm_request_duration_seconds",
+    "Duration of LLM calls including retries and hedges (cache hits excluded)",
+    ("model", "profile", "outcome"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total",
+    "LLM tokens reported in response usage metadata",
+    ("model", "profile", "kind"),
+)
+FIRESTORE_OPERATION_DURATION = REGISTRY.histogram(
+    "firestore_operation_duration_seconds",
+    "Duration of Firestore operations",
+    ("collection", "operation", "outcome"),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+def _response_outcome(result: Any) -> str:
+    if isinstance(result, dict) and result.get("status") == "error":
+        return "error"
+    return "success"
+
+
+def instrument_agent_method(agent: str) -> Callable:
+    """
+    Decorator timing an async agent method into agent_method_duration_seconds.
+
+    A returned {"status": "error"} response counts as an error, as does an
+    exception.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        method = func.__name__
+        method_logger = logging.getLogger(func.__module__)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.metrics_enabled:
+                return await func(*args, **kwargs)
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                outcome = _response_outcome(result)
+                return result
+            finally:
+                duration = time.perf_counter() - started
+                AGENT_METHOD_DURATION.observe(
+                    duration, agent=agent, method=method, outcome=outcome
+                )
+                log_performance_metric(
+                    method_logger,
+                    f"{agent}.{method}",
+                    round(duration * 1000, 2),
+                    outcome == "success",
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def record_llm_usage(model: str, profile: str, usage: Optional[Dict[str, int]]) -> None:
+    """Count prompt and output tokens from a GenerationResult usage dict."""
+    if not settings.metrics_enabled or not usage:
+        return
+    for kind, key in (("prompt", "prompt_tokens"), ("output", "output_tokens")):
+        tokens = usage.get(key) or 0
+        if tokens:
+            LLM_TOKENS.inc(tokens, model=model, profile=profile, kind=kind)
+
+
+@contextlib.contextmanager
+def observe_duration(histogram: Histogram, **labels: Any) -> Iterator[Dict[str, Any]]:
+    """Histogram.time that is a no-op while metrics are disabled."""
+    if not settings.metrics_enabled:
+        yield dict(labels)
+        return
+    with histogram.time(**labels) as observed:
+        yield observed
+
+
+def time_firestore_operation(collection: str, operation: str):
+    """Observe a Firestore operation into firestore_operation_duration_seconds."""
+    return observe_duration(
+        FIRESTORE_OPERATION_DURATION, collection=collection, operation=operation
+    )
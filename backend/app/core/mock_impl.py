@@ -1,15 +1,64 @@
 """
-Mock implementation of the database interface for testing.
+Mock implementations of the database interfaces for testing.
+
+AsyncMockClient exposes the same in-memory data as a MockClient through the
+asyncio interface, so sync and async callers in one test see each other's
+writes just as they would against Firestore.
 """
 
 import copy
-from typing import Any, Dict, List, Optional, Union
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 from app.core.database import (
     DatabaseClient, CollectionReference, DocumentReference, 
-    DocumentSnapshot, Query, ArrayUnion, Increment
+    DocumentSnapshot, Query, ArrayUnion, Increment, DocumentAlreadyExistsError,
+    WriteBatch, Transaction,
+    AsyncDatabaseClient, AsyncCollectionReference, AsyncDocumentReference, AsyncQuery
 )
 
+T = TypeVar("T")
+
+# Serializes writes, batch commits and transactions so concurrent callers
+# (e.g. via asyncio.to_thread) see the same atomicity as Firestore
+_write_lock = threading.RLock()
+
+# (operation, document, data, merge)
+_Write = Tuple[str, "MockDocumentReference", Optional[Dict[str, Any]], bool]
+
+
+def _commit_writes(writes: List[_Write]) -> None:
+    """Apply writes in order, all or nothing."""
+    with _write_lock:
+        staged: Dict[Tuple[int, str], Tuple["MockDocumentReference", Optional[Dict[str, Any]]]] = {}
+        for op, doc_ref, data, merge in writes:
+            key = (id(doc_ref._collection_data), doc_ref.id)
+            existing = staged[key][1] if key in staged else doc_ref._collection_data.get(doc_ref.id)
+
+            if op == "create" and existing is not None:
+                raise DocumentAlreadyExistsError(
+                    f"Document {doc_ref.id} already exists in {doc_ref._collection_name}"
+                )
+            if op == "update" and existing is None:
+                raise Exception(f"Document {doc_ref.id} does not exist")
+
+            if op == "delete":
+                new_data = None
+            else:
+                processed_data = doc_ref._process_operations(data, existing or {})
+                if existing is not None and (op == "update" or merge):
+                    new_data = copy.deepcopy(existing)
+                    new_data.update(processed_data)
+                else:
+                    new_data = copy.deepcopy(processed_data)
+            staged[key] = (doc_ref, new_data)
+
+        for doc_ref, new_data in staged.values():
+            if new_data is None:
+                doc_ref._collection_data.pop(doc_ref.id, None)
+            else:
+                doc_ref._collection_data[doc_ref.id] = new_data
+
 
 class MockClient(DatabaseClient):
     """Mock implementation of DatabaseClient for testing."""
@@ -24,6 +73,14 @@ class MockClient(DatabaseClient):
             self._data[name] = {}
         return MockCollectionReference(name, self._data[name], self._data)
 
+    def batch(self) -> "MockWriteBatch":
+        """Start a batch of writes committed atomically."""
+        return MockWriteBatch()
+
+    def transaction(self, max_attempts: int = 5) -> "MockTransaction":
+        """Start a read-write transaction."""
+        return MockTransaction()
+
 
 class MockCollectionReference(CollectionReference):
     """Mock implementation of CollectionReference."""
@@ -82,41 +139,32 @@ class MockDocumentReference(DocumentReference):
 
     def set(self, data: Dict[str, Any], merge: bool = False) -> None:
         """Set document data."""
-        processed_data = self._process_operations(data)
+        _commit_writes([("set", self, data, merge)])
 
-        if merge and self.id in self._collection_data:
-            # Merge with existing data
-            existing_data = copy.deepcopy(self._collection_data[self.id])
-            existing_data.update(processed_data)
-            self._collection_data[self.id] = existing_data
-        else:
-            # Replace entirely
-            self._collection_data[self.id] = copy.deepcopy(processed_data)
+    def create(self, data: Dict[str, Any]) -> None:
+        """Create the document; raises DocumentAlreadyExistsError if it exists."""
+        _commit_writes([("create", self, data, False)])
 
     def update(self, data: Dict[str, Any]) -> None:
         """Update document data."""
-        if self.id not in self._collection_data:
-            raise Exception(f"Document {self.id} does not exist")
-
-        processed_data = self._process_operations(data)
-        existing_data = copy.deepcopy(self._collection_data[self.id])
-        existing_data.update(processed_data)
-        self._collection_data[self.id] = existing_data
+        _commit_writes([("update", self, data, False)])
 
     def delete(self) -> None:
         """Delete the document."""
-        if self.id in self._collection_data:
-            del self._collection_data[self.id]
+        _commit_writes([("delete", self, None, False)])
 
-    def _process_operations(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_operations(
+        self, data: Dict[str, Any], existing_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Process abstract operations into actual data changes."""
+        if existing_data is None:
+            existing_data = self._collection_data.get(self.id, {})
         processed = {}
 
         for key, value in data.items():
             if isinstance(value, ArrayUnion):
                 # Simulate ArrayUnion by appending to existing array
-                existing_data = self._collection_data.get(self.id, {})
-                existing_array = existing_data.get(key, [])
+                existing_array = list(existing_data.get(key, []))
 
                 # Add new values that aren't already in the array
                 for new_value in value.values:
@@ -127,7 +175,6 @@ class MockDocumentReference(DocumentReference):
 
             elif isinstance(value, Increment):
                 # Simulate Increment by adding to existing value
-                existing_data = self._collection_data.get(self.id, {})
                 existing_value = existing_data.get(key, 0)
                 processed[key] = existing_value + value.value
 
@@ -280,4 +327,179 @@ class MockQuery(Query):
             return self._get_nested_value(doc_data, field)
 
         reverse = direction.upper() == "DESCENDING"
-        return sorted(docs, key=sort_key, reverse=reverse) 
+        return sorted(docs, key=sort_key, reverse=reverse)
+
+
+class MockWriteBatch(WriteBatch):
+    """Mock implementation of WriteBatch."""
+
+    def __init__(self):
+        self._writes: List[_Write] = []
+
+    def set(self, doc_ref: MockDocumentReference, data: Dict[str, Any], merge: bool = False) -> "MockWriteBatch":
+        """Buffer a set."""
+        self._writes.append(("set", doc_ref, data, merge))
+        return self
+
+    def create(self, doc_ref: MockDocumentReference, data: Dict[str, Any]) -> "MockWriteBatch":
+        """Buffer a create; the commit fails if the document exists."""
+        self._writes.append(("create", doc_ref, data, False))
+        return self
+
+    def update(self, doc_ref: MockDocumentReference, data: Dict[str, Any]) -> "MockWriteBatch":
+        """Buffer an update; the commit fails if the document is missing."""
+        self._writes.append(("update", doc_ref, data, False))
+        return self
+
+    def delete(self, doc_ref: MockDocumentReference) -> "MockWriteBatch":
+        """Buffer a delete."""
+        self._writes.append(("delete", doc_ref, None, False))
+        return self
+
+    def commit(self) -> None:
+        """Apply the buffered writes atomically."""
+        _commit_writes(self._writes)
+        self._writes = []
+
+
+class MockTransaction(Transaction):
+    """
+    Mock implementation of Transaction.
+
+    run() holds the mock's write lock for the whole attempt, so transactions
+    are serialized against each other and against plain writes and never
+    need to be retried.
+    """
+
+    def __init__(self):
+        self._writes: List[_Write] = []
+
+    def get(self, doc_ref: MockDocumentReference) -> "MockDocumentSnapshot":
+        """Read a document within the transaction."""
+        if self._writes:
+            raise Exception("Transaction reads must happen before writes")
+        return doc_ref.get()
+
+    def set(self, doc_ref: MockDocumentReference, data: Dict[str, Any], merge: bool = False) -> None:
+        """Buffer a set."""
+        self._writes.append(("set", doc_ref, data, merge))
+
+    def create(self, doc_ref: MockDocumentReference, data: Dict[str, Any]) -> None:
+        """Buffer a create; the commit fails if the document exists."""
+        self._writes.append(("create", doc_ref, data, False))
+
+    def update(self, doc_ref: MockDocumentReference, data: Dict[str, Any]) -> None:
+        """Buffer an update; the commit fails if the document is missing."""
+        self._writes.append(("update", doc_ref, data, False))
+
+    def delete(self, doc_ref: MockDocumentReference) -> None:
+        """Buffer a delete."""
+        self._writes.append(("delete", doc_ref, None, False))
+
+    def run(self, func: Callable[[Transaction], T]) -> T:
+        """Run func in the transaction and commit its writes."""
+        with _write_lock:
+            self._writes = []
+            try:
+                result = func(self)
+                _commit_writes(self._writes)
+            finally:
+                self._writes = []
+            return result
+
+
+class AsyncMockClient(AsyncDatabaseClient):
+    """
+    Mock implementation of AsyncDatabaseClient for testing.
+
+    Args:
+        project_id: Ignored, accepted for parity with AsyncFirestoreClient
+        sync_client: MockClient whose data to share (default: a new one)
+    """
+
+    def __init__(self, project_id: Optional[str] = None, sync_client: Optional[MockClient] = None):
+        self.project_id = project_id
+        self.sync_client = sync_client if sync_client is not None else MockClient(project_id)
+
+    def collection(self, name: str) -> "AsyncMockCollectionReference":
+        """Get a collection reference."""
+        return AsyncMockCollectionReference(self.sync_client.collection(name))
+
+
+class AsyncMockCollectionReference(AsyncCollectionReference):
+    """Mock implementation of AsyncCollectionReference."""
+
+    def __init__(self, collection_ref: MockCollectionReference):
+        self._collection_ref = collection_ref
+        self.name = collection_ref.name
+
+    def document(self, doc_id: str) -> "AsyncMockDocumentReference":
+        """Get a document reference."""
+        return AsyncMockDocumentReference(self._collection_ref.document(doc_id))
+
+    async def add(self, data: Dict[str, Any]) -> "AsyncMockDocumentReference":
+        """Add a new document."""
+        return AsyncMockDocumentReference(self._collection_ref.add(data))
+
+    async def stream(self) -> List[MockDocumentSnapshot]:
+        """Stream all documents in the collection."""
+        return self._collection_ref.stream()
+
+    def where(self, field: str, op: str, value: Any) -> "AsyncMockQuery":
+        """Create a query with a where clause."""
+        return AsyncMockQuery(self._collection_ref.where(field, op, value))
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "AsyncMockQuery":
+        """Create a query with ordering."""
+        return AsyncMockQuery(self._collection_ref.order_by(field, direction))
+
+
+class AsyncMockDocumentReference(AsyncDocumentReference):
+    """Mock implementation of AsyncDocumentReference."""
+
+    def __init__(self, doc_ref: MockDocumentReference):
+        self._doc_ref = doc_ref
+        self.id = doc_ref.id
+
+    async def get(self) -> MockDocumentSnapshot:
+        """Get the document."""
+        return self._doc_ref.get()
+
+    async def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        """Set document data."""
+        self._doc_ref.set(data, merge=merge)
+
+    async def create(self, data: Dict[str, Any]) -> None:
+        """Create the document; raises DocumentAlreadyExistsError if it exists."""
+        self._doc_ref.create(data)
+
+    async def update(self, data: Dict[str, Any]) -> None:
+        """Update document data."""
+        self._doc_ref.update(data)
+
+    async def delete(self) -> None:
+        """Delete the document."""
+        self._doc_ref.delete()
+
+
+class AsyncMockQuery(AsyncQuery):
+    """Mock implementation of AsyncQuery."""
+
+    def __init__(self, query: MockQuery):
+        self._query = query
+
+    def where(self, field: str, op: str, value: Any) -> "AsyncMockQuery":
+        """Add a where clause."""
+        return AsyncMockQuery(self._query.where(field, op, value))
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "AsyncMockQuery":
+        """Add ordering."""
+        return AsyncMockQuery(self._query.order_by(field, direction))
+
+    def limit(self, count: int) -> "AsyncMockQuery":
+        """Limit results."""
+        return AsyncMockQuery(self._query.limit(count))
+
+    async def stream(self) -> List[MockDocumentSnapshot]:
+        """Execute query and return results."""
+        return self._query.stream()
@@ -0,0 +1,239 @@
+"""
+Managed process pool for CPU-bound work.
+
+PDF rendering and HTML parsing hold the GIL for long stretches, so running
+them on the event loop or in the default thread pool stalls every other
+request in the process. ProcessPoolService runs them in a small pool of
+warm worker processes that import WeasyPrint, markdown and bs4 once at
+start-up, with:
+
+- a bounded queue: at most max_workers tasks run and max_queue wait for a
+  worker; further tasks are rejected with ProcessPoolBusyError
+- per-task timeouts: a task that overruns is abandoned and the pool is
+  replaced for new tasks; the old pool's workers, including the stuck one,
+  are terminated once its other in-flight tasks have finished
+- crash recovery: a worker that dies (segfault, OOM kill) breaks the pool;
+  it is replaced and the affected task is retried once
+
+Tasks must be picklable module-level functions with picklable arguments.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Sequence, Set
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY, observe_duration
+
+logger = logging.getLogger(__name__)
+
+PROCESS_POOL_TASK_DURATION = REGISTRY.histogram(
+    "process_pool_task_duration_seconds",
+    "Duration of CPU-bound tasks run in the process pool, including queueing",
+    ("task", "outcome"),
+)
+
+
+class ProcessPoolBusyError(RuntimeError):
+    """Raised when the process pool queue is full."""
+
+
+class ProcessPoolTimeoutError(TimeoutError):
+    """Raised when a process pool task exceeds its timeout."""
+
+
+def _warm_worker(modules: Sequence[str]) -> None:
+    """Worker initializer: import heavy modules once per process."""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:  # Missing native libraries surface as OSError
+            logging.getLogger(__name__).warning(f"Process pool worker could not preload {module}: {e}")
+
+
+def _ping() -> bool:
+    return True
+
+
+class ProcessPoolService:
+    """
+    Process pool with warm workers, a bounded queue, timeouts and crash recovery.
+
+    Args:
+        max_workers: Worker processes
+        max_queue: Tasks allowed to wait for a free worker
+        task_timeout_seconds: Default per-task deadline (execution only)
+        preload: Modules imported by each worker at start-up
+        start_method: multiprocessing start method ("spawn", "forkserver", "fork")
+        enabled: When False, tasks run in the default thread pool instead
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        task_timeout_seconds: Optional[float] = None,
+        preload: Optional[Sequence[str]] = None,
+        start_method: Optional[str] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.max_workers = max(1, max_workers or settings.process_pool_workers)
+        self.max_queue = max(0, max_queue if max_queue is not None else settings.process_pool_max_queue)
+        self.task_timeout_seconds = task_timeout_seconds or settings.process_pool_task_timeout_seconds
+        self.preload = tuple(preload if preload is not None else settings.process_pool_preload)
+        self.start_method = start_method or settings.process_pool_start_method
+        self.enabled = settings.process_pool_enabled if enabled is None else enabled
+        self.restarts = 0
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Tasks submitted to each executor and not yet finished or abandoned
+        self._inflight: Dict[ProcessPoolExecutor, int] = {}
+        # Replaced executors whose workers are terminated once idle
+        self._retiring: Set[ProcessPoolExecutor] = set()
+        self._lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_warm_worker,
+                    initargs=(self.preload,),
+                )
+            return self._executor
+
+    def start(self) -> None:
+        """Spawn and warm every worker so the first task does not pay for it."""
+        if not self.enabled:
+            return
+        executor = self._ensure_executor()
+        for _ in range(self.max_workers):
+            executor.submit(_ping)
+        logger.info(f"ProcessPoolService: Started {self.max_workers} workers ({self.start_method})")
+
+    def _recycle(self, executor: ProcessPoolExecutor, reason: str) -> None:
+        """
+        Start a fresh pool for new tasks and retire the old one.
+
+        The old pool's workers are terminated once its remaining in-flight
+        tasks finish, so healthy tasks sharing it with a stuck one complete.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return  # Already replaced by another task
+            self._executor = None
+            self.restarts += 1
+            self._retiring.add(executor)
+            idle = not self._inflight.get(executor)
+        logger.warning(f"ProcessPoolService: Recycling worker pool ({reason})")
+        if idle:
+            self._terminate(executor)
+
+    def _task_done(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            self._inflight[executor] -= 1
+            if self._inflight[executor]:
+                return
+            del self._inflight[executor]
+            if executor not in self._retiring:
+                return
+        self._terminate(executor)
+
+    def _terminate(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a retired pool's workers, including any stuck on an abandoned task."""
+        with self._lock:
+            self._retiring.discard(executor)
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._waiting = 0
+            self._loop = loop
+        return self._semaphore
+
+    async def run(
+        self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run func(*args) in a worker process.
+
+        Raises:
+            ProcessPoolBusyError: If max_queue tasks are already waiting
+            ProcessPoolTimeoutError: If the task exceeds its timeout
+            BrokenProcessPool: If the task crashed its worker twice
+        """
+        timeout = timeout or self.task_timeout_seconds
+        task_name = getattr(func, "__name__", "task")
+        with observe_duration(PROCESS_POOL_TASK_DURATION, task=task_name):
+            if not self.enabled:
+                try:
+                    return await asyncio.wait_for(asyncio.to_thread(func, *args), timeout)
+                except asyncio.TimeoutError:
+                    raise ProcessPoolTimeoutError(f"{task_name} exceeded {timeout}s")
+
+            semaphore = self._get_semaphore()
+            if semaphore.locked() and self._waiting >= self.max_queue:
+                raise ProcessPoolBusyError(
+                    f"Process pool queue is full ({self.max_queue} tasks waiting)"
+                )
+            self._waiting += 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self._waiting -= 1
+            try:
+                return await self._submit(func, args, timeout, task_name)
+            finally:
+                semaphore.release()
+
+    async def _submit(self, func, args, timeout: float, task_name: str) -> Any:
+        for attempt in (1, 2):
+            executor = self._ensure_executor()
+            with self._lock:
+                self._inflight[executor] = self._inflight.get(executor, 0) + 1
+            try:
+                future = asyncio.wrap_future(executor.submit(func, *args))
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                self._recycle(executor, f"{task_name} exceeded {timeout}s")
+                raise ProcessPoolTimeoutError(f"{task_name} exceeded {timeout}s")
+            except BrokenProcessPool:
+                self._recycle(executor, f"worker crashed running {task_name}")
+                if attempt == 2:
+                    raise
+                logger.warning(f"ProcessPoolService: Retrying {task_name} on a fresh pool")
+            finally:
+                self._task_done(executor)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "waiting": self._waiting,
+            "restarts": self.restarts,
+            "retiring": len(self._retiring),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            retiring = list(self._retiring)
+        for retired in retiring:
+            self._terminate(retired)
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,128 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+The first caller for a key starts the work; concurrent callers with the
+same key await the same task and receive the same result. A successful
+result is also kept for a short window after completion so late duplicates
+(double-clicks, client retries) get it instead of starting the work again.
+Failures are shared with concurrent callers but never kept.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_COALESCED = REGISTRY.counter(
+    "single_flight_coalesced_total",
+    "Calls served by an identical in-flight or recently completed call",
+    ("name", "source"),
+)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def payload_hash(payload: Any) -> str:
+    """Hash of a payload that ignores key order and surrounding whitespace."""
+    canonical = json.dumps(_normalize(payload), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    Args:
+        name: Name used in logs and metrics
+        window_seconds: How long a successful result is reused after completion
+        max_entries: Completed results kept at most
+    """
+
+    def __init__(self, name: str, window_seconds: float = 0.0, max_entries: int = 1024):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._recent: Dict[str, Tuple[float, Any]] = {}
+
+    def _recent_result(self, key: str) -> Tuple[bool, Any]:
+        entry = self._recent.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            self._recent.pop(key, None)
+            return False, None
+        return True, result
+
+    def _remember(self, key: str, result: Any) -> None:
+        if self.window_seconds <= 0:
+            return
+        now = time.monotonic()
+        for stale in [k for k, (expires_at, _) in self._recent.items() if expires_at <= now]:
+            del self._recent[stale]
+        while len(self._recent) >= self.max_entries:
+            self._recent.pop(next(iter(self._recent)))
+        self._recent[key] = (now + self.window_seconds, result)
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Run func() once per key among concurrent callers.
+
+        Args:
+            key: Identity of the call
+            func: Zero-argument coroutine function doing the work
+            cacheable: Decides whether a result is kept for the post-completion
+                window (default: every result)
+
+        Returns:
+            Any: The result of the shared call
+        """
+        found, result = self._recent_result(key)
+        if found:
+            SINGLE_FLIGHT_COALESCED.inc(name=self.name, source="recent")
+            return result
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            SINGLE_FLIGHT_COALESCED.inc(name=self.name, source="inflight")
+            logger.info(f"SingleFlight[{self.name}]: Joined in-flight call {key[:16]}")
+        else:
+            task = asyncio.create_task(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, cacheable))
+
+        # A caller that goes away (e.g. client disconnect) must not cancel
+        # the work other callers are waiting on
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task, cacheable) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if cacheable is None or cacheable(result):
+            self._remember(key, result)
+
+    def clear(self) -> None:
+        self._recent.clear()
@@ -0,0 +1,157 @@
+"""
+Structured (JSON) output handling for agent LLM calls.
+
+- extract_json_object finds the first valid JSON object in model output with
+  a string-aware balanced-brace scan, instead of a greedy regex that
+  backtracks over long outputs and breaks on trailing braces.
+- StructuredOutput wraps a pydantic model whose validator is compiled once
+  at import time, and derives the Vertex AI response schema used to request
+  JSON mode.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Schema keys understood by the Vertex AI Schema proto
+_VERTEX_SCHEMA_KEYS = frozenset(
+    ["type", "format", "description", "enum", "items", "properties", "required", "nullable"]
+)
+
+
+def _match_object_end(text: str, start: int) -> int:
+    """Index of the brace closing the object opened at start, or -1."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first valid JSON object embedded in text.
+
+    Balanced candidates that are not valid JSON are skipped as a whole, so
+    the scan is linear in the length of text; only an unmatched opening
+    brace causes the scan to resume just after it.
+    """
+    if not text:
+        return None
+    position = 0
+    while True:
+        start = text.find("{", position)
+        if start == -1:
+            return None
+        end = _match_object_end(text, start)
+        if end == -1:
+            position = start + 1
+            continue
+        try:
+            value = json.loads(text[start : end + 1])
+        except ValueError:
+            position = end + 1
+            continue
+        if isinstance(value, dict):
+            return value
+        position = end + 1
+
+
+def vertex_response_schema(json_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a pydantic JSON schema into the OpenAPI subset Vertex AI accepts
+    as a response schema: $refs are inlined, Optional fields become nullable
+    and unsupported keywords are dropped.
+    """
+    definitions = json_schema.get("$defs", {})
+
+    def convert(node: Dict[str, Any]) -> Dict[str, Any]:
+        if "$ref" in node:
+            node = definitions[node["$ref"].rsplit("/", 1)[-1]]
+        if "anyOf" in node:
+            options = [o for o in node["anyOf"] if o.get("type") != "null"]
+            if {o.get("type") for o in options} <= {"integer", "number"} and len(options) > 1:
+                converted = {"type": "number"}
+            else:
+                converted = convert(options[0]) if options else {"type": "string"}
+            if len(options) < len(node["anyOf"]):
+                converted["nullable"] = True
+            return converted
+
+        converted = {}
+        for key, value in node.items():
+            if key == "properties":
+                converted[key] = {name: convert(prop) for name, prop in value.items()}
+            elif key == "items":
+                converted[key] = convert(value)
+            elif key in _VERTEX_SCHEMA_KEYS:
+                converted[key] = value
+        return converted
+
+    return convert(json_schema)
+
+
+class StructuredOutput:
+    """
+    Output contract for one agent LLM call.
+
+    Args:
+        model: Pydantic model describing the expected JSON object. Extra
+            fields should be allowed on the model if callers rely on them.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.name = model.__name__
+        self.response_schema = vertex_response_schema(model.model_json_schema())
+
+    def generation_config(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """Generation config requesting JSON output that matches the schema."""
+        if not settings.llm_json_mode_enabled:
+            return dict(base)
+        return {
+            **base,
+            "response_mime_type": "application/json",
+            "response_schema": self.response_schema,
+        }
+
+    def validate(self, data: Any) -> Optional[Dict[str, Any]]:
+        """Validate a decoded object, returning it normalized or None."""
+        try:
+            validated = self.model.model_validate(data)
+        except ValidationError as e:
+            logger.info(
+                f"StructuredOutput: {self.name} validation failed ({e.error_count()} errors)"
+            )
+            return None
+        return validated.model_dump(exclude_unset=True)
+
+    def parse(self, text: str) -> Optional[Dict[str, Any]]:
+        """Extract and validate the JSON object in a model response."""
+        data = extract_json_object(text or "")
+        if data is None:
+            logger.info(f"StructuredOutput: No JSON object found for {self.name}")
+            return None
+        return self.validate(data)
@@ -2,8 +2,11 @@
 Main application entry point for DrFirst Business Case Generator Backend
 """
 
+import asyncio
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import firebase_admin
 from firebase_admin import credentials
@@ -15,8 +18,10 @@ from app.api.v1 import auth_routes, admin_routes, debug_routes
 from app.api.v1.cases import cases_router
 from app.api.v1 import prompts
 from app.core.config import settings
+from app.core.dependencies import close_http_client, get_process_pool, shutdown_process_pool
 from app.core.error_handlers import EXCEPTION_HANDLERS
 from app.core.logging_config import setup_logging
+from app.core.metrics import REGISTRY as metrics_registry
 from app.services.auth_service import auth_service
 from app.middleware.rate_limiter import limiter, rate_limit_exceeded_handler
 
@@ -30,10 +35,31 @@ logger = logging.getLogger(__name__)
 # The auth_service handles the initialization with proper fallbacks
 logger.info(f"Firebase Admin SDK initialization status: {auth_service.is_initialized}")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: warm the process pool, optionally run an embedded
+    job worker, and release shared clients on shutdown.
+    """
+    get_process_pool().start()
+    worker_stop = asyncio.Event()
+    worker_task = None
+    if settings.job_worker_embedded:
+        from app.worker import build_worker
+        worker_task = asyncio.create_task(build_worker().run(worker_stop))
+    yield
+    if worker_task is not None:
+        worker_stop.set()
+        await worker_task
+    await close_http_client()
+    shutdown_process_pool()
+
+
 app = FastAPI(
     title="DrFirst Business Case Generator API",
     description="Backend API for the DrFirst Agentic Business Case Generator",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS to allow frontend development servers
@@ -76,6 +102,16 @@ async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint for agent, LLM and Firestore metrics"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/debug/firebase-status")
 async def firebase_status():
     """Debug endpoint to check Firebase initialization status and configuration"""
@@ -278,6 +278,23 @@ class Job(BaseModel):
         default_factory=dict, 
         description="Additional job metadata"
     )
+    payload: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Input passed to the job handler"
+    )
+    result: Optional[Dict[str, Any]] = Field(None, description="Handler result on completion")
+    progress_message: Optional[str] = Field(
+        None,
+        max_length=500,
+        description="Latest progress description from the worker"
+    )
+    attempts: int = Field(0, ge=0, description="Number of times the job has been claimed")
+    max_attempts: int = Field(3, ge=1, description="Claims allowed before the job fails")
+    worker_id: Optional[str] = Field(None, description="Worker holding the current lease")
+    lease_expires_at: Optional[datetime] = Field(
+        None, description="When the current lease lapses unless heartbeated"
+    )
+    heartbeat_at: Optional[datetime] = None
 
     @validator('metadata')
     def validate_metadata_size(cls, v):
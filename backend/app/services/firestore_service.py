@@ -2,13 +2,12 @@
 Firestore service for database operations
 """
 
-import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 from app.core.config import settings
-from app.core.dependencies import get_db
-from app.core.database import DatabaseClient
+from app.core.dependencies import get_async_db
+from app.core.database import AsyncDatabaseClient
 from app.core.exceptions import (
     DatabaseError, UserNotFoundError, BusinessCaseNotFoundError, 
     JobNotFoundError, ServiceError
@@ -34,9 +33,9 @@ class DocumentNotFoundError(FirestoreServiceError):
 class FirestoreService:
     """Service for Firestore database operations"""
 
-    def __init__(self, db: Optional[DatabaseClient] = None):
+    def __init__(self, db: Optional[AsyncDatabaseClient] = None):
         self.logger = logging.getLogger(__name__)
-        self._db = db if db is not None else get_db()
+        self._db = db if db is not None else get_async_db()
         
         # Collection names from settings
         self.users_collection = settings.firestore_collection_users
@@ -66,7 +65,7 @@ class FirestoreService:
             if 'last_login' in user_data and user_data['last_login']:
                 user_data['last_login'] = user_data['last_login'].isoformat()
             
-            await asyncio.to_thread(user_ref.set, user_data)
+            await user_ref.set(user_data)
             
             self.logger.info(f"User {user.uid} created successfully")
             return True
@@ -85,7 +84,7 @@ class FirestoreService:
             self.logger.debug(f"Retrieving user with UID: {uid}")
             
             user_ref = self._db.collection(self.users_collection).document(uid)
-            doc = await asyncio.to_thread(user_ref.get)
+            doc = await user_ref.get()
             
             if not doc.exists:
                 self.logger.debug(f"User {uid} not found")
@@ -120,7 +119,7 @@ class FirestoreService:
             
             users_ref = self._db.collection(self.users_collection)
             query = users_ref.where("email", "==", email)
-            docs = await asyncio.to_thread(query.stream)
+            docs = await query.stream()
             
             for doc in docs:
                 if doc.exists:
@@ -161,11 +160,11 @@ class FirestoreService:
             user_ref = self._db.collection(self.users_collection).document(uid)
             
             # Check if user exists first
-            doc = await asyncio.to_thread(user_ref.get)
+            doc = await user_ref.get()
             if not doc.exists:
                 raise UserNotFoundError(uid)
             
-            await asyncio.to_thread(user_ref.update, updates)
+            await user_ref.update(updates)
             
             self.logger.info(f"User {uid} updated successfully")
             return True
@@ -186,7 +185,7 @@ class FirestoreService:
             self.logger.debug("Retrieving all users")
             
             users_ref = self._db.collection(self.users_collection)
-            docs = await asyncio.to_thread(users_ref.stream)
+            docs = await users_ref.stream()
             
             users = []
             for doc in docs:
@@ -218,11 +217,11 @@ class FirestoreService:
             user_ref = self._db.collection(self.users_collection).document(uid)
             
             # Check if user exists first
-            doc = await asyncio.to_thread(user_ref.get)
+            doc = await user_ref.get()
             if not doc.exists:
                 raise DocumentNotFoundError(f"User {uid} not found")
             
-            await asyncio.to_thread(user_ref.delete)
+            await user_ref.delete()
             
             self.logger.info(f"User {uid} deleted successfully")
             return True
@@ -263,12 +262,12 @@ class FirestoreService:
             if business_case.id:
                 # Use specific ID if provided
                 doc_ref = cases_ref.document(business_case.id)
-                await asyncio.to_thread(doc_ref.set, case_data)
+                await doc_ref.set(case_data)
                 case_id = business_case.id
             else:
                 # Auto-generate ID
-                doc_ref = await asyncio.to_thread(cases_ref.add, case_data)
-                case_id = doc_ref[1].id
+                doc_ref = await cases_ref.add(case_data)
+                case_id = doc_ref.id
             
             self.logger.info(f"Business case created with ID: {case_id}")
             return case_id
@@ -283,7 +282,7 @@ class FirestoreService:
             self.logger.debug(f"Retrieving business case: {case_id}")
             
             case_ref = self._db.collection(self.business_cases_collection).document(case_id)
-            doc = await asyncio.to_thread(case_ref.get)
+            doc = await case_ref.get()
             
             if not doc.exists:
                 self.logger.debug(f"Business case {case_id} not found")
@@ -334,11 +333,11 @@ class FirestoreService:
             case_ref = self._db.collection(self.business_cases_collection).document(case_id)
             
             # Check if case exists first
-            doc = await asyncio.to_thread(case_ref.get)
+            doc = await case_ref.get()
             if not doc.exists:
                 raise DocumentNotFoundError(f"Business case {case_id} not found")
             
-            await asyncio.to_thread(case_ref.update, updates)
+            await case_ref.update(updates)
             
             self.logger.info(f"Business case {case_id} updated successfully")
             return True
@@ -361,7 +360,7 @@ class FirestoreService:
             if status_filter:
                 query = query.where("status", "==", status_filter)
             
-            docs = await asyncio.to_thread(query.stream)
+            docs = await query.stream()
             
             cases = []
             for doc in docs:
@@ -396,7 +395,7 @@ class FirestoreService:
             
             cases_ref = self._db.collection(self.business_cases_collection)
             query = cases_ref.where("status", "==", status)
-            docs = await asyncio.to_thread(query.stream)
+            docs = await query.stream()
             
             cases = []
             for doc in docs:
@@ -434,11 +433,11 @@ class FirestoreService:
             case_ref = self._db.collection(self.business_cases_collection).document(case_id)
             
             # Check if case exists first
-            doc = await asyncio.to_thread(case_ref.get)
+            doc = await case_ref.get()
             if not doc.exists:
                 raise DocumentNotFoundError(f"Business case {case_id} not found")
             
-            await asyncio.to_thread(case_ref.delete)
+            await case_ref.delete()
             
             self.logger.info(f"Business case {case_id} deleted successfully")
             return True
@@ -476,12 +475,12 @@ class FirestoreService:
             if job.id:
                 # Use specific ID if provided
                 doc_ref = jobs_ref.document(job.id)
-                await asyncio.to_thread(doc_ref.set, job_data)
+                await doc_ref.set(job_data)
                 job_id = job.id
             else:
                 # Auto-generate ID
-                doc_ref = await asyncio.to_thread(jobs_ref.add, job_data)
-                job_id = doc_ref[1].id
+                doc_ref = await jobs_ref.add(job_data)
+                job_id = doc_ref.id
             
             self.logger.info(f"Job created with ID: {job_id}")
             return job_id
@@ -496,7 +495,7 @@ class FirestoreService:
             self.logger.debug(f"Retrieving job: {job_id}")
             
             job_ref = self._db.collection(self.jobs_collection).document(job_id)
-            doc = await asyncio.to_thread(job_ref.get)
+            doc = await job_ref.get()
             
             if not doc.exists:
                 self.logger.debug(f"Job {job_id} not found")
@@ -539,11 +538,11 @@ class FirestoreService:
             job_ref = self._db.collection(self.jobs_collection).document(job_id)
             
             # Check if job exists first
-            doc = await asyncio.to_thread(job_ref.get)
+            doc = await job_ref.get()
             if not doc.exists:
                 raise DocumentNotFoundError(f"Job {job_id} not found")
             
-            await asyncio.to_thread(job_ref.update, updates)
+            await job_ref.update(updates)
             
             self.logger.info(f"Job {job_id} updated successfully")
             return True
@@ -561,7 +560,7 @@ class FirestoreService:
             
             jobs_ref = self._db.collection(self.jobs_collection)
             query = jobs_ref.where("user_uid", "==", user_id)
-            docs = await asyncio.to_thread(query.stream)
+            docs = await query.stream()
             
             jobs = []
             for doc in docs:
@@ -595,7 +594,7 @@ class FirestoreService:
             
             jobs_ref = self._db.collection(self.jobs_collection)
             query = jobs_ref.where("status", "==", status.value)
-            docs = await asyncio.to_thread(query.stream)
+            docs = await query.stream()
             
             jobs = []
             for doc in docs:
@@ -630,11 +629,11 @@ class FirestoreService:
             job_ref = self._db.collection(self.jobs_collection).document(job_id)
             
             # Check if job exists first
-            doc = await asyncio.to_thread(job_ref.get)
+            doc = await job_ref.get()
             if not doc.exists:
                 raise DocumentNotFoundError(f"Job {job_id} not found")
             
-            await asyncio.to_thread(job_ref.delete)
+            await job_ref.delete()
             
             self.logger.info(f"Job {job_id} deleted successfully")
             return True
@@ -0,0 +1,121 @@
+"""
+Single-pass HTML text extraction.
+
+Walks the parsed document once, emitting each text node exactly once and
+breaking lines at block-level elements. Extraction stops as soon as the
+character budget is exceeded. Uses the lxml parser when it is installed and
+falls back to the standard library html.parser otherwise.
+"""
+
+from typing import Dict, List
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import Comment, Declaration, Doctype, ProcessingInstruction
+
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+TRUNCATION_MARKER = "... [Content truncated]"
+MIN_BLOCK_LENGTH = 10  # Blocks this short or shorter are dropped as noise
+
+# Elements whose text never contributes to the extracted content
+SKIP_TAGS = frozenset(
+    ["script", "style", "nav", "header", "footer", "sidebar", "aside", "noscript", "template"]
+)
+
+# Elements that start a new line of extracted text
+BLOCK_TAGS = frozenset(
+    [
+        "address", "article", "blockquote", "br", "dd", "div", "dl", "dt",
+        "fieldset", "figcaption", "figure", "form", "h1", "h2", "h3", "h4",
+        "h5", "h6", "hr", "li", "main", "ol", "p", "pre", "section", "table",
+        "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+    ]
+)
+
+# Main content containers, in priority order
+CONTENT_SELECTORS = [
+    "main",
+    "article",
+    '[role="main"]',
+    ".content",
+    "#content",
+    ".main-content",
+    ".post-content",
+    ".entry-content",
+]
+
+_IGNORED_STRINGS = (Comment, Declaration, Doctype, ProcessingInstruction)
+_BLOCK_END = object()
+
+
+def _find_content_root(soup: BeautifulSoup) -> Tag:
+    for selector in CONTENT_SELECTORS:
+        main_content = soup.select_one(selector)
+        if main_content:
+            return main_content
+    return soup.find("body") or soup
+
+
+def extract_html_text(html: str, max_chars: int) -> Dict[str, str]:
+    """
+    Extract the title and readable text of an HTML document.
+
+    Args:
+        html (str): Raw HTML content
+        max_chars (int): Character budget; longer text is cut and marked
+            with TRUNCATION_MARKER
+
+    Returns:
+        Dict[str, str]: Dictionary with 'text' and 'title' keys
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    title_tag = soup.find("title")
+    title = title_tag.get_text().strip() if title_tag else "No title"
+
+    blocks: List[str] = []
+    current: List[str] = []
+    total = 0
+    truncated = False
+
+    def flush() -> None:
+        nonlocal total, truncated
+        if not current:
+            return
+        text = " ".join("".join(current).split())
+        current.clear()
+        if len(text) > MIN_BLOCK_LENGTH:
+            blocks.append(text)
+            total += len(text) + 1
+            if total > max_chars:
+                truncated = True
+
+    # Iterative pre-order walk so deep DOMs cannot hit the recursion limit
+    stack: list = [_find_content_root(soup)]
+    while stack and not truncated:
+        node = stack.pop()
+        if node is _BLOCK_END:
+            flush()
+        elif isinstance(node, NavigableString):
+            if not isinstance(node, _IGNORED_STRINGS):
+                current.append(str(node))
+        elif isinstance(node, Tag):
+            if node.name in SKIP_TAGS:
+                continue
+            if node.name in BLOCK_TAGS:
+                flush()
+                stack.append(_BLOCK_END)
+            stack.extend(reversed(node.contents))
+    if not truncated:
+        flush()
+
+    full_text = "\n".join(blocks)
+    if truncated or len(full_text) > max_chars:
+        full_text = full_text[:max_chars] + TRUNCATION_MARKER
+
+    return {"text": full_text, "title": title}
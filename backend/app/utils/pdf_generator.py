@@ -2,7 +2,6 @@
 PDF generation utilities for the DrFirst Business Case Generator.
 """
 
-import asyncio
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -366,8 +365,9 @@ async def generate_business_case_pdf(case_data: Dict[str, Any]) -> bytes:
     try:
         logger.info(f"Starting PDF generation for case {case_data.get('case_id')}")
 
-        # Use asyncio.to_thread for the blocking PDF generation
-        pdf_bytes = await asyncio.to_thread(_generate_pdf_sync, case_data)
+        # Render in the process pool so WeasyPrint does not hold this process's GIL
+        from app.core.dependencies import get_process_pool
+        pdf_bytes = await get_process_pool().run(_generate_pdf_sync, case_data)
 
         logger.info(f"PDF generation completed for case {case_data.get('case_id')}")
         return pdf_bytes
@@ -381,8 +381,8 @@ async def generate_business_case_pdf(case_data: Dict[str, Any]) -> bytes:
 
 def _generate_pdf_sync(case_data: Dict[str, Any]) -> bytes:
     """
-    Synchronous PDF generation function.
-    Called via asyncio.to_thread for async compatibility.
+    Synchronous PDF generation function, including markdown conversion.
+    Runs in a process pool worker; case_data must be picklable.
     """
     # Prepare template data
     template_data = _prepare_template_data(case_data)
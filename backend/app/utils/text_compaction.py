@@ -0,0 +1,145 @@
+"""
+Relevance-ranked compaction of fetched page text.
+
+Splits page text into passages, drops boilerplate and duplicate passages,
+scores the rest against a query (the case title and problem statement) with
+BM25, and keeps the best passages that fit a token budget. Runs locally with
+no network calls.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+CHARS_PER_TOKEN = 4  # Rough estimate for English text
+MIN_PASSAGE_WORDS = 4
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by can do for from has have if in into is it
+    its of on or our so such that the their then there these they this to was
+    we were what when which while who will with would you your
+    """.split()
+)
+
+_BOILERPLATE_RE = re.compile(
+    r"(cookie|all rights reserved|copyright|©|privacy policy|terms of (use|service)"
+    r"|skip to (main )?content|sign in|log in|subscribe|javascript is disabled"
+    r"|was this page helpful|powered by)",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the model token count of a piece of text."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _split_passages(text: str) -> List[str]:
+    return [" ".join(line.split()) for line in text.splitlines() if line.strip()]
+
+
+def _is_boilerplate(passage: str) -> bool:
+    if len(passage.split()) < MIN_PASSAGE_WORDS:
+        return True
+    # Short lines dominated by boilerplate phrases (cookie banners, footers)
+    return len(passage) < 200 and bool(_BOILERPLATE_RE.search(passage))
+
+
+def _bm25_scores(passages: List[List[str]], query: List[str]) -> List[float]:
+    if not passages or not query:
+        return [0.0] * len(passages)
+
+    doc_count = len(passages)
+    avg_length = sum(len(p) for p in passages) / doc_count or 1.0
+    document_frequency: Dict[str, int] = Counter()
+    for tokens in passages:
+        document_frequency.update(set(tokens))
+
+    query_terms = set(query)
+    scores = []
+    for tokens in passages:
+        frequencies = Counter(tokens)
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / avg_length)
+        score = 0.0
+        for term in query_terms:
+            tf = frequencies.get(term)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + length_norm)
+        scores.append(score)
+    return scores
+
+
+def compact_text(
+    text: str, query: str = "", token_budget: int = 1500
+) -> Dict[str, object]:
+    """
+    Keep the passages of text most relevant to query within a token budget.
+
+    Passages are ranked by BM25 score (ties and zero scores keep document
+    order) and the selection is returned in original document order.
+
+    Args:
+        text (str): Extracted page text, one passage per line
+        query (str): Text the passages are ranked against
+        token_budget (int): Maximum estimated tokens to keep
+
+    Returns:
+        Dict[str, object]: 'text' (compacted text), 'original_tokens',
+        'compacted_tokens', 'passages_kept' and 'passages_dropped'
+    """
+    seen = set()
+    passages: List[str] = []
+    for passage in _split_passages(text or ""):
+        key = passage.lower()
+        if key in seen or _is_boilerplate(passage):
+            continue
+        seen.add(key)
+        passages.append(passage)
+
+    scores = _bm25_scores([tokenize(p) for p in passages], tokenize(query))
+    ranked = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+
+    selected: List[int] = []
+    used_tokens = 0
+    for index in ranked:
+        cost = estimate_tokens(passages[index])
+        if used_tokens + cost > token_budget:
+            if not selected and cost > token_budget:
+                # Keep a clipped top passage rather than nothing
+                selected.append(index)
+                passages[index] = passages[index][: token_budget * CHARS_PER_TOKEN]
+                used_tokens = token_budget
+                break
+            continue
+        selected.append(index)
+        used_tokens += cost
+
+    compacted = "\n".join(passages[i] for i in sorted(selected))
+    return {
+        "text": compacted,
+        "original_tokens": estimate_tokens(text or ""),
+        "compacted_tokens": estimate_tokens(compacted) if compacted else 0,
+        "passages_kept": len(selected),
+        "passages_dropped": len(passages) - len(selected),
+    }
+
+
+def build_relevance_query(case_title: Optional[str], problem_statement: Optional[str]) -> str:
+    """Combine the case title and problem statement into a ranking query."""
+    return "\n".join(part for part in (case_title, problem_statement) if part)
@@ -0,0 +1,219 @@
+"""
+Cache of fetched relevant-link content and summaries.
+
+Entries hold the parsed text and title of a URL together with its ETag /
+Last-Modified validators and the summary generated for that exact content.
+Reuse revalidates with a conditional GET, and the summary is kept for as
+long as the content hash is unchanged. Summaries are compacted towards a
+relevance query under a token budget, so they are also keyed by both.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.llm_cache import SQLiteCacheStore
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """Hash parsed page text for change detection."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def summary_query_key(query: str, token_budget: int) -> str:
+    """Hash the relevance query and token budget a summary was generated under."""
+    return hashlib.sha256(f"{token_budget}\n{query}".encode("utf-8")).hexdigest()
+
+
+class URLCacheEntry:
+    """Cached content, validators and summary for a single URL."""
+
+    def __init__(
+        self,
+        url: str,
+        title: str,
+        content: str,
+        content_hash: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        summary: Optional[str] = None,
+        summary_content_hash: Optional[str] = None,
+        summary_query_key: Optional[str] = None,
+        fetched_at: Optional[float] = None,
+    ):
+        self.url = url
+        self.title = title
+        self.content = content
+        self.content_hash = content_hash
+        self.etag = etag
+        self.last_modified = last_modified
+        self.summary = summary
+        self.summary_content_hash = summary_content_hash
+        self.summary_query_key = summary_query_key
+        self.fetched_at = fetched_at or time.time()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that revalidate this entry with the origin."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "URLCacheEntry":
+        return cls(**data)
+
+
+class URLContentCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache of URL content.
+
+    Entries are dropped after ttl_seconds regardless of validators so that
+    pages without ETag/Last-Modified are eventually refetched in full.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 7 * 86400,
+        sqlite_path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, URLCacheEntry]" = OrderedDict()
+        self._disk = (
+            SQLiteCacheStore(sqlite_path, table="url_cache") if sqlite_path else None
+        )
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "summary_hits": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    def _set_memory(self, entry: URLCacheEntry) -> None:
+        self._memory[entry.url] = entry
+        self._memory.move_to_end(entry.url)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get(self, url: str) -> Optional[URLCacheEntry]:
+        """Look up the cached entry for a URL, promoting disk hits into memory."""
+        entry = self._memory.get(url)
+        if entry is not None and entry.fetched_at + self.ttl_seconds < time.time():
+            del self._memory[url]
+            entry = None
+
+        if entry is None and self._disk is not None:
+            try:
+                stored = await asyncio.to_thread(self._disk.get, url)
+            except Exception as e:
+                logger.warning(f"URLContentCache: Disk tier read failed: {e}")
+                stored = None
+            if stored is not None:
+                entry = URLCacheEntry.from_dict(stored[0])
+                self._set_memory(entry)
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self._memory.move_to_end(url)
+        self.stats["hits"] += 1
+        return entry
+
+    async def put(self, entry: URLCacheEntry) -> None:
+        """
+        Store freshly fetched content, keeping the previous summary when the
+        content hash is unchanged.
+        """
+        previous = self._memory.get(entry.url)
+        if (
+            entry.summary is None
+            and previous is not None
+            and previous.summary_content_hash == entry.content_hash
+        ):
+            entry.summary = previous.summary
+            entry.summary_content_hash = previous.summary_content_hash
+            entry.summary_query_key = previous.summary_query_key
+        self._set_memory(entry)
+        self.stats["stores"] += 1
+        await self._write_disk(entry)
+
+    async def mark_revalidated(self, entry: URLCacheEntry) -> None:
+        """Record a 304 Not Modified response for a cached entry."""
+        entry.fetched_at = time.time()
+        self.stats["revalidated"] += 1
+        self._set_memory(entry)
+        await self._write_disk(entry)
+
+    async def get_summary(
+        self, url: str, content_hash: str, query_key: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Return the stored summary if it was generated for this content and
+        relevance query key.
+        """
+        entry = self._memory.get(url)
+        if entry is None or entry.summary is None:
+            return None
+        if entry.summary_content_hash != content_hash:
+            return None
+        if entry.summary_query_key != query_key:
+            return None
+        self.stats["summary_hits"] += 1
+        return entry.summary
+
+    async def store_summary(
+        self,
+        url: str,
+        content_hash: str,
+        summary: str,
+        query_key: Optional[str] = None,
+    ) -> None:
+        """Attach a generated summary to the cached entry for this content."""
+        entry = self._memory.get(url)
+        if entry is None or entry.content_hash != content_hash:
+            return
+        entry.summary = summary
+        entry.summary_content_hash = content_hash
+        entry.summary_query_key = query_key
+        await self._write_disk(entry)
+
+    async def _write_disk(self, entry: URLCacheEntry) -> None:
+        if self._disk is None:
+            return
+        try:
+            await asyncio.to_thread(
+                self._disk.set,
+                entry.url,
+                entry.to_dict(),
+                entry.fetched_at + self.ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning(f"URLContentCache: Disk tier write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop all cached entries from both tiers."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "entries": len(self._memory),
+            "disk_enabled": self._disk is not None,
+        }
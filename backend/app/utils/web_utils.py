@@ -2,13 +2,19 @@
 Web content fetching and parsing utilities for the DrFirst Business Case Generator.
 """
 
-import asyncio
+import codecs
 import logging
-from typing import Optional, Dict, Any
+import re
+from typing import Optional, Dict, Any, Tuple, TYPE_CHECKING
 from urllib.parse import urlparse
-import requests
-from bs4 import BeautifulSoup, Tag
-from requests.exceptions import RequestException, Timeout, ConnectionError, HTTPError
+import httpx
+
+from app.utils.html_extractor import extract_html_text
+from app.utils.url_cache import URLCacheEntry, content_hash
+
+if TYPE_CHECKING:
+    from app.core.http_client import SharedHTTPClient
+    from app.utils.url_cache import URLContentCache
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -16,22 +22,37 @@ logger = logging.getLogger(__name__)
 # Configuration constants
 DEFAULT_TIMEOUT = 10  # seconds
 MAX_CONTENT_LENGTH = 20000  # characters
+MAX_HTML_BYTES = 512 * 1024  # bytes of HTML read before truncating
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024  # declared Content-Length rejected above this
+READ_CHUNK_SIZE = 16384  # bytes
 USER_AGENT = "DrFirst-Business-Case-Generator/1.0"
 
 
-async def fetch_web_content(url: str) -> Dict[str, Any]:
+async def fetch_web_content(
+    url: str,
+    cache: Optional["URLContentCache"] = None,
+    http_client: Optional["SharedHTTPClient"] = None,
+) -> Dict[str, Any]:
     """
     Asynchronously fetch and parse text content from a web URL.
 
+    Previously fetched URLs are revalidated with a conditional GET; a
+    304 Not Modified response is served from the URL cache.
+
     Args:
         url (str): The URL to fetch content from
+        cache (URLContentCache, optional): URL cache to use; defaults to the
+            shared cache from app.core.dependencies
+        http_client (SharedHTTPClient, optional): Pooled client to fetch
+            with; defaults to the shared client from app.core.dependencies
 
     Returns:
         Dict[str, Any]: A dictionary containing:
             - success (bool): Whether the fetch was successful
             - content (str): The extracted text content (if successful)
             - error (str): Error message (if unsuccessful)
-            - metadata (dict): Additional info like title, url, etc.
+            - metadata (dict): Additional info like title, url, content_hash,
+              and from_cache
     """
 
     # Input validation
@@ -61,13 +82,53 @@ async def fetch_web_content(url: str) -> Dict[str, Any]:
             "metadata": {"url": url},
         }
 
+    if cache is None:
+        from app.core.dependencies import get_url_cache
+        cache = get_url_cache()
+
     try:
-        # Use asyncio.to_thread to run the synchronous requests call asynchronously
-        response = await asyncio.to_thread(_fetch_url_sync, url)
+        cached_entry = await cache.get(url) if cache is not None else None
+        conditional_headers = (
+            cached_entry.conditional_headers() if cached_entry is not None else None
+        )
+
+        response = await _fetch_url(url, conditional_headers, http_client)
 
-        if response["success"]:
-            # Parse the HTML content
-            parsed_content = _parse_html_content(response["html"], url)
+        if response.get("not_modified") and cached_entry is not None:
+            await cache.mark_revalidated(cached_entry)
+            logger.info(f"Content from {url} not modified, served from URL cache")
+            return {
+                "success": True,
+                "content": cached_entry.content,
+                "error": "",
+                "metadata": {
+                    "url": url,
+                    "title": cached_entry.title,
+                    "content_length": len(cached_entry.content),
+                    "status_code": response["status_code"],
+                    "content_hash": cached_entry.content_hash,
+                    "from_cache": True,
+                },
+            }
+
+        if response["success"] and "html" in response:
+            # Parse the HTML content in the process pool, off the event loop and GIL
+            from app.core.dependencies import get_process_pool
+            parsed_content = await get_process_pool().run(
+                _parse_html_content, response["html"], url
+            )
+            text_hash = content_hash(parsed_content["text"])
+            if cache is not None:
+                await cache.put(
+                    URLCacheEntry(
+                        url=url,
+                        title=parsed_content["title"],
+                        content=parsed_content["text"],
+                        content_hash=text_hash,
+                        etag=response.get("etag"),
+                        last_modified=response.get("last_modified"),
+                    )
+                )
             return {
                 "success": True,
                 "content": parsed_content["text"],
@@ -77,8 +138,17 @@ async def fetch_web_content(url: str) -> Dict[str, Any]:
                     "title": parsed_content["title"],
                     "content_length": len(parsed_content["text"]),
                     "status_code": response["status_code"],
+                    "content_hash": text_hash,
+                    "from_cache": False,
                 },
             }
+        elif response["success"]:
+            return {
+                "success": False,
+                "content": "",
+                "error": "Received 304 Not Modified without cached content",
+                "metadata": {"url": url, "status_code": response.get("status_code")},
+            }
         else:
             return {
                 "success": False,
@@ -97,72 +167,90 @@ async def fetch_web_content(url: str) -> Dict[str, Any]:
         }
 
 
-def _fetch_url_sync(url: str) -> Dict[str, Any]:
+async def _fetch_url(
+    url: str,
+    conditional_headers: Optional[Dict[str, str]] = None,
+    http_client: Optional["SharedHTTPClient"] = None,
+) -> Dict[str, Any]:
     """
-    Synchronous helper function to fetch URL content.
-    This is called via asyncio.to_thread for async compatibility.
+    Fetch URL content with the shared pooled HTTP client.
+
+    conditional_headers (If-None-Match / If-Modified-Since) make the request
+    conditional; a 304 response is reported as success with not_modified set.
     """
+    if http_client is None:
+        from app.core.dependencies import get_http_client
+        http_client = get_http_client()
+
     headers = {
         "User-Agent": USER_AGENT,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "Connection": "keep-alive",
     }
+    if conditional_headers:
+        headers.update(conditional_headers)
 
     try:
-        response = requests.get(
-            url,
-            headers=headers,
-            timeout=DEFAULT_TIMEOUT,
-            allow_redirects=True,
-            stream=True,  # For checking content length
-        )
-
-        # Check status code
-        response.raise_for_status()
+        async with http_client.stream(
+            "GET", url, headers=headers, timeout=DEFAULT_TIMEOUT
+        ) as response:
+            if response.status_code == 304:
+                return {"success": True, "not_modified": True, "status_code": 304}
+
+            # Check status code
+            response.raise_for_status()
+
+            # Check content type
+            content_type = response.headers.get("content-type", "").lower()
+            if "text/html" not in content_type and "application/xhtml" not in content_type:
+                return {
+                    "success": False,
+                    "error": f"Unsupported content type: {content_type}",
+                    "status_code": response.status_code,
+                }
+
+            # Reject pages that declare an oversized body before downloading
+            declared_length = response.headers.get("content-length")
+            if declared_length and declared_length.isdigit():
+                if int(declared_length) > MAX_RESPONSE_BYTES:
+                    return {
+                        "success": False,
+                        "error": f"Content too large: {declared_length} bytes exceeds {MAX_RESPONSE_BYTES} byte limit",
+                        "status_code": response.status_code,
+                    }
+
+            body, truncated = await _read_body(response, MAX_HTML_BYTES)
+            if truncated:
+                logger.warning(f"Content from {url} exceeds size limit, truncating")
+            content = body.decode(_detect_charset(content_type, body), errors="replace")
 
-        # Check content type
-        content_type = response.headers.get("content-type", "").lower()
-        if "text/html" not in content_type and "application/xhtml" not in content_type:
             return {
-                "success": False,
-                "error": f"Unsupported content type: {content_type}",
+                "success": True,
+                "html": content,
                 "status_code": response.status_code,
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
             }
 
-        # Get content with size limit
-        content = ""
-        total_size = 0
-        for chunk in response.iter_content(chunk_size=8192, decode_unicode=True):
-            if chunk:
-                total_size += len(chunk)
-                if total_size > MAX_CONTENT_LENGTH * 2:  # Allow some buffer for HTML
-                    logger.warning(f"Content from {url} exceeds size limit, truncating")
-                    break
-                content += chunk
-
-        return {"success": True, "html": content, "status_code": response.status_code}
-
-    except HTTPError as e:
+    except httpx.HTTPStatusError as e:
         return {
             "success": False,
             "error": f"HTTP error {e.response.status_code}: {str(e)}",
-            "status_code": e.response.status_code if e.response else None,
+            "status_code": e.response.status_code,
         }
-    except ConnectionError:
+    except httpx.ConnectError:
         return {
             "success": False,
             "error": "Connection error: Unable to connect to the URL",
             "status_code": None,
         }
-    except Timeout:
+    except httpx.TimeoutException:
         return {
             "success": False,
             "error": f"Timeout: Request took longer than {DEFAULT_TIMEOUT} seconds",
             "status_code": None,
         }
-    except RequestException as e:
+    except httpx.HTTPError as e:
         return {
             "success": False,
             "error": f"Request error: {str(e)}",
@@ -170,10 +258,54 @@ def _fetch_url_sync(url: str) -> Dict[str, Any]:
         }
 
 
+async def _read_body(response: httpx.Response, max_bytes: int) -> Tuple[bytes, bool]:
+    """
+    Read a streamed response body into a bounded buffer.
+
+    Returns:
+        Tuple[bytes, bool]: Body (at most max_bytes) and whether it was truncated
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes(chunk_size=READ_CHUNK_SIZE):
+        remaining = max_bytes - len(buffer)
+        if len(chunk) > remaining:
+            buffer += chunk[:remaining]
+            return bytes(buffer), True
+        buffer += chunk
+    return bytes(buffer), False
+
+
+_HEADER_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+def _detect_charset(content_type: str, body: bytes) -> str:
+    """
+    Pick the body encoding from the Content-Type header, a <meta> charset
+    declaration in the first 2 KB, or UTF-8.
+    """
+    candidates = []
+    header_match = _HEADER_CHARSET_RE.search(content_type or "")
+    if header_match:
+        candidates.append(header_match.group(1))
+    meta_match = _META_CHARSET_RE.search(body[:2048])
+    if meta_match:
+        candidates.append(meta_match.group(1).decode("ascii", errors="ignore"))
+
+    for candidate in candidates:
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
 def _parse_html_content(html: str, url: str) -> Dict[str, str]:
     """
     Parse HTML content and extract meaningful text.
 
+    CPU-bound; fetch_web_content runs it in a process pool worker.
+
     Args:
         html (str): Raw HTML content
         url (str): Original URL (for context)
@@ -182,62 +314,7 @@ def _parse_html_content(html: str, url: str) -> Dict[str, str]:
         Dict[str, str]: Dictionary with 'text' and 'title' keys
     """
     try:
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Extract title
-        title_tag = soup.find("title")
-        title = title_tag.get_text().strip() if title_tag else "No title"
-
-        # Remove unwanted elements
-        for element in soup(
-            ["script", "style", "nav", "header", "footer", "sidebar", "aside"]
-        ):
-            element.decompose()
-
-        # Extract text from meaningful elements
-        text_elements = []
-
-        # Priority order: main content areas first
-        content_selectors = [
-            "main",
-            "article",
-            '[role="main"]',
-            ".content",
-            "#content",
-            ".main-content",
-            ".post-content",
-            ".entry-content",
-        ]
-
-        main_content = None
-        for selector in content_selectors:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-
-        # If we found main content, use that; otherwise use the whole body
-        content_root = main_content if main_content else soup.find("body")
-        if not content_root:
-            content_root = soup
-
-        # Extract text from headings and paragraphs
-        for tag in content_root.find_all(
-            ["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "td", "div"]
-        ):
-            if isinstance(tag, Tag):
-                text = tag.get_text().strip()
-                if text and len(text) > 10:  # Filter out very short text snippets
-                    text_elements.append(text)
-
-        # Join all text elements
-        full_text = "\n".join(text_elements)
-
-        # Truncate if too long
-        if len(full_text) > MAX_CONTENT_LENGTH:
-            full_text = full_text[:MAX_CONTENT_LENGTH] + "... [Content truncated]"
-
-        return {"text": full_text, "title": title}
-
+        return extract_html_text(html, MAX_CONTENT_LENGTH)
     except Exception as e:
         logger.error(f"Error parsing HTML content from {url}: {str(e)}")
         return {"text": f"Error parsing content: {str(e)}", "title": "Parse Error"}
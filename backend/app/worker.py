@@ -0,0 +1,72 @@
+"""
+Background job worker entry point.
+
+Run ``python -m app.worker`` to claim and run queued jobs (business case
+generation, pipeline resumes) outside the API processes, so workers scale
+independently of API replicas. Workers also sweep for cases stuck in an
+in-progress status and queue their resume. SIGTERM/SIGINT stop claiming new
+jobs and wait for in-flight ones to finish.
+"""
+
+import asyncio
+import contextlib
+import logging
+import signal
+
+from app.core.config import settings
+from app.core.dependencies import (
+    close_http_client,
+    get_orchestrator_agent,
+    get_process_pool,
+    shutdown_process_pool,
+)
+from app.core.job_queue import JobWorker
+from app.core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def build_worker() -> JobWorker:
+    """JobWorker running the shared orchestrator's job handlers."""
+    orchestrator = get_orchestrator_agent()
+    return JobWorker(orchestrator.job_queue, orchestrator.job_handlers())
+
+
+async def sweep_stalled_cases(stop: asyncio.Event, interval_seconds: float) -> None:
+    """Periodically queue resumes for stalled cases until stop is set."""
+    orchestrator = get_orchestrator_agent()
+    while not stop.is_set():
+        try:
+            job_ids = await orchestrator.sweep_stalled_cases()
+            if job_ids:
+                logger.info(f"Queued {len(job_ids)} stalled case resumes")
+        except Exception as e:
+            logger.error(f"Stalled case sweep failed: {e}")
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), interval_seconds)
+
+
+async def run_worker(stop: asyncio.Event) -> None:
+    worker = build_worker()
+    get_process_pool().start()
+    tasks = [worker.run(stop)]
+    if settings.pipeline_sweep_interval_seconds > 0:
+        tasks.append(sweep_stalled_cases(stop, settings.pipeline_sweep_interval_seconds))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await close_http_client()
+        shutdown_process_pool()
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    await run_worker(stop)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
@@ -0,0 +1,495 @@
+"""
+End-to-end business case pipeline benchmark.
+
+Drives simulated cases through the same calls the API makes:
+
+    initiate_case        OrchestratorAgent.handle_request("initiate_case")
+    prd_approval         PRD approved, then handle_prd_approval (design + effort)
+    cost_value           CostAnalystAgent.calculate_cost and
+                         SalesValueAnalystAgent.project_value
+    approvals            value and cost estimate approvals
+    financial_model      check_and_trigger_financial_model
+    pdf                  generate_business_case_pdf
+
+against MockClient and a latency-injecting fake LLM (benchmarks.fake_llm),
+at one or more concurrency levels. Reports p50/p95/p99 per stage, case
+throughput, peak RSS and event-loop blocking, and writes the results as
+JSON so runs can be compared across commits.
+
+Usage (from backend/):
+    python -m benchmarks.pipeline --concurrency 1,10,100 --output bench.json
+    python -m benchmarks.pipeline --concurrency 50 --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.agents.orchestrator_agent import BusinessCaseStatus, OrchestratorAgent
+from app.core.constants import Collections
+from app.core.dependencies import get_array_union
+from app.core.llm_backends import LatencyModel
+from app.core.mock_impl import MockClient
+
+from benchmarks.fake_llm import FakeLLMRegistry
+
+logger = logging.getLogger(__name__)
+
+STAGES = (
+    "initiate_case",
+    "prd_approval",
+    "cost_value",
+    "approvals",
+    "financial_model",
+    "pdf",
+)
+BENCH_USER_ID = "benchmark-user"
+
+# Active default template, so value projection goes through the LLM
+PRICING_TEMPLATE = {
+    "name": "Benchmark Value Template",
+    "description": "Per-clinic subscription value",
+    "isActive": True,
+    "isDefault": True,
+    "structureDefinition": {"type": "LowBaseHigh", "scenarios": ["Low", "Base", "High"]},
+    "guidance": {"approach": "Estimate annual value from clinic adoption"},
+}
+
+
+class StageFailed(Exception):
+    """A pipeline stage returned an error response."""
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of values (q in [0, 100])."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(-(-q * len(ordered) // 100))))
+    return ordered[rank - 1]
+
+
+def summarize(values: Sequence[float], errors: int = 0) -> Dict[str, Any]:
+    """Latency summary in milliseconds."""
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "count": len(values),
+        "errors": errors,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "mean_ms": ms(sum(values) / len(values)) if values else None,
+        "max_ms": ms(max(values)) if values else None,
+    }
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class LoopMonitor:
+    """
+    Samples event-loop responsiveness and memory while a run is in progress.
+
+    A ticker sleeps for interval seconds; any extra delay before it wakes is
+    time the loop spent blocked on synchronous work. Delays above
+    threshold_seconds are summed into blocked_seconds.
+    """
+
+    def __init__(self, interval: float = 0.01, threshold_seconds: float = 0.005):
+        self.interval = interval
+        self.threshold_seconds = threshold_seconds
+        self.blocked_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.stalls = 0
+        self.samples = 0
+        self.peak_rss_bytes = current_rss_bytes()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _tick(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.samples += 1
+            self.max_lag_seconds = max(self.max_lag_seconds, lag)
+            if lag > self.threshold_seconds:
+                self.blocked_seconds += lag
+                self.stalls += 1
+            if self.samples % 10 == 0:
+                self.peak_rss_bytes = max(self.peak_rss_bytes, current_rss_bytes())
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._tick())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self.peak_rss_bytes = max(self.peak_rss_bytes, current_rss_bytes())
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "blocked_seconds": round(self.blocked_seconds, 4),
+            "max_lag_ms": round(self.max_lag_seconds * 1000, 3),
+            "stalls": self.stalls,
+            "samples": self.samples,
+        }
+
+
+def _load_pdf_generator():
+    """generate_business_case_pdf, or the reason PDF export is unavailable."""
+    try:
+        from app.utils.pdf_generator import generate_business_case_pdf
+    except Exception as e:  # WeasyPrint raises OSError when system libraries are missing
+        return None, f"{type(e).__name__}: {str(e).splitlines()[0]}"
+    return generate_business_case_pdf, None
+
+
+class PipelineBenchmark:
+    """
+    Runs simulated business cases through the orchestrator.
+
+    Args:
+        latency: Latency model for the fake LLM
+        include_pdf: Run the PDF export stage
+    """
+
+    def __init__(self, latency: LatencyModel, include_pdf: bool = True):
+        self.latency = latency
+        self.include_pdf = include_pdf
+
+    def _build(self):
+        db = MockClient(project_id="benchmark")
+        db.collection("pricingTemplates").document("benchmark_value_template").set(PRICING_TEMPLATE)
+        registry = FakeLLMRegistry(latency=self.latency)
+        orchestrator = OrchestratorAgent(db=db, llm_registry=registry)
+        return db, registry, orchestrator
+
+    @staticmethod
+    def _check(response: Dict[str, Any], stage: str) -> Dict[str, Any]:
+        if not response or response.get("status") != "success":
+            raise StageFailed(f"{stage}: {(response or {}).get('message', 'no response')}")
+        return response
+
+    async def _case(self, index: int, db, orchestrator, pdf_generator, timings, errors) -> bool:
+        case_id = None
+        case_ref = None
+        stage = STAGES[0]
+
+        async def timed(name, coro):
+            nonlocal stage
+            stage = name
+            started = time.perf_counter()
+            result = await coro
+            timings[name].append(time.perf_counter() - started)
+            return result
+
+        async def get_case():
+            snapshot = await asyncio.to_thread(case_ref.get)
+            return snapshot.to_dict() or {}
+
+        async def approve_prd():
+            await asyncio.to_thread(
+                case_ref.update,
+                {
+                    "status": BusinessCaseStatus.PRD_APPROVED.value,
+                    "updated_at": datetime.now(timezone.utc),
+                    "history": get_array_union(
+                        [{"source": "USER", "messageType": "PRD_APPROVAL", "content": "PRD approved"}]
+                    ),
+                },
+            )
+            response = self._check(await orchestrator.handle_prd_approval(case_id), "prd_approval")
+            if response.get("new_status") != BusinessCaseStatus.PLANNING_COMPLETE.value:
+                raise StageFailed(f"prd_approval: {response.get('effort_estimation_error')}")
+
+        async def cost_value():
+            case = await get_case()
+            cost, value = await asyncio.gather(
+                orchestrator.cost_analyst_agent.calculate_cost(
+                    case["effort_estimate_v1"], case["title"]
+                ),
+                orchestrator.sales_value_analyst_agent.project_value(
+                    case["prd_draft"]["content_markdown"], case["title"]
+                ),
+            )
+            await asyncio.to_thread(
+                case_ref.update,
+                {
+                    "cost_estimate_v1": self._check(cost, "cost_estimate")["cost_estimate"],
+                    "value_projection_v1": self._check(value, "value_projection")["value_projection"],
+                    "status": BusinessCaseStatus.COSTING_PENDING_REVIEW.value,
+                    "updated_at": datetime.now(timezone.utc),
+                },
+            )
+
+        async def approve(message_type: str, status: BusinessCaseStatus):
+            await asyncio.to_thread(
+                case_ref.update,
+                {
+                    "status": status.value,
+                    "updated_at": datetime.now(timezone.utc),
+                    "history": get_array_union(
+                        [{"source": "USER", "messageType": message_type, "content": "Approved"}]
+                    ),
+                },
+            )
+
+        async def approvals():
+            await approve("VALUE_PROJECTION_APPROVAL", BusinessCaseStatus.VALUE_APPROVED)
+            await approve("COST_ESTIMATE_APPROVAL", BusinessCaseStatus.COSTING_APPROVED)
+
+        async def financial_model():
+            self._check(await orchestrator.check_and_trigger_financial_model(case_id), "financial_model")
+            case = await get_case()
+            if case.get("status") != BusinessCaseStatus.FINANCIAL_MODEL_COMPLETE.value:
+                raise StageFailed(f"financial_model: case status is {case.get('status')}")
+
+        async def export_pdf():
+            case = await get_case()
+            case["case_id"] = case_id
+            pdf_bytes = await pdf_generator(case)
+            if not pdf_bytes:
+                raise StageFailed("pdf: empty document")
+
+        try:
+            response = await timed(
+                "initiate_case",
+                orchestrator.handle_request(
+                    "initiate_case",
+                    {
+                        "problemStatement": f"Benchmark case {index}: clinicians re-enter prescription data",
+                        "projectTitle": f"Benchmark Case {index}",
+                    },
+                    BENCH_USER_ID,
+                ),
+            )
+            case_id = self._check(response, "initiate_case")["caseId"]
+            case_ref = db.collection(Collections.BUSINESS_CASES).document(case_id)
+            if (await get_case()).get("status") != BusinessCaseStatus.PRD_DRAFTING.value:
+                raise StageFailed("initiate_case: PRD draft was not generated")
+
+            await timed("prd_approval", approve_prd())
+            await timed("cost_value", cost_value())
+            await timed("approvals", approvals())
+            await timed("financial_model", financial_model())
+            if pdf_generator is not None:
+                await timed("pdf", export_pdf())
+            return True
+        except Exception as e:
+            errors[stage] += 1
+            logger.debug(f"Benchmark case {index} failed in {stage}: {e}")
+            return False
+
+    async def run(self, concurrency: int, cases: Optional[int] = None) -> Dict[str, Any]:
+        """Run cases (default: concurrency) with at most concurrency in flight."""
+        cases = cases or concurrency
+        db, registry, orchestrator = self._build()
+
+        pdf_generator, pdf_unavailable = None, None
+        if self.include_pdf:
+            pdf_generator, pdf_unavailable = _load_pdf_generator()
+
+        timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        errors: Dict[str, int] = {stage: 0 for stage in STAGES}
+        pipeline_timings: List[float] = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(index: int) -> bool:
+            async with semaphore:
+                started = time.perf_counter()
+                ok = await self._case(index, db, orchestrator, pdf_generator, timings, errors)
+                if ok:
+                    pipeline_timings.append(time.perf_counter() - started)
+                return ok
+
+        monitor = LoopMonitor()
+        monitor.start()
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(cases)))
+        wall_seconds = time.perf_counter() - started
+        await monitor.stop()
+
+        completed = sum(1 for ok in results if ok)
+        stages = {stage: summarize(timings[stage], errors[stage]) for stage in STAGES}
+        if pdf_generator is None:
+            stages["pdf"]["skipped"] = pdf_unavailable or "disabled"
+
+        limiter = registry.limiter.get_metrics() if registry.limiter is not None else None
+        return {
+            "concurrency": concurrency,
+            "cases": cases,
+            "completed": completed,
+            "failed": cases - completed,
+            "wall_seconds": round(wall_seconds, 4),
+            "throughput_cases_per_second": round(completed / wall_seconds, 4) if wall_seconds else None,
+            "stages": stages,
+            "pipeline": summarize(pipeline_timings, cases - completed),
+            "peak_rss_mb": round(monitor.peak_rss_bytes / (1024 * 1024), 2),
+            "event_loop": monitor.report(),
+            "llm_calls": registry.calls,
+            "llm_limiter": limiter,
+        }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Describe p95 and throughput changes against a baseline result file."""
+    lines = []
+    previous = {run["concurrency"]: run for run in baseline.get("runs", [])}
+    for run in results["runs"]:
+        before = previous.get(run["concurrency"])
+        if before is None:
+            continue
+        lines.append(
+            f"concurrency={run['concurrency']} vs {baseline.get('commit') or 'baseline'}:"
+        )
+        for name in (*STAGES, "pipeline"):
+            now = (run["stages"].get(name) if name in STAGES else run["pipeline"]) or {}
+            then = (before["stages"].get(name) if name in STAGES else before["pipeline"]) or {}
+            if now.get("p95_ms") is None or not then.get("p95_ms"):
+                continue
+            change = (now["p95_ms"] - then["p95_ms"]) / then["p95_ms"] * 100
+            lines.append(
+                f"  {name:<16} p95 {then['p95_ms']:>10.1f} -> {now['p95_ms']:>10.1f} ms ({change:+.1f}%)"
+            )
+        if before.get("throughput_cases_per_second") and run.get("throughput_cases_per_second"):
+            lines.append(
+                f"  {'throughput':<16}     {before['throughput_cases_per_second']:>10.3f} -> "
+                f"{run['throughput_cases_per_second']:>10.3f} cases/s"
+            )
+    return lines
+
+
+def format_run(run: Dict[str, Any]) -> str:
+    lines = [
+        f"concurrency={run['concurrency']} cases={run['cases']} completed={run['completed']} "
+        f"wall={run['wall_seconds']:.2f}s throughput={run['throughput_cases_per_second']} cases/s "
+        f"peak_rss={run['peak_rss_mb']}MB loop_blocked={run['event_loop']['blocked_seconds']}s "
+        f"max_lag={run['event_loop']['max_lag_ms']}ms",
+        f"  {'stage':<16} {'count':>6} {'errors':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}",
+    ]
+    for name, summary in (*run["stages"].items(), ("pipeline", run["pipeline"])):
+        if summary.get("skipped"):
+            lines.append(f"  {name:<16} skipped ({summary['skipped']})")
+            continue
+        cells = [
+            f"{summary[key]:>10.1f}" if summary[key] is not None else f"{'-':>10}"
+            for key in ("p50_ms", "p95_ms", "p99_ms")
+        ]
+        lines.append(f"  {name:<16} {summary['count']:>6} {summary['errors']:>6} {' '.join(cells)}")
+    return "\n".join(lines)
+
+
+async def run_benchmark(
+    concurrency_levels: Sequence[int],
+    cases: Optional[int] = None,
+    latency: Optional[LatencyModel] = None,
+    include_pdf: bool = True,
+) -> Dict[str, Any]:
+    """Run the pipeline benchmark at each concurrency level."""
+    latency = latency or LatencyModel("lognormal", median_seconds=0.5, sigma=0.5)
+    benchmark = PipelineBenchmark(latency, include_pdf=include_pdf)
+    runs = []
+    for concurrency in concurrency_levels:
+        # Agents print progress; keep it off the benchmark output
+        with contextlib.redirect_stdout(io.StringIO()):
+            runs.append(await benchmark.run(concurrency, cases))
+    return {
+        "benchmark": "business_case_pipeline",
+        "run_id": str(uuid.uuid4()),
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "cases": cases,
+            "latency_mode": latency.mode,
+            "latency_median_seconds": latency.median_seconds,
+            "latency_sigma": latency.sigma,
+            "latency_scale": latency.scale,
+            "include_pdf": include_pdf,
+        },
+        "runs": runs,
+    }
+
+
+def _concurrency_levels(value: str) -> List[int]:
+    levels = [int(part) for part in value.split(",") if part.strip()]
+    if not levels or any(level < 1 or level > 500 for level in levels):
+        raise argparse.ArgumentTypeError("concurrency levels must be between 1 and 500")
+    return levels
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=_concurrency_levels, default=[1, 10, 50],
+                        help="Comma-separated simultaneous case counts (1-500)")
+    parser.add_argument("--cases", type=int, default=None,
+                        help="Cases per level (default: the concurrency level)")
+    parser.add_argument("--latency-mode", default="lognormal", choices=["lognormal", "fixed", "none"])
+    parser.add_argument("--latency-median", type=float, default=0.5, help="Median LLM latency (s)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-pdf", action="store_true", help="Skip the PDF export stage")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON results file")
+    parser.add_argument("--log-level", default="ERROR")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper())
+    latency = LatencyModel(
+        args.latency_mode, args.latency_median, args.latency_sigma, seed=args.seed
+    )
+    results = asyncio.run(
+        run_benchmark(args.concurrency, args.cases, latency, include_pdf=not args.no_pdf)
+    )
+
+    for run in results["runs"]:
+        print(format_run(run))
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            print("\n".join(compare(results, json.load(f))))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0 if all(run["failed"] == 0 for run in results["runs"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Shared fixtures for agent unit tests.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from app.agents.orchestrator_agent import OrchestratorAgent
+from app.core.constants import Collections
+from app.core.mock_impl import MockClient
+
+
+class FakeArchitect:
+    """Architect stand-in that records calls and can be held open."""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self.delay = delay
+
+    async def generate_system_design(self, prd_content, case_title):
+        self.calls.append(prd_content)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return {
+            "status": "success",
+            "system_design_draft": {"content_markdown": f"Design for {prd_content}"},
+        }
+
+
+@pytest.fixture
+def fake_architect():
+    """Factory for FakeArchitect instances."""
+    return FakeArchitect
+
+
+@pytest.fixture
+def orchestrator_with_case():
+    """Factory for an OrchestratorAgent over a MockClient holding case-1."""
+
+    def build(**case_fields):
+        db = MockClient()
+        db.collection(Collections.BUSINESS_CASES).document("case-1").set(
+            {"history": [], **case_fields}
+        )
+        return OrchestratorAgent(db=db, llm_registry=Mock()), db
+
+    return build
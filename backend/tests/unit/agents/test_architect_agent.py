@@ -0,0 +1,118 @@
+"""
+Unit tests for ArchitectAgent PRD analysis memoization and combined design mode.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+
+from app.agents.architect_agent import ArchitectAgent, COMBINED_DESIGN_MARKER
+from app.core.llm_cache import GenerationResult
+
+ANALYSIS = {
+    "key_features": ["Prescription sync"],
+    "complexity_indicators": {"estimated_complexity": "high"},
+}
+
+
+class FakeModel:
+    """Model handle stand-in returning canned texts and recording prompts."""
+
+    def __init__(self, text):
+        self.text = text
+        self.prompts = []
+        self.generation_config = {"temperature": 0.2}
+
+    async def generate(self, contents, **kwargs):
+        self.prompts.append(contents[0])
+        text = self.text(contents[0]) if callable(self.text) else self.text
+        return GenerationResult(text, "gemini-test")
+
+
+def _agent(combined_design=False, combined_text=None):
+    registry = Mock()
+    registry.get_model.return_value = None
+    agent = ArchitectAgent(llm_registry=registry, combined_design=combined_design)
+    agent.analysis_model = FakeModel(json.dumps(ANALYSIS))
+    agent.model = FakeModel(combined_text or "# System Design")
+    return agent
+
+
+class TestPrdAnalysisMemoization:
+    """Test that PRD analysis is reused for unchanged PRD content"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_prd_reuses_analysis(self):
+        agent = _agent()
+
+        first = await agent.generate_system_design("# PRD v1", "Case")
+        second = await agent.generate_system_design("# PRD v1", "Case")
+
+        assert first["status"] == second["status"] == "success"
+        assert len(agent.analysis_model.prompts) == 1
+        assert len(agent.model.prompts) == 2
+        assert second["system_design_draft"]["prd_analysis"] == ANALYSIS
+
+    @pytest.mark.asyncio
+    async def test_changed_prd_is_reanalyzed(self):
+        agent = _agent()
+
+        await agent.analyze_prd_content("# PRD v1")
+        await agent.analyze_prd_content("# PRD v2")
+
+        assert len(agent.analysis_model.prompts) == 2
+        assert "# PRD v2" in agent.analysis_model.prompts[1]
+
+    @pytest.mark.asyncio
+    async def test_fallback_analysis_is_not_memoized(self):
+        agent = _agent()
+        agent.analysis_model = FakeModel("not json")
+
+        await agent.analyze_prd_content("# PRD")
+        await agent.analyze_prd_content("# PRD")
+
+        assert len(agent.analysis_model.prompts) == 2
+
+    @pytest.mark.asyncio
+    async def test_memoized_analysis_is_a_copy(self):
+        agent = _agent()
+
+        first = await agent.analyze_prd_content("# PRD")
+        first["key_features"].append("mutated")
+        second = await agent.analyze_prd_content("# PRD")
+
+        assert second == ANALYSIS
+
+
+class TestCombinedDesignMode:
+    """Test single-call analysis plus design generation"""
+
+    @pytest.mark.asyncio
+    async def test_single_call_returns_analysis_and_design(self):
+        combined = f"{json.dumps(ANALYSIS)}\n{COMBINED_DESIGN_MARKER}\n# Combined Design"
+        agent = _agent(combined_design=True, combined_text=combined)
+
+        response = await agent.generate_system_design("# PRD", "Case")
+
+        draft = response["system_design_draft"]
+        assert draft["content_markdown"] == "# Combined Design"
+        assert draft["prd_analysis"] == ANALYSIS
+        assert agent.analysis_model.prompts == []
+        assert len(agent.model.prompts) == 1
+        assert "# PRD" in agent.model.prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_combined_mode_uses_memoized_analysis(self):
+        agent = _agent(combined_design=True)
+        await agent.analyze_prd_content("# PRD")
+
+        response = await agent.generate_system_design("# PRD", "Case")
+
+        assert response["system_design_draft"]["content_markdown"] == "# System Design"
+        assert COMBINED_DESIGN_MARKER not in agent.model.prompts[0]
+
+    def test_split_without_marker_keeps_design(self):
+        analysis, design = ArchitectAgent._split_combined_response("# Just a design")
+
+        assert analysis is None
+        assert design == "# Just a design"
@@ -0,0 +1,171 @@
+"""
+Unit tests for checkpointed, resumable design/planning pipelines
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+from app.agents.orchestrator_agent import BusinessCaseStatus
+from app.core.checkpoints import CHECKPOINTS_FIELD
+from app.core.constants import Collections
+from app.core.job_queue import JobWorker
+
+EFFORT = {"status": "success", "effort_breakdown": {"total_hours": 100, "roles": []}}
+
+
+@pytest.fixture
+def pipeline(orchestrator_with_case, fake_architect):
+    """Orchestrator over an approved case with stubbed design and planning."""
+    orchestrator, db = orchestrator_with_case(
+        user_id="user1",
+        title="Resumable Case",
+        status=BusinessCaseStatus.PRD_APPROVED.value,
+        prd_draft={"content_markdown": "# PRD"},
+        updated_at=datetime.now(timezone.utc),
+    )
+    orchestrator.speculative_design = None
+    orchestrator.architect_agent = fake_architect()
+    orchestrator.planner_agent.estimate_effort = AsyncMock(return_value=EFFORT)
+    return orchestrator, db
+
+
+def _case(db):
+    return db.collection(Collections.BUSINESS_CASES).document("case-1").get().to_dict()
+
+
+@pytest.mark.asyncio
+async def test_approval_records_stage_checkpoints(pipeline):
+    orchestrator, db = pipeline
+    response = await orchestrator.handle_prd_approval("case-1")
+
+    stored = _case(db)
+    assert response["new_status"] == BusinessCaseStatus.PLANNING_COMPLETE.value
+    assert stored[CHECKPOINTS_FIELD]["design"]["output_field"] == "system_design_v1_draft"
+    assert stored[CHECKPOINTS_FIELD]["effort"]["output_field"] == "effort_estimate_v1"
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed_design_stage(pipeline):
+    orchestrator, db = pipeline
+    # Worker dies during planning: the case is left in PLANNING_IN_PROGRESS
+    orchestrator.planner_agent.estimate_effort = AsyncMock(side_effect=RuntimeError("killed"))
+    await orchestrator.handle_prd_approval("case-1")
+    assert _case(db)["status"] == BusinessCaseStatus.PLANNING_IN_PROGRESS.value
+
+    orchestrator.planner_agent.estimate_effort = AsyncMock(return_value=EFFORT)
+    response = await orchestrator.resume_case_pipeline("case-1")
+
+    assert response["new_status"] == BusinessCaseStatus.PLANNING_COMPLETE.value
+    assert orchestrator.architect_agent.calls == ["# PRD"]
+    assert _case(db)["effort_estimate_v1"]["total_hours"] == 100
+
+    # Both stages checkpointed: resuming again makes no agent calls
+    await orchestrator.resume_case_pipeline("case-1")
+    assert orchestrator.architect_agent.calls == ["# PRD"]
+    assert orchestrator.planner_agent.estimate_effort.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_resume_reruns_stage_whose_inputs_changed(pipeline):
+    orchestrator, db = pipeline
+    await orchestrator.handle_prd_approval("case-1")
+    db.collection(Collections.BUSINESS_CASES).document("case-1").update(
+        {
+            "prd_draft": {"content_markdown": "# PRD v2"},
+            "status": BusinessCaseStatus.PRD_APPROVED.value,
+        }
+    )
+
+    await orchestrator.resume_case_pipeline("case-1")
+    assert orchestrator.architect_agent.calls == ["# PRD", "# PRD v2"]
+    assert orchestrator.planner_agent.estimate_effort.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_resume_rejects_settled_status(pipeline):
+    orchestrator, db = pipeline
+    db.collection(Collections.BUSINESS_CASES).document("case-1").update(
+        {"status": BusinessCaseStatus.APPROVED.value}
+    )
+    response = await orchestrator.resume_case_pipeline("case-1")
+    assert response["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_sweeper_queues_each_stalled_case_once_and_worker_resumes_it(pipeline):
+    orchestrator, db = pipeline
+    orchestrator.planner_agent.estimate_effort = AsyncMock(side_effect=RuntimeError("killed"))
+    await orchestrator.handle_prd_approval("case-1")
+
+    assert await orchestrator.sweep_stalled_cases(stalled_after_seconds=600) == []
+    db.collection(Collections.BUSINESS_CASES).document("case-1").update(
+        {"updated_at": datetime.now(timezone.utc) - timedelta(hours=1)}
+    )
+    first = await orchestrator.sweep_stalled_cases(stalled_after_seconds=600)
+    second = await orchestrator.sweep_stalled_cases(stalled_after_seconds=600)
+    assert len(first) == 1 and first == second
+
+    orchestrator.planner_agent.estimate_effort = AsyncMock(return_value=EFFORT)
+    worker = JobWorker(orchestrator.job_queue, orchestrator.job_handlers())
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+    assert _case(db)["status"] == BusinessCaseStatus.PLANNING_COMPLETE.value
+    assert orchestrator.architect_agent.calls == ["# PRD"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_approvals_run_design_and_planning_once(pipeline):
+    orchestrator, db = pipeline
+    responses = await asyncio.gather(
+        orchestrator.handle_prd_approval("case-1"),
+        orchestrator.handle_prd_approval("case-1"),
+    )
+
+    assert sorted(r["status"] for r in responses) == ["error", "success"]
+    assert orchestrator.architect_agent.calls == ["# PRD"]
+    assert orchestrator.planner_agent.estimate_effort.await_count == 1
+    statuses = [
+        entry["content"].split(".")[0]
+        for entry in _case(db)["history"]
+        if entry["type"] == "STATUS_UPDATE"
+    ]
+    assert statuses == [
+        f"Status updated to {BusinessCaseStatus.SYSTEM_DESIGN_DRAFTING.value}",
+        f"Status updated to {BusinessCaseStatus.SYSTEM_DESIGN_DRAFTED.value}",
+        f"Status updated to {BusinessCaseStatus.PLANNING_IN_PROGRESS.value}",
+        f"Status updated to {BusinessCaseStatus.PLANNING_COMPLETE.value}",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_superseded_run_stops_writing_after_resume(pipeline):
+    orchestrator, db = pipeline
+    planning_started = asyncio.Event()
+    release = asyncio.Event()
+    resumed_effort = {"status": "success", "effort_breakdown": {"total_hours": 40, "roles": []}}
+
+    async def estimate_effort(**kwargs):
+        if not planning_started.is_set():
+            # The original run stalls between design and planning
+            planning_started.set()
+            await release.wait()
+            return EFFORT
+        return resumed_effort
+
+    orchestrator.planner_agent.estimate_effort = estimate_effort
+    original = asyncio.create_task(orchestrator.handle_prd_approval("case-1"))
+    await planning_started.wait()
+    assert _case(db)["status"] == BusinessCaseStatus.PLANNING_IN_PROGRESS.value
+
+    resumed = await orchestrator.resume_case_pipeline("case-1")
+    release.set()
+    superseded = await original
+
+    assert resumed["new_status"] == BusinessCaseStatus.PLANNING_COMPLETE.value
+    assert superseded["status"] == "error"
+    stored = _case(db)
+    assert stored["status"] == BusinessCaseStatus.PLANNING_COMPLETE.value
+    assert stored["effort_estimate_v1"]["total_hours"] == 40
+    assert orchestrator.architect_agent.calls == ["# PRD"]
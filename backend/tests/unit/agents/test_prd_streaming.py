@@ -0,0 +1,109 @@
+"""
+Unit tests for streaming PRD generation through the OrchestratorAgent.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.agents.orchestrator_agent import BusinessCaseStatus
+from app.agents.product_manager_agent import ProductManagerAgent
+from app.api.v1.cases.prd_routes import _with_keepalive
+from app.core.constants import Collections
+
+
+@pytest.fixture
+def streaming_case(orchestrator_with_case):
+    """Factory for an orchestrator whose PM agent streams the given events."""
+
+    def build(events):
+        orchestrator, db = orchestrator_with_case(
+            title="Streaming Case",
+            problem_statement="Users wait too long for PRDs",
+            relevant_links=[],
+            status="INTAKE",
+        )
+
+        async def fake_stream_prd(**kwargs):
+            for event in events:
+                yield event
+
+        orchestrator.product_manager_agent.stream_prd = fake_stream_prd
+        return orchestrator, db
+
+    return build
+
+
+@pytest.mark.asyncio
+async def test_stream_prd_draft_relays_chunks_and_persists(streaming_case):
+    """Chunks are relayed in order and the final draft is stored on the case"""
+    prd_draft = {"title": "Streaming Case", "content_markdown": "# PRD\nBody"}
+    orchestrator, db = streaming_case(
+        [
+            {"type": "chunk", "text": "# PRD\n"},
+            {"type": "chunk", "text": "Body"},
+            {"type": "complete", "prd_draft": prd_draft},
+        ]
+    )
+
+    events = [event async for event in orchestrator.stream_prd_draft("case-1")]
+
+    assert [event["type"] for event in events] == ["chunk", "chunk", "complete"]
+    stored = db.collection(Collections.BUSINESS_CASES).document("case-1").get().to_dict()
+    assert stored["prd_draft"] == prd_draft
+    assert stored["status"] == BusinessCaseStatus.PRD_DRAFTING.value
+    assert stored["history"][-1]["content"] == "# PRD\nBody"
+
+
+@pytest.mark.asyncio
+async def test_stream_prd_draft_error_leaves_status_unchanged(streaming_case):
+    """A failed stream records the error without storing a draft"""
+    orchestrator, db = streaming_case(
+        [{"type": "error", "message": "quota exceeded"}]
+    )
+
+    events = [event async for event in orchestrator.stream_prd_draft("case-1")]
+
+    assert events == [{"type": "error", "message": "quota exceeded"}]
+    stored = db.collection(Collections.BUSINESS_CASES).document("case-1").get().to_dict()
+    assert stored["status"] == "INTAKE"
+    assert "prd_draft" not in stored
+    assert "quota exceeded" in stored["history"][-1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_stream_prd_draft_missing_case(streaming_case):
+    """Unknown cases produce a single error event"""
+    orchestrator, _ = streaming_case([])
+
+    events = [event async for event in orchestrator.stream_prd_draft("missing")]
+
+    assert events[0]["type"] == "error"
+    assert "not found" in events[0]["message"]
+
+
+@pytest.mark.asyncio
+async def test_stream_prd_reports_status_before_gathering_links():
+    agent = ProductManagerAgent(prompt_service=Mock(), llm_registry=Mock())
+    agent._build_prd_prompt = AsyncMock(return_value="prompt")
+    stream = agent.stream_prd(
+        "Users wait too long", "Streaming Case", [{"name": "Wiki", "url": "https://wiki"}]
+    )
+
+    first = await stream.__anext__()
+    assert first == {"type": "status", "message": "Gathering context from 1 relevant links"}
+    agent._build_prd_prompt.assert_not_awaited()
+    assert (await stream.__anext__())["message"] == "Generating PRD draft"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_sse_stream_sends_keepalive_comments():
+    async def slow_messages():
+        await asyncio.sleep(0.05)
+        yield "event: chunk\ndata: {}\n\n"
+
+    messages = [message async for message in _with_keepalive(slow_messages(), 0.01)]
+
+    assert messages[0] == ": keepalive\n\n"
+    assert messages[-1] == "event: chunk\ndata: {}\n\n"
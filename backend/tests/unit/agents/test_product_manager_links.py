@@ -0,0 +1,209 @@
+"""
+Unit tests for concurrent relevant-link processing in ProductManagerAgent.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+
+from app.agents.product_manager_agent import ProductManagerAgent
+from app.core.config import settings
+from app.core.llm_cache import GenerationResult
+from app.utils.url_cache import URLContentCache
+
+
+@pytest.fixture
+def agent():
+    """ProductManagerAgent with a stub prompt service and registry."""
+    return ProductManagerAgent(
+        prompt_service=Mock(), llm_registry=Mock(), url_cache=URLContentCache()
+    )
+
+
+def _links(*names):
+    return [{"name": name, "url": f"https://wiki.example.com/{name}"} for name in names]
+
+
+@pytest.mark.asyncio
+async def test_links_keep_original_order(agent, monkeypatch):
+    """Entries follow link order even when later links finish first"""
+    delays = {"slow": 0.05, "medium": 0.02, "fast": 0.0}
+
+    async def fake_fetch(url, cache=None):
+        await asyncio.sleep(delays[url.rsplit("/", 1)[1]])
+        return {"success": True, "content": url}
+
+    async def fake_summarize(content, link_name, query=""):
+        return f"summary of {link_name}"
+
+    monkeypatch.setattr(agent, "summarize_content", fake_summarize)
+    with patch("app.agents.product_manager_agent.fetch_web_content", fake_fetch):
+        entries = await agent._process_relevant_links(_links("slow", "medium", "fast"))
+
+    assert [entry.split("**")[1] for entry in entries] == ["slow", "medium", "fast"]
+    assert "summary of slow" in entries[0]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(agent, monkeypatch):
+    """No more than prd_link_concurrency links are in flight at once"""
+    monkeypatch.setattr(settings, "prd_link_concurrency", 2)
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch(url, cache=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"success": False, "error": "HTTP 404"}
+
+    with patch("app.agents.product_manager_agent.fetch_web_content", fake_fetch):
+        entries = await agent._process_relevant_links(_links("a", "b", "c", "d", "e"))
+
+    assert peak == 2
+    assert all("HTTP 404" in entry for entry in entries)
+
+
+@pytest.mark.asyncio
+async def test_slow_links_degrade_to_timeout_notes(agent, monkeypatch):
+    """Per-link and overall deadlines replace slow links with notes"""
+    monkeypatch.setattr(settings, "prd_link_timeout_seconds", 0.05)
+    monkeypatch.setattr(settings, "prd_links_total_timeout_seconds", 0.2)
+
+    async def fake_fetch(url, cache=None):
+        if url.endswith("hang"):
+            await asyncio.sleep(10)
+        return {"success": False, "error": "HTTP 500"}
+
+    with patch("app.agents.product_manager_agent.fetch_web_content", fake_fetch):
+        entries = await agent._process_relevant_links(_links("ok", "hang"))
+
+    assert "HTTP 500" in entries[0]
+    assert "timed out" in entries[1]
+
+
+@pytest.mark.asyncio
+async def test_overall_deadline_cancels_queued_links(agent, monkeypatch):
+    """Links still queued at the overall deadline are reported, not awaited"""
+    monkeypatch.setattr(settings, "prd_link_concurrency", 1)
+    monkeypatch.setattr(settings, "prd_link_timeout_seconds", 1.0)
+    monkeypatch.setattr(settings, "prd_links_total_timeout_seconds", 0.05)
+
+    async def fake_fetch(url, cache=None):
+        await asyncio.sleep(0.5)
+        return {"success": False, "error": "HTTP 500"}
+
+    with patch("app.agents.product_manager_agent.fetch_web_content", fake_fetch):
+        entries = await agent._process_relevant_links(_links("a", "b"))
+
+    assert all("deadline exceeded" in entry for entry in entries)
+
+
+@pytest.mark.asyncio
+async def test_slow_summarization_is_not_reported_as_fetch_failure(agent, monkeypatch):
+    """Fetched links whose summaries miss the overall deadline say so"""
+    monkeypatch.setattr(settings, "prd_link_timeout_seconds", 0.05)
+    monkeypatch.setattr(settings, "prd_links_total_timeout_seconds", 0.2)
+
+    async def fake_fetch(url, cache=None):
+        return {"success": True, "content": url}
+
+    async def slow_summarize(content, link_name, query=""):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(agent, "summarize_content", slow_summarize)
+    with patch("app.agents.product_manager_agent.fetch_web_content", fake_fetch):
+        entries = await agent._process_relevant_links(_links("a", "b"))
+
+    assert all("Content retrieved but summarization timed out" in entry for entry in entries)
+
+
+def _batching_agent(response_text):
+    """Agent whose summary model answers batch prompts with response_text."""
+    registry = Mock()
+    summary_model = Mock()
+    summary_model.generation_config = {"max_output_tokens": 512}
+    calls = []
+
+    async def fake_generate(contents, generation_config=None):
+        calls.append(contents[0])
+        if "Respond with only a JSON object" in contents[0]:
+            return GenerationResult(response_text, "gemini-test")
+        return GenerationResult("- individual summary", "gemini-test")
+
+    summary_model.generate = fake_generate
+    registry.get_model.return_value = summary_model
+    agent = ProductManagerAgent(
+        prompt_service=Mock(), llm_registry=registry, url_cache=URLContentCache()
+    )
+    return agent, calls
+
+
+async def _fetch_page(url, cache=None):
+    name = url.rsplit("/", 1)[1]
+    return {
+        "success": True,
+        "content": f"Requirements page {name} describes the prescription workflow in detail.",
+        "metadata": {},
+    }
+
+
+@pytest.mark.asyncio
+async def test_links_are_summarized_in_one_batch():
+    """Several fetched links share a single summarization call"""
+    agent, calls = _batching_agent(
+        '{"summaries": [{"id": 1, "summary": "- one"}, {"id": 2, "summary": "- two"}, {"id": 3, "summary": "- three"}]}'
+    )
+
+    with patch("app.agents.product_manager_agent.fetch_web_content", _fetch_page):
+        entries = await agent._process_relevant_links(_links("a", "b", "c"))
+
+    assert len(calls) == 1
+    assert ["- one" in entries[0], "- two" in entries[1], "- three" in entries[2]] == [True] * 3
+
+
+@pytest.mark.asyncio
+async def test_unparsed_links_fall_back_to_individual_calls():
+    """Links missing from the batch response are summarized one by one"""
+    agent, calls = _batching_agent('```json\n{"summaries": [{"id": "2", "summary": "- two"}]}\n```')
+
+    with patch("app.agents.product_manager_agent.fetch_web_content", _fetch_page):
+        entries = await agent._process_relevant_links(_links("a", "b", "c"))
+
+    assert len(calls) == 3
+    assert "- individual summary" in entries[0]
+    assert "- two" in entries[1]
+    assert "- individual summary" in entries[2]
+
+
+def test_parse_batch_summaries_ignores_invalid_entries():
+    parsed = ProductManagerAgent._parse_batch_summaries(
+        '{"summaries": [{"id": 1, "summary": "- ok"}, {"id": 9, "summary": "- out of range"}, {"id": 2, "summary": ""}, "junk"]}',
+        2,
+    )
+    assert parsed == {0: "- ok"}
+    assert ProductManagerAgent._parse_batch_summaries("not json", 2) == {}
+
+
+@pytest.mark.asyncio
+async def test_links_fetched_at_different_speeds_share_batches(monkeypatch):
+    """All fetched links are summarized together, one call per batch-size chunk"""
+    monkeypatch.setattr(settings, "link_summary_batch_size", 6)
+    agent, calls = _batching_agent(
+        '{"summaries": [' + ", ".join(f'{{"id": {i}, "summary": "- s{i}"}}' for i in range(1, 7)) + "]}"
+    )
+
+    async def staggered_fetch(url, cache=None):
+        await asyncio.sleep(0.03 * int(url.rsplit("-", 1)[1]))
+        return await _fetch_page(url, cache)
+
+    with patch("app.agents.product_manager_agent.fetch_web_content", staggered_fetch):
+        entries = await agent._process_relevant_links(_links(*(f"page-{i}" for i in range(6))))
+        assert len(calls) == 1
+        assert all(f"- s{i + 1}" in entry for i, entry in enumerate(entries))
+
+        calls.clear()
+        await agent._process_relevant_links(_links(*(f"other-{i}" for i in range(8))))
+        assert len(calls) == 2
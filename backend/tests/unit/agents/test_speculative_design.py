@@ -0,0 +1,166 @@
+"""
+Unit tests for speculative system design generation.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+
+from app.agents.orchestrator_agent import OrchestratorAgent, BusinessCaseStatus
+from app.agents.speculative_design import SpeculativeDesignRunner
+from app.core.llm_limiter import AdaptiveConcurrencyLimiter
+from app.core.constants import Collections
+
+
+class TestSpeculativeDesignRunner:
+    """Test speculation keyed by PRD hash"""
+
+    @pytest.mark.asyncio
+    async def test_matching_prd_is_adopted(self, fake_architect):
+        architect = fake_architect()
+        runner = SpeculativeDesignRunner(architect)
+
+        assert runner.start("case-1", "PRD v1", "Title") is True
+        assert runner.start("case-1", "PRD v1", "Title") is False
+        await asyncio.sleep(0)
+        response = await runner.adopt("case-1", "PRD v1", "Title")
+
+        assert response["system_design_draft"]["content_markdown"] == "Design for PRD v1"
+        assert architect.calls == ["PRD v1"]
+        assert runner.get_stats()["adopted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_prd_is_discarded(self, fake_architect):
+        runner = SpeculativeDesignRunner(fake_architect(delay=1))
+
+        runner.start("case-1", "PRD v1", "Title")
+        response = await runner.adopt("case-1", "PRD v2", "Title")
+
+        assert response is None
+        assert runner.get_stats()["discarded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_resubmission_replaces_stale_run(self, fake_architect):
+        architect = fake_architect()
+        runner = SpeculativeDesignRunner(architect)
+
+        runner.start("case-1", "PRD v1", "Title")
+        runner.start("case-1", "PRD v2", "Title")
+        await asyncio.sleep(0)
+        response = await runner.adopt("case-1", "PRD v2", "Title")
+
+        assert response["system_design_draft"]["content_markdown"] == "Design for PRD v2"
+
+    @pytest.mark.asyncio
+    async def test_own_concurrency_budget(self, fake_architect):
+        architect = fake_architect(delay=0.02)
+        runner = SpeculativeDesignRunner(architect, max_concurrency=2)
+
+        for i in range(5):
+            runner.start(f"case-{i}", f"PRD {i}", "Title")
+        while runner.get_stats()["pending"]:
+            await asyncio.sleep(0.01)
+
+        assert architect.peak == 2
+        assert len(architect.calls) == 5
+
+    @pytest.mark.asyncio
+    async def test_adopt_cancels_run_still_waiting_for_budget(self, fake_architect):
+        architect = fake_architect(delay=1)
+        runner = SpeculativeDesignRunner(architect, max_concurrency=1)
+
+        runner.start("case-1", "PRD 1", "Title")
+        await asyncio.sleep(0)
+        runner.start("case-2", "PRD 2", "Title")
+        response = await asyncio.wait_for(runner.adopt("case-2", "PRD 2", "Title"), timeout=0.5)
+
+        assert response is None
+        assert architect.calls == ["PRD 1"]
+        assert runner.get_stats()["discarded"] == 1
+        runner.discard("case-1")
+
+    @pytest.mark.asyncio
+    async def test_waits_while_interactive_calls_are_queued(self, fake_architect):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        architect = fake_architect()
+        runner = SpeculativeDesignRunner(architect, limiter=limiter)
+
+        with patch("app.agents.speculative_design.IDLE_POLL_SECONDS", 0.01):
+            async with limiter.slot():
+                queued = asyncio.create_task(limiter.acquire())
+                runner.start("case-1", "PRD v1", "Title")
+                await asyncio.sleep(0.05)
+                assert architect.calls == []
+            await queued
+            limiter.release(0, 0)
+            while not architect.calls:
+                await asyncio.sleep(0.01)
+            response = await runner.adopt("case-1", "PRD v1", "Title")
+
+        assert response["status"] == "success"
+
+
+@pytest.fixture
+def approved_case(orchestrator_with_case, fake_architect):
+    """Factory for an orchestrator over an approved case with speculation enabled."""
+
+    def build(prd_content):
+        with patch("app.agents.orchestrator_agent.settings.speculative_design_enabled", True):
+            orchestrator, db = orchestrator_with_case(
+                title="Speculative Case",
+                problem_statement="Approvers wait for designs",
+                status=BusinessCaseStatus.PRD_APPROVED.value,
+                prd_draft={"content_markdown": prd_content},
+            )
+        architect = fake_architect()
+        orchestrator.architect_agent = architect
+        orchestrator.speculative_design.architect_agent = architect
+        orchestrator.planner_agent.estimate_effort = Mock(side_effect=Exception("skip planning"))
+        return orchestrator, db, architect
+
+    return build
+
+
+@pytest.mark.asyncio
+async def test_prd_approval_adopts_speculative_design(approved_case):
+    """Approval reuses the design generated at submission time"""
+    orchestrator, db, architect = approved_case("# PRD")
+
+    assert orchestrator.start_speculative_system_design("case-1", "# PRD", "Speculative Case")
+    await orchestrator.handle_prd_approval("case-1")
+
+    stored = db.collection(Collections.BUSINESS_CASES).document("case-1").get().to_dict()
+    assert architect.calls == ["# PRD"]
+    assert stored["system_design_v1_draft"]["content_markdown"] == "Design for # PRD"
+
+
+@pytest.mark.asyncio
+async def test_prd_approval_regenerates_after_prd_change(approved_case):
+    """A design speculated for an older PRD is not adopted"""
+    orchestrator, db, architect = approved_case("# PRD v2")
+
+    orchestrator.start_speculative_system_design("case-1", "# PRD v1", "Speculative Case")
+    await orchestrator.handle_prd_approval("case-1")
+
+    stored = db.collection(Collections.BUSINESS_CASES).document("case-1").get().to_dict()
+    assert stored["system_design_v1_draft"]["content_markdown"] == "Design for # PRD v2"
+
+
+@pytest.mark.asyncio
+async def test_prd_approval_on_another_replica_adopts_stored_design(approved_case, fake_architect):
+    """A design speculated in one process is adopted by approval in another"""
+    submitting, db, architect = approved_case("# PRD")
+    submitting.start_speculative_system_design("case-1", "# PRD", "Speculative Case")
+    while submitting.speculative_design.get_stats()["pending"]:
+        await asyncio.sleep(0.01)
+
+    with patch("app.agents.orchestrator_agent.settings.speculative_design_enabled", True):
+        approving = OrchestratorAgent(db=db, llm_registry=Mock())
+    approving.architect_agent = fake_architect()
+    approving.planner_agent.estimate_effort = Mock(side_effect=Exception("skip planning"))
+    await approving.handle_prd_approval("case-1")
+
+    stored = db.collection(Collections.BUSINESS_CASES).document("case-1").get().to_dict()
+    assert architect.calls == ["# PRD"]
+    assert approving.architect_agent.calls == []
+    assert stored["system_design_v1_draft"]["content_markdown"] == "Design for # PRD"
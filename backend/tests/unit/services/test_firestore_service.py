@@ -77,16 +77,14 @@ class TestFirestoreService:
     async def test_create_user_success(self, firestore_service, sample_user, mock_db):
         """Test successful user creation"""
         mock_doc_ref = Mock()
+        mock_doc_ref.set = AsyncMock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = None
-            
-            result = await firestore_service.create_user(sample_user)
-            
-            assert result is True
-            mock_to_thread.assert_called_once()
-            mock_db.collection.assert_called_with("users")
+        result = await firestore_service.create_user(sample_user)
+        
+        assert result is True
+        mock_doc_ref.set.assert_awaited_once()
+        mock_db.collection.assert_called_with("users")
 
     @pytest.mark.asyncio
     async def test_create_user_error(self, firestore_service, sample_user, mock_db):
@@ -114,17 +112,15 @@ class TestFirestoreService:
             "updated_at": "2023-01-01T00:00:00"
         }
         
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = mock_doc
-            
-            result = await firestore_service.get_user(sample_user.uid)
-            
-            assert result is not None
-            assert result.uid == sample_user.uid
-            assert result.email == sample_user.email
-            mock_to_thread.assert_called_once()
+        result = await firestore_service.get_user(sample_user.uid)
+        
+        assert result is not None
+        assert result.uid == sample_user.uid
+        assert result.email == sample_user.email
+        mock_doc_ref.get.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_get_user_not_found(self, firestore_service, mock_db):
@@ -133,14 +129,12 @@ class TestFirestoreService:
         mock_doc = Mock()
         mock_doc.exists = False
         
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = mock_doc
-            
-            result = await firestore_service.get_user("nonexistent-uid")
-            
-            assert result is None
+        result = await firestore_service.get_user("nonexistent-uid")
+        
+        assert result is None
 
     @pytest.mark.asyncio
     async def test_get_user_by_email_success(self, firestore_service, sample_user, mock_db):
@@ -158,15 +152,13 @@ class TestFirestoreService:
             "updated_at": "2023-01-01T00:00:00"
         }
         
+        mock_query.stream = AsyncMock(return_value=[mock_doc])
         mock_db.collection.return_value.where.return_value = mock_query
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = [mock_doc]
-            
-            result = await firestore_service.get_user_by_email(sample_user.email)
-            
-            assert result is not None
-            assert result.email == sample_user.email
+        result = await firestore_service.get_user_by_email(sample_user.email)
+        
+        assert result is not None
+        assert result.email == sample_user.email
 
     @pytest.mark.asyncio
     async def test_update_user_success(self, firestore_service, mock_db):
@@ -175,17 +167,17 @@ class TestFirestoreService:
         mock_doc = Mock()
         mock_doc.exists = True
         
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        mock_doc_ref.update = AsyncMock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
         updates = {"display_name": "Updated Name"}
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.side_effect = [mock_doc, None]  # get, then update
-            
-            result = await firestore_service.update_user("test-uid", updates)
-            
-            assert result is True
-            assert mock_to_thread.call_count == 2
+        result = await firestore_service.update_user("test-uid", updates)
+        
+        assert result is True
+        mock_doc_ref.get.assert_awaited_once()
+        mock_doc_ref.update.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_update_user_not_found(self, firestore_service, mock_db):
@@ -196,11 +188,10 @@ class TestFirestoreService:
         
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = mock_doc
-            
-            with pytest.raises(UserNotFoundError):
-                await firestore_service.update_user("nonexistent-uid", {"test": "value"})
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        
+        with pytest.raises(UserNotFoundError):
+            await firestore_service.update_user("nonexistent-uid", {"test": "value"})
 
     @pytest.mark.asyncio
     async def test_list_users_success(self, firestore_service, sample_user, mock_db):
@@ -219,13 +210,12 @@ class TestFirestoreService:
         
         mock_db.collection.return_value = Mock()
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = [mock_doc]
-            
-            result = await firestore_service.list_users()
-            
-            assert len(result) == 1
-            assert result[0].uid == sample_user.uid
+        mock_db.collection.return_value.stream = AsyncMock(return_value=[mock_doc])
+        
+        result = await firestore_service.list_users()
+        
+        assert len(result) == 1
+        assert result[0].uid == sample_user.uid
 
     @pytest.mark.asyncio
     async def test_delete_user_success(self, firestore_service, mock_db):
@@ -234,15 +224,15 @@ class TestFirestoreService:
         mock_doc = Mock()
         mock_doc.exists = True
         
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        mock_doc_ref.delete = AsyncMock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.side_effect = [mock_doc, None]  # get, then delete
-            
-            result = await firestore_service.delete_user("test-uid")
-            
-            assert result is True
-            assert mock_to_thread.call_count == 2
+        result = await firestore_service.delete_user("test-uid")
+        
+        assert result is True
+        mock_doc_ref.get.assert_awaited_once()
+        mock_doc_ref.delete.assert_awaited_once()
 
     # Business Case tests
     @pytest.mark.asyncio
@@ -251,13 +241,12 @@ class TestFirestoreService:
         mock_doc_ref = Mock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = None
-            
-            result = await firestore_service.create_business_case(sample_business_case)
-            
-            assert result == sample_business_case.id
-            mock_to_thread.assert_called_once()
+        mock_doc_ref.set = AsyncMock()
+        
+        result = await firestore_service.create_business_case(sample_business_case)
+        
+        assert result == sample_business_case.id
+        mock_doc_ref.set.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_create_business_case_auto_id(self, firestore_service, sample_business_case, mock_db):
@@ -268,12 +257,11 @@ class TestFirestoreService:
         
         mock_db.collection.return_value = Mock()
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = (None, mock_doc_ref)
-            
-            result = await firestore_service.create_business_case(sample_business_case)
-            
-            assert result == "auto-generated-id"
+        mock_db.collection.return_value.add = AsyncMock(return_value=mock_doc_ref)
+        
+        result = await firestore_service.create_business_case(sample_business_case)
+        
+        assert result == "auto-generated-id"
 
     @pytest.mark.asyncio
     async def test_get_business_case_success(self, firestore_service, sample_business_case, mock_db):
@@ -297,14 +285,13 @@ class TestFirestoreService:
         
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = mock_doc
-            
-            result = await firestore_service.get_business_case(sample_business_case.id)
-            
-            assert result is not None
-            assert result.id == sample_business_case.id
-            assert result.request_data.title == sample_business_case.request_data.title
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        
+        result = await firestore_service.get_business_case(sample_business_case.id)
+        
+        assert result is not None
+        assert result.id == sample_business_case.id
+        assert result.request_data.title == sample_business_case.request_data.title
 
     @pytest.mark.asyncio
     async def test_update_business_case_success(self, firestore_service, mock_db):
@@ -313,16 +300,15 @@ class TestFirestoreService:
         mock_doc = Mock()
         mock_doc.exists = True
         
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        mock_doc_ref.update = AsyncMock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
         updates = {"status": "in_progress"}
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.side_effect = [mock_doc, None]  # get, then update
-            
-            result = await firestore_service.update_business_case("test-case-id", updates)
-            
-            assert result is True
+        result = await firestore_service.update_business_case("test-case-id", updates)
+        
+        assert result is True
 
     @pytest.mark.asyncio
     async def test_list_business_cases_for_user_success(self, firestore_service, sample_business_case, mock_db):
@@ -347,13 +333,12 @@ class TestFirestoreService:
         mock_query = Mock()
         mock_db.collection.return_value.where.return_value = mock_query
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = [mock_doc]
-            
-            result = await firestore_service.list_business_cases_for_user("test-uid")
-            
-            assert len(result) == 1
-            assert result[0].id == sample_business_case.id
+        mock_query.stream = AsyncMock(return_value=[mock_doc])
+        
+        result = await firestore_service.list_business_cases_for_user("test-uid")
+        
+        assert len(result) == 1
+        assert result[0].id == sample_business_case.id
 
     @pytest.mark.asyncio
     async def test_delete_business_case_success(self, firestore_service, mock_db):
@@ -362,14 +347,13 @@ class TestFirestoreService:
         mock_doc = Mock()
         mock_doc.exists = True
         
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        mock_doc_ref.delete = AsyncMock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.side_effect = [mock_doc, None]  # get, then delete
-            
-            result = await firestore_service.delete_business_case("test-case-id")
-            
-            assert result is True
+        result = await firestore_service.delete_business_case("test-case-id")
+        
+        assert result is True
 
     # Job tests
     @pytest.mark.asyncio
@@ -378,13 +362,12 @@ class TestFirestoreService:
         mock_doc_ref = Mock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = None
-            
-            result = await firestore_service.create_job(sample_job)
-            
-            assert result == sample_job.id
-            mock_to_thread.assert_called_once()
+        mock_doc_ref.set = AsyncMock()
+        
+        result = await firestore_service.create_job(sample_job)
+        
+        assert result == sample_job.id
+        mock_doc_ref.set.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_get_job_success(self, firestore_service, sample_job, mock_db):
@@ -404,14 +387,13 @@ class TestFirestoreService:
         
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = mock_doc
-            
-            result = await firestore_service.get_job(sample_job.id)
-            
-            assert result is not None
-            assert result.id == sample_job.id
-            assert result.job_type == sample_job.job_type
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        
+        result = await firestore_service.get_job(sample_job.id)
+        
+        assert result is not None
+        assert result.id == sample_job.id
+        assert result.job_type == sample_job.job_type
 
     @pytest.mark.asyncio
     async def test_update_job_success(self, firestore_service, mock_db):
@@ -420,16 +402,15 @@ class TestFirestoreService:
         mock_doc = Mock()
         mock_doc.exists = True
         
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        mock_doc_ref.update = AsyncMock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
         updates = {"status": "completed", "progress": 100}
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.side_effect = [mock_doc, None]  # get, then update
-            
-            result = await firestore_service.update_job("test-job-id", updates)
-            
-            assert result is True
+        result = await firestore_service.update_job("test-job-id", updates)
+        
+        assert result is True
 
     @pytest.mark.asyncio
     async def test_list_jobs_for_user_success(self, firestore_service, sample_job, mock_db):
@@ -450,13 +431,12 @@ class TestFirestoreService:
         mock_query = Mock()
         mock_db.collection.return_value.where.return_value = mock_query
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = [mock_doc]
-            
-            result = await firestore_service.list_jobs_for_user("test-uid")
-            
-            assert len(result) == 1
-            assert result[0].id == sample_job.id
+        mock_query.stream = AsyncMock(return_value=[mock_doc])
+        
+        result = await firestore_service.list_jobs_for_user("test-uid")
+        
+        assert len(result) == 1
+        assert result[0].id == sample_job.id
 
     @pytest.mark.asyncio
     async def test_list_jobs_by_status_success(self, firestore_service, sample_job, mock_db):
@@ -477,13 +457,12 @@ class TestFirestoreService:
         mock_query = Mock()
         mock_db.collection.return_value.where.return_value = mock_query
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.return_value = [mock_doc]
-            
-            result = await firestore_service.list_jobs_by_status(JobStatus.PENDING)
-            
-            assert len(result) == 1
-            assert result[0].status == JobStatus.PENDING
+        mock_query.stream = AsyncMock(return_value=[mock_doc])
+        
+        result = await firestore_service.list_jobs_by_status(JobStatus.PENDING)
+        
+        assert len(result) == 1
+        assert result[0].status == JobStatus.PENDING
 
     @pytest.mark.asyncio
     async def test_delete_job_success(self, firestore_service, mock_db):
@@ -492,14 +471,13 @@ class TestFirestoreService:
         mock_doc = Mock()
         mock_doc.exists = True
         
+        mock_doc_ref.get = AsyncMock(return_value=mock_doc)
+        mock_doc_ref.delete = AsyncMock()
         mock_db.collection.return_value.document.return_value = mock_doc_ref
         
-        with patch('asyncio.to_thread') as mock_to_thread:
-            mock_to_thread.side_effect = [mock_doc, None]  # get, then delete
-            
-            result = await firestore_service.delete_job("test-job-id")
-            
-            assert result is True
+        result = await firestore_service.delete_job("test-job-id")
+        
+        assert result is True
 
     # Error handling tests
     @pytest.mark.asyncio
@@ -525,7 +503,7 @@ class TestFirestoreService:
 
     def test_initialization_with_default_db(self):
         """Test FirestoreService initialization with default database"""
-        with patch('app.services.firestore_service.get_db') as mock_get_db:
+        with patch('app.services.firestore_service.get_async_db') as mock_get_db:
             mock_db = Mock()
             mock_get_db.return_value = mock_db
             
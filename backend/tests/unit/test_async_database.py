@@ -0,0 +1,110 @@
+"""
+Unit tests for the asyncio database clients
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from google.api_core.exceptions import Conflict
+
+from app.core.database import DocumentAlreadyExistsError
+from app.core.firestore_impl import AsyncFirestoreDocumentReference, AsyncFirestoreQuery
+from app.core.metrics import FIRESTORE_OPERATION_DURATION
+from app.core.mock_impl import AsyncMockClient, MockClient
+from app.models.firestore_models import User
+from app.services.firestore_service import FirestoreService
+
+
+class TestAsyncMockClient:
+    """Test the asyncio mock against the sync mock's semantics"""
+
+    @pytest.mark.asyncio
+    async def test_document_operations(self):
+        db = AsyncMockClient()
+        doc = db.collection("cases").document("case-1")
+
+        await doc.set({"status": "DRAFT", "n": 1})
+        await doc.update({"status": "DONE"})
+        assert (await doc.get()).to_dict() == {"status": "DONE", "n": 1}
+
+        with pytest.raises(DocumentAlreadyExistsError):
+            await doc.create({"status": "NEW"})
+
+        await doc.delete()
+        assert not (await doc.get()).exists
+
+    @pytest.mark.asyncio
+    async def test_queries_and_add(self):
+        db = AsyncMockClient()
+        cases = db.collection("cases")
+        for n in (3, 1, 2):
+            await cases.add({"user_id": "u1", "n": n})
+        await cases.add({"user_id": "u2", "n": 9})
+
+        docs = await cases.where("user_id", "==", "u1").order_by("n").limit(2).stream()
+        assert [d.to_dict()["n"] for d in docs] == [1, 2]
+        assert len(await cases.stream()) == 4
+
+    @pytest.mark.asyncio
+    async def test_shares_data_with_sync_client(self):
+        sync_db = MockClient()
+        db = AsyncMockClient(sync_client=sync_db)
+        sync_db.collection("jobs").document("j1").set({"status": "pending"})
+
+        assert (await db.collection("jobs").document("j1").get()).to_dict()["status"] == "pending"
+        await db.collection("jobs").document("j2").set({"status": "completed"})
+        assert sync_db.collection("jobs").document("j2").get().exists
+
+
+class TestAsyncFirestoreClient:
+    """Test AsyncClient wrapping without reaching Firestore"""
+
+    @pytest.mark.asyncio
+    async def test_operations_awaited_and_timed(self):
+        doc_ref = Mock()
+        doc_ref.get = AsyncMock(return_value=Mock(exists=True))
+        doc_ref.update = AsyncMock(side_effect=Exception("unavailable"))
+        reference = AsyncFirestoreDocumentReference(doc_ref, Mock(), "async_cases")
+
+        assert (await reference.get()).exists
+        with pytest.raises(Exception):
+            await reference.update({"status": "DONE"})
+
+        assert FIRESTORE_OPERATION_DURATION.count(
+            collection="async_cases", operation="get", outcome="success"
+        ) == 1
+        assert FIRESTORE_OPERATION_DURATION.count(
+            collection="async_cases", operation="update", outcome="error"
+        ) == 1
+
+    @pytest.mark.asyncio
+    async def test_create_conflict_maps_to_already_exists(self):
+        doc_ref = Mock(id="j1")
+        doc_ref.create = AsyncMock(side_effect=Conflict("exists"))
+        reference = AsyncFirestoreDocumentReference(doc_ref, Mock(), "job_leases")
+
+        with pytest.raises(DocumentAlreadyExistsError):
+            await reference.create({"job_id": "j1"})
+
+    @pytest.mark.asyncio
+    async def test_query_stream_consumes_async_iterator(self):
+        async def stream():
+            for doc_id in ("a", "b"):
+                yield Mock(id=doc_id)
+
+        query = Mock()
+        query.stream = stream
+        docs = await AsyncFirestoreQuery(query, Mock(), "cases").stream()
+        assert [d.id for d in docs] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_firestore_service_round_trip_on_async_client():
+    service = FirestoreService(db=AsyncMockClient())
+    user = User(uid="uid-1", email="async@drfirst.com", display_name="Async User")
+
+    assert await service.create_user(user) is True
+    assert (await service.get_user("uid-1")).email == "async@drfirst.com"
+    assert (await service.get_user_by_email("async@drfirst.com")).uid == "uid-1"
+    assert await service.delete_user("uid-1") is True
+    assert await service.get_user("uid-1") is None
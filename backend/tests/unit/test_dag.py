@@ -0,0 +1,154 @@
+"""
+Unit tests for the declarative DAG scheduler and the business case workflow
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from app.agents.orchestrator_agent import OrchestratorAgent
+from app.core.dag import DagNode, DagScheduler
+from app.core.mock_impl import MockClient
+
+
+def _node(name, inputs=(), delay=0.0, log=None, output=None, **kwargs):
+    async def func(context, results):
+        if log is not None:
+            log.append(("start", name, sorted(results)))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return output if output is not None else {"status": "success", "node": name}
+
+    return DagNode(name, func, inputs=inputs, **kwargs)
+
+
+class TestDagScheduler:
+    """Test dependency-driven execution"""
+
+    @pytest.mark.asyncio
+    async def test_independent_branches_run_concurrently(self):
+        log = []
+        dag = DagScheduler(
+            "test",
+            [
+                _node("a", log=log),
+                _node("b", ("a",), delay=0.02, log=log),
+                _node("c", ("a",), delay=0.02, log=log),
+                _node("d", ("b", "c"), log=log),
+            ],
+        )
+
+        run = await dag.run({})
+
+        assert run.succeeded
+        starts = [entry for entry in log if entry[0] == "start"]
+        assert [entry[1] for entry in starts[:1]] == ["a"]
+        assert log.index(("start", "c", ["a"])) < log.index(("end", "b"))
+        assert ("start", "d", ["a", "b", "c"]) in log
+        timings = run.timings()
+        assert timings["b"]["duration_seconds"] >= 0.02
+        assert timings["d"]["start_offset_seconds"] >= timings["c"]["end_offset_seconds"]
+
+    @pytest.mark.asyncio
+    async def test_failure_skips_dependents_only(self):
+        dag = DagScheduler(
+            "test",
+            [
+                _node("a"),
+                _node("b", ("a",), output={"status": "error", "message": "no rate card"}),
+                _node("c", ("a",)),
+                _node("d", ("b", "c")),
+            ],
+        )
+
+        run = await dag.run({})
+        nodes = run.to_dict()["nodes"]
+
+        assert run.failed_nodes == ["b"]
+        assert nodes["b"]["error"] == "no rate card"
+        assert nodes["c"]["status"] == "success"
+        assert nodes["d"]["status"] == "skipped"
+
+    @pytest.mark.asyncio
+    async def test_per_node_concurrency_limit(self):
+        active = {"now": 0, "peak": 0}
+
+        async def limited(context, results):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return {"status": "success"}
+
+        dag = DagScheduler("test", [DagNode("llm", limited)], concurrency_limits={"llm": 2})
+        await asyncio.gather(*(dag.run({}) for _ in range(6)))
+
+        assert active["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_provided_outputs_and_targets(self):
+        log = []
+        dag = DagScheduler(
+            "test",
+            [_node("a", log=log), _node("b", ("a",), log=log), _node("c", ("b",), log=log)],
+        )
+
+        run = await dag.run({}, provided={"a": {"status": "success"}}, targets=["b"])
+
+        assert [entry[1] for entry in log if entry[0] == "start"] == ["b"]
+        assert set(run.nodes) == {"a", "b"}
+        assert run.nodes["a"].status == "provided"
+
+    def test_invalid_graphs_rejected(self):
+        with pytest.raises(ValueError):
+            DagScheduler("test", [_node("a", ("b",)), _node("b", ("a",))])
+        with pytest.raises(ValueError):
+            DagScheduler("test", [_node("a", ("missing",))])
+
+
+@pytest.mark.asyncio
+async def test_coordinate_agents_runs_business_case_workflow():
+    """Cost and value start together once effort is done; financial waits for both"""
+    orchestrator = OrchestratorAgent(db=MockClient(), llm_registry=Mock())
+    log = []
+
+    def agent_call(name, response, delay=0.0):
+        async def call(**kwargs):
+            log.append(("start", name))
+            await asyncio.sleep(delay)
+            log.append(("end", name))
+            return response
+
+        return call
+
+    orchestrator.architect_agent.generate_system_design = agent_call(
+        "design", {"status": "success", "system_design_draft": {"content_markdown": "# Design"}}
+    )
+    orchestrator.planner_agent.estimate_effort = agent_call(
+        "effort", {"status": "success", "effort_breakdown": {"roles": [], "total_hours": 10}}
+    )
+    orchestrator.cost_analyst_agent.calculate_cost = agent_call(
+        "cost", {"status": "success", "cost_estimate": {"estimated_cost": 1000}}, delay=0.02
+    )
+    orchestrator.sales_value_analyst_agent.project_value = agent_call(
+        "value", {"status": "success", "value_projection": {"scenarios": []}}, delay=0.02
+    )
+    orchestrator.financial_model_agent.generate_financial_summary = agent_call(
+        "financial", {"status": "success", "financial_summary": {}}
+    )
+
+    response = await orchestrator.coordinate_agents(
+        {
+            "case_data": {"case_title": "Case"},
+            "provided": {
+                "prd": {"status": "success", "prd_draft": {"content_markdown": "# PRD"}}
+            },
+        }
+    )
+
+    assert response["status"] == "success"
+    assert response["nodes"]["prd"]["status"] == "provided"
+    assert log.index(("start", "value")) < log.index(("end", "cost"))
+    assert log.index(("start", "financial")) > log.index(("end", "value"))
+    assert response["results"]["financial"]["status"] == "success"
@@ -0,0 +1,67 @@
+"""
+Unit tests for the single-pass HTML text extractor
+"""
+
+from app.utils.html_extractor import TRUNCATION_MARKER, extract_html_text
+
+
+class TestExtractHtmlText:
+    """Test text extraction behaviour"""
+
+    def test_nested_text_is_emitted_once(self):
+        html = (
+            "<html><body><div><div><div>"
+            "<p>Deeply nested paragraph text.</p>"
+            "</div></div></div></body></html>"
+        )
+
+        result = extract_html_text(html, 1000)
+
+        assert result["text"].count("Deeply nested paragraph text.") == 1
+
+    def test_block_boundaries_and_inline_text(self):
+        html = (
+            "<html><body>"
+            "<h2>Requirements overview</h2>"
+            "<p>Prescriptions must sync <b>within five</b> seconds.</p>"
+            "<ul><li>First requirement item</li><li>Second requirement item</li></ul>"
+            "<!-- hidden editorial comment -->"
+            "</body></html>"
+        )
+
+        lines = extract_html_text(html, 1000)["text"].split("\n")
+
+        assert lines == [
+            "Requirements overview",
+            "Prescriptions must sync within five seconds.",
+            "First requirement item",
+            "Second requirement item",
+        ]
+
+    def test_main_content_is_preferred(self):
+        html = (
+            "<html><body><div>Unrelated page chrome text</div>"
+            "<article><p>Article body that matters.</p></article></body></html>"
+        )
+
+        result = extract_html_text(html, 1000)
+
+        assert result["text"] == "Article body that matters."
+
+    def test_extraction_stops_at_budget(self):
+        paragraphs = "".join(f"<p>Paragraph number {i} with some text.</p>" for i in range(5000))
+        html = f"<html><body>{paragraphs}</body></html>"
+
+        result = extract_html_text(html, 500)
+
+        assert result["text"].endswith(TRUNCATION_MARKER)
+        assert len(result["text"]) == 500 + len(TRUNCATION_MARKER)
+        assert "Paragraph number 4999" not in result["text"]
+
+    def test_deep_dom_does_not_recurse(self):
+        depth = 3000
+        html = "<div>" * depth + "<p>Bottom of a very deep tree.</p>" + "</div>" * depth
+
+        result = extract_html_text(html, 1000)
+
+        assert result["text"] == "Bottom of a very deep tree."
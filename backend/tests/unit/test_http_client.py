@@ -0,0 +1,162 @@
+"""
+Unit tests for the shared pooled HTTP client and the async fetch path
+"""
+
+import asyncio
+import httpx
+import pytest
+
+from app.core.http_client import SharedHTTPClient
+from app.utils import web_utils
+from app.utils.web_utils import _detect_charset, _fetch_url
+
+HTML_HEADERS = {"content-type": "text/html; charset=utf-8"}
+
+
+def _client(handler, **kwargs):
+    return SharedHTTPClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+class TestSharedHTTPClient:
+    """Test pooling and per-host limits"""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_and_closed(self):
+        client = _client(lambda request: httpx.Response(200))
+
+        first = client.get_client()
+        second = client.get_client()
+        assert first is second
+
+        await client.aclose()
+        assert first.is_closed
+        assert client.get_status()["open"] is False
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        client = _client(lambda request: httpx.Response(200), max_connections_per_host=2)
+        in_flight = {"a.example.com": 0, "b.example.com": 0}
+        peak = {"a.example.com": 0, "b.example.com": 0}
+
+        async def hold(url, host):
+            async with client.host_slot(url):
+                in_flight[host] += 1
+                peak[host] = max(peak[host], in_flight[host])
+                await asyncio.sleep(0.01)
+                in_flight[host] -= 1
+
+        await asyncio.gather(
+            *[hold(f"https://a.example.com/{i}", "a.example.com") for i in range(5)],
+            *[hold(f"https://b.example.com/{i}", "b.example.com") for i in range(3)],
+        )
+
+        assert peak == {"a.example.com": 2, "b.example.com": 2}
+        await client.aclose()
+
+
+class TestFetchURL:
+    """Test _fetch_url against a mock transport"""
+
+    @pytest.mark.asyncio
+    async def test_successful_fetch_returns_validators(self):
+        def handler(request):
+            assert request.headers["If-None-Match"] == '"old"'
+            return httpx.Response(
+                200,
+                headers={**HTML_HEADERS, "etag": '"new"', "last-modified": "Tue, 02 Jan 2024 00:00:00 GMT"},
+                text="<html><body><p>Hello</p></body></html>",
+            )
+
+        client = _client(handler)
+        result = await _fetch_url("https://wiki.example.com/page", {"If-None-Match": '"old"'}, client)
+
+        assert result["success"] is True
+        assert "Hello" in result["html"]
+        assert result["etag"] == '"new"'
+        assert result["last_modified"] == "Tue, 02 Jan 2024 00:00:00 GMT"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self):
+        client = _client(lambda request: httpx.Response(304))
+        result = await _fetch_url("https://wiki.example.com/page", {"If-None-Match": '"v1"'}, client)
+
+        assert result == {"success": True, "not_modified": True, "status_code": 304}
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_http_error_and_content_type(self):
+        def handler(request):
+            if request.url.path == "/missing":
+                return httpx.Response(404)
+            return httpx.Response(200, headers={"content-type": "application/pdf"}, content=b"%PDF")
+
+        client = _client(handler)
+        missing = await _fetch_url("https://wiki.example.com/missing", None, client)
+        pdf = await _fetch_url("https://wiki.example.com/file.pdf", None, client)
+
+        assert missing["success"] is False
+        assert "HTTP error 404" in missing["error"]
+        assert missing["status_code"] == 404
+        assert "Unsupported content type" in pdf["error"]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_connection_error(self):
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        client = _client(handler)
+        result = await _fetch_url("https://down.example.com", None, client)
+
+        assert result["success"] is False
+        assert "Connection error" in result["error"]
+        await client.aclose()
+
+
+class TestBoundedBodyReader:
+    """Test byte budget, Content-Length precheck and charset handling"""
+
+    @pytest.mark.asyncio
+    async def test_body_is_truncated_at_byte_budget(self, monkeypatch):
+        monkeypatch.setattr(web_utils, "MAX_HTML_BYTES", 1000)
+        client = _client(lambda request: httpx.Response(200, headers=HTML_HEADERS, content=b"a" * 5000))
+
+        result = await _fetch_url("https://wiki.example.com/big", None, client)
+
+        assert result["success"] is True
+        assert len(result["html"]) == 1000
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_oversized_content_length_is_rejected(self, monkeypatch):
+        monkeypatch.setattr(web_utils, "MAX_RESPONSE_BYTES", 100)
+        client = _client(lambda request: httpx.Response(200, headers=HTML_HEADERS, content=b"a" * 500))
+
+        result = await _fetch_url("https://wiki.example.com/export", None, client)
+
+        assert result["success"] is False
+        assert "Content too large" in result["error"]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_body_decoded_with_declared_charset(self):
+        page = "<html><body><p>Caf\u00e9 r\u00e9sum\u00e9</p></body></html>"
+        client = _client(
+            lambda request: httpx.Response(
+                200,
+                headers={"content-type": "text/html; charset=iso-8859-1"},
+                content=page.encode("iso-8859-1"),
+            )
+        )
+
+        result = await _fetch_url("https://wiki.example.com/latin", None, client)
+
+        assert "Caf\u00e9 r\u00e9sum\u00e9" in result["html"]
+        await client.aclose()
+
+    def test_detect_charset(self):
+        assert _detect_charset("text/html; charset=UTF-8", b"") == "utf-8"
+        assert _detect_charset("text/html", b'<meta charset="windows-1252">') == "cp1252"
+        assert _detect_charset("text/html; charset=bogus", b"") == "utf-8"
+        assert _detect_charset("text/html", b"<html></html>") == "utf-8"
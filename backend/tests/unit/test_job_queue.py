@@ -0,0 +1,262 @@
+"""
+Unit tests for the lease-based job queue and worker
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+from app.agents.orchestrator_agent import OrchestratorAgent
+from app.core.constants import Collections
+from app.core.database import DocumentAlreadyExistsError
+from app.core.job_queue import JobQueue, JobWorker, LeaseLostError
+from app.core.mock_impl import MockClient
+
+
+def _job(db, job_id):
+    return db.collection(Collections.JOBS).document(job_id).get().to_dict()
+
+
+def test_mock_create_is_exclusive():
+    doc = MockClient().collection("leases").document("a")
+    doc.create({"owner": 1})
+    with pytest.raises(DocumentAlreadyExistsError):
+        doc.create({"owner": 2})
+    assert doc.get().to_dict() == {"owner": 1}
+
+
+class TestJobQueue:
+    """Test claiming, leases and job state transitions"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_and_claim_oldest_first(self):
+        db = MockClient()
+        queue = JobQueue(db, lease_seconds=60)
+        first = await queue.enqueue("demo", "user1", {"n": 1})
+        await queue.enqueue("demo", "user1", {"n": 2})
+        assert _job(db, first)["status"] == "pending"
+
+        job = await queue.claim("w1")
+        assert job.id == first
+        assert job.payload == {"n": 1}
+        assert job.attempt == 1
+        stored = _job(db, first)
+        assert stored["status"] == "in_progress"
+        assert stored["worker_id"] == "w1"
+        assert stored["lease_expires_at"] > datetime.now(timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_claims_lease_each_job_once(self):
+        queue = JobQueue(MockClient(), lease_seconds=60)
+        await queue.enqueue("demo", "user1", {})
+        claims = await asyncio.gather(*(queue.claim(f"w{i}") for i in range(5)))
+        assert len([c for c in claims if c is not None]) == 1
+
+    @pytest.mark.asyncio
+    async def test_claim_filters_job_types(self):
+        queue = JobQueue(MockClient())
+        await queue.enqueue("other", "user1", {})
+        assert await queue.claim("w1", job_types=["demo"]) is None
+        assert (await queue.claim("w1", job_types=["other"])).job_type == "other"
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed_and_old_worker_loses_it(self):
+        db = MockClient()
+        queue = JobQueue(db, lease_seconds=60, max_attempts=2)
+        job_id = await queue.enqueue("demo", "user1", {})
+        stale = await queue.claim("w1")
+        assert await queue.claim("w2") is None
+
+        db.collection(Collections.JOBS).document(job_id).update(
+            {"lease_expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+        )
+        fresh = await queue.claim("w2")
+        assert fresh.attempt == 2
+        with pytest.raises(LeaseLostError):
+            await queue.heartbeat(stale)
+        with pytest.raises(LeaseLostError):
+            await queue.complete(stale)
+        with pytest.raises(LeaseLostError):
+            await queue.fail(stale, "stale")
+        stored = _job(db, job_id)
+        assert (stored["status"], stored["worker_id"], stored["attempts"]) == ("in_progress", "w2", 2)
+
+        # Out of attempts: the next lapse fails the job
+        db.collection(Collections.JOBS).document(job_id).update(
+            {"lease_expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+        )
+        assert await queue.claim("w3") is None
+        assert _job(db, job_id)["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_records_progress_and_extends_lease(self):
+        db = MockClient()
+        queue = JobQueue(db, lease_seconds=60)
+        job_id = await queue.enqueue("demo", "user1", {})
+        job = await queue.claim("w1")
+        before = _job(db, job_id)["lease_expires_at"]
+
+        await asyncio.sleep(0.01)
+        await queue.heartbeat(job, progress=40, message="Halfway")
+        stored = _job(db, job_id)
+        assert stored["progress"] == 40
+        assert stored["progress_message"] == "Halfway"
+        assert stored["lease_expires_at"] > before
+
+    @pytest.mark.asyncio
+    async def test_fail_requeues_until_attempts_exhausted(self):
+        db = MockClient()
+        queue = JobQueue(db, max_attempts=2)
+        job_id = await queue.enqueue("demo", "user1", {})
+
+        assert (await queue.fail(await queue.claim("w1"), "boom")).value == "pending"
+        assert (await queue.fail(await queue.claim("w1"), "boom")).value == "failed"
+        stored = _job(db, job_id)
+        assert stored["status"] == "failed"
+        assert stored["error_message"] == "boom"
+        assert stored["attempts"] == 2
+
+
+class TestJobWorker:
+    """Test handler execution by workers"""
+
+    @pytest.mark.asyncio
+    async def test_run_once_completes_job_with_progress(self):
+        db = MockClient()
+        queue = JobQueue(db)
+        job_id = await queue.enqueue("demo", "user1", {"x": 2})
+        seen = []
+
+        async def handler(job, progress):
+            await progress(50, "Working")
+            seen.append(_job(db, job.id)["progress"])
+            return {"status": "success", "case_id": "case-1", "value": job.payload["x"] * 2}
+
+        worker = JobWorker(queue, {"demo": handler}, worker_id="w1")
+        assert await worker.run_once() is True
+        assert await worker.run_once() is False
+
+        stored = _job(db, job_id)
+        assert seen == [50]
+        assert stored["status"] == "completed"
+        assert stored["progress"] == 100
+        assert stored["business_case_id"] == "case-1"
+        assert stored["result"]["value"] == 4
+
+    @pytest.mark.asyncio
+    async def test_error_response_fails_without_retry_and_exception_retries(self):
+        db = MockClient()
+        queue = JobQueue(db, max_attempts=3)
+        errored = await queue.enqueue("error", "user1", {})
+        raised = await queue.enqueue("raise", "user1", {})
+
+        async def error_handler(job, progress):
+            return {"status": "error", "message": "Missing problem statement"}
+
+        async def raising_handler(job, progress):
+            raise RuntimeError("transient")
+
+        worker = JobWorker(queue, {"error": error_handler, "raise": raising_handler})
+        await worker.run_once()
+        await worker.run_once()
+
+        assert _job(db, errored)["status"] == "failed"
+        assert _job(db, errored)["error_message"] == "Missing problem statement"
+        assert _job(db, raised)["status"] == "pending"
+        assert _job(db, raised)["attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_database_errors_recording_outcome_are_contained(self):
+        db = MockClient()
+        queue = JobQueue(db)
+        job_ids = [await queue.enqueue(job_type, "user1", {}) for job_type in ("ok", "raise")]
+        queue.complete = AsyncMock(side_effect=RuntimeError("unavailable"))
+        queue.fail = AsyncMock(side_effect=RuntimeError("unavailable"))
+
+        async def ok_handler(job, progress):
+            return {"status": "success"}
+
+        async def raising_handler(job, progress):
+            raise RuntimeError("transient")
+
+        worker = JobWorker(queue, {"ok": ok_handler, "raise": raising_handler})
+        assert await worker.run_once() is True
+        assert await worker.run_once() is True
+
+        assert queue.complete.await_count == 1
+        assert queue.fail.await_count == 1
+        assert all(_job(db, job_id)["status"] == "in_progress" for job_id in job_ids)
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_cancels_handler(self):
+        db = MockClient()
+        queue = JobQueue(db)
+        job_id = await queue.enqueue("demo", "user1", {})
+        cancelled = asyncio.Event()
+
+        async def handler(job, progress):
+            db.collection(Collections.JOBS).document(job.id).update({"worker_id": "other"})
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        worker = JobWorker(queue, {"demo": handler}, heartbeat_seconds=0.01)
+        await asyncio.wait_for(worker.run_once(), 1)
+        assert cancelled.is_set()
+        assert _job(db, job_id)["worker_id"] == "other"
+
+    @pytest.mark.asyncio
+    async def test_run_processes_jobs_until_stopped(self):
+        db = MockClient()
+        queue = JobQueue(db)
+        job_ids = [await queue.enqueue("demo", "user1", {"n": n}) for n in range(3)]
+
+        async def handler(job, progress):
+            await asyncio.sleep(0.01)
+            return {"status": "success"}
+
+        stop = asyncio.Event()
+        worker = JobWorker(queue, {"demo": handler}, concurrency=2, poll_interval=0.01)
+        runner = asyncio.create_task(worker.run(stop))
+        for _ in range(100):
+            if all(_job(db, j)["status"] == "completed" for j in job_ids):
+                break
+            await asyncio.sleep(0.01)
+        stop.set()
+        await asyncio.wait_for(runner, 1)
+        assert all(_job(db, j)["status"] == "completed" for j in job_ids)
+
+
+@pytest.mark.asyncio
+async def test_generate_business_case_request_returns_job_id_immediately():
+    db = MockClient()
+    orchestrator = OrchestratorAgent(db=db, llm_registry=Mock())
+    orchestrator.generate_business_case = AsyncMock(
+        return_value={"status": "success", "case_id": "case-9"}
+    )
+
+    response = await orchestrator.handle_request(
+        "generate_business_case",
+        {"requirements": {"problemStatement": "Slow refills"}, "title": "Refills"},
+        "user1",
+    )
+    assert response["status"] == "success"
+    orchestrator.generate_business_case.assert_not_called()
+    status = await orchestrator.handle_request(
+        "get_job_status", {"job_id": response["job_id"]}, "user1"
+    )
+    assert status["result"]["status"] == "pending"
+
+    worker = JobWorker(orchestrator.job_queue, orchestrator.job_handlers())
+    assert await worker.run_once() is True
+    orchestrator.generate_business_case.assert_awaited_once_with(
+        {"problemStatement": "Slow refills", "user_id": "user1"}
+    )
+    status = await orchestrator.handle_request(
+        "get_job_status", {"job_id": response["job_id"]}, "user1"
+    )
+    assert status["result"]["status"] == "completed"
+    assert status["result"]["business_case_id"] == "case-9"
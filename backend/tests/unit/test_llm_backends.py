@@ -0,0 +1,142 @@
+"""
+Unit tests for the record/replay LLM backends
+"""
+
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.core.llm_backends import (
+    CassetteMissError,
+    CassetteStore,
+    LatencyModel,
+    ReplayModel,
+)
+from app.core.llm_cache import LLMResponseCache
+from app.core.llm_registry import LLMRegistry
+
+
+def _vertex_response(text):
+    candidate = SimpleNamespace(
+        content=SimpleNamespace(parts=[SimpleNamespace(text=text)]),
+        finish_reason="STOP",
+        safety_ratings=[],
+    )
+    return SimpleNamespace(
+        candidates=[candidate],
+        prompt_feedback=None,
+        usage_metadata=SimpleNamespace(prompt_token_count=12, candidates_token_count=3),
+    )
+
+
+class FakeLiveModel:
+    """Stands in for a Vertex AI GenerativeModel."""
+
+    def __init__(self, model_name=None):
+        self.calls = 0
+
+    async def generate_content_async(self, contents, generation_config, safety_settings, stream):
+        self.calls += 1
+        if not stream:
+            return _vertex_response(f"answer to {contents[0]}")
+
+        async def chunks():
+            for text in ("first ", "second"):
+                yield _vertex_response(text)
+
+        return chunks()
+
+
+def _registry(backend, store, **kwargs):
+    with patch("vertexai.init"), patch(
+        "vertexai.generative_models.GenerativeModel", FakeLiveModel
+    ):
+        registry = LLMRegistry(
+            project_id="test-project", backend=backend, cassette_store=store, **kwargs
+        )
+        registry.get_model("gemini-test")
+    return registry
+
+
+class TestRecordReplay:
+    """Test capturing generations and serving them offline"""
+
+    @pytest.mark.asyncio
+    async def test_recorded_generation_replays_offline(self, tmp_path):
+        store = CassetteStore(str(tmp_path))
+        recorded = await _registry("record", store).get_model("gemini-test").generate(["PRD"])
+
+        with patch("vertexai.init", side_effect=AssertionError("network used")):
+            registry = LLMRegistry(project_id="test-project", backend="replay", cassette_store=store)
+            replayed = await registry.get_model("gemini-test").generate(["PRD"])
+
+        assert len(store) == 1
+        assert recorded.text == replayed.text == "answer to PRD"
+        assert replayed.usage == {"prompt_tokens": 12, "output_tokens": 3}
+
+    @pytest.mark.asyncio
+    async def test_record_bypasses_response_cache(self, tmp_path):
+        store = CassetteStore(str(tmp_path))
+        cache = LLMResponseCache()
+        await _registry("vertex", None, cache=cache).get_model("gemini-test").generate(["PRD"])
+
+        registry = _registry("record", store, cache=cache)
+        await registry.get_model("gemini-test").generate(["PRD"])
+
+        assert registry.cache is None
+        replayed = await _registry("replay", store).get_model("gemini-test").generate(["PRD"])
+        assert replayed.text == "answer to PRD"
+
+    @pytest.mark.asyncio
+    async def test_recorded_stream_replays_as_chunks(self, tmp_path):
+        store = CassetteStore(str(tmp_path))
+        handle = _registry("record", store).get_model("gemini-test")
+        recorded = [chunk.text async for chunk in handle.stream(["PRD"], bypass_cache=True)]
+
+        replay = _registry("replay", store).get_model("gemini-test")
+        replayed = [chunk.text async for chunk in replay.stream(["PRD"], bypass_cache=True)]
+        whole = await replay.generate(["PRD"], bypass_cache=True)
+
+        assert recorded == replayed == ["first ", "second"]
+        assert whole.text == "first second"
+
+    @pytest.mark.asyncio
+    async def test_replay_miss_raises(self, tmp_path):
+        handle = _registry("replay", CassetteStore(str(tmp_path))).get_model("gemini-test")
+
+        with pytest.raises(CassetteMissError):
+            await handle.generate(["never recorded"])
+
+    @pytest.mark.asyncio
+    async def test_replay_applies_latency(self, tmp_path):
+        store = CassetteStore(str(tmp_path))
+        model = ReplayModel("gemini-test", store, LatencyModel("fixed", median_seconds=0.05))
+        store.load = lambda k: {"chunks": [{"text": "ok"}], "latency_seconds": 9}
+
+        started = time.perf_counter()
+        response = await model.generate_content_async(["PRD"])
+
+        assert time.perf_counter() - started >= 0.05
+        assert response.candidates[0].content.parts[0].text == "ok"
+
+
+class TestLatencyModel:
+    """Test replay latency distributions"""
+
+    def test_modes(self):
+        assert LatencyModel("recorded", scale=0.5).sample(4.0) == 2.0
+        assert LatencyModel("fixed", median_seconds=1.5).sample(4.0) == 1.5
+        assert LatencyModel("none").sample(4.0) == 0.0
+
+    def test_lognormal_is_seeded_and_centered(self):
+        first = [LatencyModel("lognormal", 2.0, 0.5, seed=7).sample() for _ in range(3)]
+        model = LatencyModel("lognormal", 2.0, 0.5, seed=7)
+        samples = sorted(model.sample() for _ in range(999))
+
+        assert first[0] == first[1] == first[2]
+        assert 1.7 < samples[499] < 2.3
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            LatencyModel("gaussian")
@@ -0,0 +1,175 @@
+"""
+Unit tests for the LLM response cache
+"""
+
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from app.core.llm_cache import (
+    GenerationResult,
+    LLMResponseCache,
+    bypass_llm_cache,
+    is_cache_bypassed,
+    make_cache_key,
+)
+from app.core.llm_registry import GenerationProfile, ModelHandle
+
+
+def _vertex_response(text):
+    """Build a minimal object shaped like a Vertex AI response."""
+    part = Mock()
+    part.text = text
+    candidate = Mock()
+    candidate.content.parts = [part]
+    candidate.finish_reason = "STOP"
+    candidate.safety_ratings = []
+    response = Mock()
+    response.candidates = [candidate]
+    response.prompt_feedback = None
+    response.usage_metadata.prompt_token_count = 10
+    response.usage_metadata.candidates_token_count = 5
+    return response
+
+
+def _handle(cache, texts):
+    """Model handle whose model returns the given texts in order."""
+    model = Mock()
+    calls = []
+
+    async def fake_generate(contents, generation_config, safety_settings, stream):
+        calls.append(contents)
+        return _vertex_response(texts[len(calls) - 1])
+
+    model.generate_content_async = fake_generate
+    profile = GenerationProfile("test", {"temperature": 0.2})
+    return ModelHandle("gemini-test", profile, model, None, cache), calls
+
+
+class TestCacheKey:
+    """Test content-addressed key construction"""
+
+    def test_key_is_stable_and_order_independent(self):
+        first = make_cache_key("m", ["p"], {"a": 1, "b": 2}, None)
+        second = make_cache_key("m", ["p"], {"b": 2, "a": 1}, None)
+        assert first == second
+
+    def test_key_changes_with_inputs(self):
+        base = make_cache_key("m", ["p"], {"a": 1}, None)
+        assert make_cache_key("other", ["p"], {"a": 1}, None) != base
+        assert make_cache_key("m", ["q"], {"a": 1}, None) != base
+        assert make_cache_key("m", ["p"], {"a": 2}, None) != base
+
+
+class TestLLMResponseCache:
+    """Test memory and disk tiers"""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = LLMResponseCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            await cache.set(key, GenerationResult(key, "m"))
+
+        assert await cache.get("a") is None
+        assert (await cache.get("c")).text == "c"
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        cache = LLMResponseCache(ttl_seconds=0.01)
+        await cache.set("k", GenerationResult("text", "m"))
+        time.sleep(0.02)
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_empty_results_are_not_stored(self):
+        cache = LLMResponseCache()
+        await cache.set("k", GenerationResult(None, "m"))
+        assert await cache.get("k") is None
+        assert cache.get_stats()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sqlite_tier_survives_new_instance(self, tmp_path):
+        path = str(tmp_path / "llm_cache.db")
+        first = LLMResponseCache(sqlite_path=path)
+        await first.set("k", GenerationResult("persisted", "m"))
+
+        second = LLMResponseCache(sqlite_path=path)
+        result = await second.get("k")
+
+        assert result.text == "persisted"
+        assert result.cached is True
+        assert second.get_stats()["disk_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_hit_keeps_stored_expiry(self, tmp_path):
+        path = str(tmp_path / "llm_cache.db")
+        first = LLMResponseCache(ttl_seconds=60, sqlite_path=path)
+        await first.set("k", GenerationResult("persisted", "m"))
+        stored_expiry = first._memory["k"][0]
+
+        later = time.time() + 30
+        second = LLMResponseCache(ttl_seconds=60, sqlite_path=path)
+        with patch("app.core.llm_cache.time.time", return_value=later):
+            await second.get("k")
+
+        assert second._memory["k"][0] == stored_expiry
+
+
+class TestCachedGeneration:
+    """Test ModelHandle.generate through the cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_prompt_hits_cache(self):
+        cache = LLMResponseCache()
+        handle, calls = _handle(cache, ["first", "second"])
+
+        first = await handle.generate(["prompt"])
+        second = await handle.generate(["prompt"])
+
+        assert first.text == "first"
+        assert first.usage == {"prompt_tokens": 10, "output_tokens": 5}
+        assert second.text == "first"
+        assert second.cached is True
+        assert len(calls) == 1
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bypass_skips_lookup(self):
+        cache = LLMResponseCache()
+        handle, calls = _handle(cache, ["first", "second", "third"])
+
+        await handle.generate(["prompt"])
+        fresh = await handle.generate(["prompt"], bypass_cache=True)
+        with bypass_llm_cache():
+            assert is_cache_bypassed() is True
+            fresher = await handle.generate(["prompt"])
+
+        assert is_cache_bypassed() is False
+        assert fresh.text == "second"
+        assert fresher.text == "third"
+        assert len(calls) == 3
+        assert cache.get_stats()["bypassed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_completed_stream_is_cached(self):
+        cache = LLMResponseCache()
+        model = Mock()
+
+        async def fake_generate(contents, generation_config, safety_settings, stream):
+            async def chunks():
+                for text in ("Hel", "lo"):
+                    yield _vertex_response(text)
+
+            return chunks()
+
+        model.generate_content_async = fake_generate
+        handle = ModelHandle("gemini-test", GenerationProfile("test", {}), model, None, cache)
+
+        streamed = [chunk.text async for chunk in handle.stream(["prompt"])]
+        replayed = await handle.generate(["prompt"])
+
+        assert streamed == ["Hel", "lo"]
+        assert replayed.text == "Hello"
+        assert replayed.cached is True
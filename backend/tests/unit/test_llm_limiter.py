@@ -0,0 +1,167 @@
+"""
+Unit tests for the adaptive LLM concurrency limiter
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from app.core.llm_cache import LLMResponseCache
+from app.core.llm_limiter import AdaptiveConcurrencyLimiter, is_overload_error
+from app.core.llm_registry import GenerationProfile, ModelHandle
+
+
+class TestOverloadDetection:
+    """Test classification of throttling errors"""
+
+    def test_google_resource_exhausted(self):
+        from google.api_core import exceptions as api_exceptions
+
+        assert is_overload_error(api_exceptions.ResourceExhausted("quota"))
+        assert is_overload_error(api_exceptions.TooManyRequests("slow down"))
+
+    def test_message_markers(self):
+        assert is_overload_error(Exception("429 RESOURCE_EXHAUSTED: try later"))
+        assert not is_overload_error(ValueError("bad prompt"))
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test AIMD limit adaptation and fair queueing"""
+
+    @pytest.mark.asyncio
+    async def test_in_flight_never_exceeds_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        active = 0
+        peak = 0
+
+        async def call():
+            nonlocal active, peak
+            async with limiter.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.get_metrics()["requests"] == 6
+        assert limiter.get_metrics()["max_wait_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_in_order(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        order = []
+
+        async def call(index):
+            async with limiter.slot():
+                order.append(index)
+                await asyncio.sleep(0)
+
+        async with limiter.slot():
+            tasks = [asyncio.create_task(call(i)) for i in range(5)]
+            await asyncio.sleep(0)
+            assert limiter.queue_depth == 5
+        await asyncio.gather(*tasks)
+
+        assert order == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_overload_halves_limit_once_per_window(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=32)
+
+        async def throttled():
+            async with limiter.slot():
+                await asyncio.sleep(0.01)
+                raise Exception("429 RESOURCE_EXHAUSTED")
+
+        results = await asyncio.gather(
+            *(throttled() for _ in range(4)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, Exception) for r in results)
+        assert limiter.limit == 4
+        assert limiter.get_metrics()["throttled"] == 4
+
+    @pytest.mark.asyncio
+    async def test_success_grows_limit_up_to_max(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+
+        for _ in range(20):
+            async with limiter.slot():
+                pass
+
+        assert limiter.limit == 3
+
+    @pytest.mark.asyncio
+    async def test_slow_success_does_not_grow_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=2, max_limit=8, latency_threshold_seconds=0.0
+        )
+
+        async with limiter.slot():
+            await asyncio.sleep(0.01)
+
+        assert limiter.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_limit_never_drops_below_min(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1)
+
+        for _ in range(3):
+            with pytest.raises(Exception):
+                async with limiter.slot():
+                    raise Exception("RESOURCE_EXHAUSTED")
+
+        assert limiter.limit == 1
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+
+        async with limiter.slot():
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        assert limiter.in_flight == 0
+        assert limiter.queue_depth == 0
+
+
+class TestLimitedModelHandle:
+    """Test that model calls, but not cache hits, go through the limiter"""
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_skip_limiter(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        model = Mock()
+
+        async def fake_generate(contents, generation_config, safety_settings, stream):
+            assert limiter.in_flight == 1
+            part = Mock()
+            part.text = "ok"
+            candidate = Mock()
+            candidate.content.parts = [part]
+            candidate.finish_reason = "STOP"
+            candidate.safety_ratings = []
+            response = Mock()
+            response.candidates = [candidate]
+            response.prompt_feedback = None
+            response.usage_metadata = None
+            return response
+
+        model.generate_content_async = fake_generate
+        handle = ModelHandle(
+            "gemini-test", GenerationProfile("test", {}), model, None, LLMResponseCache(), limiter
+        )
+
+        first = await handle.generate(["prompt"])
+        second = await handle.generate(["prompt"])
+
+        assert first.text == second.text == "ok"
+        assert second.cached is True
+        assert limiter.get_metrics()["requests"] == 1
+        assert limiter.in_flight == 0
@@ -0,0 +1,212 @@
+"""
+Unit tests for LLM request policies (deadlines, retries, hedging)
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from app.core.llm_limiter import AdaptiveConcurrencyLimiter
+from app.core.llm_policy import (
+    LLMDeadlineExceeded,
+    RequestPolicy,
+    RequestPolicyRunner,
+    is_transient_error,
+)
+from app.core.llm_registry import GenerationProfile, ModelHandle
+
+
+def _runner(**policy_kwargs):
+    policy = RequestPolicy("test", **policy_kwargs)
+    return RequestPolicyRunner({"default": RequestPolicy("default"), "test": policy})
+
+
+def _warm(runner, latency, samples=20):
+    tracker = runner.tracker("gemini-test", "test")
+    for _ in range(samples):
+        tracker.record(latency)
+
+
+class TestErrorClassification:
+    """Test which failures are retried"""
+
+    def test_transient_errors(self):
+        from google.api_core import exceptions as api_exceptions
+
+        assert is_transient_error(api_exceptions.ServiceUnavailable("down"))
+        assert is_transient_error(Exception("429 RESOURCE_EXHAUSTED"))
+        assert not is_transient_error(ValueError("invalid argument"))
+        assert not is_transient_error(LLMDeadlineExceeded("too slow"))
+
+
+class TestDeadlinesAndRetries:
+    """Test per-call deadlines and jittered retries"""
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_slow_call(self):
+        runner = _runner(timeout_seconds=0.05)
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(LLMDeadlineExceeded):
+            await runner.run("gemini-test", "test", slow)
+        assert runner.stats["test"]["deadline_exceeded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_transient_error_is_retried(self):
+        runner = _runner(max_retries=2, retry_backoff_seconds=0.001)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise Exception("503 Service Unavailable")
+            return "ok"
+
+        assert await runner.run("gemini-test", "test", flaky) == "ok"
+        assert len(attempts) == 3
+        assert runner.stats["test"]["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_is_not_retried(self):
+        runner = _runner(max_retries=3, retry_backoff_seconds=0.001)
+        attempts = []
+
+        async def broken():
+            attempts.append(1)
+            raise ValueError("invalid prompt")
+
+        with pytest.raises(ValueError):
+            await runner.run("gemini-test", "test", broken)
+        assert len(attempts) == 1
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RequestPolicy("test", retry_backoff_seconds=1.0, retry_backoff_max_seconds=4.0)
+
+        delays = [policy.backoff(5) for _ in range(50)]
+
+        assert all(0 <= d <= 4.0 for d in delays)
+        assert len(set(delays)) > 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_policy_uses_default(self):
+        runner = RequestPolicyRunner({"default": RequestPolicy("default", timeout_seconds=9)})
+
+        assert runner.get_policy("effort_estimation").timeout_seconds == 9
+
+
+class TestHedging:
+    """Test hedged requests after the observed p95 latency"""
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_history(self):
+        runner = _runner(hedge=True, hedge_min_delay_seconds=0.01)
+
+        assert runner.hedge_delay("gemini-test", runner.get_policy("test")) is None
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_over_stuck_primary(self):
+        runner = _runner(hedge=True, hedge_min_delay_seconds=0.01)
+        _warm(runner, 0.01)
+        calls = []
+
+        async def call():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+                return "primary"
+            return "hedge"
+
+        result = await asyncio.wait_for(runner.run("gemini-test", "test", call), 1)
+
+        assert result == "hedge"
+        assert len(calls) == 2
+        assert runner.stats["test"]["hedges"] == 1
+        assert runner.stats["test"]["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        runner = _runner(hedge=True, hedge_min_delay_seconds=0.5)
+        _warm(runner, 0.5)
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return "primary"
+
+        assert await runner.run("gemini-test", "test", call) == "primary"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_while_limiter_has_queue(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        runner = RequestPolicyRunner(
+            {"test": RequestPolicy("test", hedge=True, hedge_min_delay_seconds=0.01)},
+            limiter=limiter,
+        )
+        _warm(runner, 0.01)
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "primary"
+
+        async with limiter.slot():
+            queued = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            result = await runner.run("gemini-test", "test", call)
+        await queued
+
+        assert result == "primary"
+        assert len(calls) == 1
+
+
+class TestPolicyModelHandle:
+    """Test that model handles apply policies by profile name"""
+
+    @pytest.mark.asyncio
+    async def test_profile_policy_deadline(self):
+        runner = RequestPolicyRunner(
+            {"slow_profile": RequestPolicy("slow_profile", timeout_seconds=0.05)}
+        )
+        model = Mock()
+
+        async def fake_generate(contents, generation_config, safety_settings, stream):
+            await asyncio.sleep(1)
+
+        model.generate_content_async = fake_generate
+        handle = ModelHandle(
+            "gemini-test",
+            GenerationProfile("slow_profile", {}),
+            model,
+            policy_runner=runner,
+        )
+
+        with pytest.raises(LLMDeadlineExceeded):
+            await handle.generate(["prompt"])
+
+    @pytest.mark.asyncio
+    async def test_stream_deadline(self):
+        runner = RequestPolicyRunner({"default": RequestPolicy("default", timeout_seconds=0.05)})
+        model = Mock()
+
+        async def fake_generate(contents, generation_config, safety_settings, stream):
+            async def chunks():
+                yield Mock(candidates=[], prompt_feedback=None, usage_metadata=None)
+                await asyncio.sleep(1)
+                yield Mock(candidates=[], prompt_feedback=None, usage_metadata=None)
+
+            return chunks()
+
+        model.generate_content_async = fake_generate
+        handle = ModelHandle(
+            "gemini-test", GenerationProfile("default", {}), model, policy_runner=runner
+        )
+
+        received = []
+        with pytest.raises(LLMDeadlineExceeded):
+            async for chunk in handle.stream(["prompt"]):
+                received.append(chunk)
+        assert len(received) == 1
@@ -0,0 +1,63 @@
+"""
+Unit tests for the shared LLM registry
+"""
+
+import pytest
+from unittest.mock import patch, Mock
+
+from app.core.llm_registry import LLMRegistry
+
+
+class TestLLMRegistry:
+    """Test shared model handle behaviour"""
+
+    def test_vertex_init_runs_once_and_handles_are_shared(self):
+        """Same (model, profile) pair returns the same handle; init happens once"""
+        with patch("vertexai.init") as mock_init, patch(
+            "vertexai.generative_models.GenerativeModel"
+        ) as mock_model_cls:
+            registry = LLMRegistry(project_id="test-project", location="us-central1")
+
+            first = registry.get_model("gemini-test")
+            second = registry.get_model("gemini-test")
+            summary = registry.get_model("gemini-test", "summarization")
+
+            assert first is second
+            assert summary is not first
+            assert mock_init.call_count == 1
+            assert mock_model_cls.call_count == 2
+
+    def test_unknown_profile_raises(self):
+        """Asking for an undefined profile is a programming error"""
+        with patch("vertexai.init"), patch("vertexai.generative_models.GenerativeModel"):
+            registry = LLMRegistry(project_id="test-project")
+            with pytest.raises(ValueError):
+                registry.get_model("gemini-test", "no-such-profile")
+
+    def test_init_failure_returns_no_model(self):
+        """Agents receive None when Vertex AI cannot be initialized"""
+        with patch("vertexai.init", side_effect=Exception("no credentials")):
+            registry = LLMRegistry(project_id="test-project")
+            assert registry.get_model("gemini-test") is None
+            assert registry.available is False
+
+    @pytest.mark.asyncio
+    async def test_handle_applies_profile_defaults(self):
+        """Handles pass the profile generation config when none is given"""
+        with patch("vertexai.init"), patch(
+            "vertexai.generative_models.GenerativeModel"
+        ) as mock_model_cls:
+            mock_model = Mock()
+
+            async def fake_generate(contents, generation_config, safety_settings, stream):
+                return generation_config
+
+            mock_model.generate_content_async = fake_generate
+            mock_model_cls.return_value = mock_model
+
+            registry = LLMRegistry(project_id="test-project")
+            handle = registry.get_model("gemini-test", "summarization")
+            config = await handle.generate_content_async(["prompt"])
+
+            assert config["max_output_tokens"] == 512
+            assert config["temperature"] == 0.3
@@ -0,0 +1,112 @@
+"""
+Unit tests for the metrics subsystem
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from app.core.firestore_impl import FirestoreDocumentReference
+from app.core.llm_registry import GenerationProfile, ModelHandle
+from app.core.metrics import (
+    AGENT_METHOD_DURATION,
+    FIRESTORE_OPERATION_DURATION,
+    LLM_TOKENS,
+    REGISTRY,
+    MetricsRegistry,
+    instrument_agent_method,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+class TestPrometheusRendering:
+    """Test the text exposition format"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("op_seconds", "Op time", ("op",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, op="read")
+
+        text = registry.render()
+
+        assert "# TYPE op_seconds histogram" in text
+        assert 'op_seconds_bucket{op="read",le="0.1"} 1' in text
+        assert 'op_seconds_bucket{op="read",le="1"} 2' in text
+        assert 'op_seconds_bucket{op="read",le="+Inf"} 3' in text
+        assert 'op_seconds_count{op="read"} 3' in text
+
+    def test_counter_and_label_escaping(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Events", ("name",))
+        counter.inc(2, name='say "hi"')
+
+        assert 'events_total{name="say \\"hi\\""} 2' in registry.render()
+
+    def test_label_mismatch_rejected(self):
+        with pytest.raises(ValueError):
+            LLM_TOKENS.inc(1, model="m")
+
+
+class TestInstrumentation:
+    """Test agent, LLM and Firestore instrumentation"""
+
+    @pytest.mark.asyncio
+    async def test_agent_method_outcomes(self):
+        class Agent:
+            @instrument_agent_method("TestAgent")
+            async def run(self, status):
+                if status == "raise":
+                    raise RuntimeError("boom")
+                return {"status": status}
+
+        agent = Agent()
+        await agent.run("success")
+        await agent.run("error")
+        with pytest.raises(RuntimeError):
+            await agent.run("raise")
+
+        assert AGENT_METHOD_DURATION.count(agent="TestAgent", method="run", outcome="success") == 1
+        assert AGENT_METHOD_DURATION.count(agent="TestAgent", method="run", outcome="error") == 2
+
+    @pytest.mark.asyncio
+    async def test_llm_tokens_counted_from_usage_metadata(self):
+        model = Mock()
+
+        async def generate(contents, generation_config, safety_settings, stream):
+            return SimpleNamespace(
+                candidates=[],
+                prompt_feedback=None,
+                usage_metadata=SimpleNamespace(prompt_token_count=40, candidates_token_count=7),
+            )
+
+        model.generate_content_async = generate
+        handle = ModelHandle("gemini-test", GenerationProfile("default", {}), model)
+
+        await handle.generate(["prompt"])
+
+        assert LLM_TOKENS.value(model="gemini-test", profile="default", kind="prompt") == 40
+        assert LLM_TOKENS.value(model="gemini-test", profile="default", kind="output") == 7
+        assert "llm_request_duration_seconds_count" in REGISTRY.render()
+
+    def test_firestore_operations_timed_per_collection(self):
+        doc_ref = Mock()
+        doc_ref.update.side_effect = Exception("unavailable")
+        reference = FirestoreDocumentReference(doc_ref, Mock(), "business_cases")
+
+        reference.get()
+        with pytest.raises(Exception):
+            reference.update({"status": "DONE"})
+
+        assert FIRESTORE_OPERATION_DURATION.count(
+            collection="business_cases", operation="get", outcome="success"
+        ) == 1
+        assert FIRESTORE_OPERATION_DURATION.count(
+            collection="business_cases", operation="update", outcome="error"
+        ) == 1
@@ -0,0 +1,61 @@
+"""
+Unit tests for the end-to-end pipeline benchmark harness
+"""
+
+import pytest
+
+from app.core.llm_backends import LatencyModel
+from benchmarks.fake_llm import VALUE_PROJECTION
+from benchmarks.pipeline import STAGES, PipelineBenchmark, compare, percentile, run_benchmark
+
+
+class TestPipelineBenchmark:
+    """Test the benchmark drives cases through every stage"""
+
+    @pytest.mark.asyncio
+    async def test_cases_complete_every_stage(self):
+        results = await run_benchmark(
+            [2], cases=3, latency=LatencyModel("none"), include_pdf=False
+        )
+
+        run = results["runs"][0]
+        assert run["completed"] == 3
+        assert run["failed"] == 0
+        for stage in STAGES[:-1]:
+            assert run["stages"][stage]["count"] == 3
+            assert run["stages"][stage]["p95_ms"] is not None
+        assert run["stages"]["pdf"]["skipped"] == "disabled"
+        assert run["llm_calls"] > 0
+        assert run["peak_rss_mb"] > 0
+
+    @pytest.mark.asyncio
+    async def test_value_projection_uses_benchmark_db_and_llm(self):
+        db, registry, orchestrator = PipelineBenchmark(LatencyModel("none"))._build()
+        agent = orchestrator.sales_value_analyst_agent
+
+        response = await agent.project_value("# PRD", "Benchmark Case")
+
+        assert agent.db is db
+        assert response["value_projection"]["methodology"] == VALUE_PROJECTION["methodology"]
+        assert registry.calls == 1
+
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([3.0], 95) == 3.0
+        assert percentile([], 50) is None
+
+    def test_compare_reports_p95_change(self):
+        def result(p95):
+            stages = {stage: {"p95_ms": p95} for stage in STAGES}
+            return {
+                "commit": "abc123",
+                "runs": [{"concurrency": 10, "stages": stages, "pipeline": {"p95_ms": p95}}],
+            }
+
+        lines = compare(result(150.0), result(100.0))
+
+        assert lines[0] == "concurrency=10 vs abc123:"
+        assert "+50.0%" in lines[1]
@@ -0,0 +1,90 @@
+"""
+Unit tests for the managed CPU-bound process pool
+"""
+
+import asyncio
+import math
+import os
+import time
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.process_pool import (
+    ProcessPoolBusyError,
+    ProcessPoolService,
+    ProcessPoolTimeoutError,
+)
+
+
+@pytest.fixture
+def pool():
+    service = ProcessPoolService(
+        max_workers=1, max_queue=1, task_timeout_seconds=30, preload=(), enabled=True
+    )
+    yield service
+    service.shutdown()
+
+
+class TestProcessPoolService:
+    """Test task execution, limits and recovery"""
+
+    @pytest.mark.asyncio
+    async def test_runs_task_and_propagates_errors(self, pool):
+        pool.start()
+        assert await pool.run(math.factorial, 10) == 3628800
+        with pytest.raises(ValueError):
+            await pool.run(int, "not a number")
+        assert pool.restarts == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_recycles_pool(self, pool):
+        with pytest.raises(ProcessPoolTimeoutError):
+            await pool.run(time.sleep, 10, timeout=0.5)
+        assert pool.restarts == 1
+        assert await pool.run(math.factorial, 5) == 120
+
+    @pytest.mark.asyncio
+    async def test_timeout_spares_healthy_sibling_task(self):
+        service = ProcessPoolService(
+            max_workers=2, max_queue=0, task_timeout_seconds=30, preload=(), enabled=True
+        )
+        try:
+            service.start()
+            healthy = asyncio.create_task(service.run(time.sleep, 1.5))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ProcessPoolTimeoutError):
+                await service.run(time.sleep, 10, timeout=0.5)
+            assert service.stats()["retiring"] == 1
+
+            assert await healthy is None
+            # A killed sibling would have broken the pool and forced a retry
+            assert service.restarts == 1
+            assert service.stats()["retiring"] == 0
+            assert await service.run(math.factorial, 5) == 120
+        finally:
+            service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_crashed_worker_is_replaced(self, pool):
+        with pytest.raises(BrokenProcessPool):
+            await pool.run(os._exit, 1)
+        assert pool.restarts == 2  # Crashed on the original pool and on the retry
+        assert await pool.run(math.factorial, 5) == 120
+
+    @pytest.mark.asyncio
+    async def test_bounded_queue_rejects_overflow(self, pool):
+        running = asyncio.create_task(pool.run(time.sleep, 1.0))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(pool.run(math.factorial, 3))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ProcessPoolBusyError):
+            await pool.run(math.factorial, 4)
+        await running
+        assert await waiting == 6
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_uses_threads(self):
+        service = ProcessPoolService(enabled=False, task_timeout_seconds=0.2)
+        assert await service.run(math.factorial, 4) == 24
+        with pytest.raises(ProcessPoolTimeoutError):
+            await service.run(time.sleep, 1)
@@ -0,0 +1,111 @@
+"""
+Unit tests for single-flight request coalescing
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from app.agents.orchestrator_agent import OrchestratorAgent
+from app.core.mock_impl import MockClient
+from app.core.single_flight import SingleFlight, payload_hash
+
+
+def _counting(result=None, delay=0.02, error=None):
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result if result is not None else {"status": "success", "n": len(calls)}
+
+    return func, calls
+
+
+def test_payload_hash_normalizes_key_order_and_whitespace():
+    assert payload_hash({"a": 1, "b": " x "}) == payload_hash({"b": "x", "a": 1})
+    assert payload_hash({"a": 1}) != payload_hash({"a": 2})
+
+
+class TestSingleFlight:
+    """Test coalescing and the post-completion window"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight("test")
+        func, calls = _counting()
+        results = await asyncio.gather(*(flight.do("k", func) for _ in range(5)))
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+        other, other_calls = _counting()
+        await flight.do("other", other)
+        assert len(other_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_window_reuses_successes_only(self):
+        flight = SingleFlight("test", window_seconds=60)
+        func, calls = _counting()
+        await flight.do("k", func)
+        await flight.do("k", func)
+        assert len(calls) == 1
+
+        failing, failing_calls = _counting(result={"status": "error"})
+
+        def cacheable(result):
+            return result["status"] == "success"
+
+        await flight.do("f", failing, cacheable=cacheable)
+        await flight.do("f", failing, cacheable=cacheable)
+        assert len(failing_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_window_and_no_window_run_again(self):
+        flight = SingleFlight("test", window_seconds=0.01)
+        func, calls = _counting(delay=0)
+        await flight.do("k", func)
+        await asyncio.sleep(0.02)
+        await flight.do("k", func)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_exceptions_shared_but_not_kept(self):
+        flight = SingleFlight("test", window_seconds=60)
+        func, calls = _counting(error=RuntimeError("boom"))
+        results = await asyncio.gather(
+            flight.do("k", func), flight.do("k", func), return_exceptions=True
+        )
+        assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+        with pytest.raises(RuntimeError):
+            await flight.do("k", func)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        flight = SingleFlight("test")
+        func, calls = _counting(delay=0.05)
+        first = asyncio.create_task(flight.do("k", func))
+        second = asyncio.create_task(flight.do("k", func))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second)["status"] == "success"
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_coalesces_duplicate_generate_requests():
+    orchestrator = OrchestratorAgent(db=MockClient(), llm_registry=Mock())
+    payload = {"requirements": {"problemStatement": "Slow refills"}, "title": "Refills"}
+
+    responses = await asyncio.gather(
+        orchestrator.handle_request("generate_business_case", payload, "user1"),
+        orchestrator.handle_request("generate_business_case", dict(payload), "user1"),
+        orchestrator.handle_request("generate_business_case", payload, "user2"),
+    )
+    assert responses[0]["job_id"] == responses[1]["job_id"]
+    assert responses[2]["job_id"] != responses[0]["job_id"]
+
+    late = await orchestrator.handle_request("generate_business_case", payload, "user1")
+    assert late["job_id"] == responses[0]["job_id"]
@@ -0,0 +1,123 @@
+"""
+Unit tests for structured LLM output extraction and validation
+"""
+
+import json
+import time
+import pytest
+from unittest.mock import patch
+
+from app.agents.architect_agent import PRD_ANALYSIS_OUTPUT
+from app.agents.planner_agent import EFFORT_ESTIMATE_OUTPUT
+from app.agents.sales_value_analyst_agent import VALUE_PROJECTION_OUTPUT
+from app.core.llm_registry import _sdk_generation_config
+from app.core.structured_output import extract_json_object, vertex_response_schema
+
+EFFORT = {
+    "roles": [{"role": "Lead Developer", "hours": 120}],
+    "total_hours": 120,
+    "estimated_duration_weeks": 6,
+    "complexity_assessment": "Medium",
+    "notes": "Small integration",
+}
+
+
+class TestExtractJsonObject:
+    """Test the balanced-brace JSON scanner"""
+
+    def test_object_surrounded_by_prose_and_trailing_braces(self):
+        text = 'Here you go:\n```json\n{"a": 1}\n```\nUse {placeholders} like {this}.'
+
+        assert extract_json_object(text) == {"a": 1}
+
+    def test_braces_inside_strings(self):
+        text = '{"template": "GET /api/{id}", "nested": {"ok": "}"}}'
+
+        assert extract_json_object(text) == {
+            "template": "GET /api/{id}",
+            "nested": {"ok": "}"},
+        }
+
+    def test_skips_invalid_candidates(self):
+        text = "Format {like this} then {'single': 'quotes'} then {\"valid\": true}"
+
+        assert extract_json_object(text) == {"valid": True}
+
+    def test_stray_opening_brace(self):
+        assert extract_json_object('oops { then {"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_no_object(self):
+        assert extract_json_object("[1, 2, 3]") is None
+        assert extract_json_object("") is None
+        assert extract_json_object("{unterminated") is None
+
+    def test_large_output_is_fast(self):
+        text = "{" + "x" * 200_000 + "} trailing } " + json.dumps({"k": "v"}) + " }" * 1000
+
+        started = time.perf_counter()
+        assert extract_json_object(text) == {"k": "v"}
+        assert time.perf_counter() - started < 1.0
+
+
+class TestStructuredOutput:
+    """Test per-agent schemas"""
+
+    def test_valid_effort_estimate(self):
+        parsed = EFFORT_ESTIMATE_OUTPUT.parse("Estimate:\n" + json.dumps(EFFORT))
+
+        assert parsed == EFFORT
+        assert isinstance(parsed["roles"][0]["hours"], int)
+
+    def test_invalid_effort_estimate(self):
+        invalid = dict(EFFORT, complexity_assessment="Enormous")
+        negative = dict(EFFORT, roles=[{"role": "QA Engineer", "hours": -5}])
+
+        assert EFFORT_ESTIMATE_OUTPUT.parse(json.dumps(invalid)) is None
+        assert EFFORT_ESTIMATE_OUTPUT.parse(json.dumps(negative)) is None
+        assert EFFORT_ESTIMATE_OUTPUT.parse(json.dumps(dict(EFFORT, roles=[]))) is None
+
+    def test_value_projection_keeps_extra_fields(self):
+        data = {
+            "scenarios": [{"case": "Base", "value": 250000, "description": "Adoption"}],
+            "confidence": "medium",
+        }
+
+        assert VALUE_PROJECTION_OUTPUT.parse(json.dumps(data)) == data
+
+    def test_json_mode_generation_config(self):
+        base = {"temperature": 0.2}
+
+        config = EFFORT_ESTIMATE_OUTPUT.generation_config(base)
+        with patch("app.core.structured_output.settings.llm_json_mode_enabled", False):
+            plain = EFFORT_ESTIMATE_OUTPUT.generation_config(base)
+
+        assert config["response_mime_type"] == "application/json"
+        assert config["response_schema"]["properties"]["roles"]["type"] == "array"
+        assert plain == base
+
+
+class TestVertexResponseSchema:
+    """Test conversion of pydantic schemas for Vertex AI"""
+
+    def test_refs_inlined_and_optionals_nullable(self):
+        schema = PRD_ANALYSIS_OUTPUT.response_schema
+        complexity = schema["properties"]["complexity_indicators"]
+
+        assert "$defs" not in json.dumps(schema)
+        assert complexity["nullable"] is True
+        assert complexity["properties"]["features_count"]["type"] == "number"
+
+    def test_unsupported_keywords_dropped(self):
+        schema = vertex_response_schema(
+            {"type": "object", "title": "X", "additionalProperties": True, "properties": {}}
+        )
+
+        assert schema == {"type": "object", "properties": {}}
+
+    @pytest.mark.parametrize(
+        "output", [EFFORT_ESTIMATE_OUTPUT, VALUE_PROJECTION_OUTPUT, PRD_ANALYSIS_OUTPUT]
+    )
+    def test_schemas_accepted_by_sdk(self, output):
+        config = _sdk_generation_config(output.generation_config({"temperature": 0.2}))
+
+        assert config.to_dict()["response_schema"]
@@ -0,0 +1,89 @@
+"""
+Unit tests for relevance-ranked link content compaction
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from app.agents.product_manager_agent import ProductManagerAgent
+from app.core.llm_cache import GenerationResult
+from app.utils.text_compaction import compact_text, estimate_tokens
+from app.utils.url_cache import URLContentCache
+
+PAGE = "\n".join(
+    [
+        "Skip to main content",
+        "We use cookies to improve your experience on this site.",
+        "The e-prescribing workflow requires pharmacists to re-enter prior authorization data manually.",
+        "Our company picnic will be held at the lake this summer for all staff.",
+        "Prior authorization delays cause patients to abandon prescriptions at the pharmacy counter.",
+        "The e-prescribing workflow requires pharmacists to re-enter prior authorization data manually.",
+        "Copyright 2024 Example Corp. All rights reserved.",
+    ]
+)
+QUERY = "Automate prior authorization in e-prescribing"
+
+
+class TestCompactText:
+    """Test passage filtering, ranking and budgeting"""
+
+    def test_boilerplate_and_duplicates_are_removed(self):
+        result = compact_text(PAGE, QUERY, token_budget=1000)
+
+        assert "cookies" not in result["text"]
+        assert "Skip to main content" not in result["text"]
+        assert "All rights reserved" not in result["text"]
+        assert result["text"].count("re-enter prior authorization") == 1
+
+    def test_budget_keeps_most_relevant_passages_in_document_order(self):
+        budget = estimate_tokens(
+            "The e-prescribing workflow requires pharmacists to re-enter prior authorization data manually."
+        ) + estimate_tokens(
+            "Prior authorization delays cause patients to abandon prescriptions at the pharmacy counter."
+        )
+
+        result = compact_text(PAGE, QUERY, token_budget=budget)
+        lines = result["text"].split("\n")
+
+        assert len(lines) == 2
+        assert lines[0].startswith("The e-prescribing workflow")
+        assert lines[1].startswith("Prior authorization delays")
+        assert "picnic" not in result["text"]
+        assert result["passages_kept"] == 2
+
+    def test_without_query_keeps_leading_passages(self):
+        result = compact_text(PAGE, "", token_budget=30)
+
+        assert result["text"].startswith("The e-prescribing workflow")
+        assert "Copyright" not in result["text"]
+
+    def test_oversized_single_passage_is_clipped(self):
+        result = compact_text("word " * 2000, QUERY, token_budget=50)
+
+        assert result["passages_kept"] == 1
+        assert len(result["text"]) <= 200
+
+
+@pytest.mark.asyncio
+async def test_summarization_prompt_contains_compacted_page_text():
+    """The summarization prompt embeds the ranked passages, not a placeholder"""
+    registry = Mock()
+    summary_model = Mock()
+    prompts = []
+
+    async def fake_generate(contents):
+        prompts.append(contents[0])
+        return GenerationResult("- summary", "gemini-test")
+
+    summary_model.generate = fake_generate
+    registry.get_model.return_value = summary_model
+    agent = ProductManagerAgent(
+        prompt_service=Mock(), llm_registry=registry, url_cache=URLContentCache()
+    )
+
+    summary = await agent.summarize_content(PAGE, "Wiki", query=QUERY)
+
+    assert summary == "- summary"
+    assert "{text_content" not in prompts[0]
+    assert "Prior authorization delays cause patients" in prompts[0]
+    assert "cookies" not in prompts[0]
@@ -0,0 +1,140 @@
+"""
+Unit tests for the relevant-link URL cache
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from app.agents.product_manager_agent import ProductManagerAgent
+from app.core.config import settings
+from app.utils.url_cache import URLCacheEntry, URLContentCache, content_hash
+from app.utils.web_utils import fetch_web_content
+
+PAGE = "<html><head><title>Wiki</title></head><body><p>Shared wiki page content.</p></body></html>"
+UPDATED_PAGE = "<html><head><title>Wiki</title></head><body><p>Updated wiki page content.</p></body></html>"
+
+
+def _ok(html, etag=None, last_modified=None):
+    return {
+        "success": True,
+        "html": html,
+        "status_code": 200,
+        "etag": etag,
+        "last_modified": last_modified,
+    }
+
+
+class TestConditionalRevalidation:
+    """Test fetch_web_content with a URL cache"""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_is_served_from_cache(self):
+        cache = URLContentCache()
+        with patch("app.utils.web_utils._fetch_url") as mock_fetch:
+            mock_fetch.return_value = _ok(PAGE, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+            first = await fetch_web_content("https://wiki.example.com/page", cache=cache)
+
+            mock_fetch.return_value = {"success": True, "not_modified": True, "status_code": 304}
+            second = await fetch_web_content("https://wiki.example.com/page", cache=cache)
+
+            conditional_headers = mock_fetch.call_args_list[1].args[1]
+
+        assert conditional_headers == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+        assert first["metadata"]["from_cache"] is False
+        assert second["metadata"]["from_cache"] is True
+        assert second["content"] == first["content"]
+        assert second["metadata"]["content_hash"] == first["metadata"]["content_hash"]
+        assert cache.get_stats()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_summary_survives_unchanged_content_only(self):
+        cache = URLContentCache()
+        url = "https://wiki.example.com/page"
+        with patch("app.utils.web_utils._fetch_url") as mock_fetch:
+            mock_fetch.return_value = _ok(PAGE)
+            first = await fetch_web_content(url, cache=cache)
+            first_hash = first["metadata"]["content_hash"]
+            await cache.store_summary(url, first_hash, "- summary")
+
+            same = await fetch_web_content(url, cache=cache)
+            assert await cache.get_summary(url, same["metadata"]["content_hash"]) == "- summary"
+
+            mock_fetch.return_value = _ok(UPDATED_PAGE)
+            changed = await fetch_web_content(url, cache=cache)
+
+        assert changed["metadata"]["content_hash"] != first_hash
+        assert await cache.get_summary(url, changed["metadata"]["content_hash"]) is None
+
+    @pytest.mark.asyncio
+    async def test_sqlite_tier_survives_new_instance(self, tmp_path):
+        path = str(tmp_path / "url_cache.db")
+        first = URLContentCache(sqlite_path=path)
+        await first.put(
+            URLCacheEntry("https://a", "A", "text", content_hash("text"), etag='"e"')
+        )
+        await first.store_summary("https://a", content_hash("text"), "- a")
+
+        entry = await URLContentCache(sqlite_path=path).get("https://a")
+
+        assert entry.etag == '"e"'
+        assert entry.summary == "- a"
+
+
+@pytest.mark.asyncio
+async def test_product_manager_skips_resummarizing_unchanged_links():
+    """Re-processing a link with unchanged content reuses the cached summary"""
+    agent = ProductManagerAgent(
+        prompt_service=Mock(), llm_registry=Mock(), url_cache=URLContentCache()
+    )
+    summarize_calls = []
+
+    async def fake_summarize(text, link_name, query=""):
+        summarize_calls.append(link_name)
+        return "- cached summary"
+
+    agent.summarize_content = fake_summarize
+    link = {"name": "Wiki", "url": "https://wiki.example.com/page"}
+    with patch("app.utils.web_utils._fetch_url") as mock_fetch:
+        mock_fetch.side_effect = [
+            _ok(PAGE, etag='"v1"'),
+            {"success": True, "not_modified": True, "status_code": 304},
+        ]
+        first = await agent._process_relevant_links([link])
+        second = await agent._process_relevant_links([link])
+
+    assert first == second
+    assert "- cached summary" in second[0]
+    assert summarize_calls == ["Wiki"]
+
+
+@pytest.mark.asyncio
+async def test_product_manager_resummarizes_for_a_different_query():
+    """Summaries compacted towards one case's query are not reused for another"""
+    agent = ProductManagerAgent(
+        prompt_service=Mock(), llm_registry=Mock(), url_cache=URLContentCache()
+    )
+    summarize_calls = []
+
+    async def fake_summarize(text, link_name, query=""):
+        summarize_calls.append(query)
+        return f"- summary for {query}"
+
+    agent.summarize_content = fake_summarize
+    link = {"name": "Wiki", "url": "https://wiki.example.com/page"}
+    with patch("app.utils.web_utils._fetch_url") as mock_fetch:
+        mock_fetch.side_effect = [
+            _ok(PAGE, etag='"v1"'),
+            {"success": True, "not_modified": True, "status_code": 304},
+            {"success": True, "not_modified": True, "status_code": 304},
+        ]
+        billing = await agent._process_relevant_links([link], query="billing")
+        onboarding = await agent._process_relevant_links([link], query="onboarding")
+        with patch.object(settings, "link_content_token_budget", 10):
+            await agent._process_relevant_links([link], query="onboarding")
+
+    assert "- summary for billing" in billing[0]
+    assert "- summary for onboarding" in onboarding[0]
+    assert summarize_calls == ["billing", "onboarding", "onboarding"]
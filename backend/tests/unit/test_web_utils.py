@@ -4,8 +4,14 @@ Unit tests for web_utils module
 
 import pytest
 import asyncio
+import httpx
 from unittest.mock import patch, Mock
-from app.utils.web_utils import fetch_web_content, validate_url, _parse_html_content
+from app.utils.web_utils import (
+    fetch_web_content,
+    validate_url,
+    _parse_html_content,
+    _read_body,
+)
 
 
 class TestUrlValidation:
@@ -141,8 +147,8 @@ class TestWebContentFetching:
         </html>
         """
 
-        # Mock the synchronous fetch function
-        with patch("app.utils.web_utils._fetch_url_sync") as mock_fetch:
+        # Mock the async fetch function
+        with patch("app.utils.web_utils._fetch_url") as mock_fetch:
             mock_fetch.return_value = {
                 "success": True,
                 "html": mock_html,
@@ -161,7 +167,7 @@ class TestWebContentFetching:
     @pytest.mark.asyncio
     async def test_http_error_handling(self):
         """Test handling of HTTP errors"""
-        with patch("app.utils.web_utils._fetch_url_sync") as mock_fetch:
+        with patch("app.utils.web_utils._fetch_url") as mock_fetch:
             mock_fetch.return_value = {
                 "success": False,
                 "error": "HTTP error 404: Not Found",
@@ -177,7 +183,7 @@ class TestWebContentFetching:
     @pytest.mark.asyncio
     async def test_connection_error_handling(self):
         """Test handling of connection errors"""
-        with patch("app.utils.web_utils._fetch_url_sync") as mock_fetch:
+        with patch("app.utils.web_utils._fetch_url") as mock_fetch:
             mock_fetch.return_value = {
                 "success": False,
                 "error": "Connection error: Unable to connect to the URL",
@@ -191,5 +197,25 @@ class TestWebContentFetching:
             assert result["metadata"]["status_code"] is None
 
 
+class TestBodyReading:
+    """Test bounded reading of response bodies"""
+
+    @pytest.mark.asyncio
+    async def test_body_of_exactly_max_bytes_is_not_truncated(self):
+        response = httpx.Response(200, content=b"x" * 16)
+        body, truncated = await _read_body(response, 16)
+
+        assert body == b"x" * 16
+        assert truncated is False
+
+    @pytest.mark.asyncio
+    async def test_body_over_max_bytes_is_truncated(self):
+        response = httpx.Response(200, content=b"x" * 17)
+        body, truncated = await _read_body(response, 16)
+
+        assert body == b"x" * 16
+        assert truncated is True
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,117 @@
+"""
+Unit tests for write batches and transactions
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from google.api_core.exceptions import Conflict
+
+from app.core.database import ArrayUnion, DocumentAlreadyExistsError, Increment
+from app.core.firestore_impl import FirestoreDocumentReference, FirestoreWriteBatch
+from app.core.metrics import FIRESTORE_OPERATION_DURATION
+from app.core.mock_impl import MockClient
+
+
+def _doc(db, doc_id, collection="cases"):
+    return db.collection(collection).document(doc_id)
+
+
+class TestMockWriteBatch:
+    """Test atomic batch commits on the mock"""
+
+    def test_commit_applies_writes_in_order(self):
+        db = MockClient()
+        _doc(db, "a").set({"status": "DRAFT", "history": ["created"], "n": 1})
+
+        batch = db.batch()
+        batch.update(_doc(db, "a"), {"status": "DRAFTED", "history": ArrayUnion(["drafted"])})
+        batch.update(_doc(db, "a"), {"status": "PLANNING", "history": ArrayUnion(["planning"]), "n": Increment(1)})
+        batch.set(_doc(db, "b"), {"status": "NEW"})
+        batch.delete(_doc(db, "c"))
+        assert _doc(db, "a").get().to_dict()["status"] == "DRAFT"  # Nothing applied before commit
+
+        batch.commit()
+        assert _doc(db, "a").get().to_dict() == {
+            "status": "PLANNING",
+            "history": ["created", "drafted", "planning"],
+            "n": 2,
+        }
+        assert _doc(db, "b").get().exists
+
+    def test_failed_commit_applies_nothing(self):
+        db = MockClient()
+        _doc(db, "a").set({"history": ["created"]})
+        _doc(db, "lease").set({"worker_id": "w1"})
+
+        batch = db.batch()
+        batch.update(_doc(db, "a"), {"history": ArrayUnion(["claimed"])})
+        batch.create(_doc(db, "lease"), {"worker_id": "w2"})
+        with pytest.raises(DocumentAlreadyExistsError):
+            batch.commit()
+
+        assert _doc(db, "a").get().to_dict() == {"history": ["created"]}
+        assert _doc(db, "lease").get().to_dict() == {"worker_id": "w1"}
+
+        with pytest.raises(Exception):
+            db.batch().set(_doc(db, "x"), {"ok": True}).update(_doc(db, "missing"), {"n": 1}).commit()
+        assert not _doc(db, "x").get().exists
+
+
+class TestMockTransaction:
+    """Test read-check-write transactions on the mock"""
+
+    def test_run_commits_writes_and_returns_result(self):
+        db = MockClient()
+        _doc(db, "a").set({"status": "PENDING"})
+
+        def claim(transaction):
+            if transaction.get(_doc(db, "a")).to_dict()["status"] != "PENDING":
+                return False
+            transaction.update(_doc(db, "a"), {"status": "RUNNING"})
+            transaction.create(_doc(db, "a-1", "leases"), {"worker_id": "w1"})
+            return True
+
+        assert db.transaction().run(claim) is True
+        assert db.transaction().run(claim) is False
+        assert _doc(db, "a").get().to_dict()["status"] == "RUNNING"
+        assert _doc(db, "a-1", "leases").get().exists
+
+    def test_exception_discards_writes_and_reads_must_come_first(self):
+        db = MockClient()
+        _doc(db, "a").set({"status": "PENDING"})
+
+        def failing(transaction):
+            transaction.update(_doc(db, "a"), {"status": "RUNNING"})
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            db.transaction().run(failing)
+        assert _doc(db, "a").get().to_dict()["status"] == "PENDING"
+
+        def read_after_write(transaction):
+            transaction.update(_doc(db, "a"), {"status": "RUNNING"})
+            transaction.get(_doc(db, "a"))
+
+        with pytest.raises(Exception):
+            db.transaction().run(read_after_write)
+        assert _doc(db, "a").get().to_dict()["status"] == "PENDING"
+
+
+def test_firestore_batch_unwraps_refs_and_maps_conflicts():
+    firestore = Mock()
+    sdk_batch = Mock()
+    sdk_batch.commit.side_effect = Conflict("exists")
+    sdk_ref = Mock()
+    batch = FirestoreWriteBatch(sdk_batch, firestore)
+
+    batch.update(FirestoreDocumentReference(sdk_ref, firestore, "batched_cases"), {"n": Increment(1)})
+    batch.create(FirestoreDocumentReference(sdk_ref, firestore, "batched_leases"), {"n": 1})
+    with pytest.raises(DocumentAlreadyExistsError):
+        batch.commit()
+
+    assert sdk_batch.update.call_args.args[0] is sdk_ref
+    assert sdk_batch.update.call_args.args[1] == {"n": firestore.Increment.return_value}
+    assert FIRESTORE_OPERATION_DURATION.count(
+        collection="batched_cases,batched_leases", operation="batch_commit", outcome="error"
+    ) == 1